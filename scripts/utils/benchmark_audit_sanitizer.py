@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bounded audit payload sanitizer against sanitize_for_audit.
+
+Builds an archive ``final_result`` like the one CalendarArchiveOrchestrator
+adds to its audit context, with every appointment reported as a conflict, and
+compares sanitizing time and the JSON size stored in ``audit_log.details``.
+
+Usage:
+    python scripts/utils/benchmark_audit_sanitizer.py --appointments 10000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from core.models.appointment import Appointment
+from core.utilities.audit_sanitizer import (
+    AuditPayloadSanitizer,
+    sanitize_audit_payload,
+    sanitize_for_audit,
+)
+
+
+def generate_final_result(count: int, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    appointments = []
+    for i in range(count):
+        start = base + timedelta(minutes=15 * rng.randrange(0, 4 * 24 * 90))
+        appointment = Appointment(
+            user_id=1,
+            calendar_id="primary",
+            subject=f"Customer workshop {rng.randrange(1000)}",
+            start_time=start,
+            end_time=start + timedelta(minutes=30 * rng.randint(1, 6)),
+            show_as="busy",
+        )
+        appointment.id = i + 1
+        appointment.ms_event_id = f"AAMkAG{i:08d}"
+        appointments.append(appointment)
+    return {
+        "status": "partial",
+        "archive_type": "general",
+        "total_appointments_fetched": count,
+        "appointments_archived": 0,
+        "conflicts": appointments,
+        "errors": [f"Overlap for appointment {a.id}" for a in appointments[:2000]],
+    }
+
+
+def best_of(func, repeat: int):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--appointments", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    final_result = generate_final_result(args.appointments)
+    sampling = AuditPayloadSanitizer(sample_large_collections=True)
+
+    legacy_time, legacy = best_of(lambda: sanitize_for_audit(final_result), args.repeat)
+    bounded_time, bounded = best_of(lambda: sanitize_audit_payload(final_result), args.repeat)
+    sampled_time, sampled = best_of(lambda: sampling.sanitize(final_result), args.repeat)
+
+    legacy_size = len(json.dumps(legacy))
+    print(f"Appointments:            {args.appointments}")
+    print(f"sanitize_for_audit:      {legacy_time * 1000:9.1f} ms  {legacy_size / 1024:9.1f} KiB")
+    for label, elapsed, payload in (
+        ("Bounded (head):", bounded_time, bounded),
+        ("Bounded (sampled):", sampled_time, sampled),
+    ):
+        size = len(json.dumps(payload))
+        print(
+            f"{label:<24} {elapsed * 1000:9.1f} ms  {size / 1024:9.1f} KiB"
+            f"  ({legacy_time / elapsed:5.1f}x faster, {legacy_size / size:5.1f}x smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark audit log search: OFFSET vs keyset paging, LIKE vs FTS5, with and without indexes.
+
+Seeds a temporary SQLite database with synthetic audit rows, times the
+filtered searches before the add_audit_log_indexes DDL is applied, then
+applies it and times offset paging against search_page and message_contains
+against message_search.
+
+Usage:
+    python scripts/utils/benchmark_audit_search.py --rows 5000000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from core.models.audit_log import SQLITE_FTS_STATEMENTS, AuditLog
+from core.repositories.audit_log_repository import AuditLogRepository
+
+ACTIONS = ["archive", "overlap_resolution", "re_archive", "api_call", "batch_operation"]
+WORDS = ["archived", "calendar", "overlap", "resolved", "customer", "workshop", "travel", "failed", "retry"]
+
+
+def seed(engine, rows: int, users: int, seed_value: int = 42) -> None:
+    rng = random.Random(seed_value)
+    base = datetime(2024, 1, 1)
+    insert = text(
+        "INSERT INTO audit_log (user_id, action_type, operation, status, message, correlation_id, created_at) "
+        "VALUES (:user_id, :action_type, :operation, :status, :message, :correlation_id, :created_at)"
+    )
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            action = rng.choice(ACTIONS)
+            batch.append({
+                "user_id": rng.randrange(1, users + 1),
+                "action_type": action,
+                "operation": f"{action}_op",
+                "status": "success" if rng.random() > 0.05 else "failure",
+                "message": " ".join(rng.choice(WORDS) for _ in range(6)) + f" #{i}",
+                "correlation_id": f"corr-{i // 4}",
+                "created_at": (base + timedelta(seconds=i * 6)).isoformat(sep=" "),
+            })
+            if len(batch) == 50000:
+                conn.execute(insert, batch)
+                batch = []
+        if batch:
+            conn.execute(insert, batch)
+
+
+def timed(func, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def keyset_to_depth(repository, filters, limit, pages):
+    cursor = None
+    for _ in range(pages):
+        page = repository.search_page(filters, limit=limit, cursor=cursor)
+        cursor = page.next_cursor
+    return cursor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=1000, help="Page number to fetch (per user)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/audit.db")
+        AuditLog.__table__.create(engine)
+        for index in list(AuditLog.__table__.indexes):
+            index.drop(engine)
+
+        started = time.perf_counter()
+        seed(engine, args.rows, args.users)
+        print(f"Seeded {args.rows} rows in {time.perf_counter() - started:.1f} s")
+
+        session = Session(engine)
+        repository = AuditLogRepository(session=session)
+        user_filter = {"user_id": 7}
+        offset = args.page_size * args.depth
+        print(f"{'':<34}{'no indexes':>12}{'indexed':>12}")
+
+        def offset_page():
+            repository.search(user_filter, limit=args.page_size, offset=offset)
+
+        def first_page():
+            repository.search_page({"user_id": 7, "action_type": "archive"}, limit=args.page_size)
+
+        def correlation():
+            repository.search({"correlation_id": f"corr-{args.rows // 8}"})
+
+        # A needle that matches a single row, as when tracing one event
+        needle = str(args.rows // 3)
+
+        def like_search():
+            repository.search({"message_contains": f"#{needle}"}, limit=args.page_size)
+
+        before = {
+            "offset": timed(offset_page, 1),
+            "first": timed(first_page, 1),
+            "correlation": timed(correlation, 1),
+        }
+
+        for index in AuditLog.__table__.indexes:
+            index.create(engine)
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            for statement in SQLITE_FTS_STATEMENTS:
+                conn.execute(text(statement))
+            conn.execute(text("ANALYZE"))
+        print(f"Built indexes and FTS in {time.perf_counter() - started:.1f} s")
+
+        cursor = keyset_to_depth(repository, user_filter, args.page_size, args.depth)
+        if cursor is None:
+            parser.error("--depth is past the last page for this many rows")
+
+        rows = [
+            (f"user page {args.depth} (OFFSET)", before["offset"], timed(offset_page)),
+            (
+                f"user page {args.depth} (keyset)",
+                None,
+                timed(lambda: repository.search_page(user_filter, limit=args.page_size, cursor=cursor)),
+            ),
+            ("user+action first page", before["first"], timed(first_page)),
+            ("correlation trail", before["correlation"], timed(correlation)),
+            ("message LIKE '%...%'", None, timed(like_search, 1)),
+            (
+                "message FTS5",
+                None,
+                timed(lambda: repository.search({"message_search": needle}, limit=args.page_size)),
+            ),
+        ]
+        for label, unindexed, indexed in rows:
+            unindexed_text = f"{unindexed * 1000:9.1f} ms" if unindexed is not None else f"{'-':>12}"
+            print(f"{label:<34}{unindexed_text}{indexed * 1000:9.1f} ms")
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark concurrent archive jobs against each core database engine profile.
+
+Runs N worker threads that each behave like an archive job: read the
+target window, then write its appointments in small transactions, while
+reader threads poll the same table like the web app. Reports jobs/s, lock
+errors and pool metrics for the default and sqlite-wal profiles on a
+temporary SQLite file, and for postgres-pooled when --postgres-url is given.
+
+Usage:
+    python scripts/utils/benchmark_engine_profiles.py --jobs 32 --workers 8
+"""
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, select
+from sqlalchemy.exc import OperationalError
+
+from core.db_profiles import create_profiled_engine, pool_metrics
+
+metadata = MetaData()
+archived = Table(
+    "benchmark_archived_appointments",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("job_id", Integer, index=True),
+    Column("subject", String(255)),
+    Column("start_time", DateTime, index=True),
+    Column("end_time", DateTime),
+)
+
+
+def archive_job(engine, job_id: int, appointments: int, batch: int, errors: list) -> None:
+    rng = random.Random(job_id)
+    base = datetime(2025, 1, 1) + timedelta(days=job_id % 30)
+    try:
+        with engine.connect() as conn:
+            conn.execute(
+                select(func.count()).select_from(archived)
+                .where(archived.c.start_time.between(base, base + timedelta(days=1)))
+            ).scalar()
+        for offset in range(0, appointments, batch):
+            rows = [
+                {
+                    "job_id": job_id,
+                    "subject": f"Meeting {job_id}-{i}",
+                    "start_time": base + timedelta(minutes=rng.randrange(0, 1440)),
+                    "end_time": base + timedelta(minutes=30 + rng.randrange(0, 1440)),
+                }
+                for i in range(offset, min(offset + batch, appointments))
+            ]
+            with engine.begin() as conn:
+                conn.execute(insert(archived), rows)
+    except OperationalError as e:
+        errors.append(str(e.orig))
+
+
+def reader(engine, stop: threading.Event, counter: list, errors: list) -> None:
+    while not stop.is_set():
+        try:
+            with engine.connect() as conn:
+                conn.execute(select(func.max(archived.c.id))).scalar()
+            counter[0] += 1
+        except OperationalError as e:
+            errors.append(str(e.orig))
+
+
+def run_profile(url: str, profile: str, args) -> None:
+    engine = create_profiled_engine(url, profile)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    errors: list = []
+    reads = [0]
+    stop = threading.Event()
+    readers = [threading.Thread(target=reader, args=(engine, stop, reads, errors)) for _ in range(args.readers)]
+    for thread in readers:
+        thread.start()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for job_id in range(args.jobs):
+            executor.submit(archive_job, engine, job_id, args.appointments, args.batch, errors)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    stats = pool_metrics(engine)
+    print(
+        f"{profile:<16} {args.jobs / elapsed:8.1f} jobs/s  {reads[0] / elapsed:8.0f} reads/s"
+        f"  errors {len(errors):4d}  pool waits {stats.get('waits', 0):5d}"
+        f"  max wait {stats.get('wait_ms_max', 0):7.1f} ms"
+    )
+    metadata.drop_all(engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--appointments", type=int, default=500, help="Appointments written per job")
+    parser.add_argument("--batch", type=int, default=25, help="Appointments per write transaction")
+    parser.add_argument("--postgres-url", help="Also benchmark postgres-pooled against this database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in ("default", "sqlite-wal"):
+            run_profile(f"sqlite:///{tmp}/{profile}.db", profile, args)
+    if args.postgres_url:
+        for profile in ("default", "postgres-pooled"):
+            run_profile(args.postgres_url, profile, args)
+
+
+if __name__ == "__main__":
+    main()
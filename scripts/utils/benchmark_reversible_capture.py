@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-item versus bulk reversible-operation state capture.
+
+Captures before/after states for a replace-mode archive of N appointments
+into a temporary SQLite database, first with capture_item_state and
+update_item_after_state (one commit per call), then with capture_item_states
+and update_item_after_states, with and without compression.
+
+Usage:
+    python scripts/utils/benchmark_reversible_capture.py --items 5000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from core.db import Base
+from core.models.reversible_operation import ReversibleOperation, ReversibleOperationItem
+from core.services.reversible_audit_service import ReversibleAuditService
+
+
+def make_states(count: int):
+    base = datetime(2025, 1, 1, 9)
+    return [
+        {
+            "item_type": "appointment",
+            "item_id": str(i),
+            "external_id": f"AAMkAG{i:08d}",
+            "before_state": {
+                "subject": f"Customer workshop {i}",
+                "start_time": base + timedelta(hours=i),
+                "end_time": base + timedelta(hours=i, minutes=45),
+                "body_content": "Agenda and notes " * 20,
+                "categories": ["Billable", "Client A"],
+                "attendees": [{"email": f"person{n}@example.com"} for n in range(5)],
+            },
+            "reverse_action": "restore",
+        }
+        for i in range(count)
+    ]
+
+
+def new_operation(session: Session) -> ReversibleOperation:
+    operation = ReversibleOperation(
+        audit_log_id=1, user_id=1, operation_type="archive",
+        operation_name="calendar_archive_replace", reverse_instructions={},
+    )
+    session.add(operation)
+    session.commit()
+    return operation
+
+
+def per_item(service: ReversibleAuditService, operation, states):
+    for spec in states:
+        item = service.capture_item_state(operation, **spec)
+        service.update_item_after_state(item, {"ms_event_id": f"new-{spec['item_id']}"})
+
+
+def bulk(service: ReversibleAuditService, operation, states, compress: bool):
+    items = service.capture_item_states(operation, states, compress=compress)
+    service.update_item_after_states(
+        [(item, {"ms_event_id": f"new-{spec['item_id']}"}) for item, spec in zip(items, states)],
+        compress=compress,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=5000)
+    args = parser.parse_args()
+
+    states = make_states(args.items)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/capture.db")
+        Base.metadata.create_all(engine, tables=[ReversibleOperation.__table__, ReversibleOperationItem.__table__])
+        session = Session(engine)
+        service = ReversibleAuditService(session)
+
+        runs = [
+            ("per item", lambda op: per_item(service, op, states)),
+            ("bulk", lambda op: bulk(service, op, states, compress=False)),
+            ("bulk, compressed", lambda op: bulk(service, op, states, compress=True)),
+        ]
+        baseline = None
+        for label, run in runs:
+            operation = new_operation(session)
+            started = time.perf_counter()
+            run(operation)
+            elapsed = time.perf_counter() - started
+            baseline = baseline or elapsed
+            stored = session.execute(
+                select(func.sum(func.length(ReversibleOperationItem.before_state)))
+                .where(ReversibleOperationItem.operation_id == operation.id)
+            ).scalar()
+            print(
+                f"{label:<18} {elapsed * 1000:9.1f} ms  ({baseline / elapsed:5.1f}x)"
+                f"  before_state {stored / 1024:8.1f} KiB"
+            )
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark blocked versus exhaustive task clustering.
+
+Generates synthetic To Do tasks from a random lexicon, with near-duplicates
+(transposed letters, punctuation changes, suffixes), and clusters them with
+candidate blocking. It times scoring the candidate pairs with a per-pair
+fuzz.partial_ratio loop (the previous implementation) against score_pairs
+(rapidfuzz process.cpdist on all cores). Up to --max-reference tasks it also reports pair recall:
+the share of matching pairs (found by scoring every pair with rapidfuzz's
+cdist) that blocking proposed. Up to --max-exhaustive tasks it times the
+exhaustive clustering and checks that both produce the same clusters.
+
+Usage:
+    python scripts/utils/benchmark_task_clustering.py --sizes 1000 10000 50000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from core.todo.config import TodoDedupConfig
+from core.todo.services.clustering_service import TaskClusteringService, candidate_pairs, score_pairs
+from core.todo.services.text_normalization import normalize_text
+
+VERBS = ["Follow up with", "Email", "Call", "Review", "Prepare", "Send", "Schedule", "Draft", "Update", "Book",
+         "Check", "Renew", "Approve", "Sign", "Plan", "Fix", "Order", "Pay", "Ask", "Confirm"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "te", "vo", "shi", "dan", "rel", "mon", "tra", "pel", "qui", "zor",
+             "bel", "nix", "sor", "gal", "fen", "dru", "hal", "wen", "cor", "tis", "ump", "lex", "bri", "sta"]
+
+
+def make_lexicon(rng: random.Random, size: int):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def mutate(rng: random.Random, title: str) -> str:
+    choice = rng.random()
+    if choice < 0.3 and len(title) > 5:
+        i = rng.randrange(len(title) - 1)
+        return title[:i] + title[i + 1] + title[i] + title[i + 2:]
+    if choice < 0.6:
+        return title.replace(" ", "-", 1).lower()
+    return f"{title} (flagged)"
+
+
+def generate_tasks(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    lexicon = make_lexicon(rng, 5000)
+    tasks = []
+    while len(tasks) < count:
+        words = " ".join(rng.choice(lexicon) for _ in range(rng.randint(2, 6)))
+        title = f"{rng.choice(VERBS)} {words}"
+        body = " ".join(rng.choice(lexicon) for _ in range(rng.randint(5, 20)))
+        tasks.append({"title": title, "body": body})
+        if rng.random() < 0.2:
+            tasks.append({"title": mutate(rng, title), "body": body})
+    return tasks[:count]
+
+
+def matching_pairs(tasks, threshold: int, chunk: int = 2000):
+    """Every pair scoring at least ``threshold`` with the service's formula."""
+    titles = [normalize_text(task["title"]) for task in tasks]
+    bodies = [normalize_text(task["body"])[:200] for task in tasks]
+    # The combined score can only reach the threshold if the title does, or
+    # if 0.7 * title + 30 does
+    title_floor = (threshold - 30) / 0.7
+    pairs = set()
+    for start in range(0, len(titles), chunk):
+        scores = process.cdist(titles[start:start + chunk], titles, scorer=fuzz.partial_ratio, workers=-1)
+        for row, j in np.argwhere(scores >= title_floor):
+            i = start + row
+            if i >= j:
+                continue
+            title_score = scores[row, j]
+            score = max(int(0.7 * title_score + 0.3 * fuzz.partial_ratio(bodies[i], bodies[j])), title_score)
+            if score >= threshold:
+                pairs.add((i, int(j)))
+    return pairs
+
+
+def loop_scores(titles, bodies, pairs, threshold: int):
+    """The per-pair scoring loop score_pairs replaced."""
+    matched = []
+    for left, right in pairs:
+        title_score = fuzz.partial_ratio(titles[left], titles[right])
+        body_score = fuzz.partial_ratio(bodies[left], bodies[right]) if bodies[left] and bodies[right] else 0
+        matched.append(max(int(0.7 * title_score + 0.3 * body_score), title_score) >= threshold)
+    return matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--max-exhaustive", type=int, default=2000)
+    parser.add_argument("--max-reference", type=int, default=10000)
+    args = parser.parse_args()
+
+    threshold = 86
+    service = TaskClusteringService(TodoDedupConfig(fuzzy_score_threshold=threshold))
+    print(
+        f"{'tasks':>7} {'candidates':>11} {'loop':>9} {'cpdist':>9} {'speedup':>8} {'blocked':>9}"
+        f" {'recall':>14} {'exhaustive':>11} {'clusters':>9}  same"
+    )
+    for size in args.sizes:
+        tasks = generate_tasks(size)
+        titles = [normalize_text(task["title"]) for task in tasks]
+        bodies = [normalize_text(task["body"])[:200] for task in tasks]
+        candidates = set(candidate_pairs(titles))
+        pairs = np.array(sorted(candidates), dtype=np.int64)
+
+        started = time.perf_counter()
+        expected = loop_scores(titles, bodies, pairs.tolist(), threshold)
+        loop_time = time.perf_counter() - started
+        started = time.perf_counter()
+        matched = score_pairs(titles, bodies, pairs[:, 0], pairs[:, 1], threshold)
+        vector_time = time.perf_counter() - started
+        assert matched.tolist() == expected, "vectorized scores differ from the loop"
+
+        started = time.perf_counter()
+        blocked = service.cluster_tasks(tasks, include_singletons=False)
+        blocked_time = time.perf_counter() - started
+
+        recall_text = f"{'-':>14}"
+        if size <= args.max_reference:
+            reference = matching_pairs(tasks, threshold)
+            found = len(reference & candidates)
+            recall_text = f"{found:>6}/{len(reference):<7}"
+
+        exhaustive_text, same = f"{'-':>11}", "-"
+        if size <= args.max_exhaustive:
+            started = time.perf_counter()
+            exhaustive = service.cluster_tasks(tasks, include_singletons=False, blocking=False)
+            exhaustive_text = f"{time.perf_counter() - started:9.2f} s"
+            same = str([c.indices for c in blocked] == [c.indices for c in exhaustive])
+        print(
+            f"{size:>7} {len(candidates):>11} {loop_time:7.2f} s {vector_time:7.2f} s {loop_time / vector_time:7.1f}x"
+            f" {blocked_time:7.2f} s {recall_text} {exhaustive_text}"
+            f" {len(blocked):>9}  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized timesheet report against per-appointment loops.
+
+The loop baseline mirrors how TimesheetArchiveService._generate_statistics and
+CategoryProcessingService.get_category_statistics walk appointments: one
+category parse and dictionary update per appointment.
+
+Usage:
+    python scripts/utils/benchmark_timesheet_report.py --appointments 50000
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from core.models.appointment import Appointment
+from core.services.category_processing_service import CategoryProcessingService
+from core.services.timesheet_archive_service import TimesheetArchiveService
+from core.services.timesheet_report_service import TimesheetReportService
+
+CUSTOMERS = [f"Customer {i:02d}" for i in range(40)]
+BILLING_TYPES = ["billable", "non-billable"]
+SUBJECTS = ["Design review", "Standup", "Client workshop", "Drive to site", "Flight to HQ", "Planning"]
+
+
+def generate_appointments(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    appointments = []
+    for i in range(count):
+        start = base + timedelta(minutes=15 * rng.randrange(0, 4 * 24 * 180))
+        category = f"{rng.choice(CUSTOMERS)} - {rng.choice(BILLING_TYPES)}"
+        appointments.append(
+            Appointment(
+                user_id=1,
+                calendar_id="primary",
+                subject=rng.choice(SUBJECTS),
+                start_time=start,
+                end_time=start + timedelta(minutes=15 * rng.randint(1, 12)),
+                categories=[category] if rng.random() > 0.1 else [],
+                show_as="busy",
+            )
+        )
+    return appointments
+
+
+def loop_report(appointments: list) -> dict:
+    """Per-appointment aggregation in the style of the existing statistics loops."""
+    category_service = CategoryProcessingService()
+    timesheet_service = TimesheetArchiveService()
+    by_customer = {}
+    by_billing = {}
+    by_day = {}
+    for appointment in appointments:
+        if timesheet_service._is_free_status_appointment(appointment):
+            continue
+        info = category_service.extract_customer_billing_info(appointment)
+        if timesheet_service._detect_travel_appointment(appointment):
+            billing = "travel"
+        elif info["is_personal"]:
+            billing = "personal"
+        else:
+            billing = info["billing_type"] or "uncategorized"
+        customer = info["customer"] or "(none)"
+        hours = max((appointment.end_time - appointment.start_time).total_seconds(), 0) / 3600
+        by_customer[customer] = by_customer.get(customer, 0.0) + hours
+        by_billing[billing] = by_billing.get(billing, 0.0) + hours
+        day = appointment.start_time.date().isoformat()
+        by_day[day] = by_day.get(day, 0.0) + hours
+    return {"by_customer": by_customer, "by_billing_type": by_billing, "by_day": by_day}
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--appointments", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    appointments = generate_appointments(args.appointments)
+    service = TimesheetReportService()
+
+    loop_time = best_of(lambda: loop_report(appointments), args.repeat)
+    full_time = best_of(lambda: service.generate_report(appointments), args.repeat)
+    columns = service.build_columns(appointments)
+    aggregate_time = best_of(lambda: service.aggregate(columns), args.repeat)
+
+    expected = loop_report(appointments)
+    actual = service.aggregate(columns)
+    for customer, hours in expected["by_customer"].items():
+        assert abs(actual["by_customer"][customer]["hours"] - hours) < 1e-6, customer
+    for day, hours in expected["by_day"].items():
+        assert abs(actual["by_day"][day] - hours) < 1e-6, day
+
+    print(f"Appointments:              {args.appointments}")
+    print(f"Loop aggregation:          {loop_time * 1000:9.1f} ms")
+    print(f"Columnar (build + agg):    {full_time * 1000:9.1f} ms  ({loop_time / full_time:5.1f}x)")
+    print(f"Columnar (aggregate only): {aggregate_time * 1000:9.1f} ms  ({loop_time / aggregate_time:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial versus concurrent, $batch-enriched To Do task fetching.
+
+Replays recorded-style Graph responses for a mailbox with several To Do
+lists and a Flagged Emails list, through an in-process HTTP client that adds
+a fixed latency per request. The serial run fetches lists one at a time and
+each flagged email's message with its own GET (the previous behaviour); the
+concurrent runs fetch lists on a worker pool and messages through $batch.
+
+Usage:
+    python scripts/utils/benchmark_todo_fetch.py --lists 8 --tasks 300 --flagged 400
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+# Add src directory to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from core.todo.repositories.msgraph_task_repository import MSGraphTaskRepository
+
+GRAPH = "https://graph.microsoft.com/v1.0"
+
+
+class RecordedResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self.content = json.dumps(payload).encode("utf-8")
+        self.text = self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class RecordedGraph:
+    """Serves To Do lists, task pages, messages and $batch calls with a fixed latency."""
+
+    def __init__(self, lists: int, tasks: int, flagged: int, latency: float):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.lists = [{"id": f"list{n}", "displayName": f"List {n}", "wellknownListName": None} for n in range(lists)]
+        self.lists.append({"id": "flagged", "displayName": "Flagged Emails", "wellknownListName": "flaggedEmails"})
+        self.tasks = {
+            f"list{n}": [self._task(f"l{n}-t{t}") for t in range(tasks)] for n in range(lists)
+        }
+        self.tasks["flagged"] = [
+            self._task(f"f{t}", [{"id": f"r{t}", "applicationName": "Outlook", "externalId": f"MSG{t}"}])
+            for t in range(flagged)
+        ]
+
+    @staticmethod
+    def _task(task_id, linked=()):
+        return {
+            "id": task_id,
+            "title": f"Task {task_id}",
+            "status": "notStarted",
+            "importance": "normal",
+            "createdDateTime": "2025-10-21T12:00:00Z",
+            "lastModifiedDateTime": "2025-10-21T12:00:00Z",
+            "body": {"content": "", "contentType": "text"},
+            "linkedResources": list(linked),
+        }
+
+    @staticmethod
+    def _message(message_id):
+        return {
+            "bodyPreview": f"Preview of {message_id}",
+            "body": {"content": f"<p>{message_id}</p>", "contentType": "html"},
+            "webLink": f"https://outlook.office.com/mail/{message_id}",
+        }
+
+    def _page(self, items, path, skip):
+        top = MSGraphTaskRepository.DEFAULT_TOP
+        payload = {"value": items[skip : skip + top]}
+        if skip + top < len(items):
+            payload["@odata.nextLink"] = f"{GRAPH}{path}?$skip={skip + top}"
+        return payload
+
+    def request(self, method, url, timeout=None, params=None, json=None, headers=None):
+        with self.lock:
+            self.requests += 1
+        time.sleep(self.latency)
+        parts = urlsplit(url)
+        path = parts.path[len("/v1.0") :]
+        skip = int(parts.query.split("=")[1]) if parts.query.startswith("$skip=") else 0
+        if method == "POST" and path == "/$batch":
+            responses = [
+                {"id": item["id"], "status": 200, "body": self._message(item["url"].split("/")[-1].split("?")[0])}
+                for item in json["requests"]
+            ]
+            return RecordedResponse({"responses": responses})
+        if path == "/me/todo/lists":
+            return RecordedResponse({"value": self.lists})
+        if path.startswith("/me/messages/"):
+            return RecordedResponse(self._message(path.rsplit("/", 1)[1]))
+        list_id = path.split("/")[4]
+        return RecordedResponse(self._page(self.tasks[list_id], path, skip))
+
+
+def serial_repository(graph):
+    """The previous behaviour: one list at a time, one GET per flagged email."""
+
+    repository = MSGraphTaskRepository(http_client=graph, max_workers=1)
+
+    def enrich_one_by_one(resources, base_url, headers):
+        for resource in resources:
+            repository._enrich_flagged_email_resource(resource, base_url, headers)
+
+    repository._enrich_flagged_email_resources = enrich_one_by_one
+    return repository
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lists", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=300, help="tasks per ordinary list")
+    parser.add_argument("--flagged", type=int, default=400, help="tasks in the Flagged Emails list")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    user = SimpleNamespace(id=1, email="user@example.com")
+    runs = [("serial, GET per email", None)] + [(f"{w} workers, $batch", w) for w in (4, 8)]
+    baseline = None
+    for label, workers in runs:
+        graph = RecordedGraph(args.lists, args.tasks, args.flagged, args.latency_ms / 1000)
+        repository = serial_repository(graph) if workers is None else MSGraphTaskRepository(
+            http_client=graph, max_workers=workers
+        )
+        started = time.perf_counter()
+        tasks = repository.list_all_tasks(user, "token")
+        elapsed = time.perf_counter() - started
+        baseline = baseline or (elapsed, graph.requests)
+        enriched = sum(1 for task in tasks for resource in task.linked_resources if resource.preview)
+        print(
+            f"{label:<24} {graph.requests:6d} requests ({baseline[1] / graph.requests:5.1f}x fewer)"
+            f"  {elapsed:7.2f} s ({baseline[0] / elapsed:5.1f}x)  {len(tasks)} tasks, {enriched} enriched"
+        )
+
+
+if __name__ == "__main__":
+    main()
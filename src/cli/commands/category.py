@@ -89,8 +89,9 @@ def list_category(
         table.add_column("Store", style="blue")
 
         for category in categories:
-            # For local categories, use the database ID; for msgraph, use a placeholder
-            category_id = str(getattr(category, "id", "N/A"))
+            # Local categories carry the database ID; msgraph categories the Outlook category ID
+            category_id = category.id if category.id is not None else category.graph_id
+            category_id = "N/A" if category_id is None else str(category_id)
             table.add_row(
                 category_id, category.name, category.description or "", store.title()
             )
@@ -0,0 +1,146 @@
+"""Timesheet reporting commands."""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from cli.common.helpful_group import HelpfulGroup
+from cli.common.options import user_option
+from cli.common.utils import parse_date_range, resolve_cli_user
+from core.db import get_session
+
+timesheet_app = typer.Typer(
+    help="Timesheet reporting", rich_markup_mode="rich", cls=HelpfulGroup
+)
+
+
+@timesheet_app.callback()
+def timesheet_callback(ctx: typer.Context):
+    """Timesheet reporting commands.
+
+    Summarise stored appointments by customer, billing type and day.
+    """
+    if ctx.invoked_subcommand is None:
+        typer.echo(ctx.get_help())
+
+
+def _hours(value: float) -> str:
+    return f"{value:.2f}"
+
+
+@timesheet_app.command("report")
+def report(
+    user_input: Optional[str] = user_option,
+    date_option: str = typer.Option(
+        "last month",
+        "--date",
+        help="Date or date range. Accepts: 'today', 'yesterday', 'last 7 days', 'last week', 'last 30 days', 'last month', a single date (e.g. 31-12-2024) or a range (e.g. 1-6 to 30-6).",
+    ),
+    tz_name: str = typer.Option(
+        "UTC", "--timezone", help="IANA timezone used to group hours by day."
+    ),
+    show_days: bool = typer.Option(
+        False, "--days/--no-days", help="Show per-day hour totals."
+    ),
+    calendar_id: Optional[str] = typer.Option(
+        None,
+        "--calendar",
+        help="Only report appointments stored for this calendar ID. By default all stored calendars are read and copies of the same meeting are counted once.",
+    ),
+):
+    """Report hours per customer, billing type and day from stored appointments."""
+    from core.models.appointment import Appointment
+    from core.services.timesheet_report_service import TimesheetReportService
+
+    console = Console()
+    try:
+        start_dt, end_dt = parse_date_range(date_option)
+    except Exception as e:
+        console.print(f"[red]Error parsing date: {e}[/red]")
+        raise typer.Exit(code=1)
+
+    try:
+        user = resolve_cli_user(user_input)
+    except Exception as e:
+        console.print(f"[red]Error resolving user: {e}[/red]")
+        raise typer.Exit(code=1)
+
+    session = get_session()
+    try:
+        start_datetime = datetime.combine(start_dt, datetime.min.time()).replace(
+            tzinfo=timezone.utc
+        )
+        end_datetime = datetime.combine(end_dt, datetime.max.time()).replace(
+            tzinfo=timezone.utc
+        )
+        query = session.query(Appointment).filter(
+            Appointment.user_id == user.id,
+            Appointment.start_time >= start_datetime,
+            Appointment.end_time <= end_datetime,
+        )
+        if calendar_id:
+            query = query.filter(Appointment.calendar_id == calendar_id)
+        service = TimesheetReportService()
+        # Backups and archive copies of a meeting are stored once per calendar
+        appointments = service.unique_appointments(query.all())
+        result = service.generate_report(appointments, timezone=tz_name)
+    except Exception as e:
+        console.print(f"[red]Error generating timesheet report: {e}[/red]")
+        raise typer.Exit(code=1)
+    finally:
+        session.close()
+
+    if not result["total_appointments"]:
+        console.print(
+            "[yellow]No appointments found for the specified date range.[/yellow]"
+        )
+        return
+
+    console.print(
+        f"[blue]Timesheet report for {user.email} from {start_dt} to {end_dt}: "
+        f"{result['total_appointments']} appointments, {_hours(result['total_hours'])} hours[/blue]"
+    )
+
+    billing_types = sorted(result["by_billing_type"])
+    customer_table = Table(title="Hours by Customer")
+    customer_table.add_column("Customer", style="cyan")
+    for billing_type in billing_types:
+        customer_table.add_column(billing_type, justify="right")
+    customer_table.add_column("Total", style="green", justify="right")
+    for customer, totals in sorted(
+        result["by_customer"].items(), key=lambda item: -item[1]["hours"]
+    ):
+        split = result["by_customer_billing"].get(customer, {})
+        customer_table.add_row(
+            customer,
+            *(_hours(split.get(billing_type, 0.0)) for billing_type in billing_types),
+            _hours(totals["hours"]),
+        )
+    console.print(customer_table)
+
+    billing_table = Table(title="Hours by Billing Type")
+    billing_table.add_column("Billing Type", style="cyan")
+    billing_table.add_column("Appointments", justify="right")
+    billing_table.add_column("Hours", style="green", justify="right")
+    for billing_type in billing_types:
+        totals = result["by_billing_type"][billing_type]
+        billing_table.add_row(
+            billing_type, str(totals["appointments"]), _hours(totals["hours"])
+        )
+    console.print(billing_table)
+
+    if show_days:
+        day_table = Table(title=f"Hours by Day ({tz_name})")
+        day_table.add_column("Date", style="cyan")
+        day_table.add_column("Hours", style="green", justify="right")
+        for day, hours in result["by_day"].items():
+            day_table.add_row(day, _hours(hours))
+        console.print(day_table)
+
+    if result["skipped_appointments"]:
+        console.print(
+            f"[yellow]{result['skipped_appointments']} appointments skipped (Free status or missing times)[/yellow]"
+        )
@@ -76,6 +76,7 @@ from cli.commands.category import category_app
 from cli.commands.auth import auth_app
 from cli.commands.jobs import jobs_app
 from cli.commands.interactive_prompt import interactive_prompt_app
+from cli.commands.timesheet import timesheet_app
 from cli.config.archive import archive_config_app
 from cli.config.timesheet import timesheet_config_app
 from cli.config.backup import backup_config_app
@@ -147,6 +148,9 @@ def build_command_tree():
     restore_node.add("[yellow]from-backup-calendars[/yellow] - Restore from backup calendars")
     restore_node.add("[yellow]backup-calendar[/yellow] - Backup calendar to file or another calendar")
 
+    timesheet_node = tree.add("[blue]timesheet[/blue] - Timesheet reporting")
+    timesheet_node.add("[cyan]report[/cyan] - Report hours per customer, billing type and day")
+
     config_node = tree.add("[blue]config[/blue] - Configuration operations")
     calendar_config_node = config_node.add("[cyan]calendar[/cyan] - Calendar configuration operations")
 
@@ -231,6 +235,7 @@ def main(ctx: typer.Context):
       admin-assistant config calendar timesheet list --user <USER_ID>
       admin-assistant config calendar timesheet create --user <USER_ID>
       admin-assistant config calendar timesheet activate --user <USER_ID> --config-id <CONFIG_ID>
+      admin-assistant timesheet report --user <USER_ID> --date "last month" --timezone "Europe/London"
 
       # Restoration operations
       admin-assistant calendar restore from-audit-logs --user <USER_ID> --start-date "2024-01-01"
@@ -263,6 +268,7 @@ calendar_app.add_typer(restoration_app, name="restore")
 # Register main command apps
 app.add_typer(category_app, name="category")
 app.add_typer(calendar_app, name="calendar")
+app.add_typer(timesheet_app, name="timesheet")
 app.add_typer(config_app, name="config")
 app.add_typer(auth_app, name="auth")
 app.add_typer(jobs_app, name="jobs")
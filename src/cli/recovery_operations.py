@@ -10,7 +10,7 @@ from rich.table import Table
 
 from cli.common.helpful_group import HelpfulGroup
 from core.db import get_session
-from core.services.reversible_audit_service import ReversibleAuditService
+from core.services.reversible_audit_service import ReversibleAuditService, make_msgraph_delete_reverser
 from core.services.user_service import UserService
 from core.utilities.user_resolution import resolve_user, get_user_identifier_source
 
@@ -25,6 +25,32 @@ recovery_app = typer.Typer(
 )
 
 
+def build_reversible_service(session, user=None) -> ReversibleAuditService:
+    """
+    Create the reversible audit service for a CLI command.
+
+    With a user and a cached MS Graph token, created appointments are
+    reversed through Graph $batch deletes instead of one request per item.
+    """
+    batch_reversers = {}
+    if user is not None:
+        from core.repositories.appointment_repository_msgraph import MSGraphAppointmentRepository
+        from core.utilities import get_graph_client
+        from core.utilities.auth_utility import get_cached_access_token
+
+        access_token = get_cached_access_token()
+        if access_token:
+            # Created events live in archive or other non-primary calendars, which are not recorded
+            repository = MSGraphAppointmentRepository(get_graph_client(user, access_token), user, any_calendar=True)
+            batch_reversers[("appointment", "delete")] = make_msgraph_delete_reverser(repository)
+        else:
+            console.print(
+                "[yellow]No valid MS Graph token found; appointments cannot be deleted in bulk. "
+                "Please login with 'admin-assistant login msgraph'.[/yellow]"
+            )
+    return ReversibleAuditService(session, batch_reversers=batch_reversers)
+
+
 @recovery_app.callback()
 def recovery_callback(ctx: typer.Context):
     """Recovery operations management commands.
@@ -85,7 +111,7 @@ def list_operations(
 
         # Get operations
         session = get_session()
-        reversible_service = ReversibleAuditService(session)
+        reversible_service = build_reversible_service(session)
 
         operations = reversible_service.get_reversible_operations(
             user_id=user.id,
@@ -159,7 +185,7 @@ def show_operation(
 
         # Get operation
         session = get_session()
-        reversible_service = ReversibleAuditService(session)
+        reversible_service = build_reversible_service(session)
 
         operation = reversible_service.get_operation_by_id(operation_id)
         if not operation:
@@ -241,7 +267,7 @@ def reverse_operation(
 
         # Get operation
         session = get_session()
-        reversible_service = ReversibleAuditService(session)
+        reversible_service = build_reversible_service(session, user)
 
         operation = reversible_service.get_operation_by_id(operation_id)
         if not operation:
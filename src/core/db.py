@@ -1,14 +1,22 @@
 import os
+from typing import Any, Dict
 
-from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 
+from core.db_profiles import (
+    create_profiled_engine,
+    pool_metrics,
+    resolve_engine_profile,
+)
+
 # Determine DB URL from environment or default to dev SQLite
 CORE_DATABASE_URL = os.getenv(
     "CORE_DATABASE_URL", "sqlite:///instance/admin_assistant_core_dev.db"
 )
 
-engine = create_engine(CORE_DATABASE_URL, echo=False, future=True)
+# Selected by CORE_DB_ENGINE_PROFILE (auto, default, sqlite-wal, postgres-pooled)
+ENGINE_PROFILE = resolve_engine_profile(CORE_DATABASE_URL)
+engine = create_profiled_engine(CORE_DATABASE_URL, ENGINE_PROFILE)
 SessionLocal = scoped_session(
     sessionmaker(bind=engine, autoflush=False, autocommit=False)
 )
@@ -20,3 +28,10 @@ def get_session():
     Returns a new SQLAlchemy session using SessionLocal.
     """
     return SessionLocal()
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """
+    Returns connection pool occupancy and checkout wait statistics for the core engine.
+    """
+    return {"profile": ENGINE_PROFILE.name, **pool_metrics(engine)}
@@ -0,0 +1,307 @@
+"""
+Engine profiles for the core database.
+
+A profile bundles the ``create_engine`` arguments and per-connection setup
+for one deployment shape:
+
+- ``default``: SQLAlchemy defaults (the previous behaviour).
+- ``sqlite-wal``: WAL journal, ``synchronous=NORMAL``, a busy timeout and a
+  larger page cache, so the scheduler, web app and CLI can read while one
+  of them writes.
+- ``postgres-pooled``: a sized, pre-pinged, recycled connection pool with a
+  larger statement cache and batched ``executemany``.
+
+``CORE_DB_ENGINE_PROFILE`` selects the profile (``auto`` picks by URL) and
+``CORE_DB_*`` variables override individual settings. Except for in-memory
+SQLite, every profile uses a metered queue pool, so checkout counts and wait
+times are available through ``core.db.get_pool_metrics()``.
+
+This module is imported by ``core.db`` and must not import other core
+packages (they import ``core.db`` themselves).
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+AUTO_PROFILE = "auto"
+
+
+@dataclass
+class PoolMetrics:
+    """Counters for a metered pool; read them with ``snapshot()``."""
+
+    checkouts: int = 0
+    waits: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    timeouts: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            # Only count checkouts that had to wait (or open a new connection)
+            if seconds >= 0.001:
+                self.waits += 1
+                self.wait_seconds_total += seconds
+                self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = self.waits = self.timeouts = 0
+            self.wait_seconds_total = self.wait_seconds_max = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records how long each checkout took to get a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+@dataclass
+class EngineProfile:
+    """Engine arguments and per-connection setup for one deployment shape."""
+
+    name: str
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    pool_timeout: Optional[float] = None
+    pool_recycle: Optional[int] = None
+    pool_pre_ping: bool = False
+    query_cache_size: Optional[int] = None
+    # psycopg2 only: "values_plus_batch" sends executemany as multi-row VALUES
+    executemany_mode: Optional[str] = None
+    insertmanyvalues_page_size: Optional[int] = None
+    sqlite_pragmas: Dict[str, Any] = field(default_factory=dict)
+    connect_args: Dict[str, Any] = field(default_factory=dict)
+
+    def with_env_overrides(self) -> "EngineProfile":
+        """Return a copy with ``CORE_DB_*`` environment overrides applied."""
+        overrides: Dict[str, Any] = {}
+        for attribute, variable, cast in (
+            ("pool_size", "CORE_DB_POOL_SIZE", int),
+            ("max_overflow", "CORE_DB_MAX_OVERFLOW", int),
+            ("pool_timeout", "CORE_DB_POOL_TIMEOUT", float),
+            ("pool_recycle", "CORE_DB_POOL_RECYCLE", int),
+            ("query_cache_size", "CORE_DB_STATEMENT_CACHE_SIZE", int),
+        ):
+            value = os.environ.get(variable)
+            if value is None or not value.strip():
+                continue
+            try:
+                overrides[attribute] = cast(value)
+            except ValueError:
+                logger.warning(f"Ignoring invalid {variable}={value!r}")
+        pre_ping = os.environ.get("CORE_DB_POOL_PRE_PING")
+        if pre_ping is not None and pre_ping.strip():
+            overrides["pool_pre_ping"] = pre_ping.strip().lower() in {
+                "1",
+                "true",
+                "yes",
+                "on",
+            }
+        busy_timeout = os.environ.get("CORE_DB_SQLITE_BUSY_TIMEOUT_MS")
+        if (
+            busy_timeout
+            and busy_timeout.strip().isdigit()
+            and "busy_timeout" in self.sqlite_pragmas
+        ):
+            overrides["sqlite_pragmas"] = {
+                **self.sqlite_pragmas,
+                "busy_timeout": int(busy_timeout),
+            }
+        return replace(self, **overrides)
+
+    def engine_kwargs(self, url: str) -> Dict[str, Any]:
+        """Keyword arguments for ``create_engine`` for this profile and URL."""
+        parsed = make_url(url)
+        kwargs: Dict[str, Any] = {"echo": False, "future": True}
+        # In-memory SQLite keeps SQLAlchemy's single-connection pool
+        if not _is_memory_sqlite(parsed):
+            kwargs["poolclass"] = MeteredQueuePool
+            for attribute in (
+                "pool_size",
+                "max_overflow",
+                "pool_timeout",
+                "pool_recycle",
+            ):
+                value = getattr(self, attribute)
+                if value is not None:
+                    kwargs[attribute] = value
+            kwargs["pool_pre_ping"] = self.pool_pre_ping
+        if self.query_cache_size is not None:
+            kwargs["query_cache_size"] = self.query_cache_size
+        if self.insertmanyvalues_page_size is not None:
+            kwargs["insertmanyvalues_page_size"] = self.insertmanyvalues_page_size
+        if self.executemany_mode and parsed.get_driver_name() == "psycopg2":
+            kwargs["executemany_mode"] = self.executemany_mode
+        connect_args = dict(self.connect_args)
+        if parsed.get_backend_name() == "sqlite":
+            connect_args.pop("application_name", None)
+        if connect_args:
+            kwargs["connect_args"] = connect_args
+        return kwargs
+
+    def install(self, engine: Engine) -> None:
+        """Register per-connection setup (SQLite pragmas) on ``engine``."""
+        if engine.dialect.name != "sqlite" or not self.sqlite_pragmas:
+            return
+        pragmas = dict(self.sqlite_pragmas)
+
+        @event.listens_for(engine, "connect")
+        def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
+
+
+ENGINE_PROFILES: Dict[str, EngineProfile] = {
+    "default": EngineProfile(name="default"),
+    "sqlite-wal": EngineProfile(
+        name="sqlite-wal",
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        query_cache_size=1000,
+        sqlite_pragmas={
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,
+            "temp_store": "MEMORY",
+            "cache_size": -32000,  # KiB
+            "mmap_size": 268435456,
+        },
+    ),
+    "postgres-pooled": EngineProfile(
+        name="postgres-pooled",
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        query_cache_size=1200,
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=1000,
+        connect_args={"application_name": "admin-assistant"},
+    ),
+}
+
+
+def _is_memory_sqlite(url) -> bool:
+    if url.get_backend_name() != "sqlite":
+        return False
+    database = url.database or ""
+    return (
+        database in ("", ":memory:")
+        or "mode=memory" in database
+        or url.query.get("mode") == "memory"
+    )
+
+
+def resolve_engine_profile(url: str, name: Optional[str] = None) -> EngineProfile:
+    """
+    Pick the engine profile for ``url``.
+
+    Args:
+        url: Database URL.
+        name: Profile name; defaults to ``CORE_DB_ENGINE_PROFILE`` or ``auto``,
+            which chooses ``sqlite-wal`` for file SQLite databases,
+            ``postgres-pooled`` for PostgreSQL and ``default`` otherwise.
+
+    Raises:
+        ValueError: If the profile name is unknown.
+    """
+    name = (
+        (name or os.environ.get("CORE_DB_ENGINE_PROFILE") or AUTO_PROFILE)
+        .strip()
+        .lower()
+    )
+    if name == AUTO_PROFILE:
+        parsed = make_url(url)
+        backend = parsed.get_backend_name()
+        if backend == "sqlite" and not _is_memory_sqlite(parsed):
+            name = "sqlite-wal"
+        elif backend == "postgresql":
+            name = "postgres-pooled"
+        else:
+            name = "default"
+    try:
+        profile = ENGINE_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown engine profile '{name}' (expected one of {sorted(ENGINE_PROFILES)} or '{AUTO_PROFILE}')"
+        ) from None
+    return profile.with_env_overrides()
+
+
+def create_profiled_engine(
+    url: str, profile: Union[str, EngineProfile, None] = None
+) -> Engine:
+    """Create an engine for ``url`` configured by a profile or profile name."""
+    if not isinstance(profile, EngineProfile):
+        profile = resolve_engine_profile(url, profile)
+    engine = create_engine(url, **profile.engine_kwargs(url))
+    profile.install(engine)
+    return engine
+
+
+def pool_metrics(engine: Engine) -> Dict[str, Any]:
+    """Current pool occupancy and checkout wait statistics for ``engine``."""
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
@@ -0,0 +1,55 @@
+"""Add indexed fingerprint column to appointments
+
+Revision ID: add_appointment_fingerprint
+Revises: df594ad7fd1d
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "add_appointment_fingerprint"
+down_revision: Union[str, None] = "df594ad7fd1d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the fingerprint column and index, and backfill existing rows."""
+    from core.utilities.appointment_fingerprint import compute_fingerprint
+
+    with op.batch_alter_table("appointments", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("fingerprint", sa.String(length=32), nullable=True)
+        )
+        batch_op.create_index(
+            "ix_appointments_fingerprint", ["fingerprint"], unique=False
+        )
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT id, subject, start_time, end_time FROM appointments")
+    ).fetchall()
+    for row in rows:
+        connection.execute(
+            sa.text(
+                "UPDATE appointments SET fingerprint = :fingerprint WHERE id = :id"
+            ),
+            {
+                "fingerprint": compute_fingerprint(
+                    row.subject, row.start_time, row.end_time
+                ),
+                "id": row.id,
+            },
+        )
+
+
+def downgrade() -> None:
+    """Drop the fingerprint index and column."""
+    with op.batch_alter_table("appointments", schema=None) as batch_op:
+        batch_op.drop_index("ix_appointments_fingerprint")
+        batch_op.drop_column("fingerprint")
@@ -0,0 +1,70 @@
+"""Add audit_log search indexes and message full-text index
+
+Revision ID: add_audit_log_indexes
+Revises: add_calendar_fingerprint_index
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from core.models.audit_log import (
+    POSTGRES_MESSAGE_INDEX_STATEMENT,
+    SQLITE_FTS_DROP_STATEMENTS,
+    SQLITE_FTS_STATEMENTS,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "add_audit_log_indexes"
+down_revision: Union[str, None] = "add_calendar_fingerprint_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_audit_log_created_at_id", ["created_at", "id"]),
+    ("ix_audit_log_user_created_at", ["user_id", "created_at", "id"]),
+    ("ix_audit_log_action_type_created_at", ["action_type", "created_at", "id"]),
+    ("ix_audit_log_correlation_created_at", ["correlation_id", "created_at"]),
+)
+
+
+def upgrade() -> None:
+    """Create keyset-friendly composite indexes and the message search index."""
+    bind = op.get_bind()
+    # audit_log is created from model metadata (with these indexes and the
+    # search index, via after_create DDL) on fresh databases
+    if not sa.inspect(bind).has_table("audit_log"):
+        return
+    existing = {index["name"] for index in sa.inspect(bind).get_indexes("audit_log")}
+    for name, columns in INDEXES:
+        if name in existing:
+            continue
+        op.create_index(name, "audit_log", columns, unique=False)
+
+    dialect = bind.dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_FTS_STATEMENTS:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        op.execute(POSTGRES_MESSAGE_INDEX_STATEMENT)
+
+
+def downgrade() -> None:
+    """Drop the search indexes."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("audit_log"):
+        return
+    dialect = bind.dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_FTS_DROP_STATEMENTS:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_audit_log_message_tsv")
+
+    existing = {index["name"] for index in sa.inspect(bind).get_indexes("audit_log")}
+    for name, _ in reversed(INDEXES):
+        if name in existing:
+            op.drop_index(name, table_name="audit_log")
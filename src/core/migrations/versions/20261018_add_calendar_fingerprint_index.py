@@ -0,0 +1,52 @@
+"""Add calendar_fingerprint_index table
+
+Revision ID: add_calendar_fingerprint_index
+Revises: add_appointment_fingerprint
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from core.models.appointment import UTCDateTime
+
+# revision identifiers, used by Alembic.
+revision: str = "add_calendar_fingerprint_index"
+down_revision: Union[str, None] = "add_appointment_fingerprint"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-(calendar, day) destination fingerprint index."""
+    op.create_table(
+        "calendar_fingerprint_index",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("calendar_key", sa.String(length=500), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("event_fingerprints", sa.JSON(), nullable=False),
+        sa.Column("delta_link", sa.Text(), nullable=True),
+        sa.Column("refreshed_at", UTCDateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "calendar_key", "day", name="uq_calendar_fingerprint_index_calendar_day"
+        ),
+    )
+    op.create_index(
+        op.f("ix_calendar_fingerprint_index_calendar_key"),
+        "calendar_fingerprint_index",
+        ["calendar_key"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the destination fingerprint index."""
+    op.drop_index(
+        op.f("ix_calendar_fingerprint_index_calendar_key"),
+        table_name="calendar_fingerprint_index",
+    )
+    op.drop_table("calendar_fingerprint_index")
@@ -5,6 +5,7 @@ from .audit_log import AuditLog
 from .backup_configuration import BackupConfiguration
 from .backup_job_configuration import BackupJobConfiguration
 from .calendar import Calendar
+from .calendar_fingerprint_index import CalendarFingerprintIndex
 from .category import Category
 from .chat_session import ChatSession
 from .entity_association import EntityAssociation
@@ -35,6 +35,7 @@ class Appointment(Base):
     - ms_event_id: Original MS Graph event id (nullable string)
     - recurrence: RFC 5545 RRULE string for recurring events (nullable)
     - ms_event_data: Full original MS Graph event as JSON (nullable)
+    - fingerprint: Canonical dedupe hash of subject and UTC start/end (indexed)
     """
 
     __tablename__ = "appointments"
@@ -103,6 +104,12 @@ class Appointment(Base):
         default=False,
         doc="Whether this appointment has been archived and is immutable",
     )
+    fingerprint = Column(
+        String(32),
+        nullable=True,
+        index=True,
+        doc="Canonical appointment fingerprint (see core.utilities.appointment_fingerprint)",
+    )
     # Relationships (optional, for completeness)
     # user = relationship('User', back_populates='appointments')
     # location = relationship('Location')
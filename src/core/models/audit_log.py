@@ -1,11 +1,52 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.types import JSON
 
 from core.db import Base
 from core.models.appointment import UTCDateTime
 
+# External-content FTS5 index over audit_log.message (SQLite only), kept in sync
+# by triggers. Created by the add_audit_log_indexes migration; the repository
+# falls back to LIKE matching when the table is absent.
+AUDIT_LOG_FTS_TABLE = "audit_log_fts"
+SQLITE_FTS_STATEMENTS = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {AUDIT_LOG_FTS_TABLE} "
+    "USING fts5(message, content='audit_log', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS audit_log_fts_ai AFTER INSERT ON audit_log BEGIN "
+    f"INSERT INTO {AUDIT_LOG_FTS_TABLE}(rowid, message) VALUES (new.id, new.message); END",
+    f"CREATE TRIGGER IF NOT EXISTS audit_log_fts_ad AFTER DELETE ON audit_log BEGIN "
+    f"INSERT INTO {AUDIT_LOG_FTS_TABLE}({AUDIT_LOG_FTS_TABLE}, rowid, message) "
+    "VALUES ('delete', old.id, old.message); END",
+    f"CREATE TRIGGER IF NOT EXISTS audit_log_fts_au AFTER UPDATE OF message ON audit_log BEGIN "
+    f"INSERT INTO {AUDIT_LOG_FTS_TABLE}({AUDIT_LOG_FTS_TABLE}, rowid, message) "
+    "VALUES ('delete', old.id, old.message); "
+    f"INSERT INTO {AUDIT_LOG_FTS_TABLE}(rowid, message) VALUES (new.id, new.message); END",
+    f"INSERT INTO {AUDIT_LOG_FTS_TABLE}({AUDIT_LOG_FTS_TABLE}) VALUES ('rebuild')",
+)
+# GIN index for to_tsvector() message searches (PostgreSQL only)
+POSTGRES_MESSAGE_INDEX_STATEMENT = (
+    "CREATE INDEX IF NOT EXISTS ix_audit_log_message_tsv ON audit_log "
+    "USING gin (to_tsvector('simple', coalesce(message, '')))"
+)
+SQLITE_FTS_DROP_STATEMENTS = (
+    "DROP TRIGGER IF EXISTS audit_log_fts_au",
+    "DROP TRIGGER IF EXISTS audit_log_fts_ad",
+    "DROP TRIGGER IF EXISTS audit_log_fts_ai",
+    f"DROP TABLE IF EXISTS {AUDIT_LOG_FTS_TABLE}",
+)
+
 
 class AuditLog(Base):
     """
@@ -17,6 +58,14 @@ class AuditLog(Base):
     """
 
     __tablename__ = "audit_log"
+    # Searches filter on one of these columns and page newest-first by
+    # (created_at, id), so each index ends with the keyset columns.
+    __table_args__ = (
+        Index("ix_audit_log_created_at_id", "created_at", "id"),
+        Index("ix_audit_log_user_created_at", "user_id", "created_at", "id"),
+        Index("ix_audit_log_action_type_created_at", "action_type", "created_at", "id"),
+        Index("ix_audit_log_correlation_created_at", "correlation_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -60,3 +109,15 @@ class AuditLog(Base):
 
     def __repr__(self):
         return f"<AuditLog(id={self.id}, action_type='{self.action_type}', operation='{self.operation}', status='{self.status}')>"
+
+
+# Databases created from metadata get the same message search index as migrated ones
+for _statement in SQLITE_FTS_STATEMENTS:
+    event.listen(
+        AuditLog.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL(POSTGRES_MESSAGE_INDEX_STATEMENT).execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,73 @@
+"""
+SQLAlchemy model for CalendarFingerprintIndex.
+Caches appointment fingerprints of a destination calendar per (calendar, day).
+"""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import Column, Date, Integer, String, Text, UniqueConstraint
+from sqlalchemy.types import JSON
+
+from core.db import Base
+from core.models.appointment import UTCDateTime
+
+
+class CalendarFingerprintIndex(Base):
+    """
+    Persistent fingerprint index for one day of a destination calendar.
+
+    Duplicate checks against a remote calendar read fingerprints from this table
+    instead of downloading the whole date range. Each row is kept current with the
+    calendar's Graph ``calendarView/delta`` link for that day, so only changed
+    events are fetched on refresh, and it is updated write-through when the
+    archive creates or deletes events.
+
+    Attributes:
+        id (int): Primary key.
+        calendar_key (str): Account-qualified calendar key (``<upn>/<calendar id>``).
+        day (date): UTC day covered by this row.
+        event_fingerprints (dict): Map of remote event id to appointment fingerprint.
+        delta_link (str): Graph delta link for the day; None if never synced.
+        refreshed_at (datetime): When the row was last synced with the remote calendar.
+    """
+
+    __tablename__ = "calendar_fingerprint_index"
+    __table_args__ = (
+        UniqueConstraint(
+            "calendar_key", "day", name="uq_calendar_fingerprint_index_calendar_day"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    calendar_key = Column(
+        String(500),
+        nullable=False,
+        index=True,
+        doc="Account-qualified calendar key (<upn>/<calendar id>)",
+    )
+    day = Column(Date, nullable=False, doc="UTC day covered by this row")
+    event_fingerprints = Column(
+        JSON,
+        nullable=False,
+        default=dict,
+        doc="Map of remote event id to appointment fingerprint",
+    )
+    delta_link = Column(
+        Text, nullable=True, doc="Graph calendarView delta link for this day"
+    )
+    refreshed_at = Column(
+        UTCDateTime(),
+        nullable=True,
+        default=lambda: datetime.now(UTC),
+        doc="Last sync with the remote calendar",
+    )
+
+    def fingerprints(self) -> set:
+        """Return the set of fingerprints stored for this day."""
+        return set((self.event_fingerprints or {}).values())
+
+    def __repr__(self) -> str:
+        return (
+            f"<CalendarFingerprintIndex(calendar_key='{self.calendar_key}', "
+            f"day={self.day}, events={len(self.event_fingerprints or {})})>"
+        )
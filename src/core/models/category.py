@@ -9,3 +9,6 @@ class Category(Base):
     name = Column(String, nullable=False)
     description = Column(String)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # Outlook master category id for categories read from MS Graph; not a column
+    graph_id = None
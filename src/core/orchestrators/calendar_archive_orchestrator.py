@@ -13,6 +13,9 @@ from core.repositories.action_log_repository import ActionLogRepository
 from core.repositories.appointment_repository_msgraph import (
     MSGraphAppointmentRepository,
 )
+from core.repositories.calendar_fingerprint_index_repository import (
+    CalendarFingerprintIndexRepository,
+)
 from core.repositories.entity_association_repository import EntityAssociationHelper
 from core.services.audit_log_service import AuditLogService
 from core.services.calendar_archive_service import make_appointments_immutable
@@ -771,6 +774,7 @@ class CalendarArchiveOrchestrator:
                     appointments_to_archive.append(appointment)
 
             audit_ctx.add_detail("overlap_resolution_stats", resolution_stats)
+            audit_ctx.add_detail("overlap_rule_hits", overlap_service.get_rule_statistics())
             audit_ctx.add_detail("remaining_conflicts_count", len(remaining_conflicts))
 
         else:
@@ -859,6 +863,8 @@ class CalendarArchiveOrchestrator:
             archive_repo = MSGraphAppointmentRepository(
                 msgraph_client, user, msgraph_cal_id
             )
+            # Persistent per-day fingerprint index for destination duplicate checks
+            archive_repo.fingerprint_index = CalendarFingerprintIndexRepository(db_session)
             if logger:
                 logger.info(f"Using MSGraph repository for calendar: {msgraph_cal_id}")
             if audit_ctx:
@@ -871,6 +877,13 @@ class CalendarArchiveOrchestrator:
         archive_errors = []
         archived_count = 0
 
+        # Extract date range from appointments
+        appointment_dates = []
+        for appt in appointments:
+            start_time = getattr(appt, 'start_time', None)
+            if start_time:
+                appointment_dates.append(start_time.date())
+
         if replace_mode:
             if logger:
                 logger.info("Replace mode enabled - deleting existing appointments in date range")
@@ -878,13 +891,6 @@ class CalendarArchiveOrchestrator:
             # Delete existing appointments in the date range
             if hasattr(archive_repo, 'delete_for_period'):
                 try:
-                    # Extract date range from appointments
-                    appointment_dates = []
-                    for appt in appointments:
-                        start_time = getattr(appt, 'start_time', None)
-                        if start_time:
-                            appointment_dates.append(start_time.date())
-
                     if appointment_dates:
                         range_start = min(appointment_dates)
                         range_end = max(appointment_dates)
@@ -899,6 +905,20 @@ class CalendarArchiveOrchestrator:
                     archive_errors.append(error_msg)
                     if logger:
                         logger.error(error_msg)
+        elif hasattr(archive_repo, 'check_for_duplicates') and appointment_dates:
+            # Skip appointments already present in the destination. The repository
+            # answers from its persistent fingerprint index, fetching only changed days.
+            # Pass datetimes so the repository maps the range to UTC days itself.
+            timed = [appt for appt in appointments if getattr(appt, 'start_time', None)]
+            range_start = min(appt.start_time for appt in timed)
+            range_end = max(getattr(appt, 'end_time', None) or appt.start_time for appt in timed)
+            unique_appointments = archive_repo.check_for_duplicates(appointments, range_start, range_end)
+            duplicate_count = len(appointments) - len(unique_appointments)
+            appointments = unique_appointments
+            if logger and duplicate_count:
+                logger.info(f"Skipped {duplicate_count} appointments already in destination")
+            if audit_ctx:
+                audit_ctx.add_detail("duplicate_count", duplicate_count)
 
         # Archive appointments
         if hasattr(archive_repo, 'add_bulk'):
@@ -952,6 +972,7 @@ class CalendarArchiveOrchestrator:
             "archived_count": archived_count,
             "errors": archive_errors,
             "deleted_count": len(deleted_appointments),
+            "duplicate_count": duplicate_count,
         }
 
     def _archive_user_appointments_impl(
@@ -4,6 +4,7 @@ from .appointment_repository_msgraph import MSGraphAppointmentRepository
 from .appointment_repository_sqlalchemy import SQLAlchemyAppointmentRepository
 from .archive_configuration_repository import ArchiveConfigurationRepository
 from .audit_log_repository import AuditLogRepository
+from .calendar_fingerprint_index_repository import CalendarFingerprintIndexRepository
 from .calendar_repository_base import BaseCalendarRepository
 from .calendar_repository_msgraph import MSGraphCalendarRepository
 from .calendar_repository_sqlalchemy import SQLAlchemyCalendarRepository
@@ -1,7 +1,8 @@
 import asyncio
 import logging
 import sys
-from typing import TYPE_CHECKING, Any, Dict, List, NoReturn, Optional
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, NoReturn, Optional, Set, Tuple
 
 # Removed nest_asyncio - using enhanced async runner instead
 import pytz
@@ -14,6 +15,10 @@ from core.exceptions import (
 )
 from core.models.appointment import Appointment
 from core.repositories.appointment_repository_base import BaseAppointmentRepository
+from core.utilities.appointment_fingerprint import (
+    appointment_fingerprint,
+    compute_fingerprint,
+)
 from core.utilities.async_runner import run_async
 
 logger = logging.getLogger(__name__)
@@ -22,8 +27,12 @@ if TYPE_CHECKING:
     from msgraph.graph_service_client import GraphServiceClient
 
     from core.models.user import User
+    from core.repositories.calendar_fingerprint_index_repository import (
+        CalendarFingerprintIndexRepository,
+    )
 
 DEFAULT_TIMEOUT = 30  # seconds
+DELTA_SYNC_CONCURRENCY = 4  # concurrent per-day delta requests
 
 
 # Using enhanced async runner to resolve event loop issues
@@ -41,17 +50,38 @@ class MSGraphAppointmentRepository(BaseAppointmentRepository):
     """
 
     def __init__(
-        self, msgraph_client: "GraphServiceClient", user: "User", calendar_id: str = ""
+        self,
+        msgraph_client: "GraphServiceClient",
+        user: "User",
+        calendar_id: str = "",
+        fingerprint_index: Optional["CalendarFingerprintIndexRepository"] = None,
+        any_calendar: bool = False,
     ):
         """
         Initialize the repository with a Microsoft GraphClient instance, User model, and calendar_id.
         :param msgraph_client: Authenticated msgraph.core.GraphClient instance.
         :param user: User model instance (must have .email).
         :param calendar_id: The calendar identifier (string). If empty, use the user's primary calendar.
+        :param fingerprint_index: Optional persistent per-day fingerprint index used by
+            duplicate checks instead of downloading the whole date range.
+        :param any_calendar: Address bulk deletes as /users/{email}/events/{id}, which
+            reaches an event in any of the user's calendars (for events whose calendar
+            is not known, e.g. when reversing an operation).
         """
         self.client = msgraph_client
         self.user = user
         self.calendar_id = calendar_id or ""
+        self.fingerprint_index = fingerprint_index
+        self.any_calendar = any_calendar
+
+    def _event_endpoint(self, event_id: str) -> str:
+        """Graph-relative URL of one event in this repository's calendar."""
+        if self.any_calendar:
+            return f"/users/{self.get_user_email()}/events/{event_id}"
+        # Use the correct calendar endpoint based on calendar_id
+        if self.calendar_id:
+            return f"/users/{self.get_user_email()}/calendars/{self.calendar_id}/events/{event_id}"
+        return f"/users/{self.get_user_email()}/calendar/events/{event_id}"
 
     def _get_calendar(self):
         """Return the calendar object for the given user and calendar_id."""
@@ -221,6 +251,7 @@ class MSGraphAppointmentRepository(BaseAppointmentRepository):
                 raise Exception(f"Failed to create event: HTTP {response.status_code} - {error_text}")
 
             logger.debug(f"Successfully created appointment via direct HTTP: {getattr(appointment, 'subject', 'Unknown')}")
+            self._record_created_event(appointment, response)
 
         except Exception as e:
             logger.exception(f"Failed to add appointment via direct HTTP for user {self.get_user_email()}")
@@ -255,28 +286,46 @@ class MSGraphAppointmentRepository(BaseAppointmentRepository):
         Async: Check for appointments that already exist in this calendar.
         Returns a list of appointments that do NOT exist in the destination (safe to add).
 
+        When a fingerprint index is configured and a date range is given, existing
+        fingerprints come from the index and only changed events are fetched via
+        per-day delta links; otherwise the whole range is downloaded. The indexed
+        days cover the range plus every UTC day the appointments overlap, so an
+        appointment whose UTC day differs from its local date is still checked.
+
         :param appointments: List of appointments to check
         :param start_date: Optional start date for filtering existing appointments
         :param end_date: Optional end date for filtering existing appointments
         :return: List of appointments that don't exist in destination
         """
         try:
-            # Try direct HTTP approach first to avoid event loop issues
-            try:
-                existing_appointments = await self.alist_for_user_direct(start_date, end_date)
-                logger.debug(f"Successfully retrieved {len(existing_appointments)} existing appointments via direct HTTP")
-            except Exception as direct_e:
-                logger.warning(f"Direct HTTP approach failed, trying SDK approach: {direct_e}")
-                # Fallback to SDK approach
-                existing_appointments = await self.alist_for_user(start_date, end_date)
-                logger.debug(f"Successfully retrieved {len(existing_appointments)} existing appointments via SDK")
-
-            # Create a set of existing appointment signatures for fast lookup
-            existing_signatures = set()
-            for existing in existing_appointments:
-                signature = self._create_appointment_signature(existing)
-                if signature:
-                    existing_signatures.add(signature)
+            existing_signatures = None
+            if self.fingerprint_index is not None and start_date is not None and end_date is not None:
+                try:
+                    days = set(self._utc_days(start_date, end_date))
+                    for appointment in appointments:
+                        days.update(self._event_days(appointment.start_time, appointment.end_time))
+                    existing_signatures = await self._aget_indexed_fingerprints(sorted(days))
+                    logger.debug(f"Loaded {len(existing_signatures)} existing fingerprints from index")
+                except Exception as index_e:
+                    logger.warning(f"Fingerprint index lookup failed, falling back to full listing: {index_e}")
+
+            if existing_signatures is None:
+                # Try direct HTTP approach first to avoid event loop issues
+                try:
+                    existing_appointments = await self.alist_for_user_direct(start_date, end_date)
+                    logger.debug(f"Successfully retrieved {len(existing_appointments)} existing appointments via direct HTTP")
+                except Exception as direct_e:
+                    logger.warning(f"Direct HTTP approach failed, trying SDK approach: {direct_e}")
+                    # Fallback to SDK approach
+                    existing_appointments = await self.alist_for_user(start_date, end_date)
+                    logger.debug(f"Successfully retrieved {len(existing_appointments)} existing appointments via SDK")
+
+                # Create a set of existing appointment fingerprints for O(1) lookup
+                existing_signatures = {
+                    signature
+                    for signature in map(self._create_appointment_signature, existing_appointments)
+                    if signature
+                }
 
             # Filter out appointments that already exist
             unique_appointments = []
@@ -305,31 +354,164 @@ class MSGraphAppointmentRepository(BaseAppointmentRepository):
     def _create_appointment_signature(self, appointment: Appointment) -> Optional[str]:
         """
         Create a unique signature for an appointment based on key fields.
-        Used for duplicate detection.
+        Used for duplicate detection; delegates to the canonical appointment fingerprint.
 
         :param appointment: Appointment to create signature for
-        :return: Unique signature string or None if appointment is invalid
+        :return: Fingerprint string or None if appointment is invalid
         """
         try:
-            subject = getattr(appointment, 'subject', '') or ''
             start_time = getattr(appointment, 'start_time', None)
             end_time = getattr(appointment, 'end_time', None)
 
             if not start_time or not end_time:
                 return None
 
-            # Create signature from subject, start time, and end time
-            # Use ISO format for consistent time comparison
-            start_str = start_time.isoformat() if hasattr(start_time, 'isoformat') else str(start_time)
-            end_str = end_time.isoformat() if hasattr(end_time, 'isoformat') else str(end_time)
-
-            signature = f"{subject}|{start_str}|{end_str}"
-            return signature
+            return appointment_fingerprint(appointment)
 
         except Exception as e:
             logger.debug(f"Error creating appointment signature: {e}")
             return None
 
+    def _fingerprint_calendar_key(self) -> str:
+        """Account-qualified key identifying this calendar in the fingerprint index."""
+        return f"{self.get_user_email()}/{self.calendar_id or 'primary'}"
+
+    @staticmethod
+    def _utc_days(start, end) -> List[date]:
+        """Return the UTC days from start to end (inclusive); accepts dates or datetimes."""
+        def to_day(value):
+            if isinstance(value, datetime):
+                if value.tzinfo is not None:
+                    value = value.astimezone(timezone.utc)
+                return value.date()
+            return value
+
+        first, last = to_day(start), to_day(end)
+        return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+    def _event_days(self, start_time, end_time) -> List[date]:
+        """UTC days an event overlaps, matching calendarView window semantics."""
+        if not isinstance(start_time, datetime) or not isinstance(end_time, datetime):
+            return []
+        last = end_time - timedelta(microseconds=1) if end_time > start_time else end_time
+        return self._utc_days(start_time, last)
+
+    def _event_fingerprint(self, event: Dict[str, Any]) -> Optional[str]:
+        """Fingerprint a raw Graph event dict without building an Appointment."""
+        start_time = self._parse_msgraph_datetime(event.get("start"))
+        end_time = self._parse_msgraph_datetime(event.get("end"))
+        if not start_time or not end_time:
+            return None
+        return compute_fingerprint(event.get("subject"), start_time, end_time)
+
+    async def _aget_indexed_fingerprints(self, days: List[date]) -> Set[str]:
+        """
+        Return the fingerprints of all events on the given UTC days using the fingerprint index.
+        Each day is brought up to date through its Graph delta link; days without a
+        delta link are synced from scratch. The refreshed rows are written back.
+        """
+        import httpx
+
+        calendar_key = self._fingerprint_calendar_key()
+        rows = self.fingerprint_index.get_days(calendar_key, days)
+
+        access_token = await self._get_fresh_access_token()
+        headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+            "User-Agent": "admin-assistant/1.0",
+        }
+        semaphore = asyncio.Semaphore(DELTA_SYNC_CONCURRENCY)
+        timeout = httpx.Timeout(30.0, connect=10.0)
+
+        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as http_client:
+
+            async def sync(day):
+                row = rows.get(day)
+                async with semaphore:
+                    return day, await self._async_day_delta(http_client, headers, day, row)
+
+            results = await asyncio.gather(*(sync(day) for day in days))
+
+        fingerprints: Set[str] = set()
+        stale_days = 0
+        for day, (event_fingerprints, delta_link, changed) in results:
+            fingerprints.update(event_fingerprints.values())
+            if changed:
+                stale_days += 1
+                self.fingerprint_index.save_day(
+                    calendar_key, day, event_fingerprints, delta_link, commit=False
+                )
+        self.fingerprint_index.commit()
+        logger.debug(f"Fingerprint index: {stale_days}/{len(days)} days refreshed for {calendar_key}")
+        return fingerprints
+
+    async def _async_day_delta(self, http_client, headers, day: date, row) -> Tuple[Dict[str, str], Optional[str], bool]:
+        """
+        Apply the Graph calendarView delta for one UTC day.
+
+        :return: Tuple of (event id -> fingerprint map, new delta link, whether anything changed).
+        """
+        if self.calendar_id:
+            base_url = f"https://graph.microsoft.com/v1.0/users/{self.get_user_email()}/calendars/{self.calendar_id}"
+        else:
+            base_url = f"https://graph.microsoft.com/v1.0/users/{self.get_user_email()}/calendar"
+        window_start = datetime.combine(day, time.min).strftime("%Y-%m-%dT%H:%M:%SZ")
+        window_end = datetime.combine(day + timedelta(days=1), time.min).strftime("%Y-%m-%dT%H:%M:%SZ")
+        initial_url = f"{base_url}/calendarView/delta?startDateTime={window_start}&endDateTime={window_end}"
+
+        previous_link = row.delta_link if row is not None else None
+        event_fingerprints = dict(row.event_fingerprints or {}) if previous_link else {}
+        url = previous_link or initial_url
+        delta_link = previous_link
+        changed = previous_link is None
+
+        while url:
+            response = await http_client.get(url, headers=headers)
+            if response.status_code == 410 and url == previous_link:
+                # Sync state expired on the server: resync the day from scratch
+                logger.debug(f"Delta link expired for {day}, resyncing")
+                event_fingerprints, url, previous_link, changed = {}, initial_url, None, True
+                continue
+            if response.status_code != 200:
+                error_text = response.text if hasattr(response, 'text') else str(response.content)
+                raise Exception(f"Failed to fetch calendar delta: HTTP {response.status_code} - {error_text}")
+
+            data = response.json()
+            for event in data.get("value", []):
+                event_id = event.get("id")
+                if not event_id:
+                    continue
+                changed = True
+                fingerprint = None if "@removed" in event else self._event_fingerprint(event)
+                if fingerprint:
+                    event_fingerprints[event_id] = fingerprint
+                else:
+                    event_fingerprints.pop(event_id, None)
+
+            url = data.get("@odata.nextLink")
+            delta_link = data.get("@odata.deltaLink", delta_link)
+
+        changed = changed or delta_link != (row.delta_link if row is not None else None)
+        return event_fingerprints, delta_link, changed
+
+    def _record_created_event(self, appointment: Appointment, response) -> None:
+        """Write a newly created event through to the fingerprint index (best effort)."""
+        if self.fingerprint_index is None:
+            return
+        try:
+            event_id = response.json().get("id")
+            fingerprint = self._create_appointment_signature(appointment)
+            if not event_id or not fingerprint:
+                return
+            days = self._event_days(appointment.start_time, appointment.end_time)
+            self.fingerprint_index.record_events(
+                self._fingerprint_calendar_key(),
+                {day: {event_id: fingerprint} for day in days},
+            )
+        except Exception as e:
+            logger.debug(f"Failed to record created event in fingerprint index: {e}")
+
     async def alist_for_user(self, start_date=None, end_date=None) -> List[Appointment]:
         """
         Async: List appointments for this user's calendar from MS Graph, optionally filtered by date range.
@@ -545,16 +727,10 @@ class MSGraphAppointmentRepository(BaseAppointmentRepository):
         # Build batch request payload
         batch_requests = []
         for i, event_id in enumerate(event_ids):
-            # Use the correct calendar endpoint based on calendar_id
-            if self.calendar_id:
-                calendar_endpoint = f"/users/{self.get_user_email()}/calendars/{self.calendar_id}/events/{event_id}"
-            else:
-                calendar_endpoint = f"/users/{self.get_user_email()}/calendar/events/{event_id}"
-
             batch_requests.append({
                 "id": str(i + 1),  # Batch request IDs must be strings
                 "method": "DELETE",
-                "url": calendar_endpoint
+                "url": self._event_endpoint(event_id)
             })
 
         batch_payload = {"requests": batch_requests}
@@ -601,8 +777,9 @@ class MSGraphAppointmentRepository(BaseAppointmentRepository):
         """
         # Method 1: Try to get from cached MSAL token (CLI context)
         try:
-            from core.utilities.auth_utility import get_cached_access_token
-            cached_token = get_cached_access_token()
+            from core.utilities.auth_utility import get_token_provider
+            # Served from memory; a cold refresh runs off the event loop
+            cached_token = await get_token_provider().aget_token()
             if cached_token:
                 logger.debug("Using cached MSAL token")
                 return cached_token
@@ -710,6 +887,16 @@ class MSGraphAppointmentRepository(BaseAppointmentRepository):
                     deleted_appointments.append(appointment_data_map[event_id])
                     logger.debug(f"Deleted appointment: {appointment_data_map[event_id]['subject']} ({event_id})")
 
+            if self.fingerprint_index is not None and bulk_result["successful_deletes"]:
+                try:
+                    self.fingerprint_index.remove_events(
+                        self._fingerprint_calendar_key(),
+                        bulk_result["successful_deletes"],
+                        self._utc_days(start_date, end_date),
+                    )
+                except Exception as index_e:
+                    logger.debug(f"Failed to remove deleted events from fingerprint index: {index_e}")
+
             # Log any failures
             if bulk_result["failed_deletes"]:
                 logger.warning(f"Failed to delete {len(bulk_result['failed_deletes'])} appointments: {bulk_result['failed_deletes']}")
@@ -781,16 +968,10 @@ class MSGraphAppointmentRepository(BaseAppointmentRepository):
         # Build batch request payload
         batch_requests = []
         for i, event_id in enumerate(event_ids):
-            # Use the correct calendar endpoint based on calendar_id
-            if self.calendar_id:
-                calendar_endpoint = f"/users/{self.get_user_email()}/calendars/{self.calendar_id}/events/{event_id}"
-            else:
-                calendar_endpoint = f"/users/{self.get_user_email()}/calendar/events/{event_id}"
-
             batch_requests.append({
                 "id": str(i + 1),  # Batch request IDs must be strings
                 "method": "DELETE",
-                "url": calendar_endpoint
+                "url": self._event_endpoint(event_id)
             })
 
         batch_payload = {"requests": batch_requests}
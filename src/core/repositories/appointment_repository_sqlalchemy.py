@@ -1,11 +1,12 @@
 import json
 import logging
-from typing import List, Optional
+from typing import List, Optional, Set
 
 from core.db import SessionLocal
 from core.exceptions import DuplicateAppointmentException, ImmutableAppointmentException
 from core.models.appointment import Appointment
 from core.repositories.appointment_repository_base import BaseAppointmentRepository
+from core.utilities.appointment_fingerprint import appointment_fingerprint
 
 
 class SQLAlchemyAppointmentRepository(BaseAppointmentRepository):
@@ -103,15 +104,15 @@ class SQLAlchemyAppointmentRepository(BaseAppointmentRepository):
         return str(val) if val is not None else ""
 
     def add(self, appointment: Appointment) -> None:
-        # Prevent duplicate appointments for the same user, calendar, start_time, end_time, and subject
+        # Prevent duplicate appointments for the same user, calendar and fingerprint
+        # (subject, start_time, end_time); the lookup uses the indexed fingerprint column.
+        appointment.fingerprint = appointment_fingerprint(appointment)  # type: ignore
         exists = (
-            self.session.query(Appointment)
+            self.session.query(Appointment.id)
             .filter_by(
                 user_id=self.user.id,
                 calendar_id=self.calendar_id,
-                start_time=appointment.start_time,
-                end_time=appointment.end_time,
-                subject=appointment.subject,
+                fingerprint=appointment.fingerprint,
             )
             .first()
         )
@@ -140,10 +141,35 @@ class SQLAlchemyAppointmentRepository(BaseAppointmentRepository):
             query = query.filter(Appointment.end_time <= end_date)
         return query.all()
 
+    def list_fingerprints(self, start_date=None, end_date=None) -> Set[str]:
+        """
+        Return the set of appointment fingerprints for the current user and calendar.
+        Reads only the indexed fingerprint column; rows written before the column
+        existed are fingerprinted on the fly.
+        :param start_date: Optional start date (date or datetime) for filtering events.
+        :param end_date: Optional end date (date or datetime) for filtering events.
+        :return: Set of fingerprint strings.
+        """
+        query = self.session.query(
+            Appointment.fingerprint,
+            Appointment.subject,
+            Appointment.start_time,
+            Appointment.end_time,
+        ).filter_by(user_id=self.user.id, calendar_id=self.calendar_id)
+        if start_date is not None:
+            query = query.filter(Appointment.start_time >= start_date)
+        if end_date is not None:
+            query = query.filter(Appointment.end_time <= end_date)
+        return {
+            row.fingerprint or appointment_fingerprint(row._asdict())
+            for row in query.all()
+        }
+
     def update(self, appointment: Appointment) -> None:
         # Check if appointment is immutable before updating
         appointment.validate_modification_allowed(self.user)
 
+        appointment.fingerprint = appointment_fingerprint(appointment)  # type: ignore
         appointment.calendar_id = self.safe_str(self.calendar_id)  # type: ignore
         appointment = self._sanitize_appointment_json_fields(appointment)
         self.session.merge(appointment)
@@ -1,11 +1,67 @@
+import base64
+import weakref
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
-
-from sqlalchemy import and_, asc, desc, or_
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    and_,
+    asc,
+    desc,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    tuple_,
+)
 from sqlalchemy.orm import Session
 
 from core.db import SessionLocal
-from core.models.audit_log import AuditLog
+from core.models.audit_log import AUDIT_LOG_FTS_TABLE, AuditLog
+from core.utilities.retention_engine import ChunkedRetention, RetentionConfig
+
+_EQUALITY_FILTERS = (
+    "user_id",
+    "action_type",
+    "operation",
+    "status",
+    "resource_type",
+    "resource_id",
+    "correlation_id",
+)
+
+# Engines known to have the FTS5 table; a miss is re-checked, since a migration may add it later
+_sqlite_fts_available: "weakref.WeakKeyDictionary[Any, bool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@dataclass
+class AuditLogPage:
+    """One page of a keyset-paginated audit log search."""
+
+    items: List[AuditLog] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_audit_cursor(created_at: datetime, audit_id: int) -> str:
+    """Encode the (created_at, id) position of the last row on a page."""
+    raw = f"{created_at.isoformat()}|{audit_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_audit_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by ``encode_audit_cursor``."""
+    try:
+        created_at, audit_id = (
+            base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        )
+        return datetime.fromisoformat(created_at), int(audit_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid audit log cursor: {cursor!r}") from e
 
 
 class AuditLogRepository:
@@ -23,6 +79,22 @@ class AuditLogRepository:
         self.session.refresh(audit_log)
         return audit_log
 
+    def add_many(self, audit_logs: List[AuditLog]) -> List[AuditLog]:
+        """
+        Insert several AuditLog entries with a single flush and commit.
+
+        Entries are detached from the session with their IDs populated, so they
+        stay readable from other threads after the commit.
+        """
+        if not audit_logs:
+            return []
+        self.session.add_all(audit_logs)
+        self.session.flush()
+        for audit_log in audit_logs:
+            self.session.expunge(audit_log)
+        self.session.commit()
+        return audit_logs
+
     def get_by_id(self, audit_id: int) -> Optional[AuditLog]:
         """Retrieve an AuditLog by its ID."""
         return self.session.get(AuditLog, audit_id)
@@ -132,69 +204,95 @@ class AuditLogRepository:
 
         return query.all()
 
-    def search(
-        self,
-        filters: Dict[str, Any],
-        limit: Optional[int] = None,
-        offset: Optional[int] = None,
-    ) -> List[AuditLog]:
+    def _apply_filters(self, query, filters: Dict[str, Any]):
         """
-        Advanced search with multiple filters.
-
-        Args:
-            filters: Dict with possible keys:
-                - user_id: int
-                - action_type: str
-                - operation: str
-                - status: str
-                - resource_type: str
-                - resource_id: str
-                - correlation_id: str
-                - start_date: date
-                - end_date: date
-                - message_contains: str (for text search in message)
+        Apply search filters to an AuditLog query (shared by search, search_page
+        and count_by_filters).
+
+        Supported keys:
+            - user_id, action_type, operation, status, resource_type,
+              resource_id, correlation_id: exact match
+            - start_date / end_date: inclusive created_at date bounds
+            - message_contains: substring match on message (LIKE)
+            - message_search: full-text match on message (FTS5 on SQLite,
+              tsvector on PostgreSQL, substring match elsewhere)
         """
-        query = self.session.query(AuditLog)
-
-        # Apply filters
-        if "user_id" in filters:
-            query = query.filter_by(user_id=filters["user_id"])
-
-        if "action_type" in filters:
-            query = query.filter_by(action_type=filters["action_type"])
-
-        if "operation" in filters:
-            query = query.filter_by(operation=filters["operation"])
-
-        if "status" in filters:
-            query = query.filter_by(status=filters["status"])
-
-        if "resource_type" in filters:
-            query = query.filter_by(resource_type=filters["resource_type"])
-
-        if "resource_id" in filters:
-            query = query.filter_by(resource_id=filters["resource_id"])
+        for key in _EQUALITY_FILTERS:
+            if key in filters:
+                query = query.filter_by(**{key: filters[key]})
 
-        if "correlation_id" in filters:
-            query = query.filter_by(correlation_id=filters["correlation_id"])
-
-        if "start_date" in filters and "end_date" in filters:
-            start_datetime = datetime.combine(
-                filters["start_date"], datetime.min.time()
+        if "start_date" in filters:
+            query = query.filter(
+                AuditLog.created_at
+                >= datetime.combine(filters["start_date"], datetime.min.time())
             )
-            end_datetime = datetime.combine(filters["end_date"], datetime.max.time())
+        if "end_date" in filters:
             query = query.filter(
-                and_(
-                    AuditLog.created_at >= start_datetime,
-                    AuditLog.created_at <= end_datetime,
-                )
+                AuditLog.created_at
+                <= datetime.combine(filters["end_date"], datetime.max.time())
             )
 
         if "message_contains" in filters:
             query = query.filter(AuditLog.message.contains(filters["message_contains"]))
 
-        # Order by creation date (newest first)
-        query = query.order_by(desc(AuditLog.created_at))
+        if filters.get("message_search"):
+            query = query.filter(self._message_search_clause(filters["message_search"]))
+
+        return query
+
+    def _message_search_clause(self, search_text: str):
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            return func.to_tsvector("simple", func.coalesce(AuditLog.message, "")).op(
+                "@@"
+            )(func.plainto_tsquery("simple", search_text))
+        if dialect == "sqlite" and self._has_sqlite_fts():
+            # Quote each term so user input is matched literally, not as FTS syntax
+            terms = " ".join(
+                '"' + term.replace('"', '""') + '"' for term in search_text.split()
+            )
+            matches = (
+                select(literal_column("rowid"))
+                .select_from(table(AUDIT_LOG_FTS_TABLE))
+                .where(literal_column(AUDIT_LOG_FTS_TABLE).op("MATCH")(terms))
+            )
+            return AuditLog.id.in_(matches)
+        return AuditLog.message.contains(search_text)
+
+    def _has_sqlite_fts(self) -> bool:
+        engine = self.session.get_bind()
+        engine = getattr(engine, "engine", engine)
+        if _sqlite_fts_available.get(engine):
+            return True
+        available = (
+            self.session.execute(
+                text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                ),
+                {"name": AUDIT_LOG_FTS_TABLE},
+            ).first()
+            is not None
+        )
+        if available:
+            _sqlite_fts_available[engine] = True
+        return available
+
+    def search(
+        self,
+        filters: Dict[str, Any],
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> List[AuditLog]:
+        """
+        Advanced search with multiple filters (see ``_apply_filters`` for keys).
+
+        Offset pagination is kept for existing callers; prefer ``search_page``
+        for paging through large result sets.
+        """
+        query = self._apply_filters(self.session.query(AuditLog), filters)
+
+        # Order by creation date (newest first), id as a stable tiebreaker
+        query = query.order_by(desc(AuditLog.created_at), desc(AuditLog.id))
 
         # Apply pagination
         if offset:
@@ -204,67 +302,76 @@ class AuditLogRepository:
 
         return query.all()
 
-    def count_by_filters(self, filters: Dict[str, Any]) -> int:
-        """Count audit log entries matching the given filters."""
-        query = self.session.query(AuditLog)
-
-        # Apply same filters as search method
-        if "user_id" in filters:
-            query = query.filter_by(user_id=filters["user_id"])
-
-        if "action_type" in filters:
-            query = query.filter_by(action_type=filters["action_type"])
-
-        if "operation" in filters:
-            query = query.filter_by(operation=filters["operation"])
-
-        if "status" in filters:
-            query = query.filter_by(status=filters["status"])
-
-        if "resource_type" in filters:
-            query = query.filter_by(resource_type=filters["resource_type"])
-
-        if "resource_id" in filters:
-            query = query.filter_by(resource_id=filters["resource_id"])
+    def search_page(
+        self,
+        filters: Dict[str, Any],
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> AuditLogPage:
+        """
+        Keyset-paginated search, newest first.
 
-        if "correlation_id" in filters:
-            query = query.filter_by(correlation_id=filters["correlation_id"])
+        Args:
+            filters: Same keys as ``search``.
+            limit: Page size.
+            cursor: ``next_cursor`` from the previous page; None for the first page.
 
-        if "start_date" in filters and "end_date" in filters:
-            start_datetime = datetime.combine(
-                filters["start_date"], datetime.min.time()
-            )
-            end_datetime = datetime.combine(filters["end_date"], datetime.max.time())
+        Returns:
+            AuditLogPage with the entries and the cursor for the next page
+            (None when this is the last page).
+        """
+        query = self._apply_filters(self.session.query(AuditLog), filters)
+        if cursor:
+            created_at, last_id = decode_audit_cursor(cursor)
+            # Row-value comparison so the (…, created_at, id) indexes can seek
             query = query.filter(
-                and_(
-                    AuditLog.created_at >= start_datetime,
-                    AuditLog.created_at <= end_datetime,
-                )
+                tuple_(AuditLog.created_at, AuditLog.id)
+                < tuple_(literal(created_at, AuditLog.created_at.type), last_id)
             )
+        rows = (
+            query.order_by(desc(AuditLog.created_at), desc(AuditLog.id))
+            .limit(limit + 1)
+            .all()
+        )
+        items = rows[:limit]
+        next_cursor = (
+            encode_audit_cursor(items[-1].created_at, items[-1].id)
+            if len(rows) > limit
+            else None
+        )
+        return AuditLogPage(items=items, next_cursor=next_cursor)
 
-        if "message_contains" in filters:
-            query = query.filter(AuditLog.message.contains(filters["message_contains"]))
-
-        return query.count()
+    def count_by_filters(self, filters: Dict[str, Any]) -> int:
+        """Count audit log entries matching the given filters."""
+        return self._apply_filters(self.session.query(AuditLog), filters).count()
 
     def delete_old_entries(
-        self, older_than_date: date, user_id: Optional[int] = None
+        self,
+        older_than_date: date,
+        user_id: Optional[int] = None,
+        config: Optional[RetentionConfig] = None,
     ) -> int:
         """
         Delete audit log entries older than the specified date.
         Returns the number of deleted entries.
+
+        Rows are removed in primary-key chunks with one commit per chunk, and
+        optionally exported to a cold archive first (see RetentionConfig). On
+        PostgreSQL, expired range partitions are dropped whole when no user
+        filter is given.
         """
         cutoff_datetime = datetime.combine(older_than_date, datetime.max.time())
 
-        query = self.session.query(AuditLog).filter(
-            AuditLog.created_at < cutoff_datetime
-        )
-
+        condition = AuditLog.created_at < cutoff_datetime
         if user_id:
-            query = query.filter_by(user_id=user_id)
-
-        count = query.count()
-        query.delete()
-        self.session.commit()
+            condition = and_(condition, AuditLog.user_id == user_id)
 
-        return count
+        retention = ChunkedRetention(
+            self.session, AuditLog.__table__, config or RetentionConfig.from_env()
+        )
+        result = retention.purge(
+            condition,
+            label=older_than_date.strftime("%Y%m%d"),
+            partition_cutoff=None if user_id else cutoff_datetime,
+        )
+        return result.deleted
@@ -0,0 +1,123 @@
+"""
+Repository for CalendarFingerprintIndex model.
+Provides per-(calendar, day) access to cached destination fingerprints.
+"""
+
+from datetime import UTC, date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.models.calendar_fingerprint_index import CalendarFingerprintIndex
+
+
+class CalendarFingerprintIndexRepository:
+    """Repository for CalendarFingerprintIndex operations."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_days(
+        self, calendar_key: str, days: Iterable[date]
+    ) -> Dict[date, CalendarFingerprintIndex]:
+        """Return existing index rows for the given days, keyed by day."""
+        days = list(days)
+        if not days:
+            return {}
+        rows = (
+            self.session.query(CalendarFingerprintIndex)
+            .filter(
+                CalendarFingerprintIndex.calendar_key == calendar_key,
+                CalendarFingerprintIndex.day.in_(days),
+            )
+            .all()
+        )
+        return {row.day: row for row in rows}
+
+    def save_day(
+        self,
+        calendar_key: str,
+        day: date,
+        event_fingerprints: Dict[str, str],
+        delta_link: Optional[str],
+        commit: bool = True,
+    ) -> CalendarFingerprintIndex:
+        """Create or replace the index row for one day."""
+        row = self.get_days(calendar_key, [day]).get(day)
+        if row is None:
+            row = CalendarFingerprintIndex(calendar_key=calendar_key, day=day)
+            self.session.add(row)
+        # Assign a new dict so SQLAlchemy detects the JSON change
+        row.event_fingerprints = dict(event_fingerprints)
+        row.delta_link = delta_link
+        row.refreshed_at = datetime.now(UTC)
+        if commit:
+            self.session.commit()
+        return row
+
+    def record_events(
+        self, calendar_key: str, events: Dict[date, Dict[str, str]]
+    ) -> int:
+        """
+        Write-through newly created events into already-synced days.
+
+        Days that have never been synced are left alone so that a partial row is
+        never mistaken for a complete one.
+
+        :param events: Map of day to ``{event_id: fingerprint}``.
+        :return: Number of events recorded.
+        """
+        recorded = 0
+        rows = self.get_days(calendar_key, events.keys())
+        for day, row in rows.items():
+            if not row.delta_link:
+                continue
+            updated = dict(row.event_fingerprints or {})
+            updated.update(events[day])
+            row.event_fingerprints = updated
+            recorded += len(events[day])
+        if recorded:
+            self.session.commit()
+        return recorded
+
+    def remove_events(
+        self, calendar_key: str, event_ids: Iterable[str], days: Iterable[date]
+    ) -> int:
+        """Remove deleted events from the given days. Returns the number removed."""
+        event_ids = set(event_ids)
+        removed = 0
+        for row in self.get_days(calendar_key, days).values():
+            current = row.event_fingerprints or {}
+            remaining = {k: v for k, v in current.items() if k not in event_ids}
+            if len(remaining) != len(current):
+                removed += len(current) - len(remaining)
+                row.event_fingerprints = remaining
+        if removed:
+            self.session.commit()
+        return removed
+
+    def invalidate(
+        self, calendar_key: str, days: Optional[Iterable[date]] = None
+    ) -> int:
+        """Drop index rows for a calendar (optionally only the given days)."""
+        query = self.session.query(CalendarFingerprintIndex).filter(
+            CalendarFingerprintIndex.calendar_key == calendar_key
+        )
+        if days is not None:
+            query = query.filter(CalendarFingerprintIndex.day.in_(list(days)))
+        count = query.delete(synchronize_session=False)
+        self.session.commit()
+        return count
+
+    def list_for_calendar(self, calendar_key: str) -> List[CalendarFingerprintIndex]:
+        """List all index rows for a calendar ordered by day."""
+        return (
+            self.session.query(CalendarFingerprintIndex)
+            .filter(CalendarFingerprintIndex.calendar_key == calendar_key)
+            .order_by(CalendarFingerprintIndex.day)
+            .all()
+        )
+
+    def commit(self) -> None:
+        """Commit pending changes made with ``commit=False``."""
+        self.session.commit()
@@ -61,6 +61,7 @@ class MSGraphCalendarRepository(BaseCalendarRepository):
 
             # If we get here, the calendar was created successfully
             # The result should contain the created calendar information
+            self._invalidate_calendar_directory()
 
         except Exception as e:
             # Check if the calendar was actually created despite the error
@@ -76,6 +77,7 @@ class MSGraphCalendarRepository(BaseCalendarRepository):
 
                 if calendar_exists:
                     # Calendar was created successfully despite the error
+                    self._invalidate_calendar_directory()
                     return
 
             except Exception:
@@ -86,6 +88,13 @@ class MSGraphCalendarRepository(BaseCalendarRepository):
                 f"Failed to add calendar for user {self.user.id} via MS Graph: {e}"
             ) from e
 
+    def _invalidate_calendar_directory(self) -> None:
+        """Make URI resolution see the new calendar instead of a cached miss."""
+        from core.utilities.calendar_resolver import calendar_directory_cache
+
+        if self.user.email:
+            calendar_directory_cache.invalidate(self.user.email)
+
     async def list_async(self) -> list[Calendar]:
         """
         Async version: List all calendars for the repository's user via MS Graph.
@@ -1,40 +1,170 @@
-import asyncio
-from typing import List, Optional
+import threading
+import time
+from typing import Dict, List, Optional
 
 from core.models.category import Category
 from core.models.user import User
+from core.utilities.async_runner import run_async
 
 from .category_repository_base import BaseCategoryRepository
 
+# Master categories change rarely, so a short TTL keeps CLI invocations and
+# batch category processing to one Graph listing per user.
+DEFAULT_CATEGORY_CACHE_TTL = 300.0
+
+
+class CachedCategories:
+    """Master categories for one user, keyed by id with a name -> id index."""
+
+    __slots__ = ("expires_at", "by_id", "by_name")
+
+    def __init__(self, expires_at: float, categories: List[Dict[str, str]]):
+        self.expires_at = expires_at
+        self.by_id: Dict[str, Dict[str, str]] = {c["id"]: c for c in categories}
+        self.by_name: Dict[str, str] = {c["name"]: c["id"] for c in categories}
+
+    def find_by_name(self, name: str) -> Optional[Dict[str, str]]:
+        category_id = self.by_name.get(name)
+        return self.by_id.get(category_id) if category_id else None
+
+
+class MasterCategoryCache:
+    """
+    Thread-safe, TTL'd per-user cache of Outlook master categories.
+
+    Entries hold ``{"id", "name", "color"}`` dicts in Graph order. Writes made
+    through the repository update the cached entry in place; failed writes
+    invalidate it so the next read goes back to Graph.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CATEGORY_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[str, CachedCategories] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_key: str) -> Optional[CachedCategories]:
+        """Return the cached categories for a user, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(user_key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[user_key]
+                return None
+            return entry
+
+    def put(self, user_key: str, categories: List[Dict[str, str]]) -> CachedCategories:
+        """Replace the cached categories for a user."""
+        entry = CachedCategories(time.monotonic() + self.ttl, categories)
+        with self._lock:
+            self._entries[user_key] = entry
+        return entry
+
+    def upsert(self, user_key: str, category: Dict[str, str]) -> None:
+        """Write-through a created or updated category, if the user is cached."""
+        with self._lock:
+            entry = self._entries.get(user_key)
+            if entry is None:
+                return
+            previous = entry.by_id.get(category["id"])
+            if previous and entry.by_name.get(previous["name"]) == category["id"]:
+                del entry.by_name[previous["name"]]
+            entry.by_id[category["id"]] = category
+            entry.by_name[category["name"]] = category["id"]
+
+    def remove(self, user_key: str, category_id: str) -> None:
+        """Write-through a deleted category, if the user is cached."""
+        with self._lock:
+            entry = self._entries.get(user_key)
+            if entry is None:
+                return
+            removed = entry.by_id.pop(category_id, None)
+            if removed and entry.by_name.get(removed["name"]) == category_id:
+                del entry.by_name[removed["name"]]
+
+    def invalidate(self, user_key: Optional[str] = None) -> None:
+        """Drop one user's entry, or the whole cache."""
+        with self._lock:
+            if user_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_key, None)
+
+
+# Shared across repository instances so repeated CLI/service calls reuse one listing
+master_category_cache = MasterCategoryCache()
+
 
 class MSGraphCategoryRepository(BaseCategoryRepository):
     """
     Repository for managing Category entities via Microsoft Graph API.
     Uses Outlook categories which are available through the Graph API.
+
+    Sync methods run on the shared AsyncRunner loop (one loop and Graph session
+    for the process) and read master categories through a TTL'd per-user cache.
+    Returned categories are not persisted: ``id`` stays unset and the Outlook
+    category id is carried in the non-column attribute ``graph_id``.
     """
 
-    def __init__(self, msgraph_client, user: User):
+    def __init__(
+        self,
+        msgraph_client,
+        user: User,
+        cache: Optional[MasterCategoryCache] = None,
+    ):
         super().__init__(user)
         self.client = msgraph_client
+        self.cache = cache if cache is not None else master_category_cache
+
+    @property
+    def _cache_key(self) -> str:
+        return (self.user.email or str(self.user.id)).lower()
+
+    def _master_categories(self):
+        return self.client.users.by_user_id(self.user.email).outlook.master_categories
+
+    def _to_category(self, entry: Dict[str, str]) -> Category:
+        category = Category(
+            user_id=self.user.id,
+            name=entry["name"],
+            description=f"Color: {entry['color']}",
+        )
+        category.graph_id = entry["id"]
+        return category
+
+    @staticmethod
+    def _to_entry(ms_cat) -> Dict[str, str]:
+        return {
+            "id": getattr(ms_cat, "id", None),
+            "name": getattr(ms_cat, "display_name", "") or "",
+            "color": getattr(ms_cat, "color", None) or "none",
+        }
+
+    async def _load_categories_async(self, refresh: bool = False) -> CachedCategories:
+        """Return the user's master categories, listing from Graph on a cache miss."""
+        if not refresh:
+            cached = self.cache.get(self._cache_key)
+            if cached is not None:
+                return cached
+        ms_categories = await self._master_categories().get()
+        entries = [
+            self._to_entry(c) for c in getattr(ms_categories, "value", None) or []
+        ]
+        return self.cache.put(self._cache_key, entries)
+
+    def refresh(self) -> None:
+        """Drop the cached master categories for this user."""
+        self.cache.invalidate(self._cache_key)
 
     def get_by_id(self, category_id: str) -> Optional[Category]:
         """Retrieve a category by its ID (sync wrapper)."""
-        return asyncio.run(self._get_by_id_async(category_id))
+        return run_async(self._get_by_id_async(category_id))
 
     async def _get_by_id_async(self, category_id: str) -> Optional[Category]:
         """Async: Retrieve a category by its ID."""
         try:
-            categories = await self.client.users.by_user_id(
-                self.user.email
-            ).outlook.master_categories.get()
-            for ms_cat in getattr(categories, "value", []):
-                if getattr(ms_cat, "id", None) == category_id:
-                    return Category(
-                        user_id=self.user.id,
-                        name=getattr(ms_cat, "display_name", ""),
-                        description=f"Color: {getattr(ms_cat, 'color', 'none')}",
-                    )
-            return None
+            entry = (await self._load_categories_async()).by_id.get(category_id)
+            return self._to_category(entry) if entry else None
         except Exception as e:
             raise RuntimeError(
                 f"Failed to get category {category_id} for user {self.user.id} via MS Graph: {e}"
@@ -42,7 +172,7 @@ class MSGraphCategoryRepository(BaseCategoryRepository):
 
     def add(self, category: Category) -> None:
         """Add a new category (sync wrapper)."""
-        return asyncio.run(self._add_async(category))
+        return run_async(self._add_async(category))
 
     async def _add_async(self, category: Category) -> None:
         """Async: Add a new category via MS Graph."""
@@ -54,34 +184,26 @@ class MSGraphCategoryRepository(BaseCategoryRepository):
                 str(category.name) if hasattr(category, "name") else None
             )
             ms_cat.color = "preset0"  # Default color
-            await self.client.users.by_user_id(
-                self.user.email
-            ).outlook.master_categories.post(body=ms_cat)
+            created = await self._master_categories().post(body=ms_cat)
         except Exception as e:
+            self.cache.invalidate(self._cache_key)
             raise RuntimeError(
                 f"Failed to add category for user {self.user.id} via MS Graph: {e}"
             ) from e
+        if getattr(created, "id", None):
+            self.cache.upsert(self._cache_key, self._to_entry(created))
+        else:
+            self.cache.invalidate(self._cache_key)
 
     def list(self) -> List[Category]:
         """List all categories for the repository's user (sync wrapper)."""
-        return asyncio.run(self._list_async())
+        return run_async(self._list_async())
 
     async def _list_async(self) -> List[Category]:
         """Async: List all categories for the repository's user via MS Graph."""
-        categories = []
         try:
-            ms_categories = await self.client.users.by_user_id(
-                self.user.email
-            ).outlook.master_categories.get()
-            for ms_cat in getattr(ms_categories, "value", []):
-                categories.append(
-                    Category(
-                        user_id=self.user.id,
-                        name=getattr(ms_cat, "display_name", ""),
-                        description=f"Color: {getattr(ms_cat, 'color', 'none')}",
-                    )
-                )
-            return categories
+            cached = await self._load_categories_async()
+            return [self._to_category(entry) for entry in cached.by_id.values()]
         except Exception as e:
             raise RuntimeError(
                 f"Failed to list categories for user {self.user.id} via MS Graph: {e}"
@@ -89,21 +211,18 @@ class MSGraphCategoryRepository(BaseCategoryRepository):
 
     def update(self, category: Category) -> None:
         """Update an existing category (sync wrapper)."""
-        return asyncio.run(self._update_async(category))
+        return run_async(self._update_async(category))
 
     async def _update_async(self, category: Category) -> None:
         """Async: Update an existing category via MS Graph."""
         try:
-            # For MS Graph, we need to find the category by name and update it
-            # This is a limitation of the Outlook categories API
-            categories = await self.client.users.by_user_id(
-                self.user.email
-            ).outlook.master_categories.get()
-            category_id = None
-            for ms_cat in getattr(categories, "value", []):
-                if getattr(ms_cat, "display_name", "") == category.name:
-                    category_id = getattr(ms_cat, "id", None)
-                    break
+            # Categories returned from this repository carry their Graph id and are
+            # patched directly; others are looked up by name in the cached listing.
+            category_id = category.graph_id
+            if not category_id:
+                category_id = (await self._load_categories_async()).by_name.get(
+                    category.name
+                )
 
             if category_id:
                 from msgraph.generated.models.outlook_category import OutlookCategory
@@ -113,51 +232,50 @@ class MSGraphCategoryRepository(BaseCategoryRepository):
                     str(category.name) if hasattr(category, "name") else None
                 )
                 ms_cat.color = "preset0"  # Keep default color
-                await self.client.users.by_user_id(
-                    self.user.email
-                ).outlook.master_categories.by_outlook_category_id(category_id).patch(
-                    body=ms_cat
+                await self._master_categories().by_outlook_category_id(
+                    category_id
+                ).patch(body=ms_cat)
+                self.cache.upsert(
+                    self._cache_key,
+                    {
+                        "id": category_id,
+                        "name": ms_cat.display_name or "",
+                        "color": ms_cat.color,
+                    },
                 )
             else:
                 raise ValueError(f"Category '{category.name}' not found")
         except Exception as e:
+            if not isinstance(e, ValueError):
+                self.cache.invalidate(self._cache_key)
             raise RuntimeError(
                 f"Failed to update category for user {self.user.id} via MS Graph: {e}"
             ) from e
 
     def delete(self, category_id: str) -> None:
         """Delete a category by its ID (sync wrapper)."""
-        return asyncio.run(self._delete_async(category_id))
+        return run_async(self._delete_async(category_id))
 
     async def _delete_async(self, category_id: str) -> None:
         """Async: Delete a category by its ID via MS Graph."""
         try:
-            await self.client.users.by_user_id(
-                self.user.email
-            ).outlook.master_categories.by_outlook_category_id(category_id).delete()
+            await self._master_categories().by_outlook_category_id(category_id).delete()
         except Exception as e:
+            self.cache.invalidate(self._cache_key)
             raise RuntimeError(
                 f"Failed to delete category {category_id} for user {self.user.id} via MS Graph: {e}"
             ) from e
+        self.cache.remove(self._cache_key, category_id)
 
     def get_by_name(self, name: str) -> Optional[Category]:
         """Get a category by name for the repository's user (sync wrapper)."""
-        return asyncio.run(self._get_by_name_async(name))
+        return run_async(self._get_by_name_async(name))
 
     async def _get_by_name_async(self, name: str) -> Optional[Category]:
         """Async: Get a category by name for the repository's user."""
         try:
-            categories = await self.client.users.by_user_id(
-                self.user.email
-            ).outlook.master_categories.get()
-            for ms_cat in getattr(categories, "value", []):
-                if getattr(ms_cat, "display_name", "") == name:
-                    return Category(
-                        user_id=self.user.id,
-                        name=getattr(ms_cat, "display_name", ""),
-                        description=f"Color: {getattr(ms_cat, 'color', 'none')}",
-                    )
-            return None
+            entry = (await self._load_categories_async()).find_by_name(name)
+            return self._to_category(entry) if entry else None
         except Exception as e:
             raise RuntimeError(
                 f"Failed to get category '{name}' for user {self.user.id} via MS Graph: {e}"
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 
 from core.db import SessionLocal
 from core.models.reversible_operation import ReversibleOperation, ReversibleOperationItem
+from core.utilities.retention_engine import ChunkedRetention, RetentionConfig
 
 
 class ReversibleOperationRepository:
@@ -274,45 +275,44 @@ class ReversibleOperationRepository:
 
         self.session.commit()
 
-    def delete_old_operations(self, older_than_days: int, user_id: Optional[int] = None) -> int:
+    def delete_old_operations(
+        self,
+        older_than_days: int,
+        user_id: Optional[int] = None,
+        config: Optional[RetentionConfig] = None,
+    ) -> int:
         """
         Delete old reversible operations (and their items) that are older than specified days.
         Only deletes operations that have been reversed or are marked as non-reversible.
-        
+
+        Rows are removed in primary-key chunks with one commit per chunk, and
+        optionally exported to a cold archive first (see RetentionConfig).
+
         Args:
             older_than_days: Delete operations older than this many days
             user_id: Optional user ID to limit deletion to specific user
-            
+            config: Retention settings; defaults to RetentionConfig.from_env()
+
         Returns:
             Number of operations deleted
         """
         cutoff_date = datetime.utcnow() - timedelta(days=older_than_days)
-        
-        query = self.session.query(ReversibleOperation).filter(
-            and_(
-                ReversibleOperation.created_at < cutoff_date,
-                or_(
-                    ReversibleOperation.is_reversed == True,
-                    ReversibleOperation.is_reversible == False,
-                )
-            )
+
+        condition = and_(
+            ReversibleOperation.created_at < cutoff_date,
+            or_(
+                ReversibleOperation.is_reversed == True,
+                ReversibleOperation.is_reversible == False,
+            ),
         )
-        
         if user_id:
-            query = query.filter_by(user_id=user_id)
-        
-        operations_to_delete = query.all()
-        count = len(operations_to_delete)
-        
-        # Delete items first (due to foreign key constraints)
-        for operation in operations_to_delete:
-            self.session.query(ReversibleOperationItem).filter_by(
-                operation_id=operation.id
-            ).delete()
-        
-        # Delete operations
-        for operation in operations_to_delete:
-            self.session.delete(operation)
-        
-        self.session.commit()
-        return count
+            condition = and_(condition, ReversibleOperation.user_id == user_id)
+
+        items = ReversibleOperationItem.__table__
+        retention = ChunkedRetention(
+            self.session,
+            ReversibleOperation.__table__,
+            config or RetentionConfig.from_env(),
+            children=[(items, items.c.operation_id)],
+        )
+        return retention.purge(condition, label=cutoff_date.strftime("%Y%m%d")).deleted
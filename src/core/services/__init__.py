@@ -11,4 +11,5 @@ from .privacy_automation_service import PrivacyAutomationService
 from .prompt_service import PromptService
 from .scheduled_archive_service import ScheduledArchiveService
 from .timesheet_archive_service import TimesheetArchiveService
+from .timesheet_report_service import TimesheetReportService
 from .user_service import UserService
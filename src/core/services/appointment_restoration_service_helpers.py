@@ -7,13 +7,14 @@ to keep the main service file manageable.
 """
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import uuid
 
 from core.models.appointment import Appointment
 from core.models.calendar import Calendar
 from core.models.restoration_configuration import RestorationConfiguration, DestinationType
 from core.repositories.appointment_repository_sqlalchemy import SQLAlchemyAppointmentRepository
+from core.utilities.appointment_fingerprint import appointment_fingerprint
 
 
 class AppointmentRestorationHelpers:
@@ -65,21 +66,16 @@ class AppointmentRestorationHelpers:
     def _apply_duplicate_detection(
         self, appointments: List[Dict[str, Any]], config: RestorationConfiguration
     ) -> List[Dict[str, Any]]:
-        """Remove duplicate appointments based on subject and time."""
-        # Get existing appointments from destination to check for duplicates
-        existing_appointments = self._get_existing_appointments_from_destination(config)
+        """Remove duplicate appointments based on the canonical appointment fingerprint."""
+        # Fingerprints already present in the destination; appointments repeated
+        # within the batch itself are also skipped after their first occurrence.
+        seen = self._get_existing_fingerprints_from_destination(config)
         
         filtered = []
         for appt in appointments:
-            is_duplicate = False
-            
-            for existing in existing_appointments:
-                if (appt.get("subject") == existing.get("subject") and
-                    appt.get("start_time") == existing.get("start_time")):
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
+            fingerprint = appointment_fingerprint(appt)
+            if fingerprint not in seen:
+                seen.add(fingerprint)
                 filtered.append(appt)
         
         duplicates_removed = len(appointments) - len(filtered)
@@ -149,10 +145,10 @@ class AppointmentRestorationHelpers:
         print(f"Category filters: {len(appointments)} -> {len(filtered)} appointments")
         return filtered
 
-    def _get_existing_appointments_from_destination(
+    def _get_existing_fingerprints_from_destination(
         self, config: RestorationConfiguration
-    ) -> List[Dict[str, Any]]:
-        """Get existing appointments from the destination to check for duplicates."""
+    ) -> Set[str]:
+        """Get fingerprints of existing appointments in the destination to check for duplicates."""
         try:
             if config.destination_type == DestinationType.LOCAL_CALENDAR.value:
                 calendar_name = config.destination_config.get("calendar_name")
@@ -163,23 +159,15 @@ class AppointmentRestorationHelpers:
                         appointment_repo = SQLAlchemyAppointmentRepository(
                             self.service.user, str(calendar.id), self.service.session
                         )
-                        appointments = appointment_repo.list_for_user()
-                        return [
-                            {
-                                "subject": appt.subject,
-                                "start_time": appt.start_time,
-                                "end_time": appt.end_time
-                            }
-                            for appt in appointments
-                        ]
+                        return appointment_repo.list_fingerprints()
             
-            # For other destination types, return empty list for now
+            # For other destination types, return empty set for now
             # TODO: Implement for MSGraph and export file destinations
-            return []
+            return set()
             
         except Exception as e:
             print(f"Warning: Could not check for existing appointments: {e}")
-            return []
+            return set()
 
     def restore_appointment_to_destination(
         self, appointment_data: Dict[str, Any], config: RestorationConfiguration
@@ -5,6 +5,7 @@ if TYPE_CHECKING:
     from core.repositories.archive_configuration_repository import (
         ArchiveConfigurationRepository as _ACRepo,
     )
+    from core.unit_of_work import UnitOfWork
 
 
 class ArchiveConfigurationService:
@@ -12,8 +13,13 @@ class ArchiveConfigurationService:
     Service for business logic related to ArchiveConfiguration.
     """
 
-    def __init__(self, repository: Optional["_ACRepo"] = None):
+    def __init__(
+        self,
+        repository: Optional["_ACRepo"] = None,
+        unit_of_work: Optional["UnitOfWork"] = None,
+    ):
         self._repository = repository
+        self._unit_of_work = unit_of_work
 
     @property
     def repository(self) -> "_ACRepo":
@@ -22,7 +28,8 @@ class ArchiveConfigurationService:
                 ArchiveConfigurationRepository as _Repo,
             )
 
-            self._repository = _Repo()
+            session = self._unit_of_work.session if self._unit_of_work is not None else None
+            self._repository = _Repo(session)
         return self._repository
 
     def get_by_id(self, config_id: int) -> Optional["ArchiveConfiguration"]:
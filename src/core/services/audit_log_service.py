@@ -5,6 +5,8 @@ from typing import Any, Dict, List, Optional, TYPE_CHECKING
 # Expose patch points for tests without importing DB-backed models at import time
 AuditLog = None  # Will be patched in tests; real class imported inside methods
 
+from core.services.audit_log_writer import AuditLogWriter, get_audit_log_writer
+
 if TYPE_CHECKING:
     from core.models.audit_log import AuditLog  # noqa: F401
     from core.repositories.audit_log_repository import AuditLogRepository as _AuditRepo
@@ -14,10 +16,22 @@ class AuditLogService:
     """
     Service for managing audit logging with high-level business logic.
     Provides convenient methods for logging different types of operations.
+
+    Without an explicit repository, fire-and-forget writes (``wait=False``) go
+    through the process-wide background AuditLogWriter when it is enabled via
+    AUDIT_LOG_ASYNC_ENABLED. Writes that need the row back, and all writes
+    through an injected repository (the caller's session), are synchronous.
     """
 
-    def __init__(self, repository: Optional["_AuditRepo"] = None):
+    def __init__(
+        self,
+        repository: Optional["_AuditRepo"] = None,
+        writer: Optional[AuditLogWriter] = None,
+    ):
         self._repository = repository
+        if writer is None and repository is None:
+            writer = get_audit_log_writer()
+        self.writer = writer
 
     @property
     def repository(self) -> "_AuditRepo":
@@ -44,7 +58,8 @@ class AuditLogService:
         parent_audit_id: Optional[int] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-    ) -> "AuditLog":
+        wait: bool = True,
+    ) -> Optional["AuditLog"]:
         """
         Log a general operation with full audit details.
 
@@ -64,9 +79,11 @@ class AuditLogService:
             parent_audit_id: For nested operations
             ip_address: Client IP address
             user_agent: Client user agent
+            wait: Write the row synchronously and return it. Pass False for
+                fire-and-forget logging when the caller does not need the row.
 
         Returns:
-            The created AuditLog entry
+            The created AuditLog entry, or None when queued with wait=False
         """
         # Prefer module-level patched AuditLog if tests set it; otherwise import the real model
         # Note: tests may set the module-level `AuditLog` variable to a test stub.
@@ -93,6 +110,10 @@ class AuditLogService:
             parent_audit_id=parent_audit_id,
         )
 
+        if self.writer is not None and not wait:
+            self.writer.submit(audit_log)
+            return None
+
         return self.repository.add(audit_log)
 
     def log_archive_operation(
@@ -280,6 +301,15 @@ class AuditLogService:
         """Search audit logs with advanced filtering."""
         return self.repository.search(filters, limit, offset)
 
+    def search_audit_logs_page(
+        self,
+        filters: Dict[str, Any],
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ):
+        """Search audit logs newest-first using keyset pagination; returns an AuditLogPage."""
+        return self.repository.search_page(filters, limit=limit, cursor=cursor)
+
     def get_audit_summary(self, user_id: int, days: int = 30) -> Dict[str, Any]:
         """
         Get a summary of audit activity for a user over the specified number of days.
@@ -325,6 +355,9 @@ class AuditLogService:
         """
         Clean up audit logs older than the specified number of days.
         Returns the number of deleted entries.
+
+        Deletion is chunked and can export to a cold archive first; see
+        RETENTION_* settings in core.utilities.retention_engine.
         """
         cutoff_date = date.fromordinal(date.today().toordinal() - older_than_days)
         return self.repository.delete_old_entries(cutoff_date, user_id)
@@ -0,0 +1,303 @@
+"""
+Background, batching writer for audit log rows.
+
+Audit rows are queued by the caller and inserted by a single daemon thread in
+multi-row batches (every ``batch_size`` rows or ``flush_interval_ms``,
+whichever comes first). The queue is bounded: fire-and-forget submissions wait
+up to ``put_timeout_seconds`` for space and are then dropped and counted, so a
+slow database can never stall an archive run indefinitely. Submissions that
+wait for the row block for queue space for at most ``wait_timeout_seconds``.
+
+The writer is opt-in (AUDIT_LOG_ASYNC_ENABLED) and is never used with an
+in-memory SQLite database, where the writer thread would get its own, empty
+database. Pending rows are flushed when the process exits.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.utilities.env_utility import get_bool_env, get_float_env, get_int_env
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AuditLogWriterConfig:
+    """Runtime configuration for the background audit log writer."""
+
+    enabled: bool = False
+    max_queue_size: int = 10000
+    batch_size: int = 200
+    flush_interval_ms: int = 250
+    put_timeout_seconds: float = 1.0
+    wait_timeout_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "AuditLogWriterConfig":
+        """Create configuration hydrated from environment variables."""
+        return cls(
+            enabled=get_bool_env("AUDIT_LOG_ASYNC_ENABLED", cls.enabled),
+            max_queue_size=get_int_env("AUDIT_LOG_QUEUE_SIZE", cls.max_queue_size),
+            batch_size=get_int_env("AUDIT_LOG_BATCH_SIZE", cls.batch_size),
+            flush_interval_ms=get_int_env(
+                "AUDIT_LOG_FLUSH_INTERVAL_MS", cls.flush_interval_ms
+            ),
+            put_timeout_seconds=get_float_env(
+                "AUDIT_LOG_PUT_TIMEOUT", cls.put_timeout_seconds
+            ),
+            wait_timeout_seconds=get_float_env(
+                "AUDIT_LOG_WAIT_TIMEOUT", cls.wait_timeout_seconds
+            ),
+        )
+
+
+def _default_repository_factory():
+    # Created on the writer thread, so it gets that thread's scoped session
+    from core.repositories.audit_log_repository import AuditLogRepository
+
+    return AuditLogRepository()
+
+
+class AuditLogWriter:
+    """
+    Bounded queue plus one batching writer thread for AuditLog rows.
+
+    The repository returned by ``repository_factory`` must provide
+    ``add_many(audit_logs)`` and is only ever used from the writer thread.
+    """
+
+    def __init__(
+        self,
+        repository_factory: Callable[[], Any] = _default_repository_factory,
+        config: Optional[AuditLogWriterConfig] = None,
+    ):
+        self.config = config or AuditLogWriterConfig()
+        self._repository_factory = repository_factory
+        self._queue: "queue.Queue[Tuple[Any, Optional[Future]]]" = queue.Queue(
+            maxsize=max(1, self.config.max_queue_size)
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self._stats = {
+            "submitted": 0,
+            "written": 0,
+            "failed": 0,
+            "dropped": 0,
+            "batches": 0,
+            "blocked": 0,
+        }
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def stats(self) -> Dict[str, int]:
+        """Return writer counters plus the current queue depth."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, audit_log: Any, wait: bool = False) -> Optional[Future]:
+        """
+        Queue an AuditLog row for insertion.
+
+        Args:
+            audit_log: Unsaved AuditLog instance.
+            wait: When True, block up to ``wait_timeout_seconds`` for queue
+                space; when False, up to ``put_timeout_seconds``. Either way
+                the row is dropped if the queue stays full.
+
+        Returns:
+            A Future for the persisted row, or None if the row was dropped.
+            Callers waiting on the future should pass a timeout to ``result``.
+        """
+        if self._closed:
+            raise RuntimeError("Audit log writer is closed")
+        self._ensure_started()
+        future: Future = Future()
+        item = (audit_log, future)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._count("blocked")
+            timeout = (
+                self.config.wait_timeout_seconds
+                if wait
+                else self.config.put_timeout_seconds
+            )
+            try:
+                self._queue.put(item, timeout=timeout)
+            except queue.Full:
+                self._count("dropped")
+                logger.warning(
+                    "Audit log queue full; dropped %s/%s entry",
+                    getattr(audit_log, "action_type", None),
+                    getattr(audit_log, "operation", None),
+                )
+                return None
+        self._count("submitted")
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every row queued before this call has been written."""
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.empty()
+        done = threading.Event()
+        try:
+            self._queue.put((done, None), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Flush pending rows and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put((None, None))
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        repository = None
+        interval = max(self.config.flush_interval_ms, 1) / 1000.0
+        batch_size = max(self.config.batch_size, 1)
+        running = True
+        while running:
+            batch: List[Tuple[Any, Future]] = []
+            markers: List[threading.Event] = []
+            try:
+                item = self._queue.get()
+            except Exception:  # pragma: no cover - interpreter shutdown
+                return
+            deadline = time.monotonic() + interval
+            while True:
+                payload, future = item
+                if payload is None:
+                    running = False
+                    break
+                if isinstance(payload, threading.Event):
+                    markers.append(payload)
+                    break
+                batch.append((payload, future))
+                if len(batch) >= batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                if repository is None:
+                    try:
+                        repository = self._repository_factory()
+                    except Exception as e:
+                        self._fail(batch, e)
+                        batch = []
+                if batch:
+                    self._write(repository, batch)
+            for marker in markers:
+                marker.set()
+
+    def _write(self, repository, batch: List[Tuple[Any, Future]]) -> None:
+        rows = [audit_log for audit_log, _ in batch]
+        try:
+            repository.add_many(rows)
+        except Exception as e:
+            logger.warning(
+                "Audit log batch insert of %d rows failed, retrying row by row: %s",
+                len(rows),
+                e,
+            )
+            self._rollback(repository)
+            # Isolate the bad row(s) so one failure does not discard the whole batch
+            for audit_log, future in batch:
+                try:
+                    repository.add_many([audit_log])
+                except Exception as row_error:
+                    self._rollback(repository)
+                    self._fail([(audit_log, future)], row_error)
+                else:
+                    self._count("written")
+                    future.set_result(audit_log)
+            self._count("batches")
+            return
+        self._count("written", len(batch))
+        self._count("batches")
+        for audit_log, future in batch:
+            future.set_result(audit_log)
+
+    @staticmethod
+    def _rollback(repository) -> None:
+        session = getattr(repository, "session", None)
+        if session is not None:
+            try:
+                session.rollback()
+            except Exception:
+                pass
+
+    def _fail(self, batch: List[Tuple[Any, Future]], error: Exception) -> None:
+        self._count("failed", len(batch))
+        logger.error("Failed to write %d audit log entries: %s", len(batch), error)
+        for _, future in batch:
+            future.set_exception(error)
+
+
+_writer: Optional[AuditLogWriter] = None
+_writer_lock = threading.Lock()
+_atexit_registered = False
+
+
+def get_audit_log_writer() -> Optional[AuditLogWriter]:
+    """Return the process-wide audit log writer, or None if async writes are disabled."""
+    global _writer, _atexit_registered
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                config = AuditLogWriterConfig.from_env()
+                if not config.enabled:
+                    return None
+                from core.db import engine
+                from core.db_profiles import _is_memory_sqlite
+
+                if _is_memory_sqlite(engine.url):
+                    logger.info(
+                        "Audit log writer disabled for in-memory SQLite; writing synchronously"
+                    )
+                    return None
+                _writer = AuditLogWriter(config=config)
+                if not _atexit_registered:
+                    atexit.register(shutdown_audit_log_writer)
+                    _atexit_registered = True
+    return _writer
+
+
+def shutdown_audit_log_writer() -> None:
+    """Flush and stop the process-wide writer; a new one is created on next use."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
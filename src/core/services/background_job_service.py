@@ -598,24 +598,27 @@ class BackgroundJobService:
                 f"source '{backup_config.source_calendar_name}' to '{backup_config.backup_destination}'"
             )
 
-            # Initialize backup service with the user
             from core.services.calendar_backup_service import CalendarBackupService
-            backup_service = CalendarBackupService(user_id=user_id)
+            from core.unit_of_work import UnitOfWork
 
-            if backup_config.backup_format == 'local_calendar':
-                result = backup_service.backup_calendar_to_local_calendar(
-                    source_calendar_name=backup_config.source_calendar_name,
-                    backup_calendar_name=backup_config.backup_destination
-                )
-            else:
-                from core.services.calendar_backup_service import BackupFormat
-                backup_format_enum = BackupFormat(backup_config.backup_format)
-                result = backup_service.backup_calendar_to_file(
-                    calendar_name=backup_config.source_calendar_name,
-                    backup_path=backup_config.backup_destination,
-                    backup_format=backup_format_enum,
-                    include_metadata=backup_config.include_metadata
-                )
+            # One session for the whole backup, closed when it finishes
+            with UnitOfWork() as uow:
+                backup_service = CalendarBackupService(user_id=user_id, unit_of_work=uow)
+
+                if backup_config.backup_format == 'local_calendar':
+                    result = backup_service.backup_calendar_to_local_calendar(
+                        source_calendar_name=backup_config.source_calendar_name,
+                        backup_calendar_name=backup_config.backup_destination
+                    )
+                else:
+                    from core.services.calendar_backup_service import BackupFormat
+                    backup_format_enum = BackupFormat(backup_config.backup_format)
+                    result = backup_service.backup_calendar_to_file(
+                        calendar_name=backup_config.source_calendar_name,
+                        backup_path=backup_config.backup_destination,
+                        backup_format=backup_format_enum,
+                        include_metadata=backup_config.include_metadata
+                    )
 
             if result.failed > 0:
                 logger.warning(
@@ -650,28 +653,31 @@ class BackgroundJobService:
                 f"source '{backup_config.source_calendar_name}' to '{backup_config.backup_destination}'"
             )
 
-            # Initialize backup service with the user
             from core.services.calendar_backup_service import CalendarBackupService
-            backup_service = CalendarBackupService(user_id=user_id)
-
-            if backup_config.backup_format == 'local_calendar':
-                result = backup_service.backup_calendar_to_local_calendar(
-                    source_calendar_name=backup_config.source_calendar_name,
-                    backup_calendar_name=backup_config.backup_destination,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-            else:
-                from core.services.calendar_backup_service import BackupFormat
-                backup_format_enum = BackupFormat(backup_config.backup_format)
-                result = backup_service.backup_calendar_to_file(
-                    calendar_name=backup_config.source_calendar_name,
-                    backup_path=backup_config.backup_destination,
-                    backup_format=backup_format_enum,
-                    start_date=start_date,
-                    end_date=end_date,
-                    include_metadata=backup_config.include_metadata
-                )
+            from core.unit_of_work import UnitOfWork
+
+            # One session for the whole backup, closed when it finishes
+            with UnitOfWork() as uow:
+                backup_service = CalendarBackupService(user_id=user_id, unit_of_work=uow)
+
+                if backup_config.backup_format == 'local_calendar':
+                    result = backup_service.backup_calendar_to_local_calendar(
+                        source_calendar_name=backup_config.source_calendar_name,
+                        backup_calendar_name=backup_config.backup_destination,
+                        start_date=start_date,
+                        end_date=end_date
+                    )
+                else:
+                    from core.services.calendar_backup_service import BackupFormat
+                    backup_format_enum = BackupFormat(backup_config.backup_format)
+                    result = backup_service.backup_calendar_to_file(
+                        calendar_name=backup_config.source_calendar_name,
+                        backup_path=backup_config.backup_destination,
+                        backup_format=backup_format_enum,
+                        start_date=start_date,
+                        end_date=end_date,
+                        include_metadata=backup_config.include_metadata
+                    )
 
             if result.failed > 0:
                 logger.warning(
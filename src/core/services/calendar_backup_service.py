@@ -24,6 +24,7 @@ if TYPE_CHECKING:
     from core.models.calendar import Calendar
     from core.repositories.calendar_repository_msgraph import MSGraphCalendarRepository as _GraphCalRepo
     from core.repositories.appointment_repository_msgraph import MSGraphAppointmentRepository as _GraphApptRepo
+    from core.unit_of_work import UnitOfWork
 
 
 class BackupFormat(Enum):
@@ -66,13 +67,15 @@ class CalendarBackupService:
     Service for backing up calendars and appointments to various destinations.
     """
 
-    def __init__(self, user_id: int = 1, session=None):
+    def __init__(self, user_id: int = 1, session=None, unit_of_work: UnitOfWork | None = None):
         from core.db import get_session
         from core.models.user import User as _User
         from core.repositories.audit_log_repository import AuditLogRepository as _AuditRepo
         from core.services.audit_log_service import AuditLogService as _AuditSvc
         from core.repositories.calendar_repository_sqlalchemy import SQLAlchemyCalendarRepository as _LocalCalRepo
 
+        if session is None and unit_of_work is not None:
+            session = unit_of_work.session
         self.session = session or get_session()
         self.user: User = self.session.get(_User, user_id)
         if not self.user:
@@ -4,6 +4,14 @@ from core.models.category import Category
 from core.repositories.category_repository_base import BaseCategoryRepository
 
 
+def _identity(category):
+    # Local categories are identified by their database id, MS Graph ones by their Graph id
+    category_id = getattr(category, "id", None)
+    return (
+        category_id if category_id is not None else getattr(category, "graph_id", None)
+    )
+
+
 class CategoryService:
     """
     Service for business logic related to Category entities.
@@ -48,7 +56,7 @@ class CategoryService:
 
         # Check for duplicate names for the same user
         existing = self.get_by_name(category.name.strip())
-        if existing and getattr(existing, "id", None) != getattr(category, "id", None):
+        if existing and _identity(existing) != _identity(category):
             raise ValueError(
                 f"Category with name '{category.name}' already exists for this user"
             )
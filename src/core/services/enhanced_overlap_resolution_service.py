@@ -1,23 +1,55 @@
 import logging
+from collections import Counter
 from typing import Any, Dict, List, Optional, Tuple
 
 from core.models.appointment import Appointment
+from core.utilities.overlap_rules import (
+    EXCLUDE,
+    RANK,
+    CompiledOverlapRules,
+    load_overlap_rules,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class EnhancedOverlapResolutionService:
-    """Enhanced overlap resolution with automatic rules."""
+    """
+    Enhanced overlap resolution with automatic rules.
+
+    Rules are declarative (see core.utilities.overlap_rules) and compiled once per
+    service instance. The default rule set filters 'Free', discards 'Tentative' in
+    favour of confirmed and then picks the highest importance; a different rule set
+    can be passed in or loaded from the file named by OVERLAP_RESOLUTION_RULES_FILE.
+    """
+
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None):
+        """
+        Args:
+            rules: Rule definitions; defaults to load_overlap_rules()
+        """
+        self.rule_set = CompiledOverlapRules(
+            rules if rules is not None else load_overlap_rules()
+        )
+        self.rule_hits: Counter = Counter()
+
+    def get_rule_statistics(self) -> Dict[str, int]:
+        """Return how many appointments each rule has removed (and tie conflicts)."""
+        return dict(self.rule_hits)
 
     def apply_automatic_resolution_rules(
         self, overlapping_appointments: List[Appointment]
     ) -> Dict[str, Any]:
         """
-        Apply automatic resolution rules in order:
+        Apply the configured resolution rules in order. With the default rules:
         1. Filter out 'Free' appointments
         2. Discard 'Tentative' in favor of confirmed
         3. Use Priority (importance) for final resolution
 
+        Each appointment's rule key is computed once and the group is sorted once
+        by that composite key; every rule then keeps the leading run of
+        appointments sharing the best value.
+
         Args:
             overlapping_appointments: List of overlapping appointments to resolve
 
@@ -27,82 +59,73 @@ class EnhancedOverlapResolutionService:
             - 'conflicts': List of appointments that still conflict (need manual resolution)
             - 'filtered': List of appointments that were filtered out
             - 'resolution_log': List of resolution steps taken
+            - 'rule_hits': Appointments removed per rule for this group
         """
+        result = {
+            "resolved": [],
+            "conflicts": [],
+            "filtered": [],
+            "resolution_log": [],
+            "rule_hits": {},
+        }
         if not overlapping_appointments:
-            return {
-                "resolved": [],
-                "conflicts": [],
-                "filtered": [],
-                "resolution_log": [],
-            }
-
-        resolution_log = []
-        filtered_appointments = []
-
-        # Step 1: Filter out 'Free' appointments
-        remaining_appointments, free_appointments = self.filter_free_appointments(
-            overlapping_appointments
+            return result
+
+        rules = self.rule_set.rules
+        # Exclusion rules do not take part in ordering, so sorting by the full key
+        # keeps every "best" run contiguous for the rules that do.
+        remaining = sorted(
+            ((self.rule_set.key(appt), appt) for appt in overlapping_appointments),
+            key=lambda item: item[0],
         )
-        if free_appointments:
-            filtered_appointments.extend(free_appointments)
-            resolution_log.append(
-                f"Filtered out {len(free_appointments)} 'Free' appointments"
-            )
 
-        # If only one appointment remains after filtering, it's resolved
-        if len(remaining_appointments) <= 1:
-            return {
-                "resolved": remaining_appointments,
-                "conflicts": [],
-                "filtered": filtered_appointments,
-                "resolution_log": resolution_log,
-            }
-
-        # Step 2: Resolve Tentative vs Confirmed conflicts
-        remaining_appointments, tentative_appointments = (
-            self.resolve_tentative_conflicts(remaining_appointments)
-        )
-        if tentative_appointments:
-            filtered_appointments.extend(tentative_appointments)
-            resolution_log.append(
-                f"Discarded {len(tentative_appointments)} 'Tentative' appointments in favor of confirmed"
-            )
+        for index, rule in enumerate(rules):
+            if len(remaining) <= 1:
+                break
 
-        # If only one appointment remains after tentative resolution, it's resolved
-        if len(remaining_appointments) <= 1:
-            return {
-                "resolved": remaining_appointments,
-                "conflicts": [],
-                "filtered": filtered_appointments,
-                "resolution_log": resolution_log,
-            }
-
-        # Step 3: Resolve by priority/importance
-        try:
-            primary_appointment, secondary_appointments = self.resolve_by_priority(
-                remaining_appointments
-            )
-            if secondary_appointments:
-                filtered_appointments.extend(secondary_appointments)
-                resolution_log.append(
-                    f"Selected highest priority appointment, filtered {len(secondary_appointments)} lower priority"
+            if rule.action == EXCLUDE:
+                kept = [item for item in remaining if not item[0][index]]
+            else:
+                best = remaining[0][0][index]
+                kept = [item for item in remaining if item[0][index] == best]
+                if rule.action == RANK and len(kept) > 1 and rule.on_tie == "conflict":
+                    self._record_hit(result, f"{rule.name}:tie", len(remaining))
+                    result["resolution_log"].append(
+                        (
+                            rule.tie_log
+                            or "Unable to resolve by {name}: {count} appointments tied ({score})"
+                        ).format(name=rule.name, count=len(kept), score=-best)
+                    )
+                    result["conflicts"] = [appt for _, appt in remaining]
+                    return result
+
+            removed = len(remaining) - len(kept)
+            if removed:
+                kept_ids = {id(item) for item in kept}
+                result["filtered"].extend(
+                    item[1] for item in remaining if id(item) not in kept_ids
                 )
+                self._record_hit(result, rule.name, removed)
+                result["resolution_log"].append(
+                    (rule.log or "Rule '{name}' filtered {count} appointments").format(
+                        name=rule.name, count=removed
+                    )
+                )
+            remaining = kept
+
+        if len(remaining) <= 1:
+            result["resolved"] = [appt for _, appt in remaining]
+        else:
+            result["conflicts"] = [appt for _, appt in remaining]
+            result["resolution_log"].append(
+                f"Unresolved after all rules: {len(remaining)} appointments remain"
+            )
+        return result
 
-            return {
-                "resolved": [primary_appointment],
-                "conflicts": [],
-                "filtered": filtered_appointments,
-                "resolution_log": resolution_log,
-            }
-        except ValueError as e:
-            # Unable to resolve by priority - return as conflicts for manual resolution
-            resolution_log.append(f"Unable to resolve by priority: {str(e)}")
-            return {
-                "resolved": [],
-                "conflicts": remaining_appointments,
-                "filtered": filtered_appointments,
-                "resolution_log": resolution_log,
-            }
+    def _record_hit(self, result: Dict[str, Any], name: str, count: int) -> None:
+        result["rule_hits"][name] = result["rule_hits"].get(name, 0) + count
+        self.rule_hits[name] += count
+        logger.debug("Overlap rule %s matched %d appointments", name, count)
 
     def filter_free_appointments(
         self, appointments: List[Appointment]
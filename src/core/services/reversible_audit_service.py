@@ -1,8 +1,12 @@
+import base64
+import itertools
 import json
 import uuid
+import zlib
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+from sqlalchemy import inspect, update
 from sqlalchemy.orm import Session
 
 from core.models.audit_log import AuditLog
@@ -10,6 +14,55 @@ from core.models.reversible_operation import ReversibleOperation, ReversibleOper
 from core.repositories.audit_log_repository import AuditLogRepository
 from core.services.audit_log_service import AuditLogService
 
+# Microsoft Graph accepts at most 20 requests per $batch call
+GRAPH_BATCH_LIMIT = 20
+
+# Key wrapping a zlib-compressed, base64-encoded JSON state blob
+COMPRESSED_STATE_KEY = "__zlib_b64__"
+
+# Reverses a group of items with the same (item_type, reverse_action);
+# returns an error message per item id that could not be reversed
+BatchReverser = Callable[[List[ReversibleOperationItem]], Dict[int, str]]
+
+
+def compress_state(state: Any) -> Dict[str, str]:
+    """Wrap a JSON-safe state in a compressed blob for storage."""
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return {COMPRESSED_STATE_KEY: base64.b64encode(zlib.compress(raw, 6)).decode("ascii")}
+
+
+def decode_item_state(value: Any) -> Any:
+    """Return a stored item state, decompressing it if it was stored compressed."""
+    if isinstance(value, dict) and len(value) == 1 and COMPRESSED_STATE_KEY in value:
+        return json.loads(zlib.decompress(base64.b64decode(value[COMPRESSED_STATE_KEY])))
+    return value
+
+
+def make_msgraph_delete_reverser(repository) -> BatchReverser:
+    """
+    Build a batch reverser that deletes created appointments via Graph $batch.
+
+    Args:
+        repository: MSGraphAppointmentRepository that can reach the affected
+            events (built with ``any_calendar=True`` when their calendar is not
+            known); items are matched by their ``external_id`` (the MS Graph
+            event id). Only ids Graph confirmed as deleted count as reversed.
+    """
+
+    def reverse(items: List[ReversibleOperationItem]) -> Dict[int, str]:
+        errors = {item.id: "No external_id to delete" for item in items if not item.external_id}
+        targets = [item for item in items if item.external_id]
+        if not targets:
+            return errors
+        result = repository.delete_bulk([item.external_id for item in targets])
+        deleted = set(result.get("successful_deletes", []))
+        for item in targets:
+            if item.external_id not in deleted:
+                errors[item.id] = f"Graph $batch delete failed for event {item.external_id}"
+        return errors
+
+    return reverse
+
 
 class ReversibleAuditService:
     """
@@ -19,10 +72,17 @@ class ReversibleAuditService:
     to completely reverse any operation, enabling safe rollbacks and undo functionality.
     """
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        batch_reversers: Optional[Dict[Tuple[str, str], BatchReverser]] = None,
+    ):
         self.session = session
-        self.audit_service = AuditLogService()
+        # Keyed by (item_type, reverse_action); groups without one are reversed item by item
+        self.batch_reversers = dict(batch_reversers or {})
         self.audit_repository = AuditLogRepository(session)
+        # Audit rows are needed back (for their IDs), so write them on the caller's session
+        self.audit_service = AuditLogService(self.audit_repository)
 
     @staticmethod
     def _to_json_safe(val):
@@ -167,6 +227,93 @@ class ReversibleAuditService:
         item.after_state = safe_after_state
         self.session.commit()
 
+    def capture_item_states(
+        self,
+        operation: ReversibleOperation,
+        items: Iterable[Dict[str, Any]],
+        chunk_size: int = 500,
+        compress: bool = False,
+    ) -> List[ReversibleOperationItem]:
+        """
+        Capture the state of many items in one transaction.
+
+        Args:
+            operation: The reversible operation these items belong to
+            items: Dicts with the keyword arguments of capture_item_state
+                (item_type, item_id, before_state, reverse_action and
+                optionally reverse_data, external_id)
+            chunk_size: Number of rows inserted per flush
+            compress: Store before_state as a compressed blob (see decode_item_state)
+
+        Returns:
+            List of ReversibleOperationItem instances, in input order
+        """
+        created: List[ReversibleOperationItem] = []
+        pending: List[ReversibleOperationItem] = []
+        for spec in items:
+            before_state = self._to_json_safe(spec["before_state"])
+            pending.append(
+                ReversibleOperationItem(
+                    operation_id=operation.id,
+                    item_type=spec["item_type"],
+                    item_id=spec["item_id"],
+                    external_id=spec.get("external_id"),
+                    before_state=compress_state(before_state) if compress else before_state,
+                    reverse_action=spec["reverse_action"],
+                    reverse_data=self._to_json_safe(spec.get("reverse_data") or {}),
+                )
+            )
+            if len(pending) >= chunk_size:
+                self._flush_items(pending)
+                created.extend(pending)
+                pending = []
+        if pending:
+            self._flush_items(pending)
+            created.extend(pending)
+        self.session.commit()
+        return created
+
+    def _flush_items(self, items: List[ReversibleOperationItem]) -> None:
+        self.session.add_all(items)
+        self.session.flush()
+
+    def update_item_after_states(
+        self,
+        updates: Iterable[Tuple[ReversibleOperationItem, Dict[str, Any]]],
+        chunk_size: int = 500,
+        compress: bool = False,
+    ) -> int:
+        """
+        Record the after-operation state of many items in one transaction.
+
+        Args:
+            updates: (item, after_state) pairs
+            chunk_size: Number of rows updated per statement
+            compress: Store after_state as a compressed blob
+
+        Returns:
+            Number of items updated
+        """
+        count = 0
+        rows: List[Dict[str, Any]] = []
+        for item, after_state in updates:
+            # identity avoids reloading items expired by an earlier commit
+            identity = inspect(item).identity
+            safe_after_state = self._to_json_safe(after_state)
+            rows.append({
+                "id": identity[0] if identity else item.id,
+                "after_state": compress_state(safe_after_state) if compress else safe_after_state,
+            })
+            if len(rows) >= chunk_size:
+                self.session.execute(update(ReversibleOperationItem), rows)
+                count += len(rows)
+                rows = []
+        if rows:
+            self.session.execute(update(ReversibleOperationItem), rows)
+            count += len(rows)
+        self.session.commit()
+        return count
+
     def complete_operation(
         self,
         operation: ReversibleOperation,
@@ -292,15 +439,23 @@ class ReversibleAuditService:
         reversed_by_user_id: int,
         reason: str,
         dry_run: bool = False,
+        batch_size: int = GRAPH_BATCH_LIMIT,
     ) -> Dict[str, Any]:
         """
         Reverse a completed operation.
 
+        Consecutive items with the same (item_type, reverse_action) are
+        grouped into groups of ``batch_size``, so items are still reversed in
+        their stored order; groups with a registered batch reverser are
+        reversed in one call (e.g. one Graph $batch request), the rest item
+        by item.
+
         Args:
             operation_id: ID of operation to reverse
             reversed_by_user_id: ID of user performing the reversal
             reason: Reason for reversal
             dry_run: If True, only simulate the reversal without executing
+            batch_size: Maximum number of items per batch reverser call
 
         Returns:
             Dict with reversal results and any errors
@@ -347,17 +502,16 @@ class ReversibleAuditService:
                 parent_audit_id=operation.audit_log_id,
             )
 
-            # Reverse each item
-            for item in operation.items:
-                try:
-                    self._reverse_operation_item(item)
-                    item.is_reversed = True
-                    item.reversed_at = datetime.utcnow()
-                    reversal_results["reversed_items"] += 1
-                except Exception as e:
-                    item.reverse_error = str(e)
-                    reversal_results["failed_items"] += 1
-                    reversal_results["errors"].append(f"Failed to reverse {item.item_type} {item.item_id}: {str(e)}")
+            for group in self._group_items(operation.items, batch_size):
+                for item, error in self._reverse_item_group(group):
+                    if error is None:
+                        item.is_reversed = True
+                        item.reversed_at = datetime.utcnow()
+                        reversal_results["reversed_items"] += 1
+                    else:
+                        item.reverse_error = error
+                        reversal_results["failed_items"] += 1
+                        reversal_results["errors"].append(f"Failed to reverse {item.item_type} {item.item_id}: {error}")
 
             # Mark operation as reversed if all items succeeded
             if reversal_results["failed_items"] == 0:
@@ -385,6 +539,39 @@ class ReversibleAuditService:
 
         return reversal_results
 
+    @staticmethod
+    def _group_items(
+        items: Iterable[ReversibleOperationItem], batch_size: int
+    ) -> List[List[ReversibleOperationItem]]:
+        """Split items into runs of one (item_type, reverse_action), keeping their order."""
+        size = max(batch_size, 1)
+        groups: List[List[ReversibleOperationItem]] = []
+        for _, run in itertools.groupby(items, key=lambda item: (item.item_type, item.reverse_action)):
+            run = list(run)
+            groups.extend(run[start:start + size] for start in range(0, len(run), size))
+        return groups
+
+    def _reverse_item_group(
+        self, items: List[ReversibleOperationItem]
+    ) -> List[Tuple[ReversibleOperationItem, Optional[str]]]:
+        """Reverse a group of like items; returns (item, error or None) pairs."""
+        reverser = self.batch_reversers.get((items[0].item_type, items[0].reverse_action))
+        if reverser is not None:
+            try:
+                errors = reverser(items)
+            except Exception as e:
+                return [(item, str(e)) for item in items]
+            return [(item, errors.get(item.id)) for item in items]
+
+        outcomes = []
+        for item in items:
+            try:
+                self._reverse_operation_item(item)
+                outcomes.append((item, None))
+            except Exception as e:
+                outcomes.append((item, str(e)))
+        return outcomes
+
     def _reverse_operation_item(self, item: ReversibleOperationItem) -> None:
         """
         Reverse a single operation item.
@@ -429,7 +616,7 @@ class ReversibleAuditService:
         from core.models.appointment import Appointment
 
         # Reconstruct appointment from before_state
-        before_state = item.before_state
+        before_state = decode_item_state(item.before_state)
         if not before_state:
             raise ValueError("No before_state available for restoration")
 
@@ -267,7 +267,8 @@ class TimesheetArchiveService:
                 "free_status": 0,
                 "invalid_category": 0
             },
-            "category_breakdown": {}
+            "category_breakdown": {},
+            "overlap_rule_hits": {}
         }
 
         # Add rate calculations
@@ -283,6 +284,8 @@ class TimesheetArchiveService:
             stats["appointments_resolved_by_overlap"] += len(resolution["resolved"])
             stats["appointments_filtered_by_overlap"] += len(resolution["filtered"])
             stats["appointments_still_conflicted"] += len(resolution["conflicts"])
+            for rule_name, hits in resolution.get("rule_hits", {}).items():
+                stats["overlap_rule_hits"][rule_name] = stats["overlap_rule_hits"].get(rule_name, 0) + hits
 
         # Analyze exclusion reasons
         for appointment in excluded_appointments:
@@ -322,7 +325,8 @@ class TimesheetArchiveService:
                 "free_status": 0,
                 "invalid_category": 0
             },
-            "category_breakdown": {}
+            "category_breakdown": {},
+            "overlap_rule_hits": {}
         }
 
     def get_timesheet_statistics(self, appointments: List[Appointment]) -> Dict[str, Any]:
@@ -0,0 +1,318 @@
+"""
+Timesheet Report Service
+
+Columnar aggregation of appointment durations for timesheet and billing reports.
+
+Appointments are converted once into NumPy arrays (start/end epoch seconds plus
+interned customer and billing-type codes) and all totals are computed with
+vectorized group-bys instead of per-appointment Python loops. This keeps
+multi-month, multi-user reports fast: category parsing and travel detection run
+once per distinct category set / subject rather than once per appointment.
+
+Key Features:
+- Per-customer, per-billing-type and per-day hour totals
+- Customer x billing-type matrix for invoicing
+- Day grouping in any IANA timezone (DST aware)
+- Same classification rules as TimesheetArchiveService (travel by subject keywords,
+  customer/billing from the first valid category, 'Free' appointments excluded)
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from core.models.appointment import Appointment
+from core.services.category_processing_service import CategoryProcessingService
+from core.services.timesheet_archive_service import TimesheetArchiveService
+from core.utilities.appointment_fingerprint import appointment_fingerprint
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+# Timezone offsets only change on quarter-hour boundaries, so offsets are resolved
+# once per distinct 15-minute bucket rather than once per appointment.
+_OFFSET_BUCKET_SECONDS = 900
+
+NO_CUSTOMER = "(none)"
+TRAVEL = "travel"
+PERSONAL = "personal"
+UNCATEGORIZED = "uncategorized"
+
+
+@dataclass
+class AppointmentColumns:
+    """
+    Columnar view of a list of appointments.
+
+    Attributes:
+        start: Start times as UTC epoch seconds (int64).
+        end: End times as UTC epoch seconds (int64).
+        customer: Customer code per appointment, indexing ``customers``.
+        billing: Billing-type code per appointment, indexing ``billing_types``.
+        customers: Interned customer names.
+        billing_types: Interned billing-type labels.
+        skipped: Number of appointments dropped (Free status or missing times).
+    """
+
+    start: np.ndarray
+    end: np.ndarray
+    customer: np.ndarray
+    billing: np.ndarray
+    customers: List[str] = field(default_factory=list)
+    billing_types: List[str] = field(default_factory=list)
+    skipped: int = 0
+
+    def __len__(self) -> int:
+        return int(self.start.shape[0])
+
+    @property
+    def durations(self) -> np.ndarray:
+        """Durations in seconds; negative durations are clamped to zero."""
+        return np.maximum(self.end - self.start, 0)
+
+
+def _to_epoch(value: datetime) -> int:
+    """Convert a datetime to UTC epoch seconds, treating naive values as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp())
+
+
+class TimesheetReportService:
+    """Service for vectorized timesheet statistics and billing aggregation."""
+
+    def __init__(
+        self,
+        category_service: Optional[CategoryProcessingService] = None,
+        timesheet_service: Optional[TimesheetArchiveService] = None,
+    ):
+        """Initialize the report service."""
+        self.logger = logger
+        self.category_service = category_service or CategoryProcessingService()
+        self.timesheet_service = timesheet_service or TimesheetArchiveService()
+
+    def build_columns(self, appointments: Iterable[Appointment]) -> AppointmentColumns:
+        """
+        Convert appointments into an AppointmentColumns instance.
+
+        Args:
+            appointments: Appointment model instances (any mix of users/calendars)
+
+        Returns:
+            AppointmentColumns with interned customer and billing codes
+        """
+        starts: List[int] = []
+        ends: List[int] = []
+        customer_codes: List[int] = []
+        billing_codes: List[int] = []
+        customer_index: Dict[str, int] = {}
+        billing_index: Dict[str, int] = {}
+        # Classification depends only on (subject is travel, categories), so cache it
+        travel_cache: Dict[str, bool] = {}
+        label_cache: Dict[Tuple[bool, Tuple[str, ...]], Tuple[int, int]] = {}
+        skipped = 0
+
+        for appointment in appointments:
+            start_time = getattr(appointment, "start_time", None)
+            end_time = getattr(appointment, "end_time", None)
+            if start_time is None or end_time is None:
+                skipped += 1
+                continue
+            if self.timesheet_service._is_free_status_appointment(appointment):
+                skipped += 1
+                continue
+
+            subject = getattr(appointment, "subject", "") or ""
+            is_travel = travel_cache.get(subject)
+            if is_travel is None:
+                is_travel = self.timesheet_service._detect_travel_appointment(
+                    appointment
+                )
+                travel_cache[subject] = is_travel
+
+            categories = tuple(
+                self.category_service._extract_categories_from_appointment(appointment)
+            )
+            key = (is_travel, categories)
+            codes = label_cache.get(key)
+            if codes is None:
+                customer, billing_type = self._classify(appointment, is_travel)
+                codes = (
+                    customer_index.setdefault(customer, len(customer_index)),
+                    billing_index.setdefault(billing_type, len(billing_index)),
+                )
+                label_cache[key] = codes
+
+            starts.append(_to_epoch(start_time))
+            ends.append(_to_epoch(end_time))
+            customer_codes.append(codes[0])
+            billing_codes.append(codes[1])
+
+        return AppointmentColumns(
+            start=np.asarray(starts, dtype=np.int64),
+            end=np.asarray(ends, dtype=np.int64),
+            customer=np.asarray(customer_codes, dtype=np.int32),
+            billing=np.asarray(billing_codes, dtype=np.int32),
+            customers=list(customer_index),
+            billing_types=list(billing_index),
+            skipped=skipped,
+        )
+
+    def _classify(self, appointment: Appointment, is_travel: bool) -> Tuple[str, str]:
+        """Return the (customer, billing type) labels for an appointment."""
+        info = self.category_service.extract_customer_billing_info(appointment)
+        customer = info["customer"] or NO_CUSTOMER
+        if is_travel:
+            return customer, TRAVEL
+        if info["is_personal"]:
+            return customer, PERSONAL
+        return customer, info["billing_type"] or UNCATEGORIZED
+
+    def day_ordinals(
+        self, columns: AppointmentColumns, timezone: str = "UTC"
+    ) -> np.ndarray:
+        """
+        Return the local calendar day of each appointment start as days since the epoch.
+
+        Args:
+            columns: Appointment columns
+            timezone: IANA timezone name used to assign appointments to days
+        """
+        if len(columns) == 0:
+            return np.empty(0, dtype=np.int64)
+        if timezone.upper() == "UTC":
+            return columns.start // SECONDS_PER_DAY
+
+        tz = ZoneInfo(timezone)
+        buckets, inverse = np.unique(
+            columns.start // _OFFSET_BUCKET_SECONDS, return_inverse=True
+        )
+        offsets = np.fromiter(
+            (
+                datetime.fromtimestamp(int(b) * _OFFSET_BUCKET_SECONDS, tz)
+                .utcoffset()
+                .total_seconds()
+                for b in buckets
+            ),
+            dtype=np.int64,
+            count=buckets.shape[0],
+        )
+        return (columns.start + offsets[inverse]) // SECONDS_PER_DAY
+
+    def aggregate(
+        self, columns: AppointmentColumns, timezone: str = "UTC"
+    ) -> Dict[str, Any]:
+        """
+        Compute hour totals from appointment columns.
+
+        Args:
+            columns: Appointment columns produced by build_columns
+            timezone: IANA timezone name used for per-day totals
+
+        Returns:
+            Dictionary with keys:
+            - 'total_appointments': Number of appointments aggregated
+            - 'skipped_appointments': Appointments excluded (Free or missing times)
+            - 'total_hours': Sum of all durations in hours
+            - 'by_customer': {customer: {'hours': float, 'appointments': int}}
+            - 'by_billing_type': {billing_type: {'hours': float, 'appointments': int}}
+            - 'by_day': {ISO date: hours}
+            - 'by_customer_billing': {customer: {billing_type: hours}}
+        """
+        durations = columns.durations.astype(np.float64)
+        n_customers = len(columns.customers)
+        n_billing = len(columns.billing_types)
+
+        customer_seconds = np.bincount(
+            columns.customer, weights=durations, minlength=n_customers
+        )
+        customer_counts = np.bincount(columns.customer, minlength=n_customers)
+        billing_seconds = np.bincount(
+            columns.billing, weights=durations, minlength=n_billing
+        )
+        billing_counts = np.bincount(columns.billing, minlength=n_billing)
+        matrix = np.bincount(
+            columns.customer.astype(np.int64) * n_billing + columns.billing,
+            weights=durations,
+            minlength=n_customers * n_billing,
+        ).reshape(n_customers, n_billing)
+
+        days, day_inverse = np.unique(
+            self.day_ordinals(columns, timezone), return_inverse=True
+        )
+        day_seconds = np.bincount(
+            day_inverse, weights=durations, minlength=days.shape[0]
+        )
+
+        epoch = date(1970, 1, 1)
+        return {
+            "total_appointments": len(columns),
+            "skipped_appointments": columns.skipped,
+            "total_hours": float(durations.sum()) / 3600,
+            "by_customer": {
+                name: {
+                    "hours": float(customer_seconds[i]) / 3600,
+                    "appointments": int(customer_counts[i]),
+                }
+                for i, name in enumerate(columns.customers)
+            },
+            "by_billing_type": {
+                name: {
+                    "hours": float(billing_seconds[i]) / 3600,
+                    "appointments": int(billing_counts[i]),
+                }
+                for i, name in enumerate(columns.billing_types)
+            },
+            "by_day": {
+                (epoch + timedelta(days=int(day))).isoformat(): float(seconds) / 3600
+                for day, seconds in zip(days, day_seconds)
+            },
+            "by_customer_billing": {
+                customer: {
+                    billing: float(matrix[i, j]) / 3600
+                    for j, billing in enumerate(columns.billing_types)
+                    if matrix[i, j] > 0
+                }
+                for i, customer in enumerate(columns.customers)
+            },
+        }
+
+    @staticmethod
+    def unique_appointments(appointments: Iterable[Appointment]) -> List[Appointment]:
+        """
+        Drop copies of the same meeting, keeping the first of each.
+
+        Locally stored appointments can hold the same meeting several times
+        (source calendar backups and archive copies); copies share a
+        fingerprint of subject, start and end.
+        """
+        seen = set()
+        unique = []
+        for appointment in appointments:
+            key = getattr(appointment, "fingerprint", None) or appointment_fingerprint(
+                appointment
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(appointment)
+        return unique
+
+    def generate_report(
+        self, appointments: Iterable[Appointment], timezone: str = "UTC"
+    ) -> Dict[str, Any]:
+        """
+        Build columns for the given appointments and aggregate them.
+
+        Args:
+            appointments: Appointment model instances to report on
+            timezone: IANA timezone name used for per-day totals
+
+        Returns:
+            Report dictionary (see aggregate)
+        """
+        return self.aggregate(self.build_columns(appointments), timezone)
@@ -3,6 +3,7 @@ from typing import List, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
     from core.models.user import User
     from core.repositories.user_repository import UserRepository
+    from core.unit_of_work import UnitOfWork
 
 
 class UserService:
@@ -10,9 +11,15 @@ class UserService:
     Service for business logic related to User entities.
     """
 
-    def __init__(self, repository: Optional["UserRepository"] = None):
+    def __init__(
+        self,
+        repository: Optional["UserRepository"] = None,
+        unit_of_work: Optional["UnitOfWork"] = None,
+    ):
         # Store the provided repository (may be None); create lazily when accessed
         self._repository = repository
+        # When given, a lazily created repository uses the unit of work's session
+        self._unit_of_work = unit_of_work
         # Track whether we *should* own the repository if we create one lazily
         self._owns_repository = repository is None
 
@@ -23,9 +30,14 @@ class UserService:
             # Local import to avoid importing DB-backed repo at module import time
             from core.repositories.user_repository import UserRepository as _UR
 
-            self._repository = _UR()
-            # We created the repository, so we own it
-            self._owns_repository = True
+            if self._unit_of_work is not None:
+                # The unit of work owns (and closes) the session
+                self._repository = _UR(self._unit_of_work.session)
+                self._owns_repository = False
+            else:
+                self._repository = _UR()
+                # We created the repository, so we own it
+                self._owns_repository = True
         return self._repository
 
     @repository.setter
@@ -2,14 +2,22 @@
 
 from .prompt_builder import PromptBuilder  # noqa: F401
 from .response_parser import DedupResponseParser  # noqa: F401
-from .batch_manager import BatchJobManager, BatchRequestBuilder  # noqa: F401
+from .batch_manager import BatchJobManager, BatchRequestBuilder, StreamingBatchWriter  # noqa: F401
+from .batch_pipeline import BatchDedupPipeline, BatchRunReport  # noqa: F401
+from .decision_cache import DecisionCache  # noqa: F401
 from .dedup_orchestrator import AIDeduplicationService  # noqa: F401
+from .rate_limiter import RateLimiter  # noqa: F401
 
 __all__ = [
     "PromptBuilder",
     "DedupResponseParser",
     "BatchRequestBuilder",
     "BatchJobManager",
+    "StreamingBatchWriter",
+    "BatchDedupPipeline",
+    "BatchRunReport",
     "AIDeduplicationService",
+    "DecisionCache",
+    "RateLimiter",
 ]
 
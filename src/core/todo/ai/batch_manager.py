@@ -2,15 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
 import json
 import logging
+import os
 import time
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional
 
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_BATCH_STATUSES = {"completed", "failed", "cancelled", "expired"}
+# Per-file limits of the OpenAI Batch API
+MAX_BATCH_FILE_REQUESTS = 50_000
+MAX_BATCH_FILE_BYTES = 200 * 1024 * 1024
+
+
+def in_running_loop() -> bool:
+    """Whether the calling thread is running an asyncio event loop."""
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
 
 def token_parameter_for_model(model: str) -> str:
     model_lower = model.lower()
@@ -25,12 +44,44 @@ def uses_responses_api(model: str) -> bool:
     return model.lower().startswith("gpt-5")
 
 
+def build_batch_request(
+    *,
+    custom_id: str,
+    model: str,
+    messages: Iterable[Dict[str, str]],
+    max_tokens: int,
+    temperature: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Return one Batch API input line for ``model``'s endpoint."""
+
+    messages_list = list(messages)
+    token_field = token_parameter_for_model(model)
+
+    if uses_responses_api(model):
+        body: Dict[str, Any] = {
+            "model": model,
+            "input": messages_list,
+            token_field: max_tokens,
+        }
+        return {"custom_id": custom_id, "method": "POST", "url": "/v1/responses", "body": body}
+
+    body = {
+        "model": model,
+        "messages": messages_list,
+        token_field: max_tokens,
+    }
+    if temperature is not None:
+        body["temperature"] = temperature
+    return {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
+
+
 class BatchRequestBuilder:
-    """Build JSONL batches for OpenAI."""
+    """Build JSONL batches for OpenAI in memory; see StreamingBatchWriter for large runs."""
 
     def __init__(self) -> None:
         self._requests: List[Dict[str, Any]] = []
         self._endpoint: Optional[str] = None
+        self._digest = hashlib.sha256()
 
     def add_request(
         self,
@@ -41,26 +92,13 @@ class BatchRequestBuilder:
         max_tokens: int,
         temperature: Optional[float] = None,
     ) -> None:
-        messages_list = list(messages)
-        token_field = token_parameter_for_model(model)
-
-        if uses_responses_api(model):
-            body: Dict[str, Any] = {
-                "model": model,
-                "input": messages_list,
-                token_field: max_tokens,
-            }
-            request = {"custom_id": custom_id, "method": "POST", "url": "/v1/responses", "body": body}
-        else:
-            body = {
-                "model": model,
-                "messages": messages_list,
-                token_field: max_tokens,
-            }
-            if temperature is not None:
-                body["temperature"] = temperature
-            request = {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
-
+        request = build_batch_request(
+            custom_id=custom_id,
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
         if self._endpoint and self._endpoint != request["url"]:
             raise ValueError("Mixed endpoints within the same batch are not supported")
         self._endpoint = request["url"]
@@ -80,10 +118,134 @@ class BatchRequestBuilder:
     def endpoint(self) -> str:
         return self._endpoint or "/v1/chat/completions"
 
+    @property
+    def digest(self) -> str:
+        return self._digest.hexdigest()
+
     def __len__(self) -> int:
         return len(self._requests)
 
 
+class StreamingBatchWriter:
+    """
+    Append batch requests to JSONL shard files as they are added.
+
+    Only the open shard's file handle is held, so memory stays flat however
+    many requests a run has. A new shard starts before a request would take
+    the current one past ``max_requests`` lines or ``max_bytes`` of JSONL
+    (the provider's per-file limits by default). With ``compress`` the
+    shards are written as ``.jsonl.gz`` for archiving; the Batch API itself
+    takes plain JSONL. ``close`` returns the shard paths in order, and
+    ``digest`` is a SHA-256 of every request line written.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        *,
+        prefix: str = "batch",
+        max_requests: int = MAX_BATCH_FILE_REQUESTS,
+        max_bytes: int = MAX_BATCH_FILE_BYTES,
+        compress: bool = False,
+    ) -> None:
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_requests = max(1, max_requests)
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._shards: List[Path] = []
+        self._shard_requests: List[int] = []
+        self._shard_bytes = 0
+        self._handle: Optional[IO[bytes]] = None
+        self._endpoint: Optional[str] = None
+        self._digest = hashlib.sha256()
+
+    def add_request(
+        self,
+        *,
+        custom_id: str,
+        model: str,
+        messages: Iterable[Dict[str, str]],
+        max_tokens: int,
+        temperature: Optional[float] = None,
+    ) -> Path:
+        """Write one request and return the shard it went to."""
+
+        request = build_batch_request(
+            custom_id=custom_id,
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        if self._endpoint and self._endpoint != request["url"]:
+            raise ValueError("Mixed endpoints within the same batch are not supported")
+        line = (json.dumps(request) + "\n").encode("utf-8")
+        if len(line) > self.max_bytes:
+            raise ValueError(f"Batch request {custom_id} is {len(line)} bytes, over the {self.max_bytes} byte shard limit")
+
+        self._endpoint = request["url"]
+        if (
+            self._handle is None
+            or self._shard_requests[-1] >= self.max_requests
+            or self._shard_bytes + len(line) > self.max_bytes
+        ):
+            self._start_shard()
+        self._handle.write(line)
+        self._digest.update(line)
+        self._shard_requests[-1] += 1
+        self._shard_bytes += len(line)
+        return self._shards[-1]
+
+    def _start_shard(self) -> None:
+        self._close_handle()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        path = self.output_dir / f"{self.prefix}_{len(self._shards):04d}{suffix}"
+        self._handle = gzip.open(path, "wb") if self.compress else path.open("wb")
+        self._shards.append(path)
+        self._shard_requests.append(0)
+        self._shard_bytes = 0
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def close(self) -> List[Path]:
+        """Close the open shard and return every shard path written."""
+
+        self._close_handle()
+        return list(self._shards)
+
+    @property
+    def shards(self) -> List[Path]:
+        return list(self._shards)
+
+    @property
+    def shard_requests(self) -> List[int]:
+        """Number of requests in each shard."""
+
+        return list(self._shard_requests)
+
+    @property
+    def endpoint(self) -> str:
+        return self._endpoint or "/v1/chat/completions"
+
+    @property
+    def digest(self) -> str:
+        return self._digest.hexdigest()
+
+    def __len__(self) -> int:
+        return sum(self._shard_requests)
+
+    def __enter__(self) -> "StreamingBatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
 class BatchJobManager:
     """Submit and poll OpenAI batch jobs."""
 
@@ -115,13 +277,65 @@ class BatchJobManager:
         state_file.write_text(json.dumps(state_payload), encoding="utf-8")
         return batch.id
 
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        batch = self._client.batches.retrieve(batch_id)
+        return batch.to_dict() if hasattr(batch, "to_dict") else dict(batch)
+
+    async def wait_for_completion_async(
+        self,
+        batch_id: str,
+        *,
+        poll_interval: float,
+        timeout_seconds: float,
+        on_poll: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """Poll ``batch_id`` without blocking the event loop until it reaches a terminal status."""
+
+        start = time.monotonic()
+        while True:
+            batch = await asyncio.to_thread(self.retrieve, batch_id)
+            if on_poll is not None:
+                on_poll(batch)
+            if batch.get("status") in TERMINAL_BATCH_STATUSES:
+                return batch
+            if time.monotonic() - start > timeout_seconds:
+                raise TimeoutError(f"Batch {batch_id} did not complete before timeout")
+            await asyncio.sleep(poll_interval)
+
     def wait_for_completion(self, batch_id: str, *, poll_interval: int, timeout_seconds: int) -> Dict[str, Any]:
-        start = time.time()
+        """
+        Blocking wrapper around :meth:`wait_for_completion_async`.
+
+        Inside a running event loop, where ``asyncio.run`` is unavailable, it
+        polls with ``time.sleep`` instead; async callers should await
+        :meth:`wait_for_completion_async`.
+        """
+
+        if not in_running_loop():
+            return asyncio.run(
+                self.wait_for_completion_async(batch_id, poll_interval=poll_interval, timeout_seconds=timeout_seconds)
+            )
+        start = time.monotonic()
         while True:
-            batch = self._client.batches.retrieve(batch_id)
-            status = getattr(batch, "status", "unknown")
-            if status in {"completed", "failed", "cancelled"}:
-                return batch.to_dict() if hasattr(batch, "to_dict") else dict(batch)
-            if time.time() - start > timeout_seconds:
+            batch = self.retrieve(batch_id)
+            if batch.get("status") in TERMINAL_BATCH_STATUSES:
+                return batch
+            if time.monotonic() - start > timeout_seconds:
                 raise TimeoutError(f"Batch {batch_id} did not complete before timeout")
             time.sleep(poll_interval)
+
+    def download_file(self, file_id: str, destination: Path) -> Path:
+        """Stream a batch output/error file to ``destination`` (written atomically)."""
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        partial = destination.with_name(destination.name + ".part")
+        streaming = getattr(self._client.files, "with_streaming_response", None)
+        if streaming is not None:
+            with streaming.content(file_id) as response:
+                response.stream_to_file(partial)
+        else:
+            content = self._client.files.content(file_id)
+            data = content.read() if hasattr(content, "read") else content
+            partial.write_bytes(data if isinstance(data, bytes) else str(data).encode("utf-8"))
+        os.replace(partial, destination)
+        return destination
@@ -0,0 +1,361 @@
+"""End-to-end OpenAI Batch API runs for AI deduplication requests."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from .batch_manager import (
+    TERMINAL_BATCH_STATUSES,
+    BatchJobManager,
+    StreamingBatchWriter,
+    in_running_loop,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from core.todo.config import TodoDedupConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "admin-assistant", "todo-dedup-batches")
+
+
+@dataclass(slots=True)
+class BatchRunReport:
+    """Per-request outcome counts of one batch run; ``errors`` maps custom ids to reasons."""
+
+    run_id: str
+    requests: int = 0
+    shards: int = 0
+    submitted_shards: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    missing: int = 0
+    unparseable: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def record_error(self, custom_id: str, reason: str, *, counter: str = "failed") -> None:
+        setattr(self, counter, getattr(self, counter) + 1)
+        self.errors[custom_id] = reason
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "requests": self.requests,
+            "shards": self.shards,
+            "submitted_shards": self.submitted_shards,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "missing": self.missing,
+            "unparseable": self.unparseable,
+        }
+
+
+def response_content(body: Mapping[str, Any]) -> Optional[str]:
+    """Text of a chat completions or responses API body, or None when it has none."""
+
+    choices = body.get("choices")
+    if choices:
+        message = choices[0].get("message") or {}
+        return message.get("content")
+    if body.get("output_text"):
+        return body["output_text"]
+    parts = [
+        part.get("text", "")
+        for item in body.get("output") or []
+        if item.get("type") == "message"
+        for part in item.get("content") or []
+        if part.get("type") == "output_text"
+    ]
+    return "".join(parts) if parts else None
+
+
+def _read_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping malformed line %s in %s", line_number, path)
+
+
+class BatchDedupPipeline:
+    """
+    Run model requests through the OpenAI Batch API, resumably.
+
+    Requests are consumed one at a time from an iterable and streamed to JSONL
+    shards of at most ``config.batch_shard_size`` requests and
+    ``config.batch_shard_max_bytes`` bytes, each submitted as its own batch.
+    A run is identified by a hash of the lines written, and its progress
+    (batch ids, statuses, downloaded files) is saved to ``run_<id>.json`` in
+    the state directory after every step, so calling ``run`` again with the
+    same requests after a crash or timeout resumes polling instead of
+    resubmitting. Shards are polled concurrently on an event loop, and
+    output/error files are streamed to disk and read line by line.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        config: "TodoDedupConfig",
+        *,
+        state_dir: Optional[Path] = None,
+        job_manager: Optional[BatchJobManager] = None,
+    ) -> None:
+        self._config = config
+        self._state_dir = Path(state_dir or config.batch_state_dir or DEFAULT_STATE_DIR)
+        self._jobs = job_manager or BatchJobManager(client, self._state_dir)
+
+    def run(self, requests: Iterable[Tuple[str, List[Dict[str, str]]]]) -> Tuple[Dict[str, str], BatchRunReport]:
+        """
+        Submit ``(custom_id, messages)`` requests and wait for their results.
+
+        ``requests`` may be a generator: each prompt is written to its shard
+        as it is produced, so prompts need not all be held in memory.
+
+        Returns the response content by custom id and a report; requests
+        that failed or have no result are counted in the report and absent
+        from the contents. Raises TimeoutError when the batches are still
+        running after ``config.batch_completion_timeout_seconds``; the run
+        can then be resumed by calling ``run`` again.
+
+        Shards are polled on an event loop of their own; inside a running
+        loop, where that is unavailable, they are polled with ``time.sleep``.
+        Async callers should await :meth:`arun` instead.
+        """
+
+        if not in_running_loop():
+            return asyncio.run(self.arun(requests))
+        report, state = self._start(requests)
+        if state is None:
+            return {}, report
+        self._poll_shards_blocking(state)
+        return self._finish(state, report), report
+
+    async def arun(
+        self, requests: Iterable[Tuple[str, List[Dict[str, str]]]]
+    ) -> Tuple[Dict[str, str], BatchRunReport]:
+        """Async :meth:`run`; file uploads and downloads run in worker threads."""
+
+        report, state = await asyncio.to_thread(self._start, requests)
+        if state is None:
+            return {}, report
+        await self._poll_shards(state)
+        return await asyncio.to_thread(self._finish, state, report), report
+
+    def _start(
+        self, requests: Iterable[Tuple[str, List[Dict[str, str]]]]
+    ) -> Tuple[BatchRunReport, Optional[Dict[str, Any]]]:
+        """Write and submit the run's shards, or load a previous run's state; None for no requests."""
+
+        staging_dir = self._state_dir / f"staging_{uuid.uuid4().hex}"
+        try:
+            endpoint, shards, custom_ids, digest = self._write_shards(requests, staging_dir)
+            run_id = self._run_id(digest)
+            report = BatchRunReport(run_id=run_id, requests=len(custom_ids))
+            if not custom_ids:
+                return report, None
+
+            run_dir = self._state_dir / f"run_{run_id}"
+            state = self._load_state(run_id)
+            if state is None:
+                # A run directory without state is left over from a crash before the first save
+                shutil.rmtree(run_dir, ignore_errors=True)
+                os.replace(staging_dir, run_dir)
+                for shard in shards:
+                    shard["input_path"] = str(run_dir / Path(shard["input_path"]).name)
+                state = {
+                    "run_id": run_id,
+                    "model": self._config.dedup_model,
+                    "endpoint": endpoint,
+                    "custom_ids": custom_ids,
+                    "shards": shards,
+                }
+                self._save_state(state)
+            else:
+                logger.info("Resuming AI dedup batch run %s", run_id)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        report.shards = len(state["shards"])
+        for shard in state["shards"]:
+            if shard["batch_id"] is None:
+                self._submit_shard(shard, state["endpoint"], run_dir)
+                report.submitted_shards += 1
+                self._save_state(state)
+        return report, state
+
+    def _finish(self, state: Dict[str, Any], report: BatchRunReport) -> Dict[str, str]:
+        """Download and read the finished shards; return the response content by custom id."""
+
+        run_dir = self._state_dir / f"run_{state['run_id']}"
+        contents: Dict[str, str] = {}
+        for shard in state["shards"]:
+            self._download_shard(shard, run_dir, state)
+            self._collect_shard(shard, contents, report)
+
+        for custom_id in state["custom_ids"]:
+            if custom_id not in contents and custom_id not in report.errors:
+                report.record_error(custom_id, "No result in batch output", counter="missing")
+        report.succeeded = len(contents)
+        logger.info(
+            "AI dedup batch run %s: %s requests in %s shards, %s succeeded, %s failed, %s missing",
+            report.run_id,
+            report.requests,
+            report.shards,
+            report.succeeded,
+            report.failed,
+            report.missing,
+        )
+        return contents
+
+    def _run_id(self, digest: str) -> str:
+        run_digest = hashlib.sha256()
+        run_digest.update(f"{self._config.batch_shard_size}:{self._config.batch_shard_max_bytes}:".encode("utf-8"))
+        run_digest.update(digest.encode("utf-8"))
+        return run_digest.hexdigest()[:16]
+
+    def _state_path(self, run_id: str) -> Path:
+        return self._state_dir / f"run_{run_id}.json"
+
+    def _load_state(self, run_id: str) -> Optional[Dict[str, Any]]:
+        path = self._state_path(run_id)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        path = self._state_path(state["run_id"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".part")
+        partial.write_text(json.dumps(state, indent=2), encoding="utf-8")
+        os.replace(partial, path)
+
+    def _write_shards(
+        self, requests: Iterable[Tuple[str, List[Dict[str, str]]]], run_dir: Path
+    ) -> Tuple[str, List[Dict[str, Any]], List[str], str]:
+        custom_ids: List[str] = []
+        with StreamingBatchWriter(
+            run_dir,
+            prefix="shard",
+            max_requests=self._config.batch_shard_size,
+            max_bytes=self._config.batch_shard_max_bytes,
+        ) as writer:
+            for custom_id, messages in requests:
+                writer.add_request(
+                    custom_id=custom_id,
+                    model=self._config.dedup_model,
+                    messages=messages,
+                    max_tokens=self._config.dedup_max_completion_tokens,
+                )
+                custom_ids.append(custom_id)
+        shards = [
+            {"index": index, "input_path": str(path), "requests": count, "batch_id": None, "status": "pending"}
+            for index, (path, count) in enumerate(zip(writer.shards, writer.shard_requests))
+        ]
+        return writer.endpoint, shards, custom_ids, writer.digest
+
+    def _submit_shard(self, shard: Dict[str, Any], endpoint: str, run_dir: Path) -> None:
+        shard["batch_id"] = self._jobs.submit(
+            Path(shard["input_path"]),
+            endpoint=endpoint,
+            description=f"todo-dedup {run_dir.name} shard {shard['index']}",
+        )
+        shard["status"] = "submitted"
+        logger.info(
+            "Submitted AI dedup batch shard %s (%s requests) as %s", shard["index"], shard["requests"], shard["batch_id"]
+        )
+
+    def _record_poll(self, shard: Dict[str, Any], batch: Dict[str, Any], state: Dict[str, Any]) -> None:
+        if batch.get("status") != shard["status"]:
+            shard["status"] = batch.get("status")
+            shard["output_file_id"] = batch.get("output_file_id")
+            shard["error_file_id"] = batch.get("error_file_id")
+            self._save_state(state)
+
+    async def _poll_shards(self, state: Dict[str, Any]) -> None:
+        async def poll(shard: Dict[str, Any]) -> None:
+            await self._jobs.wait_for_completion_async(
+                shard["batch_id"],
+                poll_interval=self._config.batch_poll_interval_seconds,
+                timeout_seconds=self._config.batch_completion_timeout_seconds,
+                on_poll=lambda batch: self._record_poll(shard, batch, state),
+            )
+
+        await asyncio.gather(
+            *(poll(shard) for shard in state["shards"] if shard["status"] not in TERMINAL_BATCH_STATUSES)
+        )
+
+    def _poll_shards_blocking(self, state: Dict[str, Any]) -> None:
+        pending = [shard for shard in state["shards"] if shard["status"] not in TERMINAL_BATCH_STATUSES]
+        start = time.monotonic()
+        while True:
+            for shard in pending:
+                self._record_poll(shard, self._jobs.retrieve(shard["batch_id"]), state)
+            pending = [shard for shard in pending if shard["status"] not in TERMINAL_BATCH_STATUSES]
+            if not pending:
+                return
+            if time.monotonic() - start > self._config.batch_completion_timeout_seconds:
+                raise TimeoutError(f"Batch {pending[0]['batch_id']} did not complete before timeout")
+            time.sleep(self._config.batch_poll_interval_seconds)
+
+    def _download_shard(self, shard: Dict[str, Any], run_dir: Path, state: Dict[str, Any]) -> None:
+        for kind in ("output", "error"):
+            file_id = shard.get(f"{kind}_file_id")
+            if not file_id or shard.get(f"{kind}_path"):
+                continue
+            destination = run_dir / f"shard_{shard['index']:04d}_{kind}.jsonl"
+            self._jobs.download_file(file_id, destination)
+            shard[f"{kind}_path"] = str(destination)
+            self._save_state(state)
+
+    def _collect_shard(self, shard: Dict[str, Any], contents: Dict[str, str], report: BatchRunReport) -> None:
+        if shard["status"] != "completed":
+            logger.warning("AI dedup batch %s finished with status %s", shard["batch_id"], shard["status"])
+        for kind in ("output", "error"):
+            path = shard.get(f"{kind}_path")
+            if not path:
+                continue
+            for record in _read_jsonl(Path(path)):
+                custom_id = record.get("custom_id")
+                if not custom_id:
+                    continue
+                response = record.get("response") or {}
+                error = record.get("error")
+                status_code = response.get("status_code")
+                if error or status_code != 200:
+                    reason = (error or {}).get("message") if isinstance(error, Mapping) else error
+                    if not reason:
+                        body_error = (response.get("body") or {}).get("error") or {}
+                        reason = body_error.get("message") or f"HTTP {status_code}"
+                    report.record_error(custom_id, str(reason))
+                    continue
+                content = response_content(response.get("body") or {})
+                if content is None:
+                    report.record_error(custom_id, "Response missing message content")
+                    continue
+                contents[custom_id] = content
+
+
+__all__ = ["BatchDedupPipeline", "BatchRunReport", "response_content"]
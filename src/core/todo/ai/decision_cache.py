@@ -0,0 +1,161 @@
+"""Persistent cache of AI dedup responses keyed by cluster fingerprint."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Sequence
+
+
+def cluster_fingerprint(
+    *,
+    template_version: str,
+    model: str,
+    max_completion_tokens: int,
+    available_lists: Iterable[str],
+    user_emails: Iterable[str],
+    members: Sequence[Any],
+) -> str:
+    """
+    Content address of one model request.
+
+    ``members`` describes the prompt's tasks in prompt order, e.g.
+    ``(task_key, etag)`` pairs; everything else the prompt depends on is
+    passed explicitly, so any change to it produces a new key.
+    """
+
+    payload = {
+        "template": template_version,
+        "model": model,
+        "max_tokens": max_completion_tokens,
+        "lists": sorted(set(available_lists)),
+        "emails": sorted(set(user_emails)),
+        "members": list(members),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def member_fingerprint(task_key: str, task: Mapping[str, Any]) -> Any:
+    """``(task_key, etag)`` for a task, or a hash of its contents when it has no etag."""
+
+    etag = task.get("etag") or task.get("@odata.etag")
+    if etag:
+        return [task_key, str(etag)]
+    encoded = json.dumps(task, sort_keys=True, separators=(",", ":"), default=str)
+    return [task_key, "sha256:" + hashlib.sha256(encoded.encode("utf-8")).hexdigest()]
+
+
+class DecisionCache:
+    """
+    SQLite store of raw model responses with TTL and LRU eviction.
+
+    Entries older than ``ttl_seconds`` are treated as misses and removed;
+    the least recently used beyond ``max_entries`` are evicted every
+    ``EVICT_EVERY`` writes, so the store can briefly exceed the limit.
+    ``stats()`` reports hits and misses since creation.
+    """
+
+    EVICT_EVERY = 100
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_entries: int = 50_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._puts = 0
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS dedup_decision_cache ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_dedup_decision_cache_last_used"
+            " ON dedup_decision_cache (last_used_at)"
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key``, or None on a miss or expiry."""
+
+        now = self._clock()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, created_at FROM dedup_decision_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._connection.execute("DELETE FROM dedup_decision_cache WHERE key = ?", (key,))
+                self._connection.commit()
+                row = None
+            if row is None:
+                self._misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE dedup_decision_cache SET last_used_at = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            self._hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Store ``response`` under ``key`` and evict beyond ``max_entries``."""
+
+        now = self._clock()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO dedup_decision_cache (key, response, created_at, last_used_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._puts += 1
+            if self.max_entries and self._puts % self.EVICT_EVERY == 0:
+                self._connection.execute(
+                    "DELETE FROM dedup_decision_cache WHERE key IN ("
+                    " SELECT key FROM dedup_decision_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._connection.commit()
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL; return how many were removed."""
+
+        if not self.ttl_seconds:
+            return 0
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM dedup_decision_cache WHERE created_at < ?", (self._clock() - self.ttl_seconds,)
+            )
+            self._connection.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+__all__ = ["DecisionCache", "cluster_fingerprint", "member_fingerprint"]
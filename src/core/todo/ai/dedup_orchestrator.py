@@ -4,17 +4,26 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Dict, Iterable, List, Mapping, MutableSequence, Optional
+import threading
+import time
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableSequence, Optional, Tuple
 
 from core.todo.config import TodoDedupConfig
 from core.todo.models import DedupDecision, TaskCluster
 from core.todo.services import ExactDuplicateService
+from .batch_pipeline import BatchDedupPipeline, BatchRunReport
+from .decision_cache import DecisionCache, cluster_fingerprint, member_fingerprint
 from .prompt_builder import PromptBuilder
+from .rate_limiter import RateLimiter, backoff_delay, estimate_tokens, is_rate_limit_error, retry_after_seconds
 from .response_parser import DedupResponseParser
 
 try:  # pragma: no cover - optional dependency
+    from opentelemetry import context as otel_context
     from opentelemetry import trace
 except ImportError:  # pragma: no cover - OTEL optional
+    otel_context = None  # type: ignore
     trace = None  # type: ignore
 
 
@@ -30,8 +39,43 @@ def _task_key(task: Mapping[str, Any]) -> str:
     )
 
 
+def _empty_run_stats() -> Dict[str, int]:
+    return {"model_calls": 0, "packed_calls": 0, "prompt_tokens": 0, "prompt_tokens_saved": 0}
+
+
+@dataclass(slots=True)
+class _ClusterRequest:
+    """A cluster's remaining tasks and its single-cluster prompt (None when built lazily)."""
+
+    position: int
+    cluster: TaskCluster
+    entries: List[Dict[str, Any]]
+    messages: Optional[List[Dict[str, str]]]
+    cache_key: Optional[str] = None
+    cached_response: Optional[str] = None
+
+
 class AIDeduplicationService:
-    """Coordinate auto-deduplication and AI-backed decisions."""
+    """
+    Coordinate auto-deduplication and AI-backed decisions.
+
+    With ``config.dedup_max_concurrency`` above 1, clusters are processed on
+    a thread pool; model calls share the request/token budgets of one
+    ``RateLimiter`` and rate-limited (HTTP 429) calls are retried with
+    backoff. Decisions are merged in cluster order either way.
+
+    With a ``DecisionCache`` (``config.decision_cache_path``), a cluster whose
+    prompt inputs are unchanged since an earlier run reuses that run's
+    model response instead of calling the model.
+
+    With ``config.dedup_pack_token_budget`` above 0, small clusters are
+    packed into shared model calls (see ``_process_packed``);
+    ``last_run_stats`` reports the calls made and prompt tokens saved.
+
+    With ``config.batch_enabled``, clusters left after exact duplicates and
+    cache hits are sent through the OpenAI Batch API instead (see
+    ``_process_batch``); ``last_batch_report`` holds the per-request outcome.
+    """
 
     def __init__(
         self,
@@ -41,6 +85,10 @@ class AIDeduplicationService:
         parser: Optional[DedupResponseParser] = None,
         exact_duplicate_service: Optional[ExactDuplicateService] = None,
         openai_client: Any = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        decision_cache: Optional[DecisionCache] = None,
+        batch_pipeline: Optional[BatchDedupPipeline] = None,
     ) -> None:
         self._config = config or TodoDedupConfig.from_env()
         self._prompt_builder = prompt_builder or PromptBuilder(self._config)
@@ -48,6 +96,30 @@ class AIDeduplicationService:
         self._exact_duplicates = exact_duplicate_service or ExactDuplicateService()
         self._client = openai_client or self._create_openai_client()
         self._tracer = trace.get_tracer(__name__) if trace else None
+        self._rate_limiter = rate_limiter or RateLimiter(
+            self._config.dedup_requests_per_minute,
+            self._config.dedup_tokens_per_minute,
+        )
+        self._sleep = sleep
+        self._decision_cache = decision_cache
+        if self._decision_cache is None and self._config.decision_cache_path:
+            self._decision_cache = DecisionCache(
+                self._config.decision_cache_path,
+                ttl_seconds=self._config.decision_cache_ttl_seconds,
+                max_entries=self._config.decision_cache_max_entries,
+            )
+        self._batch_pipeline = batch_pipeline
+        self.last_batch_report: Optional[BatchRunReport] = None
+        self._stats_lock = threading.Lock()
+        # Model calls, packed calls, estimated prompt tokens sent and saved by packing in the last run
+        self.last_run_stats: Dict[str, int] = _empty_run_stats()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Decision cache hits, misses and hit rate (zeros when the cache is disabled)."""
+
+        if self._decision_cache is None:
+            return {"hits": 0, "misses": 0, "hit_rate": 0.0}
+        return self._decision_cache.stats()
 
     def process_clusters(
         self,
@@ -58,23 +130,80 @@ class AIDeduplicationService:
     ) -> Dict[str, DedupDecision]:
         decisions: Dict[str, DedupDecision] = {}
         available_lists_list = list(available_lists)
-
-        for cluster in clusters:
-            span_ctx = (
-                self._tracer.start_as_current_span("todo.ai_dedup_cluster", attributes={"cluster.id": cluster.cluster_id})
-                if self._tracer
-                else None
-            )
-            with span_ctx if span_ctx else _NullContext():
-                cluster_decisions = self._process_cluster(
+        clusters_list = list(clusters)
+        stats_before = self.cache_stats()
+        with self._stats_lock:
+            self.last_run_stats = _empty_run_stats()
+
+        if self._config.batch_enabled:
+            decisions = self._process_batch(tasks=tasks, clusters=clusters_list, available_lists=available_lists_list)
+        elif self._config.dedup_pack_token_budget > 0:
+            decisions = self._process_packed(tasks=tasks, clusters=clusters_list, available_lists=available_lists_list)
+        else:
+            results = self._run_ordered(
+                clusters_list,
+                lambda cluster, parent_context: self._process_cluster_traced(
                     tasks=tasks,
                     cluster=cluster,
                     available_lists=available_lists_list,
-                )
-                decisions.update(cluster_decisions)
+                    parent_context=parent_context,
+                ),
+            )
+            for result in results:
+                decisions.update(result)
 
+        self._log_cache_stats(stats_before)
         return decisions
 
+    def _run_ordered(self, items: List[Any], work: Callable[[Any, Any], Any]) -> List[Any]:
+        """Apply ``work(item, parent_context)`` to every item, concurrently if configured, in item order."""
+
+        concurrency = min(max(1, self._config.dedup_max_concurrency), len(items))
+        if concurrency <= 1:
+            return [work(item, None) for item in items]
+
+        # Worker threads do not inherit the caller's OTEL context
+        parent_context = otel_context.get_current() if otel_context else None
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="todo-dedup") as executor:
+            futures = [executor.submit(work, item, parent_context) for item in items]
+            try:
+                # Collect in submission order so the merged result matches a sequential run
+                return [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _log_cache_stats(self, before: Mapping[str, Any]) -> None:
+        if self._decision_cache is None:
+            return
+        after = self._decision_cache.stats()
+        hits = after["hits"] - before["hits"]
+        lookups = hits + after["misses"] - before["misses"]
+        if lookups:
+            logger.info(
+                "AI dedup decision cache: %s/%s clusters served from cache (%.0f%%)",
+                hits,
+                lookups,
+                100.0 * hits / lookups,
+            )
+
+    def _span(self, name: str, parent_context: Any = None, **attributes: Any):
+        if not self._tracer:
+            return _NullContext()
+        return self._tracer.start_as_current_span(name, context=parent_context, attributes=attributes)
+
+    def _process_cluster_traced(
+        self,
+        *,
+        tasks: List[Mapping[str, Any]],
+        cluster: TaskCluster,
+        available_lists: List[str],
+        parent_context: Any = None,
+    ) -> Dict[str, DedupDecision]:
+        with self._span("todo.ai_dedup_cluster", parent_context, **{"cluster.id": cluster.cluster_id}):
+            return self._process_cluster(tasks=tasks, cluster=cluster, available_lists=available_lists)
+
     def _process_cluster(
         self,
         *,
@@ -82,6 +211,24 @@ class AIDeduplicationService:
         cluster: TaskCluster,
         available_lists: List[str],
     ) -> Dict[str, DedupDecision]:
+        auto_decisions, remaining_entries = self._prepare_cluster(tasks=tasks, cluster=cluster)
+        if not remaining_entries:
+            return auto_decisions
+
+        request = self._build_request(0, cluster, remaining_entries, available_lists)
+        if trace is not None and self._decision_cache is not None:
+            trace.get_current_span().set_attribute("cache.hit", request.cached_response is not None)
+        auto_decisions.update(self._decide(request))
+        return auto_decisions
+
+    def _prepare_cluster(
+        self,
+        *,
+        tasks: List[Mapping[str, Any]],
+        cluster: TaskCluster,
+    ) -> Tuple[Dict[str, DedupDecision], List[Dict[str, Any]]]:
+        """Resolve exact duplicates and lone tasks; return those decisions and the entries left for the model."""
+
         cluster_tasks = [tasks[index] for index in cluster.indices]
 
         # Auto-detect exact duplicates first
@@ -120,37 +267,334 @@ class AIDeduplicationService:
                     cluster_id=cluster.cluster_id,
                     cluster_size=cluster.size,
                 )
-            return auto_decisions
+            return auto_decisions, []
 
-        # Prepare prompt for AI decisions
-        prompt_tasks = [entry["task"] for entry in remaining_entries]
-        prompt = self._prompt_builder.build_prompt(prompt_tasks, available_lists)
+        return auto_decisions, remaining_entries
 
-        messages = [
+    def _build_request(
+        self,
+        position: int,
+        cluster: TaskCluster,
+        entries: List[Dict[str, Any]],
+        available_lists: List[str],
+        *,
+        build_messages: bool = True,
+    ) -> "_ClusterRequest":
+        """Build the single-cluster prompt and look it up in the decision cache."""
+
+        messages = self._cluster_messages(entries, available_lists) if build_messages else None
+
+        cache_key = None
+        cached_response = None
+        if self._decision_cache is not None:
+            cache_key = cluster_fingerprint(
+                template_version=self._prompt_builder.template_version,
+                model=self._config.dedup_model,
+                max_completion_tokens=self._config.dedup_max_completion_tokens,
+                available_lists=available_lists,
+                user_emails=self._config.user_emails,
+                members=[member_fingerprint(entry["task_key"], entry["task"]) for entry in entries],
+            )
+            cached_response = self._decision_cache.get(cache_key)
+
+        return _ClusterRequest(
+            position=position,
+            cluster=cluster,
+            entries=entries,
+            messages=messages,
+            cache_key=cache_key,
+            cached_response=cached_response,
+        )
+
+    def _cluster_messages(self, entries: List[Dict[str, Any]], available_lists: List[str]) -> List[Dict[str, str]]:
+        prompt = self._prompt_builder.build_prompt([entry["task"] for entry in entries], available_lists)
+        return [
             {"role": "system", "content": self._prompt_builder.system_prompt},
             {"role": "user", "content": prompt},
         ]
 
-        response_content = self._invoke_model(messages=messages)
+    def _decide(self, request: "_ClusterRequest") -> Dict[str, DedupDecision]:
+        """Decide one cluster from its cached response or a single-cluster model call."""
+
+        from_cache = request.cached_response is not None
+        response_content = request.cached_response if from_cache else self._invoke_model(messages=request.messages)
 
-        ai_decisions, errors = self._parser.parse(response_content, remaining_entries)
+        ai_decisions, errors = self._parser.parse(response_content, request.entries)
 
         if errors:
             logger.warning("AI dedup parser reported issues: %s", errors)
+        elif request.cache_key is not None and not from_cache:
+            # Only responses that parsed cleanly are worth replaying
+            self._decision_cache.put(request.cache_key, response_content)
 
-        for decision in ai_decisions.values():
+        return self._stamp_cluster(ai_decisions, request.cluster)
+
+    @staticmethod
+    def _stamp_cluster(decisions: Dict[str, DedupDecision], cluster: TaskCluster) -> Dict[str, DedupDecision]:
+        for decision in decisions.values():
             decision.cluster_id = cluster.cluster_id
             decision.cluster_size = cluster.size
+        return decisions
 
-        auto_decisions.update(ai_decisions)
-        return auto_decisions
+    def _process_packed(
+        self,
+        *,
+        tasks: List[Mapping[str, Any]],
+        clusters: List[TaskCluster],
+        available_lists: List[str],
+    ) -> Dict[str, DedupDecision]:
+        """
+        Decide clusters with several small clusters per model call.
 
-    def _invoke_model(self, *, messages: List[Dict[str, str]]) -> str:
-        completion = self._client.chat.completions.create(
-            model=self._config.dedup_model,
-            messages=messages,
-            max_tokens=self._config.dedup_max_completion_tokens,
+        Exact duplicates and cache hits are resolved first; the remaining
+        clusters are packed in order up to ``dedup_pack_token_budget``
+        prompt tokens and ``dedup_pack_max_tasks`` tasks per call.
+        """
+
+        auto_by_position, ai_by_position, pending = self._resolve_locally(
+            tasks=tasks, clusters=clusters, available_lists=available_lists
+        )
+
+        unpacked_tokens = sum(estimate_tokens(request.messages, 0) for request in pending)
+        packs = self._pack_requests(pending, available_lists)
+        for result in self._run_ordered(
+            packs, lambda pack, parent_context: self._decide_pack_traced(pack, available_lists, parent_context)
+        ):
+            ai_by_position.update(result)
+        # Retried splits count against the saving
+        self._add_run_stat("prompt_tokens_saved", unpacked_tokens - self.last_run_stats["prompt_tokens"])
+
+        decisions = self._merge_positions(auto_by_position, ai_by_position)
+
+        stats = self.last_run_stats
+        logger.info(
+            "AI dedup packing: %s model calls (%s packed), ~%s prompt tokens saved",
+            stats["model_calls"],
+            stats["packed_calls"],
+            stats["prompt_tokens_saved"],
+        )
+        return decisions
+
+    def _resolve_locally(
+        self,
+        *,
+        tasks: List[Mapping[str, Any]],
+        clusters: List[TaskCluster],
+        available_lists: List[str],
+        build_messages: bool = True,
+    ) -> Tuple[List[Dict[str, DedupDecision]], Dict[int, Dict[str, DedupDecision]], List["_ClusterRequest"]]:
+        """
+        Decide what needs no model call; return auto decisions, cached AI decisions and pending requests.
+
+        Without ``build_messages`` the pending requests carry no prompt; build
+        it with ``_cluster_messages`` when it is needed.
+        """
+
+        auto_by_position: List[Dict[str, DedupDecision]] = []
+        ai_by_position: Dict[int, Dict[str, DedupDecision]] = {}
+        pending: List[_ClusterRequest] = []
+        for position, cluster in enumerate(clusters):
+            auto_decisions, remaining_entries = self._prepare_cluster(tasks=tasks, cluster=cluster)
+            auto_by_position.append(auto_decisions)
+            if not remaining_entries:
+                continue
+            request = self._build_request(
+                position, cluster, remaining_entries, available_lists, build_messages=build_messages
+            )
+            if request.cached_response is not None:
+                with self._span("todo.ai_dedup_cluster", **{"cluster.id": cluster.cluster_id, "cache.hit": True}):
+                    ai_by_position[position] = self._decide(request)
+            else:
+                pending.append(request)
+        return auto_by_position, ai_by_position, pending
+
+    @staticmethod
+    def _merge_positions(
+        auto_by_position: List[Dict[str, DedupDecision]],
+        ai_by_position: Mapping[int, Dict[str, DedupDecision]],
+    ) -> Dict[str, DedupDecision]:
+        decisions: Dict[str, DedupDecision] = {}
+        for position, auto_decisions in enumerate(auto_by_position):
+            decisions.update(auto_decisions)
+            decisions.update(ai_by_position.get(position, {}))
+        return decisions
+
+    def _process_batch(
+        self,
+        *,
+        tasks: List[Mapping[str, Any]],
+        clusters: List[TaskCluster],
+        available_lists: List[str],
+    ) -> Dict[str, DedupDecision]:
+        """
+        Decide clusters through the OpenAI Batch API.
+
+        Every cluster still needing the model becomes one batch request,
+        identified by cluster id and position. Prompts are built one at a
+        time as the pipeline writes them to its shards. A request that
+        failed, went missing or could not be parsed leaves its cluster
+        without AI decisions and is recorded in ``last_batch_report``.
+        """
+
+        auto_by_position, ai_by_position, pending = self._resolve_locally(
+            tasks=tasks, clusters=clusters, available_lists=available_lists, build_messages=False
         )
+
+        pipeline = self._batch_pipeline or BatchDedupPipeline(self._client, self._config)
+        requests_by_id = {f"cluster-{request.cluster.cluster_id}-{request.position}": request for request in pending}
+        batch_requests = (
+            (custom_id, self._cluster_messages(request.entries, available_lists))
+            for custom_id, request in requests_by_id.items()
+        )
+        with self._span("todo.ai_dedup_batch", **{"batch.requests": len(requests_by_id)}):
+            contents, report = pipeline.run(batch_requests)
+
+        for custom_id, request in requests_by_id.items():
+            content = contents.get(custom_id)
+            if content is None:
+                continue
+            ai_decisions, errors = self._parser.parse(content, request.entries)
+            if errors:
+                report.record_error(custom_id, "; ".join(errors), counter="unparseable")
+            elif request.cache_key is not None:
+                self._decision_cache.put(request.cache_key, content)
+            ai_by_position[request.position] = self._stamp_cluster(ai_decisions, request.cluster)
+
+        self.last_batch_report = report
+        if report.errors:
+            logger.warning(
+                "AI dedup batch: %s of %s requests without usable decisions, e.g. %s",
+                len(report.errors),
+                report.requests,
+                dict(list(report.errors.items())[:5]),
+            )
+        return self._merge_positions(auto_by_position, ai_by_position)
+
+    def _pack_requests(
+        self, requests: List["_ClusterRequest"], available_lists: List[str]
+    ) -> List[List["_ClusterRequest"]]:
+        """Group requests in order into packs within the token budget and task limit."""
+
+        budget = self._config.dedup_pack_token_budget
+        max_tasks = max(1, self._config.dedup_pack_max_tasks)
+        overhead = estimate_tokens(self._packed_messages([], available_lists), 0)
+
+        packs: List[List[_ClusterRequest]] = []
+        current: List[_ClusterRequest] = []
+        current_tokens = overhead
+        current_tasks = 0
+        for request in requests:
+            tokens = estimate_tokens(
+                [{"content": self._prompt_builder.tasks_json([entry["task"] for entry in request.entries])}], 0
+            )
+            if current and (current_tokens + tokens > budget or current_tasks + len(request.entries) > max_tasks):
+                packs.append(current)
+                current, current_tokens, current_tasks = [], overhead, 0
+            current.append(request)
+            current_tokens += tokens
+            current_tasks += len(request.entries)
+        if current:
+            packs.append(current)
+        return packs
+
+    def _packed_messages(self, requests: List["_ClusterRequest"], available_lists: List[str]) -> List[Dict[str, str]]:
+        prompt = self._prompt_builder.build_packed_prompt(
+            [[entry["task"] for entry in request.entries] for request in requests], available_lists
+        )
+        return [
+            {"role": "system", "content": self._prompt_builder.system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+
+    def _decide_pack_traced(
+        self,
+        pack: List["_ClusterRequest"],
+        available_lists: List[str],
+        parent_context: Any = None,
+    ) -> Dict[int, Dict[str, DedupDecision]]:
+        if len(pack) == 1:
+            request = pack[0]
+            with self._span("todo.ai_dedup_cluster", parent_context, **{"cluster.id": request.cluster.cluster_id}):
+                return {request.position: self._decide(request)}
+        cluster_ids = [request.cluster.cluster_id for request in pack]
+        with self._span("todo.ai_dedup_pack", parent_context, **{"cluster.ids": cluster_ids}):
+            return self._decide_pack(pack, available_lists)
+
+    def _decide_pack(
+        self, pack: List["_ClusterRequest"], available_lists: List[str]
+    ) -> Dict[int, Dict[str, DedupDecision]]:
+        """
+        Decide a pack with one model call and demultiplex the response.
+
+        Clusters whose decisions fail validation are split in halves and
+        retried, down to single-cluster prompts.
+        """
+
+        response_content = self._invoke_model(messages=self._packed_messages(pack, available_lists))
+        self._add_run_stat("packed_calls", 1)
+        results = self._parser.parse_packed(response_content, [request.entries for request in pack])
+
+        decided: Dict[int, Dict[str, DedupDecision]] = {}
+        failed: List[_ClusterRequest] = []
+        for request, (ai_decisions, errors, single_response) in zip(pack, results):
+            if errors:
+                failed.append(request)
+                continue
+            if request.cache_key is not None:
+                self._decision_cache.put(request.cache_key, single_response)
+            decided[request.position] = self._stamp_cluster(ai_decisions, request.cluster)
+
+        if failed:
+            logger.warning(
+                "Packed AI dedup response failed validation for %s of %s clusters; retrying them split",
+                len(failed),
+                len(pack),
+            )
+            middle = (len(failed) + 1) // 2
+            for half in (failed[:middle], failed[middle:]):
+                if half:
+                    decided.update(self._decide_pack_traced(half, available_lists))
+        return decided
+
+    def _add_run_stat(self, name: str, amount: int) -> None:
+        with self._stats_lock:
+            self.last_run_stats[name] += amount
+
+    def _invoke_model(self, *, messages: List[Dict[str, str]]) -> str:
+        estimated_tokens = estimate_tokens(messages, self._config.dedup_max_completion_tokens)
+        prompt_tokens = estimate_tokens(messages, 0)
+        with self._stats_lock:
+            self.last_run_stats["model_calls"] += 1
+            self.last_run_stats["prompt_tokens"] += prompt_tokens
+        attempt = 0
+        while True:
+            self._rate_limiter.acquire(estimated_tokens)
+            try:
+                completion = self._client.chat.completions.create(
+                    model=self._config.dedup_model,
+                    messages=messages,
+                    max_tokens=self._config.dedup_max_completion_tokens,
+                )
+                break
+            except Exception as exc:
+                if not is_rate_limit_error(exc) or attempt >= self._config.dedup_max_retries:
+                    raise
+                delay = retry_after_seconds(exc)
+                if delay is None:
+                    delay = backoff_delay(attempt, self._config.dedup_retry_base_seconds)
+                attempt += 1
+                logger.warning(
+                    "AI dedup model call rate limited; retry %s/%s in %.1fs",
+                    attempt,
+                    self._config.dedup_max_retries,
+                    delay,
+                )
+                self._sleep(delay)
+
+        used_tokens = getattr(getattr(completion, "usage", None), "total_tokens", None)
+        if isinstance(used_tokens, int):
+            self._rate_limiter.refund(estimated_tokens - used_tokens)
+
         choice = completion.choices[0]
         message = getattr(choice, "message", choice["message"] if isinstance(choice, Mapping) else None)
         content = getattr(message, "content", None)
@@ -170,7 +614,8 @@ class AIDeduplicationService:
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY environment variable required for dedup service")
 
-        return openai.OpenAI(api_key=api_key)
+        # Rate-limit retries are paced by this service's RateLimiter and backoff loop
+        return openai.OpenAI(api_key=api_key, max_retries=0)
 
 
 class _NullContext:
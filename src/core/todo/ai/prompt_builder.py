@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import textwrap
 from typing import Any, Dict, Iterable, Sequence
@@ -59,6 +60,40 @@ class PromptBuilder:
         """
     ).strip()
 
+    _PACKED_TEMPLATE = textwrap.dedent(
+        """
+        You are assisting with deduplicating Microsoft To Do tasks. The tasks below are grouped into independent clusters; compare tasks only with other tasks in the same cluster. Return a single JSON object describing a decision for every task in every cluster. Follow these rules exactly.
+
+        1. Output format
+           - Return only JSON, nothing else.
+           - Top-level object: `decisions`: array of objects.
+           - Each decision object must contain:
+             - `cluster` (integer): the `cluster` number the task belongs to.
+             - `index` (integer): matches the task's index within its cluster.
+             - `action` (string): one of `keep`, `merge`, `delete`, `move`.
+             - `target_list` (string or null): null or an exact string from `available_lists`.
+             - `merged_title` (string or null): populated only for `merge` and ≤250 chars.
+             - `rationale` (string): ≤120 chars, plain English, no confidential text.
+
+        2. Determinism and safety
+           - Use provided `available_lists` exactly; do not invent new list names.
+           - Prefer the least-destructive action when uncertain.
+           - `move` and `merge` are mutually exclusive.
+           - Never merge or delete a task because of a task in a different cluster.
+           - Do not expose raw confidential text beyond short rationales.
+
+        3. Auto-validation
+           - Before returning, ensure every (`cluster`, `index`) pair appears exactly once.
+           - If validation fails, return `{{"decisions": [], "error": "<reason>"}}`.
+
+        available_lists: {available_lists}
+        user_emails: {user_emails}
+
+        Clusters (JSON array of {{"cluster": number, "tasks": array}}):
+        {clusters_json}
+        """
+    ).strip()
+
     def __init__(self, config: TodoDedupConfig) -> None:
         self._config = config
 
@@ -66,21 +101,59 @@ class PromptBuilder:
     def system_prompt(self) -> str:
         return self._DEFAULT_SYSTEM_PROMPT
 
+    @property
+    def template_version(self) -> str:
+        """Short hash of the prompts and snippet limits; changes whenever they do."""
+
+        source = "\x00".join(
+            [
+                self.system_prompt,
+                self._DEFAULT_TEMPLATE,
+                self._PACKED_TEMPLATE,
+                str(self.BODY_SNIPPET_LENGTH),
+                str(self.LINK_PREVIEW_LENGTH),
+            ]
+        )
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
     def build_prompt(
         self,
         tasks: Sequence[Dict[str, Any]],
         available_lists: Iterable[str],
     ) -> str:
+        return self._DEFAULT_TEMPLATE.format(
+            tasks_json=self.tasks_json(tasks),
+            available_lists=self._available_lists_str(available_lists),
+            user_emails=self._user_emails_str(),
+        )
+
+    def build_packed_prompt(
+        self,
+        clusters: Sequence[Sequence[Dict[str, Any]]],
+        available_lists: Iterable[str],
+    ) -> str:
+        """Prompt for several clusters at once; clusters are numbered from 0 in the given order."""
+
+        payload = [
+            {"cluster": number, "tasks": [self._task_payload(task, index) for index, task in enumerate(tasks)]}
+            for number, tasks in enumerate(clusters)
+        ]
+        return self._PACKED_TEMPLATE.format(
+            clusters_json=json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+            available_lists=self._available_lists_str(available_lists),
+            user_emails=self._user_emails_str(),
+        )
+
+    def tasks_json(self, tasks: Sequence[Dict[str, Any]]) -> str:
         payload = [self._task_payload(task, index) for index, task in enumerate(tasks)]
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
 
-        available_lists_str = ", ".join(f'"{name}"' for name in sorted(set(available_lists)))
-        user_emails_str = ", ".join(sorted(self._config.user_emails)) or "(none)"
+    @staticmethod
+    def _available_lists_str(available_lists: Iterable[str]) -> str:
+        return ", ".join(f'"{name}"' for name in sorted(set(available_lists)))
 
-        return self._DEFAULT_TEMPLATE.format(
-            tasks_json=json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
-            available_lists=available_lists_str,
-            user_emails=user_emails_str,
-        )
+    def _user_emails_str(self) -> str:
+        return ", ".join(sorted(self._config.user_emails)) or "(none)"
 
     def _task_payload(self, task: Dict[str, Any], index: int) -> Dict[str, Any]:
         return {
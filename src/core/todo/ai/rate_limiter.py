@@ -0,0 +1,124 @@
+"""Request and token budgets for concurrent model calls."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+
+def estimate_tokens(messages: Iterable[Mapping[str, Any]], max_completion_tokens: int) -> int:
+    """Rough token cost of a chat request: ~4 characters per prompt token plus the completion cap."""
+
+    characters = sum(len(str(message.get("content") or "")) for message in messages)
+    return characters // 4 + max_completion_tokens
+
+
+class RateLimiter:
+    """
+    Thread-safe token buckets for requests per minute and tokens per minute.
+
+    Each bucket holds up to one minute of budget and refills continuously.
+    ``acquire`` blocks until both buckets can cover the request; a budget
+    of 0 disables that bucket. A request larger than the whole token budget
+    waits for a full bucket rather than forever.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Take one request and ``tokens`` from the budgets; return the seconds spent waiting."""
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                needed_tokens = min(tokens, self.tokens_per_minute)
+                wait = 0.0
+                if self.requests_per_minute and self._requests < 1:
+                    wait = (1 - self._requests) * 60 / self.requests_per_minute
+                if self.tokens_per_minute and self._tokens < needed_tokens:
+                    wait = max(wait, (needed_tokens - self._tokens) * 60 / self.tokens_per_minute)
+                if wait <= 0:
+                    if self.requests_per_minute:
+                        self._requests -= 1
+                    if self.tokens_per_minute:
+                        self._tokens -= needed_tokens
+                    return waited
+            self._sleep(wait)
+            waited += wait
+
+    def refund(self, tokens: int) -> None:
+        """Return unused tokens once a response reports its actual usage."""
+
+        if not self.tokens_per_minute or tokens <= 0:
+            return
+        with self._lock:
+            self._tokens = min(self.tokens_per_minute, self._tokens + tokens)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True for HTTP 429 errors from the OpenAI client or compatible fakes."""
+
+    if type(exc).__name__ == "RateLimitError":
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """The server's Retry-After hint in seconds, if the error carries one."""
+
+    headers: Any = getattr(getattr(exc, "response", None), "headers", None)
+    if not hasattr(headers, "get"):
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name) or headers.get(name.title())
+        if value:
+            try:
+                return float(value) * scale
+            except ValueError:
+                continue
+    return None
+
+
+def backoff_delay(attempt: int, base_seconds: float, max_seconds: float = 60.0) -> float:
+    """Exponential backoff with full jitter for retry ``attempt`` (0-based)."""
+
+    return random.uniform(0, min(max_seconds, base_seconds * (2**attempt)))
+
+
+__all__ = [
+    "RateLimiter",
+    "backoff_delay",
+    "estimate_tokens",
+    "is_rate_limit_error",
+    "retry_after_seconds",
+]
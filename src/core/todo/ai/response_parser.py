@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
 
 from core.todo.models import DedupDecision
 
@@ -34,10 +34,73 @@ class DedupResponseParser:
         except json.JSONDecodeError as exc:
             return decisions, [f"Invalid JSON: {exc}"]
 
-        decision_list = data.get("decisions")
+        decision_list = data.get("decisions") if isinstance(data, dict) else None
         if not isinstance(decision_list, list):
             return decisions, ["Missing 'decisions' array"]
 
+        return self._parse_decision_list(decision_list, entries)
+
+    def parse_packed(
+        self,
+        ai_payload: str,
+        packed_entries: Sequence[Sequence[Dict[str, Any]]],
+    ) -> List[Tuple[Dict[str, DedupDecision], List[str], str]]:
+        """
+        Demultiplex a response to a packed prompt.
+
+        Returns one ``(decisions, errors, single_response)`` per cluster, in
+        pack order. Decisions name their cluster with ``cluster`` and their
+        task with ``index`` within it. A cluster also gets an error when any
+        of its tasks has no decision, so callers can retry it on its own.
+        ``single_response`` re-encodes the cluster's decisions as a response
+        to its single-cluster prompt.
+        """
+
+        count = len(packed_entries)
+        failure = None
+        decision_list: Any = None
+        if not ai_payload:
+            failure = "Empty response from model"
+        else:
+            try:
+                data = json.loads(self._strip_code_fence(ai_payload))
+            except json.JSONDecodeError as exc:
+                failure = f"Invalid JSON: {exc}"
+            else:
+                decision_list = data.get("decisions") if isinstance(data, dict) else None
+                if not isinstance(decision_list, list):
+                    failure = "Missing 'decisions' array"
+        if failure is not None:
+            return [({}, [failure], "") for _ in range(count)]
+
+        groups: List[List[Dict[str, Any]]] = [[] for _ in range(count)]
+        stray: List[str] = []
+        for decision_data in decision_list:
+            cluster = decision_data.get("cluster") if isinstance(decision_data, dict) else None
+            if not isinstance(cluster, int) or not 0 <= cluster < count:
+                stray.append(f"Invalid cluster: {cluster}")
+                continue
+            groups[cluster].append({key: value for key, value in decision_data.items() if key != "cluster"})
+        if stray:
+            logger.debug("AI packed response has decisions for unknown clusters: %s", stray)
+
+        results = []
+        for entries, group in zip(packed_entries, groups):
+            decisions, errors = self._parse_decision_list(group, list(entries))
+            covered = {decision_data.get("index") for decision_data in group}
+            errors.extend(f"Missing decision for index {index}" for index in range(len(entries)) if index not in covered)
+            single_response = json.dumps({"decisions": group}, ensure_ascii=False, separators=(",", ":"))
+            results.append((decisions, errors, single_response))
+        return results
+
+    def _parse_decision_list(
+        self,
+        decision_list: List[Any],
+        entries: List[Dict[str, Any]],
+    ) -> Tuple[Dict[str, DedupDecision], List[str]]:
+        decisions: Dict[str, DedupDecision] = {}
+        errors: List[str] = []
+
         seen_indices: set[int] = set()
         for decision_data in decision_list:
             if not isinstance(decision_data, dict):
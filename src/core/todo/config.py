@@ -6,31 +6,7 @@ from dataclasses import dataclass, field
 import os
 from typing import Set
 
-
-def _get_bool_env(var_name: str, default: bool) -> bool:
-    """Return boolean value for an environment variable."""
-
-    value = os.environ.get(var_name)
-    if value is None:
-        return default
-    lowered = value.strip().lower()
-    if lowered in {"1", "true", "yes", "on"}:
-        return True
-    if lowered in {"0", "false", "no", "off"}:
-        return False
-    return default
-
-
-def _get_int_env(var_name: str, default: int) -> int:
-    """Return integer value for an environment variable."""
-
-    value = os.environ.get(var_name)
-    if value is None:
-        return default
-    try:
-        return int(value)
-    except ValueError:
-        return default
+from core.utilities.env_utility import get_bool_env, get_float_env, get_int_env
 
 
 def _get_str_env(var_name: str, default: str) -> str:
@@ -58,26 +34,83 @@ class TodoDedupConfig:
     batch_enabled: bool = False
     batch_poll_interval_seconds: int = 60
     batch_completion_timeout_seconds: int = 3600
+    # Requests per batch input file; each shard is submitted as its own batch
+    batch_shard_size: int = 5000
+    # Bytes of JSONL per batch input file (the Batch API accepts up to 200 MB)
+    batch_shard_max_bytes: int = 100 * 1024 * 1024
+    # Directory for batch input/output files and resumable run state; empty uses ~/.cache
+    batch_state_dir: str = ""
     user_emails: Set[str] = field(default_factory=set)
+    # Concurrent model calls in AIDeduplicationService (1 = one cluster at a time)
+    dedup_max_concurrency: int = 1
+    # Request and token budgets per minute; 0 disables the limit
+    dedup_requests_per_minute: int = 0
+    dedup_tokens_per_minute: int = 0
+    # Retries for rate-limited (HTTP 429) calls, with exponential backoff
+    dedup_max_retries: int = 5
+    dedup_retry_base_seconds: float = 1.0
+    # Pack small clusters into shared model calls up to this many prompt tokens (0 = one call per cluster)
+    dedup_pack_token_budget: int = 0
+    dedup_pack_max_tasks: int = 24
+    # SQLite file caching model responses by cluster fingerprint; empty disables it
+    decision_cache_path: str = ""
+    decision_cache_ttl_seconds: int = 7 * 24 * 3600
+    decision_cache_max_entries: int = 50_000
+    # Semantic clustering: "none", "tfidf" (hashed TF-IDF, no downloads) or
+    # "sentence-transformer" (local CPU model)
+    semantic_backend: str = "none"
+    semantic_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # Cosine similarity at which the semantic index proposes a pair
+    semantic_threshold: float = 0.45
+    # Share of the blended score taken from semantic similarity (0 = fuzzy only)
+    semantic_weight: float = 0.7
+    # SQLite file caching embeddings by a hash of the embedded text; empty disables the cache
+    embedding_cache_path: str = ""
 
     @classmethod
     def from_env(cls) -> "TodoDedupConfig":
         """Create configuration hydrated from environment variables."""
 
+        # Slotted dataclasses keep no class-level defaults, so read them from an instance
+        defaults = cls()
         return cls(
-            fuzzy_score_threshold=_get_int_env("TODO_DEDUP_THRESHOLD", cls.fuzzy_score_threshold),
-            dedup_model=_get_str_env("TODO_DEDUP_MODEL", cls.dedup_model),
-            dedup_max_completion_tokens=_get_int_env(
-                "TODO_DEDUP_MAX_COMPLETION_TOKENS", cls.dedup_max_completion_tokens
+            fuzzy_score_threshold=get_int_env("TODO_DEDUP_THRESHOLD", defaults.fuzzy_score_threshold),
+            dedup_model=_get_str_env("TODO_DEDUP_MODEL", defaults.dedup_model),
+            dedup_max_completion_tokens=get_int_env(
+                "TODO_DEDUP_MAX_COMPLETION_TOKENS", defaults.dedup_max_completion_tokens
             ),
-            batch_enabled=_get_bool_env("TODO_DEDUP_BATCH_ENABLED", cls.batch_enabled),
-            batch_poll_interval_seconds=_get_int_env(
-                "TODO_DEDUP_BATCH_POLL_INTERVAL", cls.batch_poll_interval_seconds
+            batch_enabled=get_bool_env("TODO_DEDUP_BATCH_ENABLED", defaults.batch_enabled),
+            batch_poll_interval_seconds=get_int_env(
+                "TODO_DEDUP_BATCH_POLL_INTERVAL", defaults.batch_poll_interval_seconds
             ),
-            batch_completion_timeout_seconds=_get_int_env(
-                "TODO_DEDUP_BATCH_TIMEOUT", cls.batch_completion_timeout_seconds
+            batch_completion_timeout_seconds=get_int_env(
+                "TODO_DEDUP_BATCH_TIMEOUT", defaults.batch_completion_timeout_seconds
             ),
+            batch_shard_size=get_int_env("TODO_DEDUP_BATCH_SHARD_SIZE", defaults.batch_shard_size),
+            batch_shard_max_bytes=get_int_env("TODO_DEDUP_BATCH_SHARD_MAX_BYTES", defaults.batch_shard_max_bytes),
+            batch_state_dir=os.environ.get("TODO_DEDUP_BATCH_STATE_DIR", defaults.batch_state_dir).strip(),
             user_emails=_get_set_env("TODO_DEDUP_USER_EMAILS"),
+            dedup_max_concurrency=get_int_env("TODO_DEDUP_MAX_CONCURRENCY", defaults.dedup_max_concurrency),
+            dedup_requests_per_minute=get_int_env("TODO_DEDUP_RPM", defaults.dedup_requests_per_minute),
+            dedup_tokens_per_minute=get_int_env("TODO_DEDUP_TPM", defaults.dedup_tokens_per_minute),
+            dedup_max_retries=get_int_env("TODO_DEDUP_MAX_RETRIES", defaults.dedup_max_retries),
+            dedup_retry_base_seconds=get_float_env(
+                "TODO_DEDUP_RETRY_BASE_SECONDS", defaults.dedup_retry_base_seconds
+            ),
+            dedup_pack_token_budget=get_int_env("TODO_DEDUP_PACK_TOKEN_BUDGET", defaults.dedup_pack_token_budget),
+            dedup_pack_max_tasks=get_int_env("TODO_DEDUP_PACK_MAX_TASKS", defaults.dedup_pack_max_tasks),
+            decision_cache_path=os.environ.get("TODO_DEDUP_DECISION_CACHE", defaults.decision_cache_path).strip(),
+            decision_cache_ttl_seconds=get_int_env(
+                "TODO_DEDUP_DECISION_CACHE_TTL", defaults.decision_cache_ttl_seconds
+            ),
+            decision_cache_max_entries=get_int_env(
+                "TODO_DEDUP_DECISION_CACHE_MAX_ENTRIES", defaults.decision_cache_max_entries
+            ),
+            semantic_backend=_get_str_env("TODO_DEDUP_SEMANTIC_BACKEND", defaults.semantic_backend).lower(),
+            semantic_model=_get_str_env("TODO_DEDUP_SEMANTIC_MODEL", defaults.semantic_model),
+            semantic_threshold=get_float_env("TODO_DEDUP_SEMANTIC_THRESHOLD", defaults.semantic_threshold),
+            semantic_weight=get_float_env("TODO_DEDUP_SEMANTIC_WEIGHT", defaults.semantic_weight),
+            embedding_cache_path=os.environ.get("TODO_DEDUP_EMBEDDING_CACHE", defaults.embedding_cache_path).strip(),
         )
 
 
@@ -1,4 +1,4 @@
 """Repository implementations for Microsoft To Do."""
 
 from .msgraph_task_repository import MSGraphTaskRepository, MSGraphTaskRepositoryError  # noqa: F401
-
+from .task_store import TaskStore, TaskSyncResult, task_record  # noqa: F401
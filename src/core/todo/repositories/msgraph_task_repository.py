@@ -3,15 +3,31 @@
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from typing import Any, Dict, Iterable, List, Optional
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from core.models.user import User
 from core.todo.models import LinkedResource, Task, TaskDateTime
 from core.utilities.graph_utility import get_graph_client
 
+from .task_store import TaskStore, TaskSyncResult
+
 try:
     from opentelemetry import trace
 
@@ -22,13 +38,37 @@ except ImportError:  # pragma: no cover - tracing is optional in tests
 
 logger = logging.getLogger(__name__)
 
+_Item = TypeVar("_Item")
+_Result = TypeVar("_Result")
+
 
 class MSGraphTaskRepositoryError(RuntimeError):
     """Raised when Microsoft Graph returns an error for To Do operations."""
 
+    def __init__(self, message: str, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass(slots=True)
+class _ListSync:
+    """Outcome of syncing one list: its new delta link, open task payloads and removed ids."""
+
+    list_metadata: Dict[str, Optional[str]]
+    delta_link: Optional[str]
+    payloads: List[Dict[str, Any]]
+    removed_ids: List[str]
+    full: bool
+
 
 class MSGraphTaskRepository:
-    """Provides high-fidelity access to Microsoft To Do tasks via Graph."""
+    """
+    Provides high-fidelity access to Microsoft To Do tasks via Graph.
+
+    Lists are fetched on up to ``max_workers`` threads over one pooled
+    session, and the emails behind flagged-email tasks are fetched through
+    Graph ``$batch`` requests of up to 20 messages instead of one GET each.
+    """
 
     TASK_SELECT_FIELDS = [
         "id",
@@ -50,11 +90,16 @@ class MSGraphTaskRepository:
     LIST_SELECT_FIELDS = ["id", "displayName", "wellknownListName"]
     DEFAULT_TOP = 100
     GRAPH_TIMEOUT_SECONDS = 30
+    # Microsoft Graph accepts at most 20 requests per $batch call
+    GRAPH_BATCH_LIMIT = 20
+    MESSAGE_SELECT_FIELDS = "bodyPreview,body,webLink"
 
-    def __init__(self, *, http_client: Optional[requests.Session] = None) -> None:
-        """Initialise the repository with an optional custom HTTP client."""
+    def __init__(self, *, http_client: Optional[requests.Session] = None, max_workers: int = 4) -> None:
+        """Initialise the repository with an optional custom HTTP client and worker count."""
 
         self._http_client = http_client
+        self._max_workers = max(1, max_workers)
+        self._session_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Public API
@@ -70,6 +115,23 @@ class MSGraphTaskRepository:
                 return self._list_all_tasks_impl(user, access_token)
         return self._list_all_tasks_impl(user, access_token)
 
+    def sync_tasks(self, user: User, access_token: str, store: TaskStore) -> TaskSyncResult:
+        """
+        Bring ``store`` up to date using per-list Graph delta queries.
+
+        Lists with a stored delta link fetch only what changed since; new
+        lists, and lists whose delta link expired, are downloaded in full.
+        Completed and deleted tasks are removed from the store.
+        """
+
+        if not access_token:
+            raise ValueError("access_token is required to call Microsoft Graph")
+
+        if tracer:
+            with tracer.start_as_current_span("todo.sync_tasks"):
+                return self._sync_tasks_impl(user, access_token, store)
+        return self._sync_tasks_impl(user, access_token, store)
+
     def update_task(
         self,
         user: User,
@@ -97,45 +159,183 @@ class MSGraphTaskRepository:
         base_url = self._resolve_base_url(client)
         headers = self._build_headers(access_token)
 
-        list_items = self._get_collection(
-            f"{base_url}/me/todo/lists",
-            headers,
-            params={"$select": ",".join(self.LIST_SELECT_FIELDS)},
+        list_metadatas = self._list_metadatas(base_url, headers)
+        params = self._task_params()
+        task_pages = self._map_concurrent(
+            lambda metadata: self._get_collection(
+                f"{base_url}/me/todo/lists/{metadata['list_id']}/tasks", headers, params=params
+            ),
+            list_metadatas,
         )
 
         tasks: List[Task] = []
-        for list_payload in list_items:
-            list_id = list_payload.get("id")
-            if not list_id:
-                continue
-
-            list_metadata = {
-                "list_id": list_id,
-                "list_name": list_payload.get("displayName"),
-                "wellknown_list_name": list_payload.get("wellknownListName"),
-            }
-
-            task_url = f"{base_url}/me/todo/lists/{list_id}/tasks"
-            params = {
-                "$select": ",".join(self.TASK_SELECT_FIELDS),
-                "$orderby": "lastModifiedDateTime desc",
-                "$expand": "linkedResources",
-                "$filter": "status ne 'completed'",
-                "$top": str(self.DEFAULT_TOP),
-            }
-
-            task_payloads = self._get_collection(task_url, headers, params=params)
+        flagged_resources: List[LinkedResource] = []
+        for list_metadata, task_payloads in zip(list_metadatas, task_pages):
+            is_flagged_list = self._is_flagged_list(list_metadata)
             for task_payload in task_payloads:
                 linked_resources = self._parse_linked_resources(
                     task_payload.get("linkedResources", []) or [],
                     list_metadata,
                     base_url,
                     headers,
+                    enrich=False,
                 )
+                if is_flagged_list:
+                    flagged_resources.extend(linked_resources)
                 tasks.append(Task.from_graph(task_payload, list_metadata, linked_resources))
 
+        # Resources are shared with the tasks, so enriching them in place updates the tasks
+        self._enrich_flagged_email_resources(flagged_resources, base_url, headers)
         return tasks
 
+    def _sync_tasks_impl(self, user: User, access_token: str, store: TaskStore) -> TaskSyncResult:
+        client = get_graph_client(user, access_token)
+        base_url = self._resolve_base_url(client)
+        headers = self._build_headers(access_token)
+
+        list_metadatas = self._list_metadatas(base_url, headers)
+        delta_links = store.delta_links()
+        list_syncs = self._map_concurrent(
+            lambda metadata: self._sync_list(base_url, headers, metadata, delta_links.get(metadata["list_id"])),
+            list_metadatas,
+        )
+
+        tasks_by_list: List[List[Task]] = []
+        flagged_resources: List[LinkedResource] = []
+        for list_sync in list_syncs:
+            is_flagged_list = self._is_flagged_list(list_sync.list_metadata)
+            tasks: List[Task] = []
+            for payload in list_sync.payloads:
+                linked_resources = self._parse_linked_resources(
+                    payload.get("linkedResources", []) or [],
+                    list_sync.list_metadata,
+                    base_url,
+                    headers,
+                    enrich=False,
+                )
+                if is_flagged_list:
+                    flagged_resources.extend(linked_resources)
+                tasks.append(Task.from_graph(payload, list_sync.list_metadata, linked_resources))
+            tasks_by_list.append(tasks)
+        self._enrich_flagged_email_resources(flagged_resources, base_url, headers)
+
+        result = TaskSyncResult()
+        for list_sync, tasks in zip(list_syncs, tasks_by_list):
+            removed = store.apply_list_sync(
+                list_sync.list_metadata,
+                list_sync.delta_link,
+                tasks,
+                list_sync.removed_ids,
+                replace=list_sync.full,
+            )
+            result.changed_ids.update(task.task_id for task in tasks)
+            result.removed_ids.update(removed)
+            if list_sync.full:
+                result.resynced_lists.append(list_sync.list_metadata["list_id"])
+
+        current_lists = {metadata["list_id"] for metadata in list_metadatas}
+        for list_id in set(delta_links) - current_lists:
+            result.removed_ids.update(store.remove_list(list_id))
+        result.changed_ids -= result.removed_ids
+        logger.info(
+            "To Do delta sync: %s changed, %s removed, %s of %s lists downloaded in full",
+            len(result.changed_ids),
+            len(result.removed_ids),
+            len(result.resynced_lists),
+            len(list_metadatas),
+        )
+        return result
+
+    def _sync_list(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        list_metadata: Dict[str, Optional[str]],
+        delta_link: Optional[str],
+    ) -> _ListSync:
+        list_id = list_metadata["list_id"]
+        if delta_link:
+            try:
+                changes, next_delta_link = self._get_delta(delta_link, headers)
+            except MSGraphTaskRepositoryError as exc:
+                if exc.status_code != 410:
+                    raise
+                logger.info("Delta link for To Do list %s expired; downloading it in full", list_id)
+            else:
+                removed_ids = [change["id"] for change in changes if "@removed" in change and change.get("id")]
+                removed = set(removed_ids)
+                changed_ids = list(
+                    dict.fromkeys(change["id"] for change in changes if change.get("id") and change["id"] not in removed)
+                )
+                # Delta payloads carry no linked resources, so changed tasks are re-read with them
+                payloads, missing_ids = self._get_tasks(base_url, headers, list_id, changed_ids)
+                open_payloads = [payload for payload in payloads if payload.get("status") != "completed"]
+                removed_ids.extend(missing_ids)
+                removed_ids.extend(payload["id"] for payload in payloads if payload.get("status") == "completed")
+                return _ListSync(list_metadata, next_delta_link, open_payloads, removed_ids, full=False)
+
+        # Take the delta link before listing, so changes made meanwhile show up in the next sync.
+        # The listing returns 100 open tasks per page with their linked resources, where
+        # re-reading the delta round's ids would cost one throttled sub-request per task.
+        _, next_delta_link = self._get_delta(f"{base_url}/me/todo/lists/{list_id}/tasks/delta", headers)
+        payloads = self._get_collection(
+            f"{base_url}/me/todo/lists/{list_id}/tasks", headers, params=self._task_params()
+        )
+        return _ListSync(list_metadata, next_delta_link, payloads, [], full=True)
+
+    def _get_delta(self, url: str, headers: Dict[str, str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Follow a delta query's pages; return the changes and the delta link for the next round."""
+
+        changes: List[Dict[str, Any]] = []
+        next_url: Optional[str] = url
+        visited: set[str] = set()
+        while next_url:
+            visited.add(next_url)
+            response = self._http_get(next_url, headers)
+            changes.extend(response.get("value", []) or [])
+            delta_link = response.get("@odata.deltaLink")
+            if delta_link:
+                return changes, delta_link
+            next_url = self._extract_next_link(response)
+            if next_url in visited:
+                break
+        logger.warning("Graph delta query for %s ended without a delta link", self._redact_url(url))
+        return changes, None
+
+    def _get_tasks(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        list_id: str,
+        task_ids: List[str],
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Read tasks with their linked resources via ``$batch``; return payloads and ids that no longer exist.
+
+        Called from list workers, so the ``$batch`` calls run on the caller's thread.
+        """
+
+        query = f"$select={','.join(self.TASK_SELECT_FIELDS)}&$expand=linkedResources"
+        urls = [f"/me/todo/lists/{list_id}/tasks/{task_id}?{query}" for task_id in task_ids]
+        payloads: List[Dict[str, Any]] = []
+        missing: List[str] = []
+        results = self._batch_get(urls, base_url, headers, concurrent=False)
+        for task_id, url, (status, body) in zip(task_ids, urls, results):
+            if status == 404:
+                missing.append(task_id)
+                continue
+            if not 200 <= status < 300:
+                # Throttled, failed or unbatched: read it directly, letting real errors abort the sync
+                try:
+                    body = self._http_get(f"{base_url}{url}", headers)
+                except MSGraphTaskRepositoryError as exc:
+                    if exc.status_code != 404:
+                        raise
+                    missing.append(task_id)
+                    continue
+            payloads.append(body)
+        return payloads, missing
+
     def _update_task_impl(
         self,
         user: User,
@@ -199,6 +399,31 @@ class MSGraphTaskRepository:
         updated_task = Task.from_graph(refreshed_payload, list_metadata, linked_resources)
         return updated_task
 
+    def _list_metadatas(self, base_url: str, headers: Dict[str, str]) -> List[Dict[str, Optional[str]]]:
+        list_items = self._get_collection(
+            f"{base_url}/me/todo/lists",
+            headers,
+            params={"$select": ",".join(self.LIST_SELECT_FIELDS)},
+        )
+        return [
+            {
+                "list_id": list_payload.get("id"),
+                "list_name": list_payload.get("displayName"),
+                "wellknown_list_name": list_payload.get("wellknownListName"),
+            }
+            for list_payload in list_items
+            if list_payload.get("id")
+        ]
+
+    def _task_params(self) -> Dict[str, str]:
+        return {
+            "$select": ",".join(self.TASK_SELECT_FIELDS),
+            "$orderby": "lastModifiedDateTime desc",
+            "$expand": "linkedResources",
+            "$filter": "status ne 'completed'",
+            "$top": str(self.DEFAULT_TOP),
+        }
+
     # ------------------------------------------------------------------
     # HTTP helpers
     # ------------------------------------------------------------------
@@ -220,11 +445,43 @@ class MSGraphTaskRepository:
         response = self._send_request("PATCH", url, headers=headers, json=payload)
         if response.status_code >= 400:
             raise MSGraphTaskRepositoryError(
-                f"Graph PATCH failed ({response.status_code}) for {self._redact_url(url)}: {response.text}"
+                f"Graph PATCH failed ({response.status_code}) for {self._redact_url(url)}: {response.text}",
+                response.status_code,
             )
 
+    def _http_post(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        response = self._send_request("POST", url, headers=headers, json=payload)
+        return response.json() if self._has_body(response) else {}
+
+    def _get_http_client(self) -> requests.Session:
+        """Return the injected client, or a session pooling one connection per worker."""
+
+        if self._http_client is None:
+            with self._session_lock:
+                if self._http_client is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._max_workers)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._http_client = session
+        return self._http_client
+
+    def _map_concurrent(self, func: Callable[[_Item], _Result], items: Sequence[_Item]) -> List[_Result]:
+        """Apply ``func`` to ``items`` on up to ``max_workers`` threads; results keep item order."""
+
+        workers = min(self._max_workers, len(items))
+        if workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="todo-graph") as executor:
+            return list(executor.map(func, items))
+
     def _send_request(self, method: str, url: str, **kwargs: Any):
-        client = self._http_client or requests
+        client = self._get_http_client()
         try:
             response = client.request(
                 method,
@@ -239,7 +496,8 @@ class MSGraphTaskRepository:
 
         if response.status_code >= 400:
             raise MSGraphTaskRepositoryError(
-                f"Graph {method} failed ({response.status_code}) for {self._redact_url(url)}: {response.text}"
+                f"Graph {method} failed ({response.status_code}) for {self._redact_url(url)}: {response.text}",
+                response.status_code,
             )
         return response
 
@@ -286,36 +544,124 @@ class MSGraphTaskRepository:
             or response.get("@odata.nextlink")
         )
 
+    @staticmethod
+    def _is_flagged_list(list_metadata: Dict[str, Optional[str]]) -> bool:
+        return (list_metadata.get("wellknown_list_name") or "").lower() == "flaggedemails"
+
     def _parse_linked_resources(
         self,
         raw_resources: Iterable[Dict[str, Any]],
         list_metadata: Dict[str, Optional[str]],
         base_url: str,
         headers: Dict[str, str],
+        *,
+        enrich: bool = True,
     ) -> List[LinkedResource]:
         resources: List[LinkedResource] = []
-        is_flagged_list = (list_metadata.get("wellknown_list_name") or "").lower() == "flaggedemails"
 
         for raw in raw_resources:
-            resource = LinkedResource(
-                resource_id=raw.get("id"),
-                application_name=raw.get("applicationName"),
-                display_name=raw.get("displayName"),
-                external_id=raw.get("externalId"),
-                web_url=raw.get("webUrl"),
-                resource_type=raw.get("@odata.type") or raw.get("type"),
-                preview=raw.get("preview"),
-                body=raw.get("body"),
-                body_content_type=raw.get("bodyContentType"),
-                raw=raw,
+            resources.append(
+                LinkedResource(
+                    resource_id=raw.get("id"),
+                    application_name=raw.get("applicationName"),
+                    display_name=raw.get("displayName"),
+                    external_id=raw.get("externalId"),
+                    web_url=raw.get("webUrl"),
+                    resource_type=raw.get("@odata.type") or raw.get("type"),
+                    preview=raw.get("preview"),
+                    body=raw.get("body"),
+                    body_content_type=raw.get("bodyContentType"),
+                    raw=raw,
+                )
             )
 
-            if is_flagged_list:
+        if enrich and self._is_flagged_list(list_metadata):
+            self._enrich_flagged_email_resources(resources, base_url, headers)
+
+        return resources
+
+    def _enrich_flagged_email_resources(
+        self,
+        resources: Iterable[LinkedResource],
+        base_url: str,
+        headers: Dict[str, str],
+    ) -> None:
+        """Fill in flagged-email resources from their source messages, 20 messages per ``$batch`` call."""
+
+        by_message: Dict[str, List[LinkedResource]] = {}
+        for resource in resources:
+            if (resource.preview and resource.body) or not resource.external_id:
+                continue
+            by_message.setdefault(resource.external_id, []).append(resource)
+
+        if len(by_message) == 1:
+            # A batch of one costs the same request as a plain GET
+            for resource in next(iter(by_message.values())):
                 self._enrich_flagged_email_resource(resource, base_url, headers)
+            return
 
-            resources.append(resource)
+        message_ids = list(by_message)
+        urls = [f"/me/messages/{message_id}?$select={self.MESSAGE_SELECT_FIELDS}" for message_id in message_ids]
+        retry: List[str] = []
+        for message_id, (status, message_payload) in zip(message_ids, self._batch_get(urls, base_url, headers)):
+            if 200 <= status < 300:
+                for resource in by_message[message_id]:
+                    self._apply_message_payload(resource, message_payload)
+            elif status == 429 or status >= 500:
+                retry.append(message_id)
+            elif status:
+                logger.debug("Unable to enrich flagged email resource %s: HTTP %s", message_id, status)
+
+        # Throttled or server-failed messages get one direct attempt each
+        for message_id in retry:
+            for resource in by_message[message_id]:
+                self._enrich_flagged_email_resource(resource, base_url, headers)
 
-        return resources
+    def _batch_get(
+        self,
+        urls: List[str],
+        base_url: str,
+        headers: Dict[str, str],
+        *,
+        concurrent: bool = True,
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        GET Graph-relative ``urls`` through ``$batch`` calls of 20.
+
+        The calls run on the worker pool, or one after another on the
+        caller's thread without ``concurrent`` (callers already running on
+        the pool must not start a nested one, which would overflow the
+        connection pool sized to ``max_workers``).
+
+        Returns ``(status, body)`` per URL in order; status is 0 for URLs
+        whose whole ``$batch`` call failed or that got no response.
+        """
+
+        chunks = [urls[start : start + self.GRAPH_BATCH_LIMIT] for start in range(0, len(urls), self.GRAPH_BATCH_LIMIT)]
+        post_headers = deepcopy(headers)
+        post_headers["Content-Type"] = "application/json"
+
+        def send(chunk: List[str]) -> List[Tuple[int, Dict[str, Any]]]:
+            results: List[Tuple[int, Dict[str, Any]]] = [(0, {})] * len(chunk)
+            batch_payload = {
+                "requests": [{"id": str(index), "method": "GET", "url": url} for index, url in enumerate(chunk)]
+            }
+            try:
+                response = self._http_post(f"{base_url}/$batch", post_headers, batch_payload)
+            except MSGraphTaskRepositoryError as exc:
+                logger.debug("Graph $batch of %s requests failed: %s", len(chunk), exc)
+                return results
+            for item in response.get("responses", []) or []:
+                try:
+                    index = int(item.get("id"))
+                except (TypeError, ValueError):
+                    continue
+                if 0 <= index < len(chunk):
+                    results[index] = (int(item.get("status") or 0), item.get("body") or {})
+            return results
+
+        chunk_results = self._map_concurrent(send, chunks) if concurrent else [send(chunk) for chunk in chunks]
+        return [result for results in chunk_results for result in results]
 
     def _enrich_flagged_email_resource(
         self,
@@ -331,13 +677,17 @@ class MSGraphTaskRepository:
 
         # Fetch the source email for additional context
         message_url = f"{base_url}/me/messages/{resource.external_id}"
-        params = {"$select": "bodyPreview,body,webLink"}
+        params = {"$select": self.MESSAGE_SELECT_FIELDS}
         try:
             message_payload = self._http_get(message_url, headers, params=params)
         except MSGraphTaskRepositoryError as exc:
             logger.debug("Unable to enrich flagged email resource %s: %s", resource.external_id, exc)
             return
 
+        self._apply_message_payload(resource, message_payload)
+
+    @staticmethod
+    def _apply_message_payload(resource: LinkedResource, message_payload: Dict[str, Any]) -> None:
         resource.preview = resource.preview or message_payload.get("bodyPreview")
         body = message_payload.get("body") or {}
         resource.body = resource.body or body.get("content")
@@ -0,0 +1,249 @@
+"""Local SQLite mirror of Microsoft To Do tasks, kept current with Graph delta queries."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from core.todo.models import LinkedResource, Task
+
+
+@dataclass(slots=True)
+class TaskSyncResult:
+    """Tasks added or modified, and tasks removed or completed, by one sync."""
+
+    changed_ids: Set[str] = field(default_factory=set)
+    removed_ids: Set[str] = field(default_factory=set)
+    # Lists downloaded in full because they had no (valid) delta link
+    resynced_lists: List[str] = field(default_factory=list)
+
+    @property
+    def touched_ids(self) -> Set[str]:
+        return self.changed_ids | self.removed_ids
+
+
+def task_record(task: Task) -> Dict[str, Any]:
+    """Flatten a task into the mapping the clustering and AI dedup services read."""
+
+    preview = next((resource.preview for resource in task.linked_resources if resource.preview), None)
+    due = task.due_date_time.date_time if task.due_date_time else None
+    return {
+        "id": task.task_id,
+        "etag": task.etag,
+        "title": task.title,
+        "body": task.body_content,
+        "body_preview": task.body_preview,
+        "list_id": task.list_id,
+        "list_name": task.list_name,
+        "status": task.status,
+        "importance": task.importance,
+        "categories": list(task.categories),
+        "due": due,
+        "is_reminder_on": task.is_reminder_on,
+        "linked_message_preview": preview,
+        "last_modified": task.last_modified_datetime.isoformat() if task.last_modified_datetime else None,
+    }
+
+
+class TaskStore:
+    """
+    SQLite file holding open To Do tasks, their linked resources and a delta link per list.
+
+    ``MSGraphTaskRepository.sync_tasks`` fills it: each list's changes since
+    its stored delta link are applied in one transaction together with the
+    new link, so an interrupted sync leaves the previous consistent state.
+    Tasks keep their Graph payload and etag; linked resources keep their
+    enriched preview and body. The last clustering can be saved by task key
+    so the next run re-clusters only around changed tasks::
+
+        result = repository.sync_tasks(user, token, store)
+        records = store.records()
+        clusters, touched = clustering.recluster_changed(records, store.load_clusters(), result.touched_ids)
+        decisions = ai_dedup.process_clusters(tasks=records, clusters=touched, available_lists=lists)
+        store.save_clusters(records, clusters)
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.executescript(
+            "CREATE TABLE IF NOT EXISTS todo_store_lists ("
+            " list_id TEXT PRIMARY KEY, list_name TEXT, wellknown_list_name TEXT,"
+            " delta_link TEXT, synced_at REAL);"
+            "CREATE TABLE IF NOT EXISTS todo_store_tasks ("
+            " task_id TEXT PRIMARY KEY, list_id TEXT NOT NULL, etag TEXT,"
+            " last_modified TEXT, payload TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS ix_todo_store_tasks_list ON todo_store_tasks (list_id);"
+            "CREATE TABLE IF NOT EXISTS todo_store_linked_resources ("
+            " task_id TEXT NOT NULL, position INTEGER NOT NULL, resource_id TEXT,"
+            " external_id TEXT, payload TEXT NOT NULL, PRIMARY KEY (task_id, position));"
+            "CREATE TABLE IF NOT EXISTS todo_store_clusters ("
+            " task_id TEXT PRIMARY KEY, cluster INTEGER NOT NULL);"
+        )
+        self._connection.commit()
+
+    # ------------------------------------------------------------------
+    # Sync state
+    # ------------------------------------------------------------------
+    def delta_links(self) -> Dict[str, Optional[str]]:
+        """Stored delta link by list id (None for lists never synced incrementally)."""
+
+        with self._lock:
+            return dict(self._connection.execute("SELECT list_id, delta_link FROM todo_store_lists"))
+
+    def apply_list_sync(
+        self,
+        list_metadata: Dict[str, Optional[str]],
+        delta_link: Optional[str],
+        tasks: Sequence[Task],
+        removed_ids: Iterable[str] = (),
+        *,
+        replace: bool = False,
+    ) -> Set[str]:
+        """
+        Upsert ``tasks``, delete ``removed_ids`` and store ``delta_link`` for one list.
+
+        With ``replace`` the tasks are the list's complete contents and any
+        other stored task of the list is deleted. Returns the ids deleted.
+        """
+
+        list_id = list_metadata["list_id"]
+        with self._lock, self._connection:
+            removed = {task_id for task_id in removed_ids}
+            if replace:
+                kept = {task.task_id for task in tasks}
+                stored = self._connection.execute(
+                    "SELECT task_id FROM todo_store_tasks WHERE list_id = ?", (list_id,)
+                )
+                removed.update(task_id for (task_id,) in stored if task_id not in kept)
+            self._delete_tasks(removed)
+            for task in tasks:
+                self._upsert_task(task)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO todo_store_lists"
+                " (list_id, list_name, wellknown_list_name, delta_link, synced_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    list_id,
+                    list_metadata.get("list_name"),
+                    list_metadata.get("wellknown_list_name"),
+                    delta_link,
+                    time.time(),
+                ),
+            )
+        return removed
+
+    def remove_list(self, list_id: str) -> Set[str]:
+        """Forget a list that no longer exists; return the ids of its tasks."""
+
+        with self._lock, self._connection:
+            removed = {
+                task_id
+                for (task_id,) in self._connection.execute(
+                    "SELECT task_id FROM todo_store_tasks WHERE list_id = ?", (list_id,)
+                )
+            }
+            self._delete_tasks(removed)
+            self._connection.execute("DELETE FROM todo_store_lists WHERE list_id = ?", (list_id,))
+        return removed
+
+    def _upsert_task(self, task: Task) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO todo_store_tasks (task_id, list_id, etag, last_modified, payload)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (
+                task.task_id,
+                task.list_id,
+                task.etag,
+                task.last_modified_datetime.isoformat() if task.last_modified_datetime else None,
+                json.dumps(task.raw),
+            ),
+        )
+        self._connection.execute("DELETE FROM todo_store_linked_resources WHERE task_id = ?", (task.task_id,))
+        self._connection.executemany(
+            "INSERT INTO todo_store_linked_resources (task_id, position, resource_id, external_id, payload)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [
+                (task.task_id, position, resource.resource_id, resource.external_id, json.dumps(asdict(resource)))
+                for position, resource in enumerate(task.linked_resources)
+            ],
+        )
+
+    def _delete_tasks(self, task_ids: Set[str]) -> None:
+        rows = [(task_id,) for task_id in task_ids]
+        self._connection.executemany("DELETE FROM todo_store_tasks WHERE task_id = ?", rows)
+        self._connection.executemany("DELETE FROM todo_store_linked_resources WHERE task_id = ?", rows)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def tasks(self) -> List[Task]:
+        """All stored tasks, by list then most recently modified first."""
+
+        with self._lock:
+            resources: Dict[str, List[LinkedResource]] = {}
+            for task_id, payload in self._connection.execute(
+                "SELECT task_id, payload FROM todo_store_linked_resources ORDER BY task_id, position"
+            ):
+                resources.setdefault(task_id, []).append(LinkedResource(**json.loads(payload)))
+            rows = self._connection.execute(
+                "SELECT t.task_id, t.payload, l.list_id, l.list_name, l.wellknown_list_name"
+                " FROM todo_store_tasks t JOIN todo_store_lists l ON l.list_id = t.list_id"
+                " ORDER BY l.rowid, t.last_modified DESC, t.task_id"
+            ).fetchall()
+
+        return [
+            Task.from_graph(
+                json.loads(payload),
+                {"list_id": list_id, "list_name": list_name, "wellknown_list_name": wellknown},
+                resources.get(task_id, []),
+            )
+            for task_id, payload, list_id, list_name, wellknown in rows
+        ]
+
+    def records(self) -> List[Dict[str, Any]]:
+        """All stored tasks as :func:`task_record` mappings."""
+
+        return [task_record(task) for task in self.tasks()]
+
+    # ------------------------------------------------------------------
+    # Clusters from the previous run
+    # ------------------------------------------------------------------
+    def save_clusters(self, tasks: Sequence[Any], clusters: Iterable[Any]) -> None:
+        """Store cluster membership by task id; singletons need not be kept."""
+
+        rows = []
+        for number, cluster in enumerate(clusters):
+            if cluster.size > 1:
+                rows.extend((_record_id(tasks[index]), number) for index in cluster.indices)
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM todo_store_clusters")
+            self._connection.executemany("INSERT INTO todo_store_clusters (task_id, cluster) VALUES (?, ?)", rows)
+
+    def load_clusters(self) -> List[List[str]]:
+        """Task ids of each saved multi-task cluster."""
+
+        clusters: Dict[int, List[str]] = {}
+        with self._lock:
+            for task_id, cluster in self._connection.execute(
+                "SELECT task_id, cluster FROM todo_store_clusters ORDER BY cluster, rowid"
+            ):
+                clusters.setdefault(cluster, []).append(task_id)
+        return list(clusters.values())
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def _record_id(task: Any) -> str:
+    return str(task.task_id if isinstance(task, Task) else task["id"])
+
+
+__all__ = ["TaskStore", "TaskSyncResult", "task_record"]
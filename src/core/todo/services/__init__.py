@@ -3,10 +3,13 @@
 from .clustering_service import TaskClusteringService  # noqa: F401
 from .duplicate_scoring import DuplicatePriorityScorer  # noqa: F401
 from .exact_duplicate_service import ExactDuplicateService  # noqa: F401
+from .semantic_backend import SemanticBackend, build_semantic_backend  # noqa: F401
 
 __all__ = [
     "TaskClusteringService",
     "DuplicatePriorityScorer",
     "ExactDuplicateService",
+    "SemanticBackend",
+    "build_semantic_backend",
 ]
 
@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterable, List, Sequence
+import math
+import re
+from collections import defaultdict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+import numpy as np
 
 from core.todo.config import TodoDedupConfig
 from core.todo.models import Task, TaskCluster
 
+from .exact_duplicate_service import _task_key
+from .semantic_backend import SemanticBackend, build_semantic_backend
+from .text_normalization import normalize_text
+
 try:  # pragma: no cover - import failure handled in runtime path
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
 except ImportError as exc:  # pragma: no cover - should be caught via tests
     raise RuntimeError("rapidfuzz is required for TaskClusteringService") from exc
 
@@ -35,11 +45,303 @@ def _get_text(task: Any, keys: Iterable[str]) -> str:
     return ""
 
 
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def _normalize(text: str) -> str:
+    """Lowercase ``text`` and collapse punctuation and whitespace to single spaces."""
+
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def _tokens(text: str) -> Set[str]:
+    """Return the distinct normalized word tokens of ``text``."""
+
+    return set(_normalize(text).split())
+
+
+def candidate_pairs(texts: Sequence[str], min_overlap: float = 0.5) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the index pairs (lower index first) worth fuzzy scoring.
+
+    Two blocking passes are combined: token overlap (see
+    :func:`_token_overlap_pairs`) catches rewordings and containment, and
+    MinHash LSH over character shingles (see :func:`_minhash_pairs`) catches
+    typos that split or join words. Each pair is yielded once.
+    """
+
+    return _with_extra_pairs(_token_overlap_pairs(texts, min_overlap), _minhash_pairs(texts))
+
+
+def _with_extra_pairs(
+    pairs: Iterable[Tuple[int, int]], extra: Iterable[Tuple[int, int]]
+) -> Iterator[Tuple[int, int]]:
+    """Yield ``pairs``, then the pairs of ``extra`` not already yielded."""
+
+    remaining = set(extra)
+    for pair in pairs:
+        remaining.discard(pair)
+        yield pair
+    yield from sorted(remaining)
+
+
+def _token_overlap_pairs(texts: Sequence[str], min_overlap: float) -> Iterator[Tuple[int, int]]:
+    """
+    Yield pairs sharing at least ``min_overlap`` of the tokens of the one with fewer tokens.
+
+    Prefix filtering finds every such pair without comparing all of them:
+    tokens are ordered from rarest to most common, and each text probes the
+    inverted index only with its rarest
+    ``|tokens| - ceil(min_overlap * |tokens|) + 1`` tokens, against texts
+    with at least as many tokens. Frequent tokens ("email", "call") therefore
+    rarely drive the search. Texts without tokens never pair.
+    """
+
+    token_sets = [_tokens(text) for text in texts]
+    vocabulary: Dict[str, int] = {}
+    encoded = [
+        np.fromiter(
+            (vocabulary.setdefault(token, len(vocabulary)) for token in token_set),
+            dtype=np.int64,
+            count=len(token_set),
+        )
+        for token_set in token_sets
+    ]
+    if not vocabulary:
+        return
+
+    # Rank texts by token count so a probe only reads postings after its own rank
+    order = sorted(range(len(texts)), key=lambda index: (len(encoded[index]), index))
+    rank_of = np.empty(len(texts), dtype=np.int64)
+    rank_of[order] = np.arange(len(texts))
+
+    lengths = np.fromiter((len(tokens) for tokens in encoded), dtype=np.int64, count=len(encoded))
+    all_tokens = np.concatenate(encoded)
+    all_ranks = np.repeat(rank_of, lengths)
+    by_token = np.lexsort((all_ranks, all_tokens))
+    all_tokens, all_ranks = all_tokens[by_token], all_ranks[by_token]
+    document_frequency = np.bincount(all_tokens, minlength=len(vocabulary))
+    starts = np.concatenate(([0], np.cumsum(document_frequency)))
+
+    for rank, index in enumerate(order):
+        tokens = encoded[index]
+        size = len(tokens)
+        if not size:
+            continue
+        required = max(1, math.ceil(min_overlap * size))
+        prefix = tokens[np.lexsort((tokens, document_frequency[tokens]))][: size - required + 1]
+        chunks = []
+        for token in prefix:
+            postings = all_ranks[starts[token] : starts[token + 1]]
+            chunks.append(postings[np.searchsorted(postings, rank, side="right") :])
+        token_set = token_sets[index]
+        for position in np.unique(np.concatenate(chunks)).tolist():
+            other = order[position]
+            if len(token_set & token_sets[other]) >= required:
+                yield (index, other) if index < other else (other, index)
+
+
+# Prime modulus for the MinHash hash family (a * x + b) mod p
+_MINHASH_PRIME = (1 << 31) - 1
+
+
+def _minhash_pairs(
+    texts: Sequence[str],
+    shingle_size: int = 4,
+    bands: int = 10,
+    rows: int = 3,
+    seed: int = 1,
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield pairs whose character shingles collide in a MinHash LSH band.
+
+    Shingles are taken from the normalized text with spaces removed, so
+    "Chec kgalgal" and "Check galgal" look alike. With 10 bands of 3 rows a
+    pair with shingle Jaccard similarity 0.6 is found with probability ~0.91
+    and 0.8 with ~0.9997, while pairs below 0.3 rarely collide. Pairs may
+    repeat across bands.
+    """
+
+    rng = np.random.default_rng(seed)
+    count = bands * rows
+    multipliers = rng.integers(1, _MINHASH_PRIME, size=count, dtype=np.int64)
+    offsets = rng.integers(0, _MINHASH_PRIME, size=count, dtype=np.int64)
+
+    vocabulary: Dict[str, int] = {}
+    buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+    for index, text in enumerate(texts):
+        compact = _normalize(text).replace(" ", "")
+        if not compact:
+            continue
+        shingles = {compact[i : i + shingle_size] for i in range(max(len(compact) - shingle_size + 1, 1))}
+        ids = np.fromiter(
+            (vocabulary.setdefault(shingle, len(vocabulary)) for shingle in shingles),
+            dtype=np.int64,
+            count=len(shingles),
+        )
+        signature = ((np.outer(ids, multipliers) + offsets) % _MINHASH_PRIME).min(axis=0)
+        for band in range(bands):
+            buckets[(band, signature[band * rows : (band + 1) * rows].tobytes())].append(index)
+
+    for members in buckets.values():
+        for position, left in enumerate(members):
+            for right in members[position + 1 :]:
+                yield left, right
+
+
+# Candidate pairs scored per rapidfuzz call; bounds the index and score arrays
+_SCORE_BATCH_SIZE = 100_000
+# Rows of the title matrix computed per cdist call in exhaustive mode
+_EXHAUSTIVE_ROWS = 2000
+
+
+def _title_cutoff(threshold: float, use_body: bool) -> float:
+    """Lowest title score that ``0.7 * title + 30`` could still lift to ``threshold``."""
+
+    if not use_body:
+        return threshold
+    return max(0.0, (threshold - 30) / 0.7)
+
+
+def score_pairs(
+    titles: Sequence[str],
+    bodies: Sequence[str],
+    left: np.ndarray,
+    right: np.ndarray,
+    threshold: float,
+    *,
+    use_body: bool = True,
+    similarity: np.ndarray | None = None,
+    semantic_threshold: float = 0.45,
+    semantic_weight: float = 0.0,
+) -> np.ndarray:
+    """
+    Return a boolean mask of the pairs ``(left[k], right[k])`` that match.
+
+    A pair's fuzzy score is ``max(int(0.7 * title + 0.3 * body), title)``
+    using rapidfuzz ``partial_ratio``; the body term is 0 when either body
+    is empty. Title scores for all pairs come from one ``process.cpdist``
+    call on all cores, with a ``score_cutoff`` below which no body could
+    lift the pair to ``threshold``; bodies are scored only for pairs between
+    that cutoff and the threshold.
+
+    With ``similarity`` (cosine similarity per pair) and a positive
+    ``semantic_weight`` a pair also matches when
+    ``(1 - w) * fuzzy / threshold + w * similarity / semantic_threshold``
+    reaches 1, i.e. each signal is measured against its own bar. Semantic
+    similarity can only add matches, never remove fuzzy ones.
+    """
+
+    if not len(left):
+        return np.zeros(0, dtype=bool)
+
+    blend = similarity is not None and semantic_weight > 0
+    # Blending needs real fuzzy scores for every pair, not just those near the threshold
+    cutoff = 0.0 if blend else _title_cutoff(threshold, use_body)
+    title_scores = process.cpdist(
+        [titles[index] for index in left.tolist()],
+        [titles[index] for index in right.tolist()],
+        scorer=fuzz.partial_ratio,
+        score_cutoff=cutoff,
+        dtype=np.float64,
+        workers=-1,
+    )
+    matched = title_scores >= threshold
+    fuzzy_scores = title_scores
+
+    if use_body:
+        has_body = np.fromiter((bool(body) for body in bodies), dtype=bool, count=len(bodies))
+        pending = np.flatnonzero(~matched & (title_scores >= cutoff) & has_body[left] & has_body[right])
+        if len(pending):
+            body_scores = process.cpdist(
+                [bodies[index] for index in left[pending].tolist()],
+                [bodies[index] for index in right[pending].tolist()],
+                scorer=fuzz.partial_ratio,
+                dtype=np.float64,
+                workers=-1,
+            )
+            combined = np.floor(0.7 * title_scores[pending] + 0.3 * body_scores)
+            matched[pending] = combined >= threshold
+            fuzzy_scores = title_scores.copy()
+            fuzzy_scores[pending] = np.maximum(combined, title_scores[pending])
+
+    if blend:
+        blended = (1 - semantic_weight) * fuzzy_scores / threshold + semantic_weight * similarity / semantic_threshold
+        matched |= blended >= 1.0
+    return matched
+
+
+def _batched_pairs(pairs: Iterable[Tuple[int, int]], size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Group an iterable of index pairs into ``(left, right)`` arrays of at most ``size``."""
+
+    iterator = iter(pairs)
+    while True:
+        chunk = np.array(list(islice(iterator, size)), dtype=np.int64)
+        if not len(chunk):
+            return
+        yield chunk[:, 0], chunk[:, 1]
+
+
+def _exhaustive_pairs(titles: Sequence[str], cutoff: float) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield every pair ``i < j`` whose title score reaches ``cutoff``, from row blocks of a cdist matrix."""
+
+    for start in range(0, len(titles), _EXHAUSTIVE_ROWS):
+        scores = process.cdist(
+            titles[start : start + _EXHAUSTIVE_ROWS],
+            titles,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=cutoff,
+            dtype=np.float64,
+            workers=-1,
+        )
+        rows, columns = np.nonzero(scores >= cutoff)
+        rows += start
+        upper = rows < columns
+        yield rows[upper], columns[upper]
+
+
+class _DisjointSet:
+    """Union-find over ``0..size-1`` with path halving and union by size."""
+
+    def __init__(self, size: int):
+        self._parent = list(range(size))
+        self._size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, left: int, right: int) -> None:
+        left, right = self.find(left), self.find(right)
+        if left == right:
+            return
+        if self._size[left] < self._size[right]:
+            left, right = right, left
+        self._parent[right] = left
+        self._size[left] += self._size[right]
+
+    def groups(self) -> List[List[int]]:
+        """Return the members of each set, sorted, ordered by smallest member."""
+
+        members: Dict[int, List[int]] = {}
+        for item in range(len(self._parent)):
+            members.setdefault(self.find(item), []).append(item)
+        return sorted(members.values(), key=lambda group: group[0])
+
+
 class TaskClusteringService:
-    """Cluster tasks using fuzzy matching heuristics."""
+    """Cluster tasks using fuzzy matching heuristics, optionally blended with embeddings."""
 
-    def __init__(self, config: TodoDedupConfig | None = None):
+    def __init__(
+        self,
+        config: TodoDedupConfig | None = None,
+        semantic_backend: SemanticBackend | None = None,
+    ):
         self._config = config or TodoDedupConfig.from_env()
+        self._semantic_backend = semantic_backend or build_semantic_backend(self._config)
 
     @property
     def config(self) -> TodoDedupConfig:
@@ -54,53 +356,217 @@ class TaskClusteringService:
         threshold: int | None = None,
         include_singletons: bool = True,
         use_body: bool = True,
+        blocking: bool = True,
     ) -> List[TaskCluster]:
-        """Group tasks into clusters of similar titles/bodies."""
+        """
+        Group tasks into clusters of similar titles/bodies.
+
+        With ``blocking`` only pairs returned by :func:`candidate_pairs` are
+        scored; otherwise every pair is. Titles and bodies are compared
+        case-insensitively after :func:`normalize_text`, in bulk through
+        :func:`score_pairs`. With a semantic backend, pairs proposed by its
+        nearest-neighbour index are scored too, and cosine similarity is
+        blended in by ``config.semantic_weight``. Matching pairs are joined with
+        union-find, so membership is transitive and does not depend on task
+        order. Clusters are ordered by their lowest task index.
+        """
 
         if not tasks:
             return []
 
         effective_threshold = threshold or self.config.fuzzy_score_threshold
+        titles, bodies, embeddings = self._prepare(tasks, use_body)
+        disjoint_set = _DisjointSet(len(titles))
+        self._join_matches(disjoint_set, titles, bodies, embeddings, effective_threshold, use_body, blocking)
+
+        clusters: List[TaskCluster] = []
+        for member_indices in disjoint_set.groups():
+            if len(member_indices) > 1 or include_singletons:
+                clusters.append(TaskCluster(cluster_id=len(clusters) + 1, indices=member_indices))
+
+        return clusters
+
+    def recluster_changed(
+        self,
+        tasks: Sequence[Any],
+        previous_clusters: Iterable[Iterable[str]],
+        changed_keys: Iterable[str],
+        *,
+        threshold: int | None = None,
+        include_singletons: bool = True,
+        use_body: bool = True,
+    ) -> Tuple[List[TaskCluster], List[TaskCluster]]:
+        """
+        Update an earlier clustering of ``tasks`` after some of them changed.
+
+        ``previous_clusters`` holds the task keys of each earlier multi-task
+        cluster and ``changed_keys`` the keys of tasks added, modified or
+        removed since. Only the neighbourhood of the change is clustered
+        again: the changed tasks, the tasks matching one of them (found by
+        scoring changed tasks against all others), and every member of an
+        earlier cluster containing any of those. Earlier clusters outside it
+        cannot have changed, because clusters are closed under matching.
+
+        Returns all clusters, ordered and numbered as :meth:`cluster_tasks`
+        does, and the subset inside the neighbourhood, which are the only
+        ones whose dedup decisions need revisiting.
+        """
+
+        effective_threshold = threshold or self.config.fuzzy_score_threshold
+        changed_keys = set(changed_keys)
+        position = {_task_key(task): index for index, task in enumerate(tasks)}
+        previous_keys = [list(cluster) for cluster in previous_clusters]
+        previous = [[position[key] for key in cluster if key in position] for cluster in previous_keys]
+        cluster_of = {index: number for number, members in enumerate(previous) for index in members}
+
+        changed = sorted(position[key] for key in changed_keys if key in position)
+        neighbourhood = set(changed)
+        # Clusters that lost or changed a member may split
+        for number, cluster in enumerate(previous_keys):
+            if changed_keys.intersection(cluster):
+                neighbourhood.update(previous[number])
+
+        groups: List[List[int]] = []
+        if neighbourhood:
+            titles, bodies, embeddings = self._prepare(tasks, use_body)
+            if changed:
+                pairs = self._changed_pairs(titles, embeddings, changed, effective_threshold, use_body)
+                for first, second in self._matching_pairs(
+                    titles, bodies, embeddings, pairs, effective_threshold, use_body
+                ):
+                    neighbourhood.update((first, second))
+            for index in list(neighbourhood):
+                if index in cluster_of:
+                    neighbourhood.update(previous[cluster_of[index]])
+
+            members = sorted(neighbourhood)
+            disjoint_set = _DisjointSet(len(members))
+            self._join_matches(
+                disjoint_set,
+                [titles[index] for index in members],
+                [bodies[index] for index in members],
+                embeddings[members] if embeddings is not None else None,
+                effective_threshold,
+                use_body,
+                blocking=True,
+            )
+            groups = [[members[local] for local in group] for group in disjoint_set.groups()]
+
+        kept = [members for members in previous if len(members) > 1 and not neighbourhood.intersection(members)]
+        clustered = {index for members in kept + groups for index in members}
+        singletons = [[index] for index in range(len(tasks)) if index not in clustered]
+
+        clusters: List[TaskCluster] = []
+        touched: List[TaskCluster] = []
+        for member_indices in sorted(kept + groups + singletons, key=lambda members: members[0]):
+            if len(member_indices) == 1 and not include_singletons:
+                continue
+            cluster = TaskCluster(cluster_id=len(clusters) + 1, indices=member_indices)
+            clusters.append(cluster)
+            if member_indices[0] in neighbourhood:
+                touched.append(cluster)
+        return clusters, touched
+
+    def _prepare(
+        self, tasks: Sequence[Any], use_body: bool
+    ) -> Tuple[List[str], List[str], np.ndarray | None]:
+        """Return normalized titles and bodies, and embeddings when a semantic backend is set."""
 
         titles = []
         bodies = []
         for task in tasks:
             title = _get_text(task, ("original_title", "title", "body_preview"))
             body = _get_text(task, ("body", "body_content", "summary")) if use_body else ""
-            titles.append(title)
-            bodies.append(body[:200] if body else "")
+            titles.append(normalize_text(title))
+            bodies.append(normalize_text(body)[:200] if body else "")
 
-        visited: set[int] = set()
-        clusters: List[TaskCluster] = []
+        embeddings = None
+        if self._semantic_backend is not None:
+            texts = [f"{title} {body}".strip() for title, body in zip(titles, bodies)]
+            embeddings = self._semantic_backend.embed_tasks(texts)
+        return titles, bodies, embeddings
 
-        for index, title in enumerate(titles):
-            if index in visited:
-                continue
+    def _join_matches(
+        self,
+        disjoint_set: "_DisjointSet",
+        titles: Sequence[str],
+        bodies: Sequence[str],
+        embeddings: np.ndarray | None,
+        threshold: float,
+        use_body: bool,
+        blocking: bool,
+    ) -> None:
+        if blocking:
+            pairs = candidate_pairs(titles)
+            if embeddings is not None:
+                neighbours_left, neighbours_right = self._semantic_backend.neighbour_pairs(embeddings)
+                pairs = _with_extra_pairs(pairs, zip(neighbours_left.tolist(), neighbours_right.tolist()))
+            batches = _batched_pairs(pairs, _SCORE_BATCH_SIZE)
+        else:
+            cutoff = 0.0 if embeddings is not None else _title_cutoff(threshold, use_body)
+            batches = _exhaustive_pairs(titles, cutoff)
 
-            member_indices = [index]
-            for candidate_index in range(index + 1, len(titles)):
-                if candidate_index in visited:
-                    continue
-
-                title_score = fuzz.partial_ratio(title, titles[candidate_index])
-                if not use_body:
-                    combined_score = title_score
-                else:
-                    body_score = 0
-                    if bodies[index] and bodies[candidate_index]:
-                        body_score = fuzz.partial_ratio(bodies[index], bodies[candidate_index])
-                    combined_score = int(0.7 * title_score + 0.3 * body_score)
-                    combined_score = max(combined_score, title_score)
-
-                if combined_score >= effective_threshold:
-                    member_indices.append(candidate_index)
-
-            if len(member_indices) > 1:
-                visited.update(member_indices)
-                clusters.append(TaskCluster(cluster_id=len(clusters) + 1, indices=member_indices))
-            elif include_singletons:
-                visited.add(index)
-                clusters.append(TaskCluster(cluster_id=len(clusters) + 1, indices=member_indices))
+        for first, second in self._matching_pairs(titles, bodies, embeddings, batches, threshold, use_body):
+            disjoint_set.union(first, second)
 
-        return clusters
+    def _matching_pairs(
+        self,
+        titles: Sequence[str],
+        bodies: Sequence[str],
+        embeddings: np.ndarray | None,
+        batches: Iterable[Tuple[np.ndarray, np.ndarray]],
+        threshold: float,
+        use_body: bool,
+    ) -> Iterator[Tuple[int, int]]:
+        for left, right in batches:
+            similarity = None
+            if embeddings is not None:
+                similarity = np.einsum("ij,ij->i", embeddings[left], embeddings[right])
+            matched = score_pairs(
+                titles,
+                bodies,
+                left,
+                right,
+                threshold,
+                use_body=use_body,
+                similarity=similarity,
+                semantic_threshold=self.config.semantic_threshold,
+                semantic_weight=self.config.semantic_weight,
+            )
+            yield from zip(left[matched].tolist(), right[matched].tolist())
+
+    def _changed_pairs(
+        self,
+        titles: Sequence[str],
+        embeddings: np.ndarray | None,
+        changed: Sequence[int],
+        threshold: float,
+        use_body: bool,
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield pairs of a changed task and any other task that could match it.
+
+        A pair can only match if its title score reaches the body-adjusted
+        cutoff or its cosine similarity reaches the semantic threshold (the
+        blend needs one signal above its own bar), so rows of a cdist matrix
+        and of the similarity matrix cover every candidate.
+        """
 
+        cutoff = _title_cutoff(threshold, use_body)
+        for start in range(0, len(changed), _EXHAUSTIVE_ROWS):
+            rows_index = np.asarray(changed[start : start + _EXHAUSTIVE_ROWS])
+            scores = process.cdist(
+                [titles[index] for index in rows_index.tolist()],
+                titles,
+                scorer=fuzz.partial_ratio,
+                score_cutoff=cutoff,
+                dtype=np.float64,
+                workers=-1,
+            )
+            candidates = scores >= cutoff
+            if embeddings is not None:
+                candidates |= embeddings[rows_index] @ embeddings.T >= self.config.semantic_threshold
+            rows, columns = np.nonzero(candidates)
+            left = rows_index[rows]
+            distinct = left != columns
+            yield left[distinct], columns[distinct]
@@ -6,12 +6,13 @@ from typing import Any, Dict, Mapping, MutableMapping, Sequence
 
 from core.todo.models import DedupDecision, Task, TaskCluster
 from .duplicate_scoring import DuplicatePriorityScorer, _get
+from .text_normalization import normalize_text
 
 
 def _normalize_text(value: str | None) -> str:
     if not value:
         return ""
-    return " ".join(str(value).lower().split())
+    return normalize_text(str(value))
 
 
 def _task_key(task: Any) -> str:
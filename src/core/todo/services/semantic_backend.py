@@ -0,0 +1,289 @@
+"""Embedding-based similarity for grouping paraphrased To Do tasks."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from core.todo.config import TodoDedupConfig
+
+SEMANTIC_BACKENDS = ("none", "tfidf", "sentence-transformer")
+
+_WORD = re.compile(r"[0-9a-z]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or re the to with".split()
+)
+
+
+class Embedder(Protocol):
+    """Turns texts into vectors; ``name`` identifies the vector space in the cache."""
+
+    name: str
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return one float32 row per text; rows may be cached and reused."""
+
+    def prepare(self, vectors: np.ndarray) -> np.ndarray:
+        """Return unit-length rows ready for inner-product search."""
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+class HashedTfidfEmbedder:
+    """
+    TF-IDF over hashed word and character n-gram features; needs no model download.
+
+    ``embed`` returns sublinear term frequencies only, so cached rows stay
+    valid whatever else is in the task list; ``prepare`` applies IDF weights
+    computed over the vectors being compared and normalizes them. Character
+    4-grams inside words let "invoice" match "invoicing".
+    """
+
+    def __init__(self, dimension: int = 1024, char_ngram: int = 4):
+        self.dimension = dimension
+        self.char_ngram = char_ngram
+        self.name = f"hashed-tfidf-{dimension}-{char_ngram}"
+        self._buckets: Dict[str, int] = {}
+
+    def _features(self, text: str) -> Iterable[str]:
+        for word in _WORD.findall(text.lower()):
+            if word in _STOPWORDS:
+                continue
+            yield word
+            padded = f"<{word}>"
+            for start in range(len(padded) - self.char_ngram + 1):
+                yield "#" + padded[start : start + self.char_ngram]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        buckets = self._buckets
+        for row, text in enumerate(texts):
+            counts: Dict[int, int] = {}
+            for feature in self._features(text):
+                bucket = buckets.get(feature)
+                if bucket is None:
+                    # crc32 rather than hash(): vectors are cached across processes
+                    bucket = buckets[feature] = zlib.crc32(feature.encode("utf-8")) % self.dimension
+                counts[bucket] = counts.get(bucket, 0) + 1
+            for bucket, count in counts.items():
+                vectors[row, bucket] = 1.0 + math.log(count)
+        return vectors
+
+    def prepare(self, vectors: np.ndarray) -> np.ndarray:
+        document_frequency = np.count_nonzero(vectors, axis=0)
+        idf = np.log((1.0 + len(vectors)) / (1.0 + document_frequency)) + 1.0
+        return _normalize_rows(vectors * idf.astype(np.float32))
+
+
+class SentenceTransformerEmbedder:
+    """Local sentence embeddings from a ``sentence-transformers`` model, run on the CPU."""
+
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", batch_size: int = 64):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.name = f"st-{model_name}"
+        self._model = None
+
+    def _load(self):
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as exc:
+                raise RuntimeError(
+                    "sentence-transformers is required for the 'sentence-transformer' semantic backend"
+                ) from exc
+            self._model = SentenceTransformer(self.model_name, device="cpu")
+        return self._model
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        vectors = self._load().encode(list(texts), batch_size=self.batch_size, convert_to_numpy=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+    def prepare(self, vectors: np.ndarray) -> np.ndarray:
+        return _normalize_rows(vectors)
+
+
+class EmbeddingCache:
+    """
+    SQLite file of embedding rows keyed by embedder name and text hash.
+
+    The key is a hash of the embedded text, so a vector is reused exactly
+    when the text it was computed from (after normalization, truncation and
+    the ``use_body`` choice) is unchanged.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " embedder TEXT NOT NULL, key TEXT NOT NULL, vector BLOB NOT NULL,"
+            " PRIMARY KEY (embedder, key))"
+        )
+        self._connection.commit()
+
+    def get_many(self, embedder: str, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = list(keys[start : start + 500])
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE embedder = ? AND key IN ({placeholders})",
+                    [embedder, *chunk],
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, embedder: str, vectors: Mapping[str, np.ndarray]) -> None:
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (embedder, key, vector) VALUES (?, ?, ?)",
+                [(embedder, key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in vectors.items()],
+            )
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class InnerProductIndex:
+    """
+    Exact nearest-neighbour search by brute-force inner product over unit vectors.
+
+    Similarities are computed ``block_size`` rows at a time, so memory stays
+    at ``block_size * n`` floats. Each vector keeps at most ``top_k``
+    neighbours above the threshold, which bounds the pairs produced by very
+    generic tasks.
+    """
+
+    def __init__(self, top_k: int = 10, block_size: int = 1024):
+        self.top_k = top_k
+        self.block_size = block_size
+
+    def neighbour_pairs(self, vectors: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(left, right)`` index arrays, ``left < right``, with similarity >= ``threshold``."""
+
+        lefts: List[np.ndarray] = []
+        rights: List[np.ndarray] = []
+        count = len(vectors)
+        for start in range(0, count, self.block_size):
+            similarities = vectors[start : start + self.block_size] @ vectors.T
+            rows = np.arange(similarities.shape[0])
+            similarities[rows, rows + start] = -np.inf  # never pair a task with itself
+            if self.top_k < count - 1:
+                keep = np.argpartition(-similarities, self.top_k, axis=1)[:, : self.top_k]
+                mask = np.zeros_like(similarities, dtype=bool)
+                mask[rows[:, None], keep] = True
+                similarities[~mask] = -np.inf
+            block_rows, columns = np.nonzero(similarities >= threshold)
+            lefts.append(np.minimum(block_rows + start, columns))
+            rights.append(np.maximum(block_rows + start, columns))
+        if not lefts:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        pairs = np.unique(np.stack([np.concatenate(lefts), np.concatenate(rights)], axis=1), axis=0)
+        return pairs[:, 0].astype(np.int64), pairs[:, 1].astype(np.int64)
+
+
+def _cache_key(text: str) -> str:
+    return "sha1:" + hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class SemanticBackend:
+    """
+    Embeds tasks (through an optional on-disk cache) and proposes similar pairs.
+
+    Args:
+        embedder: Produces the vectors.
+        cache: Stores vectors between runs, keyed by a hash of the embedded text.
+        index: Finds neighbours among the prepared vectors.
+        threshold: Cosine similarity at which a pair is proposed.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        cache: Optional[EmbeddingCache] = None,
+        index: Optional[InnerProductIndex] = None,
+        threshold: float = 0.45,
+    ):
+        self.embedder = embedder
+        self.cache = cache
+        self.index = index or InnerProductIndex()
+        self.threshold = threshold
+
+    def embed_tasks(self, texts: Sequence[str]) -> np.ndarray:
+        """Return unit-length vectors for ``texts`` (one per task)."""
+
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        keys = [_cache_key(text) for text in texts]
+        cached = self.cache.get_many(self.embedder.name, keys) if self.cache else {}
+        missing = [position for position, key in enumerate(keys) if key not in cached]
+        fresh = self.embedder.embed([texts[position] for position in missing]) if missing else None
+        if self.cache is not None and fresh is not None:
+            self.cache.put_many(self.embedder.name, {keys[position]: fresh[row] for row, position in enumerate(missing)})
+
+        rows: List[Optional[np.ndarray]] = [cached.get(key) for key in keys]
+        for row, position in enumerate(missing):
+            rows[position] = fresh[row]
+        return self.embedder.prepare(np.vstack(rows))
+
+    def neighbour_pairs(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self.index.neighbour_pairs(vectors, self.threshold)
+
+
+def build_semantic_backend(config: "TodoDedupConfig") -> Optional[SemanticBackend]:
+    """Return the backend selected by ``config.semantic_backend``, or None when disabled."""
+
+    name = config.semantic_backend
+    if name == "none":
+        return None
+    if name == "tfidf":
+        embedder: Embedder = HashedTfidfEmbedder()
+    elif name == "sentence-transformer":
+        embedder = SentenceTransformerEmbedder(config.semantic_model)
+    else:
+        raise ValueError(f"Unknown semantic backend '{name}' (expected one of {SEMANTIC_BACKENDS})")
+    cache = EmbeddingCache(config.embedding_cache_path) if config.embedding_cache_path else None
+    return SemanticBackend(embedder, cache=cache, threshold=config.semantic_threshold)
+
+
+__all__ = [
+    "EmbeddingCache",
+    "HashedTfidfEmbedder",
+    "InnerProductIndex",
+    "SemanticBackend",
+    "SentenceTransformerEmbedder",
+    "build_semantic_backend",
+]
@@ -0,0 +1,16 @@
+"""Shared text normalization for To Do deduplication."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65536)
+def normalize_text(value: str) -> str:
+    """Lowercase ``value`` and collapse runs of whitespace to single spaces.
+
+    Results are cached because clustering and exact duplicate detection
+    normalize the same titles and bodies for every run over a task export.
+    """
+
+    return " ".join(value.lower().split())
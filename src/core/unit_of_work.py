@@ -0,0 +1,166 @@
+"""
+Unit of work for long-running jobs.
+
+A ``UnitOfWork`` owns one session for the duration of a job (an archive run,
+a backup) instead of borrowing the thread-local ``SessionLocal`` and leaving
+it open. Repositories in this codebase call ``session.commit()`` after every
+statement; inside a unit of work those calls only flush, and the real commit
+happens at stage boundaries, or once ``commit_every`` deferred commits or
+``commit_interval_seconds`` have accumulated so SQLite's write lock is never
+held for the whole job. The session is always closed on exit.
+
+Usage::
+
+    with UnitOfWork() as uow:
+        users = UserService(unit_of_work=uow)
+        with uow.stage("lookup"):
+            user = users.get_by_id(user_id)
+        with uow.stage("archive"):
+            orchestrator.archive(..., db_session=uow.session)
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class UnitOfWorkSession(Session):
+    """Session whose ``commit()`` is deferred to its unit of work while one is active."""
+
+    unit_of_work: Optional["UnitOfWork"] = None
+
+    def commit(self) -> None:
+        if self.unit_of_work is None or not self.unit_of_work.defer_commits:
+            super().commit()
+            return
+        self.unit_of_work._deferred_commit()
+
+    def commit_now(self) -> None:
+        """Commit the underlying transaction regardless of deferral."""
+        super().commit()
+
+
+class UnitOfWork:
+    """
+    Owns one session for a job and decides when it commits.
+
+    Args:
+        session_factory: Callable returning a new UnitOfWorkSession; defaults
+            to one bound to the core engine.
+        defer_commits: Turn repository ``commit()`` calls into flushes.
+        commit_every: Commit after this many deferred commits.
+        commit_interval_seconds: Commit when this long has passed since the
+            last commit and a deferred commit arrives.
+        flush_every: ``add``/``add_all`` flush after this many new objects.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        defer_commits: bool = True,
+        commit_every: int = 200,
+        commit_interval_seconds: float = 2.0,
+        flush_every: int = 500,
+    ):
+        self._session_factory = session_factory or _default_session_factory
+        self.defer_commits = defer_commits
+        self.commit_every = commit_every
+        self.commit_interval_seconds = commit_interval_seconds
+        self.flush_every = flush_every
+        self.session: Optional[Session] = None
+        self.commits = 0
+        self._deferred = 0
+        self._pending_adds = 0
+        self._last_commit = time.monotonic()
+
+    def __enter__(self) -> "UnitOfWork":
+        self.session = self._session_factory()
+        self.session.unit_of_work = self
+        self._last_commit = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self.close()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator["UnitOfWork"]:
+        """Commit when the stage completes; roll it back if it raises."""
+        started = time.perf_counter()
+        try:
+            yield self
+        except Exception:
+            logger.warning(f"Unit of work stage '{name}' failed; rolling back")
+            self.rollback()
+            raise
+        self.commit()
+        logger.debug(
+            f"Unit of work stage '{name}' committed in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+    def add(self, instance: Any) -> None:
+        """Add an object, flushing once ``flush_every`` objects are pending."""
+        self.session.add(instance)
+        self._pending_adds += 1
+        if self._pending_adds >= self.flush_every:
+            self.flush()
+
+    def add_all(self, instances: Iterable[Any]) -> None:
+        for instance in instances:
+            self.add(instance)
+
+    def flush(self) -> None:
+        self.session.flush()
+        self._pending_adds = 0
+
+    def commit(self) -> None:
+        """Commit everything flushed or pending so far."""
+        if self.session is None:
+            return
+        if isinstance(self.session, UnitOfWorkSession):
+            self.session.commit_now()
+        else:
+            self.session.commit()
+        self.commits += 1
+        self._deferred = 0
+        self._pending_adds = 0
+        self._last_commit = time.monotonic()
+
+    def rollback(self) -> None:
+        if self.session is not None:
+            self.session.rollback()
+        self._deferred = 0
+        self._pending_adds = 0
+
+    def close(self) -> None:
+        """Close the session; safe to call more than once."""
+        if self.session is not None:
+            self.session.unit_of_work = None
+            self.session.close()
+            self.session = None
+
+    def _deferred_commit(self) -> None:
+        self._deferred += 1
+        if (
+            self._deferred >= self.commit_every
+            or time.monotonic() - self._last_commit >= self.commit_interval_seconds
+        ):
+            self.commit()
+        else:
+            self.flush()
+
+
+def _default_session_factory() -> Session:
+    from core.db import engine
+
+    return UnitOfWorkSession(bind=engine, autoflush=False)
@@ -1,3 +1,4 @@
+from .appointment_fingerprint import appointment_fingerprint
 from .calendar_overlap_utility import detect_overlaps, merge_duplicates
 from .calendar_recurrence_utility import (
     create_non_recurring_instance,
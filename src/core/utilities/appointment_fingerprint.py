@@ -0,0 +1,98 @@
+"""
+Canonical appointment fingerprinting.
+
+A fingerprint is a stable 128-bit BLAKE2b digest (32 hex characters) over the
+normalized subject and the UTC start/end times of an appointment. It is the
+single definition of "the same appointment" used by in-memory deduplication,
+destination duplicate checks and restore deduplication, and it is persisted in
+the ``appointments.fingerprint`` column for local calendars.
+
+Unlike the built-in ``hash()``, the digest does not depend on
+``PYTHONHASHSEED`` and is therefore comparable across processes and runs.
+"""
+
+import hashlib
+import unicodedata
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+FINGERPRINT_DIGEST_SIZE = 16  # bytes -> 128-bit digest, 32 hex characters
+_FIELD_SEPARATOR = "\x1f"
+
+
+def normalize_subject(subject: Any) -> str:
+    """
+    Normalize a subject for fingerprinting.
+
+    Applies Unicode NFC normalization, strips leading/trailing whitespace and
+    collapses internal whitespace runs to a single space. Case is preserved.
+    """
+    if subject is None or not isinstance(subject, str):
+        return ""
+    return " ".join(unicodedata.normalize("NFC", subject).split())
+
+
+def _normalize_time(value: Any) -> str:
+    """
+    Normalize a datetime to whole UTC epoch seconds.
+
+    Naive datetimes are treated as UTC, matching how ``UTCDateTime`` stores them.
+    ISO-8601 strings are accepted. Missing or unparseable values yield "".
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return ""
+    if not isinstance(value, datetime):
+        return ""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return str(int(value.timestamp()))
+
+
+def compute_fingerprint(subject: Any, start_time: Any, end_time: Any) -> str:
+    """
+    Compute the canonical fingerprint from raw field values.
+
+    :param subject: Appointment subject (None is treated as empty).
+    :param start_time: Start datetime (aware, naive UTC or ISO string).
+    :param end_time: End datetime (aware, naive UTC or ISO string).
+    :return: 32-character hex digest.
+    """
+    payload = _FIELD_SEPARATOR.join(
+        (
+            normalize_subject(subject),
+            _normalize_time(start_time),
+            _normalize_time(end_time),
+        )
+    )
+    return hashlib.blake2b(
+        payload.encode("utf-8"), digest_size=FINGERPRINT_DIGEST_SIZE
+    ).hexdigest()
+
+
+def appointment_fingerprint(appointment: Any) -> Optional[str]:
+    """
+    Compute the canonical fingerprint for an Appointment-like object or dict.
+
+    The fingerprint is always recomputed from the current field values so that
+    in-memory modifications (e.g. meeting modifications) are reflected.
+
+    :param appointment: Appointment model, duck-typed object or dict with
+        ``subject``, ``start_time`` and ``end_time``.
+    :return: 32-character hex digest, or None if ``appointment`` is None.
+    """
+    if appointment is None:
+        return None
+    if isinstance(appointment, dict):
+        return compute_fingerprint(
+            appointment.get("subject"),
+            appointment.get("start_time"),
+            appointment.get("end_time"),
+        )
+    return compute_fingerprint(
+        getattr(appointment, "subject", None),
+        getattr(appointment, "start_time", None),
+        getattr(appointment, "end_time", None),
+    )
@@ -5,13 +5,19 @@ from datetime import datetime
 from typing import Any, Callable, Dict, Optional, Union
 
 from core.services.audit_log_service import AuditLogService
-from core.utilities.audit_sanitizer import sanitize_for_audit
+from core.utilities.audit_sanitizer import (
+    default_audit_sanitizer,
+    sanitize_audit_payload,
+)
 
 
 class AuditContext:
     """
     Context manager for audit logging that automatically tracks operation duration
     and handles success/failure logging.
+
+    The final entry is written fire-and-forget, so with the background audit
+    writer enabled ``audit_log`` stays None after the block exits.
     """
 
     def __init__(
@@ -38,6 +44,10 @@ class AuditContext:
         self.details = {}
         self.request_data = {}
         self.response_data = {}
+        # One byte budget for details, request and response data of this row;
+        # each slot's cost is refunded when its value is replaced
+        self._payload_run = default_audit_sanitizer.new_run()
+        self._payload_costs: Dict[Any, int] = {}
 
     def __enter__(self):
         self.start_time = time.time()
@@ -77,6 +87,7 @@ class AuditContext:
                 duration_ms=duration_ms,
                 correlation_id=self.correlation_id,
                 parent_audit_id=self.parent_audit_id,
+                wait=False,
             )
         else:
             # If no audit service is provided, create a mock audit log for compatibility
@@ -85,10 +96,19 @@ class AuditContext:
         # Don't suppress exceptions
         return False
 
+    def _sanitize_payload(self, slot: Any, value: Any) -> Any:
+        """Sanitize a value for ``slot``, charging the row budget only for what is kept."""
+        run = self._payload_run
+        run.remaining += self._payload_costs.pop(slot, 0)
+        before = run.remaining
+        sanitized = sanitize_audit_payload(value, run=run)
+        self._payload_costs[slot] = before - run.remaining
+        return sanitized
+
     def add_detail(self, key: str, value: Any):
         """Add a detail to the audit log."""
         try:
-            self.details[key] = sanitize_for_audit(value)
+            self.details[key] = self._sanitize_payload(("details", key), value)
         except Exception as e:
             # If sanitization fails, log the error and store a safe representation
             import logging
@@ -99,7 +119,7 @@ class AuditContext:
     def set_request_data(self, data: Dict[str, Any]):
         """Set the request data for the audit log."""
         try:
-            self.request_data = sanitize_for_audit(data)
+            self.request_data = self._sanitize_payload("request_data", data)
         except Exception as e:
             # If sanitization fails, log the error and store a safe representation
             import logging
@@ -110,7 +130,7 @@ class AuditContext:
     def set_response_data(self, data: Dict[str, Any]):
         """Set the response data for the audit log."""
         try:
-            self.response_data = sanitize_for_audit(data)
+            self.response_data = self._sanitize_payload("response_data", data)
         except Exception as e:
             # If sanitization fails, log the error and store a safe representation
             import logging
@@ -296,6 +316,7 @@ class AuditLogHelper:
             },
             correlation_id=correlation_id,
             parent_audit_id=parent_audit_id,
+            wait=False,
         )
 
     @staticmethod
@@ -330,4 +351,5 @@ class AuditLogHelper:
             resource_id=resource_id,
             details={"changes": changes, "fields_modified": list(changes.keys())},
             correlation_id=correlation_id,
+            wait=False,
         )
@@ -4,10 +4,16 @@ Audit Data Sanitization Utility
 Provides functions to convert complex Python objects into JSON-serializable
 representations for audit logging. Handles SQLAlchemy models, datetime objects,
 and other non-serializable types while preserving meaningful information.
+
+``sanitize_for_audit`` keeps everything it can reach. ``AuditPayloadSanitizer``
+(used by AuditContext via ``sanitize_audit_payload``) is the bounded variant:
+it enforces byte and element budgets, encodes models through per-type
+encoders, and switches large collections of models to compact encodings.
 """
 
 import datetime
-from typing import Any, Dict, List, Set, Union, Optional
+import hashlib
+from typing import Any, Callable, Dict, List, Set, Union, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -275,3 +281,260 @@ def sanitize_audit_data(data: Dict[str, Any]) -> Dict[str, Any]:
         return sanitize_for_audit(data)
     
     return sanitize_for_audit(data)
+
+
+# Defaults for the bounded sanitizer: a single audit row stays well below
+# 64 KiB of JSON even when an archive result carries thousands of conflicts.
+DEFAULT_MAX_PAYLOAD_BYTES = 64 * 1024
+DEFAULT_MAX_COLLECTION_ITEMS = 500
+DEFAULT_MAX_STRING_LENGTH = 4096
+DEFAULT_COMPACT_THRESHOLD = 20
+
+TRUNCATED_MARKER = "<truncated>"
+
+
+def _subject_hash(subject: Any) -> Optional[str]:
+    if not subject:
+        return None
+    return hashlib.blake2b(str(subject).encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _isoformat(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (datetime.datetime, datetime.date)) else value
+
+
+def _compact_appointment(appointment: Any) -> List[Any]:
+    """Encode an appointment as ``[id, start, end, subject_hash]``."""
+    appointment_id = getattr(appointment, "id", None)
+    if appointment_id is None:
+        appointment_id = getattr(appointment, "ms_event_id", None)
+    return [
+        appointment_id,
+        _isoformat(getattr(appointment, "start_time", None)),
+        _isoformat(getattr(appointment, "end_time", None)),
+        _subject_hash(getattr(appointment, "subject", None)),
+    ]
+
+
+def _compact_identity(model: Any) -> Any:
+    return getattr(model, "id", None)
+
+
+class AuditPayloadSanitizer:
+    """
+    Size-bounded, schema-aware sanitizer for audit payloads.
+
+    - Encoders are registered per class name (matching how models are detected
+      in ``_sanitize_sqlalchemy_model``). Each has a full form and an optional
+      compact form, used for items of collections larger than
+      ``compact_threshold``; appointments compact to ``[id, start, end,
+      subject_hash]``.
+    - ``max_bytes`` bounds the estimated JSON size of the whole payload; once it
+      is spent, remaining values become ``TRUNCATED_MARKER`` and collections end
+      with a ``"<truncated:N more>"`` entry.
+    - Collections longer than ``max_items`` keep the first ``max_items`` items,
+      or an evenly spaced sample when ``sample_large_collections`` is set
+      (marked ``"<sampled:K of N>"``).
+    - Strings longer than ``max_string_length`` are cut.
+    """
+
+    _full_encoders: Dict[str, Callable[[Any], Any]] = {}
+    _compact_encoders: Dict[str, Callable[[Any], Any]] = {
+        "Appointment": _compact_appointment,
+        "User": _compact_identity,
+        "Calendar": _compact_identity,
+    }
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_PAYLOAD_BYTES,
+        max_items: int = DEFAULT_MAX_COLLECTION_ITEMS,
+        max_depth: int = 10,
+        max_string_length: int = DEFAULT_MAX_STRING_LENGTH,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+        sample_large_collections: bool = False,
+    ):
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self.max_string_length = max_string_length
+        self.compact_threshold = compact_threshold
+        self.sample_large_collections = sample_large_collections
+
+    @classmethod
+    def register_encoder(
+        cls,
+        type_name: str,
+        encoder: Optional[Callable[[Any], Any]] = None,
+        compact_encoder: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        """
+        Register encoders for objects whose class is named ``type_name``.
+
+        Encoders return JSON-friendly values; their output still passes through
+        the budgets. Omitting ``encoder`` keeps the default model encoding.
+        """
+        if encoder is not None:
+            cls._full_encoders[type_name] = encoder
+        if compact_encoder is not None:
+            cls._compact_encoders[type_name] = compact_encoder
+
+    def sanitize(self, obj: Any) -> Any:
+        """Return a JSON-serializable, size-bounded representation of ``obj``."""
+        return _BoundedRun(self).encode(obj, 0, False)
+
+    def new_run(self) -> "_BoundedRun":
+        """
+        Start a run whose ``sanitize`` calls share one ``max_bytes`` budget.
+
+        Use one run per audit row so details, request and response data
+        together stay within the budget.
+        """
+        return _BoundedRun(self)
+
+
+class _BoundedRun:
+    """State for one ``AuditPayloadSanitizer.sanitize`` call or a shared run."""
+
+    __slots__ = ("config", "remaining", "seen")
+
+    def __init__(self, config: AuditPayloadSanitizer):
+        self.config = config
+        self.remaining = config.max_bytes
+        self.seen: Set[int] = set()
+
+    def sanitize(self, obj: Any) -> Any:
+        return self.encode(obj, 0, False)
+
+    def encode(self, obj: Any, depth: int, compact: bool) -> Any:
+        obj_type = type(obj)
+        if obj is None or obj_type is bool:
+            self.remaining -= 5
+            return obj
+        if obj_type is int or obj_type is float:
+            self.remaining -= 8
+            return obj
+        if obj_type is str:
+            return self._string(obj)
+        if isinstance(obj, bool):
+            self.remaining -= 5
+            return bool(obj)
+        if isinstance(obj, (int, float)):
+            self.remaining -= 8
+            return obj
+        if isinstance(obj, str):
+            return self._string(str(obj))
+
+        if self.remaining <= 0:
+            return TRUNCATED_MARKER
+        if depth > self.config.max_depth:
+            return f"<max_depth_exceeded:{obj_type.__name__}>"
+        if isinstance(obj, (datetime.datetime, datetime.date)):
+            self.remaining -= 34
+            return obj.isoformat()
+
+        obj_id = id(obj)
+        if obj_id in self.seen:
+            return f"<circular_reference:{obj_type.__name__}>"
+        self.seen.add(obj_id)
+        try:
+            if isinstance(obj, dict):
+                return self._mapping(obj, depth)
+            if isinstance(obj, (list, tuple, set, frozenset)):
+                return self._sequence(obj, depth)
+
+            type_name = obj_type.__name__
+            encoder = (
+                AuditPayloadSanitizer._compact_encoders.get(type_name) if compact else None
+            ) or AuditPayloadSanitizer._full_encoders.get(type_name)
+            if encoder is not None:
+                return self.encode(encoder(obj), depth + 1, False)
+            if hasattr(obj, "__table__"):
+                model = _sanitize_sqlalchemy_model(obj, self.config.max_depth, set(), depth)
+                return self.encode(model, depth, False)
+            if hasattr(obj, "__iter__") and not isinstance(obj, (bytes, bytearray)):
+                try:
+                    items = list(obj)
+                except Exception:
+                    return self._string(str(obj))
+                return self._sequence(items, depth)
+        finally:
+            self.seen.discard(obj_id)
+
+        try:
+            return self._string(str(obj))
+        except Exception as e:
+            logger.warning(f"Failed to convert object {obj_type} to string: {e}")
+            return f"<unserializable:{obj_type.__name__}>"
+
+    def _string(self, value: str) -> str:
+        limit = self.config.max_string_length
+        if len(value) > limit:
+            value = f"{value[:limit]}<truncated:{len(value) - limit} chars>"
+        if self.remaining <= 0:
+            return TRUNCATED_MARKER
+        self.remaining -= len(value) + 2
+        return value
+
+    def _select(self, items: List[Any]):
+        """Apply the element budget; returns (items to encode, marker or None)."""
+        total = len(items)
+        limit = self.config.max_items
+        if total <= limit:
+            return items, None
+        if self.config.sample_large_collections and limit > 1:
+            step = (total - 1) / (limit - 1)
+            return [items[round(i * step)] for i in range(limit)], f"<sampled:{limit} of {total}>"
+        return items[:limit], f"<truncated:{total - limit} more>"
+
+    def _sequence(self, obj: Any, depth: int) -> List[Any]:
+        items = obj if isinstance(obj, list) else list(obj)
+        compact = len(items) > self.config.compact_threshold
+        selected, marker = self._select(items)
+        result = []
+        self.remaining -= 2
+        for index, item in enumerate(selected):
+            if self.remaining <= 0:
+                marker = f"<truncated:{len(items) - index} more>"
+                break
+            result.append(self.encode(item, depth + 1, compact))
+            self.remaining -= 1
+        if marker:
+            result.append(marker)
+        return result
+
+    def _mapping(self, obj: Dict[Any, Any], depth: int) -> Dict[str, Any]:
+        items = list(obj.items())
+        compact = len(items) > self.config.compact_threshold
+        selected, marker = self._select(items)
+        result = {}
+        self.remaining -= 2
+        for index, (key, value) in enumerate(selected):
+            if self.remaining <= 0:
+                marker = f"<truncated:{len(items) - index} more>"
+                break
+            safe_key = key if isinstance(key, str) else str(key)
+            self.remaining -= len(safe_key) + 4
+            result[safe_key] = self.encode(value, depth + 1, compact)
+        if marker:
+            result["_truncated"] = marker
+        return result
+
+
+default_audit_sanitizer = AuditPayloadSanitizer()
+
+
+def sanitize_audit_payload(
+    obj: Any,
+    sanitizer: Optional[AuditPayloadSanitizer] = None,
+    run: Optional[_BoundedRun] = None,
+) -> Any:
+    """
+    Sanitize an audit payload with byte/element budgets (see AuditPayloadSanitizer).
+
+    Pass a ``run`` from ``AuditPayloadSanitizer.new_run`` to charge the payload
+    to a budget shared with other payloads of the same audit row.
+    """
+    if run is not None:
+        return run.sanitize(obj)
+    return (sanitizer or default_audit_sanitizer).sanitize(obj)
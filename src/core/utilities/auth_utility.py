@@ -1,15 +1,28 @@
+import asyncio
+import logging
 import os
 import stat
+import tempfile
+import threading
+import time
+from typing import Optional, Tuple
 
 import msal
 
 from core.models.user import User
 
+logger = logging.getLogger(__name__)
+
 # Secure cache directory with restricted permissions
 CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "admin-assistant")
 CACHE_PATH = os.path.join(CACHE_DIR, "ms_token.json")
 SCOPES = ["https://graph.microsoft.com/.default"]
 
+# Refresh in the background once a token is this close to expiry...
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+# ...and synchronously once it is closer than this.
+TOKEN_MIN_VALIDITY_SECONDS = 60
+
 
 def ensure_secure_cache_dir():
     """Ensure cache directory exists with secure permissions."""
@@ -72,6 +85,7 @@ def msal_login():
 
     # Set secure file permissions (owner read/write only)
     os.chmod(CACHE_PATH, 0o600)
+    _token_provider.invalidate()
 
     if "access_token" not in result:
         raise RuntimeError(
@@ -83,13 +97,190 @@ def msal_login():
 def msal_logout():
     if os.path.exists(CACHE_PATH):
         os.remove(CACHE_PATH)
+    _token_provider.invalidate()
+
+
+def _cache_file_signature() -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of the token cache file, or None if it is missing."""
+    try:
+        file_stat = os.stat(CACHE_PATH)
+    except OSError:
+        return None
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+
+def _write_token_cache(data: str) -> None:
+    """Atomically replace the token cache file, readable by the owner only."""
+    ensure_secure_cache_dir()
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(CACHE_PATH), prefix=".ms_token."
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.chmod(tmp_path, stat.S_IRUSR | stat.S_IWUSR)
+        os.replace(tmp_path, CACHE_PATH)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class TokenProvider:
+    """
+    Process-wide provider for the cached MS Graph access token.
+
+    The MSAL application and the decoded access token are kept in memory until
+    shortly before the token expires. Inside TOKEN_REFRESH_MARGIN_SECONDS of
+    expiry the current token is still returned while a background thread
+    refreshes it; only when it is nearly expired does a caller wait for the
+    refresh. The token cache file is re-read only when it changes on disk (for
+    example after ``auth msgraph login`` in another process) and written back
+    only when MSAL reports that the cache state changed.
+
+    Reads take a short state lock and never wait on the network while a valid
+    token is held, so the provider is safe to call from worker threads and
+    from coroutines running on the AsyncRunner loop.
+    """
+
+    def __init__(self):
+        self._state_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._app = None
+        self._cache = None
+        self._app_key = None
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def get_token(self) -> Optional[str]:
+        """Return a valid access token, or None if no account is signed in."""
+        token = self._current_token()
+        if token is not None:
+            return token
+        with self._refresh_lock:
+            # Another thread may have refreshed while we waited
+            token = self._current_token()
+            if token is not None:
+                return token
+            return self._refresh()
+
+    async def aget_token(self) -> Optional[str]:
+        """Async variant of get_token that refreshes off the event loop."""
+        token = self._current_token()
+        if token is not None:
+            return token
+        return await asyncio.to_thread(self.get_token)
+
+    def invalidate(self) -> None:
+        """Forget the in-memory token and MSAL application."""
+        with self._state_lock:
+            self._app = self._cache = self._app_key = None
+            self._token = None
+            self._expires_at = 0.0
+
+    def _current_token(self) -> Optional[str]:
+        """Return the memoized token if still usable, scheduling early refresh."""
+        now = time.time()
+        with self._state_lock:
+            if (
+                self._token is None
+                or now >= self._expires_at - TOKEN_MIN_VALIDITY_SECONDS
+                or (self._app_key and self._app_key[2] != _cache_file_signature())
+            ):
+                return None
+            token = self._token
+            needs_refresh = now >= self._expires_at - TOKEN_REFRESH_MARGIN_SECONDS
+        if needs_refresh:
+            self._schedule_refresh()
+        return token
+
+    def _schedule_refresh(self) -> None:
+        with self._state_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._background_refresh, name="msal-token-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _background_refresh(self) -> None:
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._refresh()
+        except Exception as e:
+            logger.warning(f"Background token refresh failed: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def _get_app(self):
+        """Return the memoized MSAL app, rebuilding it if config or cache file changed."""
+        key = (
+            os.getenv("MS_CLIENT_ID"),
+            os.getenv("MS_TENANT_ID"),
+            _cache_file_signature(),
+        )
+        with self._state_lock:
+            if self._app is not None and self._app_key == key:
+                return self._app, self._cache
+        app, cache = get_msal_app()
+        with self._state_lock:
+            self._app, self._cache, self._app_key = app, cache, key
+        return app, cache
+
+    def _refresh(self) -> Optional[str]:
+        """Acquire a token silently via MSAL. Caller must hold the refresh lock."""
+        app, cache = self._get_app()
+        result = None
+        accounts = app.get_accounts()
+        if accounts:
+            result = app.acquire_token_silent(SCOPES, account=accounts[0])
+        self._persist(cache)
+
+        token = result.get("access_token") if result else None
+        with self._state_lock:
+            self._token = token
+            self._expires_at = self._expiry_from(result) if token else 0.0
+        return token
+
+    def _persist(self, cache) -> None:
+        """Write the token cache back to disk if MSAL changed it (e.g. a rotated refresh token)."""
+        if getattr(cache, "has_state_changed", False) is not True:
+            return
+        try:
+            _write_token_cache(cache.serialize())
+            cache.has_state_changed = False
+        except Exception as e:
+            logger.warning(f"Failed to persist MSAL token cache: {e}")
+            return
+        with self._state_lock:
+            if self._app_key is not None:
+                # Our own write must not look like an external change
+                self._app_key = self._app_key[:2] + (_cache_file_signature(),)
+
+    @staticmethod
+    def _expiry_from(result: dict) -> float:
+        """Absolute expiry (epoch seconds) of a token result; unknown means do not memoize."""
+        now = time.time()
+        try:
+            if result.get("expires_on"):
+                return float(result["expires_on"])
+            if result.get("expires_in"):
+                return now + float(result["expires_in"])
+        except (TypeError, ValueError):
+            pass
+        return now
+
+
+_token_provider = TokenProvider()
+
+
+def get_token_provider() -> TokenProvider:
+    """Return the process-wide TokenProvider."""
+    return _token_provider
 
 
 def get_cached_access_token():
-    app, cache = get_msal_app()
-    accounts = app.get_accounts()
-    if accounts:
-        result = app.acquire_token_silent(SCOPES, account=accounts[0])
-        if result and "access_token" in result:
-            return result["access_token"]
-    return None
+    """Return the cached MS Graph access token, refreshing it when needed."""
+    return _token_provider.get_token()
@@ -2,23 +2,19 @@ from datetime import datetime
 from typing import Any, Dict, List
 
 from core.models.appointment import Appointment
+from core.utilities.appointment_fingerprint import appointment_fingerprint
 
 
 def merge_duplicates(appointments: List[Appointment]) -> List[Appointment]:
     """
     Merge duplicate appointments (same subject, start_time, end_time).
-    Only model fields are considered for deduplication.
+    Duplicates are identified by the canonical appointment fingerprint, so
+    subjects are whitespace-normalized and times compared in UTC.
+    The first occurrence of each fingerprint is kept, preserving order.
     """
     seen = {}
     for appt in appointments:
-        subject = getattr(appt, "subject", None)
-        start_time = getattr(appt, "start_time", None)
-        end_time = getattr(appt, "end_time", None)
-        key = (
-            subject,
-            start_time,
-            end_time,
-        )
+        key = appointment_fingerprint(appt)
         if key not in seen:
             seen[key] = appt
     return list(seen.values())
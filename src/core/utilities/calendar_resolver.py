@@ -6,8 +6,10 @@ to actual calendar IDs across different providers.
 """
 
 import logging
+import threading
+import time
 import requests
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from core.utilities.uri_utility import (
     parse_resource_uri, 
     ParsedURI, 
@@ -25,6 +27,101 @@ class CalendarResolutionError(Exception):
     pass
 
 
+# How long a listed calendar directory is trusted before it is revalidated
+CALENDAR_DIRECTORY_TTL_SECONDS = 600
+# How long an unknown calendar name is remembered as missing
+NEGATIVE_LOOKUP_TTL_SECONDS = 60
+
+_SPECIAL_PRIMARY_IDENTIFIERS = ('primary', 'calendar', '')
+
+
+class CalendarDirectory:
+    """
+    The calendars of one account with precomputed lookup indexes.
+
+    Exact, normalized and legacy-compatible name keys are built once when the
+    directory is listed, so resolving a friendly name is a dictionary lookup.
+    When several calendars share a key the first one listed wins, matching the
+    order of the previous linear scans.
+    """
+
+    def __init__(self, calendars: List[Dict[str, Any]], etag: Optional[str] = None,
+                 ttl: float = CALENDAR_DIRECTORY_TTL_SECONDS):
+        self.calendars = calendars
+        self.etag = etag
+        self.ttl = ttl
+        self.expires_at = time.monotonic() + ttl
+        self.by_name: Dict[str, str] = {}
+        self.by_normalized: Dict[str, str] = {}
+        self.by_legacy: Dict[str, str] = {}
+        self._missing: Dict[str, float] = {}
+        for cal in calendars:
+            name = cal.get('name', '')
+            calendar_id = cal.get('id', '')
+            self.by_name.setdefault(name, calendar_id)
+            self.by_normalized.setdefault(normalize_calendar_name_for_lookup(name), calendar_id)
+            self.by_legacy.setdefault(create_legacy_compatible_lookup_key(name), calendar_id)
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def touch(self) -> None:
+        """Extend the TTL after the directory was revalidated as unchanged."""
+        self.expires_at = time.monotonic() + self.ttl
+
+    def lookup(self, identifier: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return (calendar_id, match_type) for a friendly name, or (None, None)."""
+        if identifier in self.by_name:
+            return self.by_name[identifier], 'exact'
+        key = normalize_calendar_name_for_lookup(identifier)
+        if key in self.by_normalized:
+            return self.by_normalized[key], 'normalized'
+        key = create_legacy_compatible_lookup_key(identifier)
+        if key in self.by_legacy:
+            return self.by_legacy[key], 'legacy'
+        return None, None
+
+    def is_known_missing(self, identifier: str) -> bool:
+        expires_at = self._missing.get(identifier)
+        return expires_at is not None and time.monotonic() < expires_at
+
+    def record_missing(self, identifier: str) -> None:
+        self._missing[identifier] = time.monotonic() + NEGATIVE_LOOKUP_TTL_SECONDS
+
+
+class CalendarDirectoryCache:
+    """
+    Process-wide, thread-safe cache of calendar directories keyed by account.
+
+    Shared by every CalendarResolver so an archive run, its destination lookup
+    and later scheduled jobs list a user's calendars once per TTL.
+    """
+
+    def __init__(self):
+        self._directories: Dict[str, CalendarDirectory] = {}
+        self._lock = threading.Lock()
+
+    def get(self, account: str) -> Optional[CalendarDirectory]:
+        with self._lock:
+            return self._directories.get(account)
+
+    def put(self, account: str, directory: CalendarDirectory) -> None:
+        with self._lock:
+            self._directories[account] = directory
+
+    def invalidate(self, account: Optional[str] = None) -> None:
+        """Drop one account's directory (e.g. after creating a calendar), or all of them."""
+        with self._lock:
+            if account is None:
+                self._directories.clear()
+            else:
+                self._directories.pop(account.lower(), None)
+
+
+calendar_directory_cache = CalendarDirectoryCache()
+
+
 class CalendarResolver:
     """Resolves calendar URIs to actual calendar IDs."""
 
@@ -38,7 +135,7 @@ class CalendarResolver:
         """
         self.user = user
         self.access_token = access_token
-        self._calendar_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._directory: Optional[CalendarDirectory] = None
         self._session = None  # Lazy-initialized requests session
 
     def resolve_calendar_uri(self, uri: str) -> str:
@@ -170,32 +267,23 @@ class CalendarResolver:
             return parsed.identifier
 
         # Resolve friendly name to actual calendar ID
-        calendars = self._get_msgraph_calendars()
-
-        # Try exact name match first
-        for cal in calendars:
-            if cal.get('name', '') == parsed.identifier:
-                calendar_id = cal.get('id', '')
-                logger.debug(f"Resolved '{parsed.identifier}' to calendar ID via exact match: {calendar_id}")
-                return calendar_id
-
-        # Try normalized name matching
-        target_normalized = normalize_calendar_name_for_lookup(parsed.identifier)
-        for cal in calendars:
-            cal_normalized = normalize_calendar_name_for_lookup(cal.get('name', ''))
-            if cal_normalized == target_normalized:
-                calendar_id = cal.get('id', '')
-                logger.debug(f"Resolved '{parsed.identifier}' to calendar ID via normalized match: {calendar_id}")
-                return calendar_id
-
-        # Try legacy-compatible matching for backward compatibility
-        target_legacy = create_legacy_compatible_lookup_key(parsed.identifier)
-        for cal in calendars:
-            cal_legacy = create_legacy_compatible_lookup_key(cal.get('name', ''))
-            if cal_legacy == target_legacy:
-                calendar_id = cal.get('id', '')
-                logger.debug(f"Resolved '{parsed.identifier}' to calendar ID via legacy match: {calendar_id}")
-                return calendar_id
+        directory = self._get_calendar_directory()
+        calendar_id, match_type = directory.lookup(parsed.identifier)
+
+        if (
+            calendar_id is None
+            and parsed.identifier not in _SPECIAL_PRIMARY_IDENTIFIERS
+            and not directory.is_known_missing(parsed.identifier)
+        ):
+            # The calendar may have been created since the directory was listed
+            directory = self._get_calendar_directory(refresh=True)
+            calendar_id, match_type = directory.lookup(parsed.identifier)
+            if calendar_id is None:
+                directory.record_missing(parsed.identifier)
+
+        if calendar_id is not None:
+            logger.debug(f"Resolved '{parsed.identifier}' to calendar ID via {match_type} match: {calendar_id}")
+            return calendar_id
 
         # Handle special cases only if no actual calendar was found with that name
         if parsed.identifier in ('primary', 'calendar', ''):
@@ -229,23 +317,71 @@ class CalendarResolver:
         # For now, return as-is
         return parsed.identifier
 
-    def _get_msgraph_calendars(self) -> List[Dict[str, Any]]:
+    @property
+    def _account_key(self) -> str:
+        return (self.user.email or str(self.user.id)).lower()
+
+    def _get_calendar_directory(self, refresh: bool = False) -> CalendarDirectory:
+        """
+        Return the lookup directory for the user's calendars.
+
+        Uses the shared directory when _get_msgraph_calendars served it; calendars
+        supplied any other way (e.g. by a subclass) are indexed on the fly.
+        """
+        calendars = self._get_msgraph_calendars(refresh=refresh) if refresh else self._get_msgraph_calendars()
+        directory = self._directory
+        if directory is None or directory.calendars is not calendars:
+            directory = CalendarDirectory(calendars)
+        return directory
+
+    def _get_msgraph_calendars(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Get list of calendars from MS Graph API.
 
+        Served from the shared calendar directory cache while it is fresh. An
+        expired directory is revalidated with its ETag when Graph supplied one,
+        so an unchanged calendar list costs a 304 instead of a re-list.
+
+        Args:
+            refresh: Revalidate even if the cached directory is still fresh
+
         Returns:
             List of calendar data dictionaries
         """
-        cache_key = f"msgraph_calendars_{self.user.email}"
+        account = self._account_key
+        cached = calendar_directory_cache.get(account)
+        if cached is not None and cached.is_fresh and not refresh:
+            self._directory = cached
+            return cached.calendars
+
+        calendars, etag = self._fetch_msgraph_calendars(cached.etag if cached else None)
+        if calendars is None and cached is not None:
+            # 304 Not Modified: keep the existing directory
+            cached.touch()
+            directory = cached
+        else:
+            directory = CalendarDirectory(calendars or [], etag=etag)
+            calendar_directory_cache.put(account, directory)
+        self._directory = directory
+        return directory.calendars
 
-        if cache_key in self._calendar_cache:
-            return self._calendar_cache[cache_key]
+    def _fetch_msgraph_calendars(self, etag: Optional[str] = None) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        List the user's calendars from MS Graph, following paging links.
 
+        Args:
+            etag: ETag of the cached listing, sent as If-None-Match
+
+        Returns:
+            Tuple of (calendars, etag); calendars is None if Graph answered 304
+        """
         try:
             headers = {
                 'Authorization': f'Bearer {self.access_token}',
                 'Content-Type': 'application/json'
             }
+            if etag:
+                headers['If-None-Match'] = etag
 
             url = f"https://graph.microsoft.com/v1.0/users/{self.user.email}/calendars?$select=id,name,isDefaultCalendar"
 
@@ -253,28 +389,39 @@ class CalendarResolver:
             if self._session is None:
                 self._session = requests.Session()
 
-            response = self._session.get(url, headers=headers)
+            calendars: List[Dict[str, Any]] = []
+            response_etag = None
+            while url:
+                response = self._session.get(url, headers=headers)
 
-            if response.status_code != 200:
-                raise CalendarResolutionError(f"Failed to fetch calendars from MS Graph: {response.status_code} {response.text}")
+                if response.status_code == 304 and etag:
+                    logger.debug(f"Calendar list for user {self.user.email} not modified")
+                    return None, etag
 
-            calendars_data = response.json()
-            calendars = calendars_data.get('value', [])
+                if response.status_code != 200:
+                    raise CalendarResolutionError(f"Failed to fetch calendars from MS Graph: {response.status_code} {response.text}")
 
-            # Cache the results
-            self._calendar_cache[cache_key] = calendars
+                if response_etag is None:
+                    response_etag = (getattr(response, 'headers', None) or {}).get('ETag')
+                calendars_data = response.json()
+                calendars.extend(calendars_data.get('value', []))
+                url = calendars_data.get('@odata.nextLink')
+                headers.pop('If-None-Match', None)
 
             logger.debug(f"Retrieved {len(calendars)} calendars from MS Graph for user {self.user.email}")
-            return calendars
+            return calendars, response_etag
 
+        except CalendarResolutionError:
+            raise
         except requests.RequestException as e:
             raise CalendarResolutionError(f"Network error while fetching calendars: {e}") from e
         except Exception as e:
             raise CalendarResolutionError(f"Unexpected error while fetching calendars: {e}") from e
 
     def clear_cache(self):
-        """Clear the calendar cache."""
-        self._calendar_cache.clear()
+        """Clear the cached calendar directory for this resolver's account."""
+        self._directory = None
+        calendar_directory_cache.invalidate(self._account_key)
 
     def close(self):
         """Close and clean up resources."""
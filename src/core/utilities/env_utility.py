@@ -0,0 +1,47 @@
+"""Helpers for reading typed settings from environment variables."""
+
+import os
+from typing import Optional
+
+
+def get_bool_env(var_name: str, default: bool) -> bool:
+    """Return boolean value for an environment variable."""
+    value = os.environ.get(var_name)
+    if value is None:
+        return default
+    lowered = value.strip().lower()
+    if lowered in {"1", "true", "yes", "on"}:
+        return True
+    if lowered in {"0", "false", "no", "off"}:
+        return False
+    return default
+
+
+def get_int_env(var_name: str, default: int) -> int:
+    """Return integer value for an environment variable."""
+    value = os.environ.get(var_name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def get_float_env(var_name: str, default: float) -> float:
+    """Return float value for an environment variable."""
+    value = os.environ.get(var_name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def get_str_env(var_name: str, default: Optional[str]) -> Optional[str]:
+    """Return a stripped string value, or the default when unset or blank."""
+    value = os.environ.get(var_name)
+    if value is None:
+        return default
+    return value.strip() or default
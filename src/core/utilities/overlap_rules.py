@@ -0,0 +1,171 @@
+"""
+Declarative overlap resolution rules.
+
+A rule set is an ordered list of plain dictionaries (so it can live in JSON
+config) that is compiled once into key functions. Each rule reads a single
+appointment attribute and has one of three actions:
+
+- ``exclude``: drop appointments whose field matches one of ``match``.
+- ``prefer_not``: drop matching appointments if at least one non-matching
+  appointment remains (e.g. discard Tentative in favour of confirmed).
+- ``rank``: keep the appointments with the highest score from ``scores``
+  (``default`` for unknown values). If several share the highest score the
+  group is returned as a conflict, unless ``on_tie`` is ``"continue"``.
+
+Example rule::
+
+    {"name": "priority", "action": "rank", "field": "importance",
+     "scores": {"high": 3, "normal": 2, "low": 1}, "default": 2}
+
+Optional ``log`` and ``tie_log`` format strings control the resolution log
+entries; ``{count}`` is the number of appointments removed and ``{score}`` the
+tied score.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+EXCLUDE = "exclude"
+PREFER_NOT = "prefer_not"
+RANK = "rank"
+ACTIONS = {EXCLUDE, PREFER_NOT, RANK}
+
+OVERLAP_RULES_FILE_ENV = "OVERLAP_RESOLUTION_RULES_FILE"
+
+DEFAULT_OVERLAP_RULES: List[Dict[str, Any]] = [
+    {
+        "name": "free",
+        "action": EXCLUDE,
+        "field": "show_as",
+        "match": ["free"],
+        "log": "Filtered out {count} 'Free' appointments",
+    },
+    {
+        "name": "tentative",
+        "action": PREFER_NOT,
+        "field": "show_as",
+        "match": ["tentative"],
+        "log": "Discarded {count} 'Tentative' appointments in favor of confirmed",
+    },
+    {
+        "name": "priority",
+        "action": RANK,
+        "field": "importance",
+        "scores": {"high": 3, "normal": 2, "low": 1},
+        "default": 2,
+        "log": "Selected highest priority appointment, filtered {count} lower priority",
+        "tie_log": "Unable to resolve by priority: Multiple appointments have the same highest priority ({score})",
+    },
+]
+
+
+@dataclass(frozen=True)
+class OverlapRule:
+    """A single compiled overlap resolution rule."""
+
+    name: str
+    action: str
+    field: str
+    match: frozenset = frozenset()
+    scores: Dict[str, int] = field(default_factory=dict)
+    default: int = 0
+    on_tie: str = "conflict"
+    log: Optional[str] = None
+    tie_log: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OverlapRule":
+        """Validate and build a rule from its config dictionary."""
+        try:
+            name = str(data["name"])
+            action = str(data["action"]).lower()
+            field_name = str(data["field"])
+        except KeyError as e:
+            raise ValueError(f"Overlap rule is missing required key {e}") from e
+        if action not in ACTIONS:
+            raise ValueError(
+                f"Overlap rule '{name}' has unknown action '{action}' (expected one of {sorted(ACTIONS)})"
+            )
+        if action == RANK and not data.get("scores"):
+            raise ValueError(f"Overlap rule '{name}' requires 'scores'")
+        if action != RANK and not data.get("match"):
+            raise ValueError(f"Overlap rule '{name}' requires 'match'")
+        on_tie = str(data.get("on_tie", "conflict")).lower()
+        if on_tie not in {"conflict", "continue"}:
+            raise ValueError(f"Overlap rule '{name}' has unknown on_tie '{on_tie}'")
+        return cls(
+            name=name,
+            action=action,
+            field=field_name,
+            match=frozenset(str(v).lower() for v in data.get("match", ())),
+            scores={str(k).lower(): int(v) for k, v in data.get("scores", {}).items()},
+            default=int(data.get("default", 0)),
+            on_tie=on_tie,
+            log=data.get("log"),
+            tie_log=data.get("tie_log"),
+        )
+
+    def compile(self) -> Callable[[Optional[str]], Any]:
+        """
+        Return a function mapping a lower-cased field value to this rule's key.
+
+        ``exclude`` and ``prefer_not`` produce 1 for a match and 0 otherwise;
+        ``rank`` produces the negated score so that an ascending sort puts the
+        best appointment first.
+        """
+        if self.action == RANK:
+            scores, default = self.scores, self.default
+            return lambda value: -scores.get(value, default) if value else -default
+        match = self.match
+        return lambda value: 1 if value in match else 0
+
+
+class CompiledOverlapRules:
+    """
+    An ordered rule set compiled to a single composite key per appointment.
+
+    Each appointment's fields are read once; the resulting tuple holds one entry
+    per rule and sorts the best candidate first.
+    """
+
+    def __init__(self, rules: Sequence[Dict[str, Any]]):
+        self.rules: List[OverlapRule] = [OverlapRule.from_dict(r) for r in rules]
+        names = [r.name for r in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate overlap rule names in {names}")
+        self.fields: List[str] = list(dict.fromkeys(r.field for r in self.rules))
+        field_index = {name: i for i, name in enumerate(self.fields)}
+        self._keys = [(field_index[r.field], r.compile()) for r in self.rules]
+
+    def key(self, appointment: Any) -> tuple:
+        """Return the composite rule key for one appointment."""
+        values = []
+        for name in self.fields:
+            value = getattr(appointment, name, None)
+            values.append(str(value).lower() if value else None)
+        return tuple(fn(values[i]) for i, fn in self._keys)
+
+
+def load_overlap_rules(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load rule definitions from a JSON file.
+
+    Args:
+        path: JSON file containing a list of rules (or ``{"rules": [...]}``).
+            Defaults to the ``OVERLAP_RESOLUTION_RULES_FILE`` environment variable.
+
+    Returns:
+        The configured rules, or DEFAULT_OVERLAP_RULES when no file is configured.
+    """
+    path = path or os.environ.get(OVERLAP_RULES_FILE_ENV)
+    if not path:
+        return DEFAULT_OVERLAP_RULES
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("rules", [])
+    if not isinstance(data, list):
+        raise ValueError(f"Overlap rules file {path} must contain a list of rules")
+    return data
@@ -0,0 +1,350 @@
+"""
+Chunked retention for large tables (audit log, reversible operations).
+
+Expired rows are removed in bounded primary-key ranges, one short transaction
+per chunk, instead of a single ``DELETE`` that holds the SQLite write lock for
+the whole purge and grows the WAL by the size of the table. Optionally each
+chunk is first appended to a cold archive file (gzip NDJSON, or Parquet when
+pyarrow is installed). On SQLite the freed pages are handed back with
+``incremental_vacuum`` and the WAL is checkpointed between chunks; on
+PostgreSQL, range partitions lying entirely before the cutoff are exported and
+dropped whole before the chunked delete handles the remainder.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, Table, and_, delete, select, text
+from sqlalchemy.orm import Session
+
+from core.utilities.env_utility import (
+    get_bool_env,
+    get_float_env,
+    get_int_env,
+    get_str_env,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {"ndjson", "parquet"}
+
+
+@dataclass
+class RetentionConfig:
+    """Runtime configuration for chunked retention."""
+
+    chunk_size: int = 5000
+    export_dir: Optional[str] = None
+    export_format: str = "ndjson"
+    vacuum: bool = True
+    vacuum_pages: int = 2000
+    pause_seconds: float = 0.0
+    drop_partitions: bool = True
+
+    @classmethod
+    def from_env(cls) -> "RetentionConfig":
+        """Create configuration hydrated from environment variables."""
+        return cls(
+            chunk_size=get_int_env("RETENTION_CHUNK_SIZE", cls.chunk_size),
+            export_dir=get_str_env("RETENTION_EXPORT_DIR", cls.export_dir),
+            export_format=(
+                get_str_env("RETENTION_EXPORT_FORMAT", cls.export_format) or "ndjson"
+            ).lower(),
+            vacuum=get_bool_env("RETENTION_VACUUM", cls.vacuum),
+            vacuum_pages=get_int_env("RETENTION_VACUUM_PAGES", cls.vacuum_pages),
+            pause_seconds=get_float_env("RETENTION_PAUSE_SECONDS", cls.pause_seconds),
+            drop_partitions=get_bool_env(
+                "RETENTION_DROP_PARTITIONS", cls.drop_partitions
+            ),
+        )
+
+
+@dataclass
+class RetentionResult:
+    """Outcome of a retention run."""
+
+    deleted: int = 0
+    exported: int = 0
+    chunks: int = 0
+    export_files: List[str] = field(default_factory=list)
+    dropped_partitions: List[str] = field(default_factory=list)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    return str(value)
+
+
+class _ColdArchiveWriter:
+    """Appends exported rows for one table to a single cold archive file."""
+
+    def __init__(self, directory: str, table_name: str, export_format: str, label: str):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown retention export format '{export_format}' (expected one of {sorted(EXPORT_FORMATS)})"
+            )
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        extension = "ndjson.gz" if export_format == "ndjson" else "parquet"
+        self.path = os.path.join(directory, f"{table_name}_{label}_{stamp}.{extension}")
+        self.format = export_format
+        self._file = None
+        self._parquet_writer = None
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self.format == "ndjson":
+            if self._file is None:
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            for row in rows:
+                self._file.write(
+                    json.dumps(row, default=_json_default, separators=(",", ":"))
+                )
+                self._file.write("\n")
+            self._file.flush()
+            return
+
+        try:
+            import pyarrow as pa  # type: ignore
+            import pyarrow.parquet as pq  # type: ignore
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "pyarrow package is required for Parquet retention exports"
+            ) from exc
+        # JSON columns are stored as strings so every chunk has the same schema
+        normalized = [
+            {
+                key: (
+                    json.dumps(value, default=_json_default)
+                    if isinstance(value, (dict, list))
+                    else value
+                )
+                for key, value in row.items()
+            }
+            for row in rows
+        ]
+        batch = pa.Table.from_pylist(normalized)
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(
+                self.path, batch.schema, compression="zstd"
+            )
+        self._parquet_writer.write_table(batch.cast(self._parquet_writer.schema))
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+class ChunkedRetention:
+    """
+    Delete rows matching a retention condition in bounded primary-key chunks.
+
+    Args:
+        session: Session used for all statements; each chunk is committed.
+        table: Table to purge.
+        config: Chunk size, export and vacuum settings.
+        children: ``(child_table, fk_column)`` pairs whose rows reference
+            ``table`` and are deleted (and exported) with their parents.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        table: Table,
+        config: Optional[RetentionConfig] = None,
+        children: Sequence[Tuple[Table, Column]] = (),
+    ):
+        self.session = session
+        self.table = table
+        self.config = config or RetentionConfig()
+        self.children = list(children)
+        primary_key = list(table.primary_key.columns)
+        if len(primary_key) != 1:
+            raise ValueError(
+                f"Chunked retention needs a single-column primary key on {table.name}"
+            )
+        self.pk = primary_key[0]
+
+    @property
+    def dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def purge(
+        self,
+        condition,
+        label: str = "expired",
+        partition_cutoff: Optional[datetime] = None,
+    ) -> RetentionResult:
+        """
+        Export (optionally) and delete every row matching ``condition``.
+
+        Args:
+            condition: SQLAlchemy boolean expression selecting expired rows.
+            label: Used in cold archive file names (e.g. the cutoff date).
+            partition_cutoff: On PostgreSQL, range partitions whose upper bound
+                is at or before this value are dropped whole first. Only pass it
+                when ``condition`` is exactly "older than the cutoff".
+
+        Returns:
+            RetentionResult with counts, chunks and files written.
+        """
+        result = RetentionResult()
+        writers: Dict[str, _ColdArchiveWriter] = {}
+        try:
+            # Partitions are only dropped for tables without dependent child rows
+            if (
+                partition_cutoff is not None
+                and self.config.drop_partitions
+                and not self.children
+                and self.dialect == "postgresql"
+            ):
+                self._drop_expired_partitions(partition_cutoff, label, writers, result)
+
+            last_pk = None
+            while True:
+                query = select(self.pk).where(condition)
+                if last_pk is not None:
+                    query = query.where(self.pk > last_pk)
+                ids = (
+                    self.session.execute(
+                        query.order_by(self.pk).limit(max(self.config.chunk_size, 1))
+                    )
+                    .scalars()
+                    .all()
+                )
+                if not ids:
+                    break
+                low, high = ids[0], ids[-1]
+                chunk_condition = and_(condition, self.pk >= low, self.pk <= high)
+                self._delete_chunk(chunk_condition, label, writers, result)
+                last_pk = high
+                result.chunks += 1
+                self._after_chunk()
+                if self.config.pause_seconds:
+                    time.sleep(self.config.pause_seconds)
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            for writer in writers.values():
+                writer.close()
+        result.export_files = [writer.path for writer in writers.values()]
+        return result
+
+    def _export(
+        self,
+        table_name: str,
+        statement,
+        label: str,
+        writers: Dict[str, _ColdArchiveWriter],
+    ) -> int:
+        writer = writers.get(table_name)
+        if writer is None:
+            writer = writers[table_name] = _ColdArchiveWriter(
+                self.config.export_dir, table_name, self.config.export_format, label
+            )
+        rows = [dict(row) for row in self.session.execute(statement).mappings()]
+        writer.write(rows)
+        return len(rows)
+
+    def _delete_chunk(
+        self, chunk_condition, label, writers, result: RetentionResult
+    ) -> None:
+        parent_ids = select(self.pk).where(chunk_condition)
+        if self.config.export_dir:
+            result.exported += self._export(
+                self.table.name,
+                select(self.table).where(chunk_condition),
+                label,
+                writers,
+            )
+            for child, fk in self.children:
+                self._export(
+                    child.name, select(child).where(fk.in_(parent_ids)), label, writers
+                )
+        for child, fk in self.children:
+            self.session.execute(delete(child).where(fk.in_(parent_ids)))
+        deleted = self.session.execute(
+            delete(self.table).where(chunk_condition)
+        ).rowcount
+        self.session.commit()
+        result.deleted += deleted or 0
+
+    def _after_chunk(self) -> None:
+        if not self.config.vacuum or self.dialect != "sqlite":
+            return
+        try:
+            if (
+                self.session.execute(text("PRAGMA auto_vacuum")).scalar() == 2
+            ):  # INCREMENTAL
+                self.session.execute(
+                    text(f"PRAGMA incremental_vacuum({int(self.config.vacuum_pages)})")
+                )
+            if (
+                str(self.session.execute(text("PRAGMA journal_mode")).scalar()).lower()
+                == "wal"
+            ):
+                self.session.execute(text("PRAGMA wal_checkpoint(PASSIVE)"))
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            logger.warning(f"Incremental vacuum after retention chunk failed: {e}")
+
+    _PARTITION_BOUND = re.compile(r"FOR VALUES FROM \('([^']*)'\) TO \('([^']*)'\)")
+
+    def _drop_expired_partitions(
+        self, cutoff: datetime, label, writers, result: RetentionResult
+    ) -> None:
+        """Export and drop range partitions of ``table`` that end at or before ``cutoff``."""
+        partitions = self.session.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+                "FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :parent"
+            ),
+            {"parent": self.table.name},
+        ).all()
+        for name, bound in partitions:
+            match = self._PARTITION_BOUND.search(bound or "")
+            if not match:
+                continue  # DEFAULT or non-range partition
+            try:
+                upper = datetime.fromisoformat(match.group(2))
+            except ValueError:
+                continue
+            compare_cutoff = (
+                cutoff.replace(tzinfo=None) if upper.tzinfo is None else cutoff
+            )
+            if upper > compare_cutoff:
+                continue
+            if self.config.export_dir:
+                result.exported += self._export(
+                    self.table.name, text(f'SELECT * FROM "{name}"'), label, writers
+                )
+            count = (
+                self.session.execute(text(f'SELECT count(*) FROM "{name}"')).scalar()
+                or 0
+            )
+            self.session.execute(
+                text(f'ALTER TABLE "{self.table.name}" DETACH PARTITION "{name}"')
+            )
+            self.session.execute(text(f'DROP TABLE "{name}"'))
+            self.session.commit()
+            result.deleted += count
+            result.dropped_partitions.append(name)
+            logger.info(f"Dropped expired partition {name} ({count} rows)")
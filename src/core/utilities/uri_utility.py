@@ -27,16 +27,19 @@ Output Format (user-friendly):
 import re
 import urllib.parse
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True)
 class ParsedURI:
     """Represents a parsed resource URI.
 
     Supports both legacy and new URI formats:
     - Legacy: <scheme>://<namespace>/<identifier>
     - New: <scheme>://<account>/<namespace>/<identifier>
+
+    Instances are immutable so that parse results can be shared from the cache.
     """
     scheme: str  # e.g., 'msgraph', 'local', 'google'
     namespace: str  # e.g., 'calendars', 'contacts', 'emails'
@@ -212,6 +215,10 @@ def parse_resource_uri(uri: str) -> ParsedURI:
     - Legacy: <scheme>://<namespace>/<identifier>
     - New: <scheme>://<account>/<namespace>/<identifier>
 
+    Results are memoized per URI string. Plain URIs (simple identifier, known
+    namespace or email/numeric account) are matched by a single precompiled
+    pattern; everything else goes through the full parser.
+
     Args:
         uri: URI to parse (e.g., 'msgraph://calendars/primary' or 'msgraph://user@example.com/calendars/primary')
 
@@ -221,6 +228,33 @@ def parse_resource_uri(uri: str) -> ParsedURI:
     Raises:
         URIParseError: If URI format is invalid
     """
+    if not isinstance(uri, str):
+        return _parse_resource_uri_full(uri)
+    return _parse_resource_uri_cached(uri)
+
+
+@lru_cache(maxsize=512)
+def _parse_resource_uri_cached(uri: str) -> ParsedURI:
+    match = _FAST_URI_PATTERN.match(uri)
+    if match is None:
+        return _parse_resource_uri_full(uri)
+    account = match.group('account')
+    return ParsedURI(
+        scheme=match.group('scheme'),
+        namespace=match.group('account_namespace') if account else match.group('namespace'),
+        identifier=match.group('identifier'),
+        raw_uri=uri,
+        account=account,
+    )
+
+
+def clear_uri_parse_cache() -> None:
+    """Clear the memoized parse_resource_uri results."""
+    _parse_resource_uri_cached.cache_clear()
+
+
+def _parse_resource_uri_full(uri: str) -> ParsedURI:
+    """Full parser covering every supported URI shape; see parse_resource_uri."""
     # Handle legacy URIs for backward compatibility (including empty string)
     if uri in ('', 'calendar', 'primary'):
         return ParsedURI(
@@ -533,6 +567,17 @@ SUPPORTED_NAMESPACES = {
     'files': 'File resources'
 }
 
+# Fast path for the common shapes: scheme://<known namespace>/<identifier> and
+# scheme://<email or numeric account>/<namespace>/<identifier>, where the
+# identifier needs no unquoting, unescaping or trimming. Anything else (quotes,
+# escapes, %-encoding, nested paths, usernames) falls back to the full parser.
+_FAST_URI_PATTERN = re.compile(
+    r'(?P<scheme>[a-z][a-z0-9+.-]*)://'
+    r'(?:(?P<account>[A-Za-z0-9._+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}|[0-9]+)/(?P<account_namespace>[A-Za-z0-9_-]+)'
+    r'|(?P<namespace>' + '|'.join(sorted(SUPPORTED_NAMESPACES)) + r'))'
+    r'/(?P<identifier>[A-Za-z0-9_.~!$&*+,=:@()-]+)\Z'
+)
+
 
 def validate_uri_components(scheme: str, namespace: str, identifier: str = None) -> bool:
     """
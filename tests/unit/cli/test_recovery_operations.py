@@ -0,0 +1,29 @@
+"""
+Unit tests for building the reversible audit service in the recovery CLI.
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from cli.recovery_operations import build_reversible_service
+
+
+def test_reverse_registers_graph_batch_delete_reverser():
+    user = SimpleNamespace(id=1, email="user@example.com")
+    with patch("core.utilities.auth_utility.get_cached_access_token", return_value="token"), patch(
+        "core.utilities.get_graph_client", return_value=MagicMock()
+    ), patch("core.repositories.appointment_repository_msgraph.MSGraphAppointmentRepository") as repository_cls:
+        service = build_reversible_service(MagicMock(), user)
+
+    assert repository_cls.call_args.kwargs == {"any_calendar": True}
+    reverser = service.batch_reversers[("appointment", "delete")]
+    # evt-3 got no sub-response, so it is neither deleted nor failed
+    repository_cls.return_value.delete_bulk.return_value = {"successful_deletes": ["evt-1"], "failed_deletes": ["evt-2"]}
+    items = [SimpleNamespace(id=n, external_id=f"evt-{n}") for n in (1, 2, 3)]
+    assert reverser(items) == {
+        2: "Graph $batch delete failed for event evt-2",
+        3: "Graph $batch delete failed for event evt-3",
+    }
+
+
+def test_listing_needs_no_graph_reversers():
+    assert build_reversible_service(MagicMock()).batch_reversers == {}
@@ -359,3 +359,42 @@ class TestTimesheetCommands:
         ])
         
         assert result.exit_code != 0
+
+    @patch('cli.commands.timesheet.get_session')
+    @patch('cli.commands.timesheet.resolve_cli_user')
+    @patch('cli.commands.timesheet.parse_date_range')
+    def test_timesheet_report_command(self, mock_parse_date_range, mock_resolve_user, mock_get_session):
+        """Test the 'admin-assistant timesheet report' command"""
+        from datetime import datetime, timezone
+        from core.models.appointment import Appointment
+
+        mock_parse_date_range.return_value = (date(2025, 6, 1), date(2025, 6, 30))
+        mock_resolve_user.return_value = Mock(id=1, email="test@example.com")
+        session = MagicMock()
+        # The same workshop stored in the source calendar backup and the archive calendar
+        session.query.return_value.filter.return_value.all.return_value = [
+            Appointment(
+                user_id=1,
+                calendar_id=calendar_id,
+                subject="Workshop",
+                start_time=datetime(2025, 6, 2, 9, tzinfo=timezone.utc),
+                end_time=datetime(2025, 6, 2, 12, tzinfo=timezone.utc),
+                categories=["Acme - billable"],
+            )
+            for calendar_id in ("backup", "archive")
+        ]
+        mock_get_session.return_value = session
+
+        result = self.runner.invoke(app, [
+            'timesheet', 'report',
+            '--user', 'test@example.com',
+            '--date', 'last month',
+            '--days'
+        ])
+
+        assert result.exit_code == 0
+        assert "Hours by Customer" in result.output
+        assert "Acme" in result.output
+        assert "1 appointments, 3.00 hours" in " ".join(result.output.split())
+        assert "2025-06-02" in result.output
+        session.close.assert_called_once()
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from core.db_profiles import (
+    ENGINE_PROFILES,
+    MeteredQueuePool,
+    _is_memory_sqlite,
+    create_profiled_engine,
+    pool_metrics,
+    resolve_engine_profile,
+)
+
+
+def test_auto_profile_is_chosen_by_url(monkeypatch):
+    monkeypatch.delenv("CORE_DB_ENGINE_PROFILE", raising=False)
+    assert resolve_engine_profile("sqlite:///instance/core.db").name == "sqlite-wal"
+    assert resolve_engine_profile("sqlite://").name == "default"
+    assert resolve_engine_profile("postgresql://u:p@localhost/core").name == "postgres-pooled"
+
+
+def test_unknown_profile_raises():
+    with pytest.raises(ValueError):
+        resolve_engine_profile("sqlite://", "mysql-turbo")
+
+
+def test_env_overrides_pool_settings(monkeypatch):
+    monkeypatch.setenv("CORE_DB_POOL_SIZE", "3")
+    monkeypatch.setenv("CORE_DB_SQLITE_BUSY_TIMEOUT_MS", "250")
+    profile = resolve_engine_profile("sqlite:///core.db", "sqlite-wal")
+    assert profile.pool_size == 3
+    assert profile.sqlite_pragmas["busy_timeout"] == 250
+    # the registered profile itself is unchanged
+    assert ENGINE_PROFILES["sqlite-wal"].pool_size == 5
+
+
+def test_postgres_kwargs_only_batch_for_psycopg2():
+    profile = ENGINE_PROFILES["postgres-pooled"]
+    kwargs = profile.engine_kwargs("postgresql+psycopg2://u:p@localhost/core")
+    assert kwargs["executemany_mode"] == "values_plus_batch"
+    assert kwargs["pool_pre_ping"] is True and kwargs["pool_size"] == 10
+    assert "executemany_mode" not in profile.engine_kwargs("postgresql+psycopg://u:p@localhost/core")
+
+
+def test_sqlite_wal_engine_applies_pragmas(tmp_path):
+    engine = create_profiled_engine(f"sqlite:///{tmp_path}/core.db", "sqlite-wal")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+    finally:
+        engine.dispose()
+
+
+def test_pool_metrics_track_checkouts_and_overflow(tmp_path, monkeypatch):
+    monkeypatch.setenv("CORE_DB_POOL_SIZE", "1")
+    monkeypatch.setenv("CORE_DB_MAX_OVERFLOW", "1")
+    engine = create_profiled_engine(f"sqlite:///{tmp_path}/core.db", "sqlite-wal")
+    try:
+        assert isinstance(engine.pool, MeteredQueuePool)
+        first, second = engine.connect(), engine.connect()
+        stats = pool_metrics(engine)
+        assert stats["checked_out"] == 2 and stats["overflow"] == 1
+
+        released = threading.Timer(0.05, second.close)
+        released.start()
+        third = engine.connect()  # waits for the overflow slot
+        released.join()
+        stats = pool_metrics(engine)
+        assert stats["checkouts"] == 3
+        assert stats["wait_ms_max"] >= 40
+        first.close()
+        third.close()
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "url, in_memory",
+    [
+        ("sqlite:///:memory:", True),
+        ("sqlite://", True),
+        ("sqlite:///file:audit?mode=memory&cache=shared&uri=true", True),
+        ("sqlite:///instance/core.db", False),
+        ("postgresql://user@localhost/core", False),
+    ],
+)
+def test_in_memory_sqlite_is_detected(url, in_memory):
+    assert _is_memory_sqlite(make_url(url)) is in_memory
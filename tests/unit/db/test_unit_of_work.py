@@ -0,0 +1,84 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, func, insert, select
+from sqlalchemy.orm import Session, registry
+
+from core.unit_of_work import UnitOfWork, UnitOfWorkSession
+
+metadata = MetaData()
+notes = Table("uow_notes", metadata, Column("id", Integer, primary_key=True), Column("text", String(50)))
+
+
+class Note:
+    def __init__(self, text):
+        self.text = text
+
+
+registry().map_imperatively(Note, notes)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/uow.db")
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def count(engine):
+    with Session(engine) as session:
+        return session.execute(select(func.count()).select_from(notes)).scalar()
+
+
+def make_uow(engine, **kwargs):
+    return UnitOfWork(session_factory=lambda: UnitOfWorkSession(bind=engine), **kwargs)
+
+
+def test_repository_commits_are_deferred_until_stage_end(engine):
+    with make_uow(engine, commit_every=1000, commit_interval_seconds=3600) as uow:
+        with uow.stage("write"):
+            for i in range(5):
+                note = Note(f"note {i}")
+                uow.session.add(note)
+                uow.session.commit()  # what a repository does
+                uow.session.refresh(note)
+                assert note.id is not None
+            assert count(engine) == 0
+        assert count(engine) == 5
+        assert uow.commits == 1
+
+
+def test_commit_every_bounds_the_open_transaction(engine):
+    with make_uow(engine, commit_every=2, commit_interval_seconds=3600) as uow:
+        for i in range(5):
+            uow.session.add(Note(f"note {i}"))
+            uow.session.commit()
+        assert count(engine) == 4
+    assert count(engine) == 5
+
+
+def test_failed_stage_rolls_back_and_session_is_closed(engine):
+    uow = make_uow(engine)
+    with pytest.raises(RuntimeError):
+        with uow:
+            with uow.stage("ok"):
+                uow.session.execute(insert(notes).values(text="kept"))
+            with uow.stage("fails"):
+                uow.session.execute(insert(notes).values(text="lost"))
+                raise RuntimeError("boom")
+    assert count(engine) == 1
+    assert uow.session is None
+
+
+def test_add_flushes_in_batches(engine):
+    with make_uow(engine, flush_every=3) as uow:
+        notes_added = [Note(f"n{i}") for i in range(4)]
+        uow.add_all(notes_added)
+        assert [note.id is not None for note in notes_added] == [True, True, True, False]
+
+
+def test_session_outside_unit_of_work_commits_normally(engine):
+    session = UnitOfWorkSession(bind=engine)
+    session.execute(insert(notes).values(text="direct"))
+    session.commit()
+    session.close()
+    assert count(engine) == 1
@@ -1,4 +1,7 @@
 from core.orchestrators.archive_job_runner import ArchiveJobRunner
+from core.services.archive_configuration_service import ArchiveConfigurationService
+from core.services.user_service import UserService
+from core.unit_of_work import UnitOfWork
 
 
 class DummyUser:
@@ -21,8 +24,19 @@ def _graph_client(user: object, access_token: object) -> object:  # noqa: D401 -
     return object()
 
 
-def _session() -> object:
-    return object()
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.closed = False
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
 
 
 def _no_token() -> None:
@@ -35,7 +49,7 @@ def test_run_archive_job_user_not_found(monkeypatch):
     def _no_user(_: int) -> None:
         return None
 
-    runner.user_service.get_by_id = _no_user
+    monkeypatch.setattr(UserService, "get_by_id", lambda self, user_id: _no_user(user_id))
 
     res = runner.run_archive_job(user_id=1, archive_config_id=2)
     assert res.get("status") == "error"
@@ -51,8 +65,8 @@ def test_run_archive_job_config_not_found(monkeypatch):
     def _no_archive_config(_: int):
         return None
 
-    runner.user_service.get_by_id = _user
-    runner.archive_config_service.get_by_id = _no_archive_config
+    monkeypatch.setattr(UserService, "get_by_id", lambda self, user_id: _user(user_id))
+    monkeypatch.setattr(ArchiveConfigurationService, "get_by_id", lambda self, config_id: _no_archive_config(config_id))
 
     res = runner.run_archive_job(user_id=1, archive_config_id=2)
     assert res.get("status") == "error"
@@ -68,8 +82,8 @@ def test_run_archive_job_no_token(monkeypatch):
     def _config(_: int) -> DummyConfig:
         return DummyConfig("a", "b")
 
-    runner.user_service.get_by_id = _user_for_token
-    runner.archive_config_service.get_by_id = _config
+    monkeypatch.setattr(UserService, "get_by_id", lambda self, user_id: _user_for_token(user_id))
+    monkeypatch.setattr(ArchiveConfigurationService, "get_by_id", lambda self, config_id: _config(config_id))
 
     # Patch get_cached_access_token to return falsy
     monkeypatch.setattr("core.utilities.auth_utility.get_cached_access_token", _no_token)
@@ -91,13 +105,12 @@ def test_run_archive_job_success(monkeypatch):
     def _existing_config(_: int) -> DummyConfig:
         return cfg
 
-    runner.user_service.get_by_id = _existing_user
-    runner.archive_config_service.get_by_id = _existing_config
+    monkeypatch.setattr(UserService, "get_by_id", lambda self, user_id: _existing_user(user_id))
+    monkeypatch.setattr(ArchiveConfigurationService, "get_by_id", lambda self, config_id: _existing_config(config_id))
 
     # Patch token, graph client, and DB session
     monkeypatch.setattr("core.utilities.auth_utility.get_cached_access_token", _token)
     monkeypatch.setattr("core.utilities.get_graph_client", _graph_client)
-    monkeypatch.setattr("core.db.get_session", _session)
 
     called = {}
 
@@ -131,12 +144,11 @@ def test_run_archive_job_date_handling(monkeypatch):
     def _date_config(_: int) -> DummyConfig:
         return cfg
 
-    runner.user_service.get_by_id = _date_user
-    runner.archive_config_service.get_by_id = _date_config
+    monkeypatch.setattr(UserService, "get_by_id", lambda self, user_id: _date_user(user_id))
+    monkeypatch.setattr(ArchiveConfigurationService, "get_by_id", lambda self, config_id: _date_config(config_id))
 
     monkeypatch.setattr("core.utilities.auth_utility.get_cached_access_token", _token)
     monkeypatch.setattr("core.utilities.get_graph_client", _graph_client)
-    monkeypatch.setattr("core.db.get_session", _session)
 
     called = {}
 
@@ -159,3 +171,30 @@ def test_run_archive_job_date_handling(monkeypatch):
     assert res.get("status") == "ok"
     assert called["end_date"] is not None
     assert (called["end_date"] - called["start_date"]).days == 7
+
+
+def test_run_archive_job_uses_one_closed_session_per_job(monkeypatch):
+    sessions = []
+
+    def factory():
+        sessions.append(FakeSession())
+        return UnitOfWork(session_factory=lambda: sessions[-1])
+
+    runner = ArchiveJobRunner(unit_of_work_factory=factory)
+    user = DummyUser(5, "alice@example.com")
+    monkeypatch.setattr(UserService, "get_by_id", lambda self, user_id: user)
+    monkeypatch.setattr(ArchiveConfigurationService, "get_by_id", lambda self, config_id: DummyConfig("a", "b"))
+    monkeypatch.setattr("core.utilities.auth_utility.get_cached_access_token", _token)
+    monkeypatch.setattr("core.utilities.get_graph_client", _graph_client)
+
+    called = {}
+    runner.orchestrator.archive_user_appointments_with_config = lambda **kwargs: called.update(kwargs) or {"status": "ok"}
+
+    runner.run_archive_job(user_id=5, archive_config_id=1)
+    runner.run_archive_job(user_id=5, archive_config_id=1)
+
+    assert len(sessions) == 2
+    assert called["db_session"] is sessions[1]
+    assert all(session.closed for session in sessions)
+    # lookup stage, archive stage and the final commit on exit
+    assert sessions[0].commits == 3
@@ -32,6 +32,27 @@ def test_add_audit_log(repository, mock_session):
     assert result == audit_log
 
 
+def test_add_many_returns_detached_rows_with_ids():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    engine = create_engine("sqlite://")
+    AuditLog.__table__.create(engine)
+    session = Session(engine)
+    logs = [
+        AuditLog(user_id=1, action_type='test', operation=f'op_{i}', status='success')
+        for i in range(3)
+    ]
+
+    AuditLogRepository(session=session).add_many(logs)
+    session.close()
+
+    assert [log.id for log in logs] == [1, 2, 3]
+    assert logs[2].operation == 'op_2' and logs[0].created_at is not None
+    with Session(engine) as check:
+        assert check.query(AuditLog).count() == 3
+
+
 def test_search_with_filters(repository, mock_session):
     filters = {
         'user_id': 1,
@@ -52,3 +73,65 @@ def test_search_with_filters(repository, mock_session):
     mock_query.order_by.assert_called_once()
     mock_query.all.assert_called_once()
 
+
+
+@pytest.fixture
+def sqlite_repository():
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    engine = create_engine("sqlite://")
+    # Creating the table from metadata also creates the FTS5 index and its triggers
+    AuditLog.__table__.create(engine)
+    session = Session(engine)
+    base = datetime(2026, 1, 1, 12, 0)
+    for i in range(25):
+        session.add(AuditLog(
+            user_id=1 if i % 5 else 2,
+            action_type='archive',
+            operation='calendar_archive',
+            status='success',
+            message=f'Archived {i} appointments from the Activity calendar',
+            # Pairs share a timestamp so the id tiebreaker is exercised
+            created_at=base + timedelta(minutes=i // 2),
+        ))
+    session.commit()
+    yield AuditLogRepository(session=session)
+    session.close()
+
+
+def test_search_page_walks_all_rows_without_gaps(sqlite_repository):
+    seen, cursor = [], None
+    while True:
+        page = sqlite_repository.search_page({'user_id': 1}, limit=7, cursor=cursor)
+        seen.extend(log.id for log in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    expected = [log.id for log in sqlite_repository.search({'user_id': 1})]
+    assert seen == expected
+    assert len(seen) == 20 == sqlite_repository.count_by_filters({'user_id': 1})
+
+
+def test_search_page_rejects_bad_cursor(sqlite_repository):
+    with pytest.raises(ValueError):
+        sqlite_repository.search_page({}, cursor='not-a-cursor')
+
+
+def test_message_search_uses_full_text_index(sqlite_repository):
+    hits = sqlite_repository.search({'message_search': 'archived 7'})
+    assert [log.message for log in hits] == ['Archived 7 appointments from the Activity calendar']
+    # Input is matched literally, not parsed as FTS query syntax
+    assert sqlite_repository.search({'message_search': 'activity OR "'}) == []
+    sqlite_repository.session.query(AuditLog).filter_by(id=hits[0].id).delete()
+    sqlite_repository.session.commit()
+    assert sqlite_repository.search({'message_search': 'archived 7'}) == []
+
+
+def test_message_search_does_not_fall_back_to_like_on_fresh_tables(sqlite_repository):
+    assert sqlite_repository._has_sqlite_fts()
+    clause = sqlite_repository._message_search_clause('archived')
+    assert 'MATCH' in str(clause.compile(compile_kwargs={'literal_binds': True}))
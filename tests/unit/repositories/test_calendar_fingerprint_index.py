@@ -0,0 +1,216 @@
+import asyncio
+from datetime import UTC, date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from core.models.appointment import Appointment
+from core.repositories.appointment_repository_msgraph import MSGraphAppointmentRepository
+from core.repositories.calendar_fingerprint_index_repository import (
+    CalendarFingerprintIndexRepository,
+)
+from core.utilities.appointment_fingerprint import compute_fingerprint
+
+DAY = date(2025, 6, 1)
+CALENDAR_KEY = "user@example.com/cal-1"
+
+
+def graph_event(event_id, subject, start_hour, end_hour):
+    return {
+        "id": event_id,
+        "subject": subject,
+        "start": {"dateTime": f"2025-06-01T{start_hour:02d}:00:00.0000000", "timeZone": "UTC"},
+        "end": {"dateTime": f"2025-06-01T{end_hour:02d}:00:00.0000000", "timeZone": "UTC"},
+    }
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeAsyncClient:
+    """Serves queued responses per URL prefix and records requested URLs."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requested = []
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, url, headers=None):
+        self.requested.append(url)
+        for prefix, responses in self.routes.items():
+            if url.startswith(prefix):
+                return responses.pop(0)
+        raise AssertionError(f"Unexpected URL {url}")
+
+
+@pytest.fixture
+def index_repo(db_session):
+    return CalendarFingerprintIndexRepository(db_session)
+
+
+@pytest.fixture
+def graph_repo(index_repo):
+    user = SimpleNamespace(id=1, email="user@example.com")
+    repo = MSGraphAppointmentRepository(MagicMock(), user, "cal-1", fingerprint_index=index_repo)
+    repo._get_fresh_access_token = AsyncMock(return_value="token")
+    return repo
+
+
+def make_appointment(subject, start_hour, end_hour):
+    return Appointment(
+        user_id=1,
+        subject=subject,
+        start_time=datetime(2025, 6, 1, start_hour, tzinfo=UTC),
+        end_time=datetime(2025, 6, 1, end_hour, tzinfo=UTC),
+        calendar_id="cal-1",
+    )
+
+
+class TestCalendarFingerprintIndexRepository:
+    def test_save_and_get_day(self, index_repo):
+        index_repo.save_day(CALENDAR_KEY, DAY, {"e1": "fp1"}, "delta-1")
+        rows = index_repo.get_days(CALENDAR_KEY, [DAY, date(2025, 6, 2)])
+        assert list(rows) == [DAY]
+        assert rows[DAY].fingerprints() == {"fp1"}
+        assert rows[DAY].delta_link == "delta-1"
+
+    def test_record_events_only_updates_synced_days(self, index_repo):
+        index_repo.save_day(CALENDAR_KEY, DAY, {"e1": "fp1"}, "delta-1")
+        index_repo.save_day(CALENDAR_KEY, date(2025, 6, 2), {}, None)
+        recorded = index_repo.record_events(
+            CALENDAR_KEY, {DAY: {"e2": "fp2"}, date(2025, 6, 2): {"e3": "fp3"}}
+        )
+        assert recorded == 1
+        rows = index_repo.get_days(CALENDAR_KEY, [DAY, date(2025, 6, 2)])
+        assert rows[DAY].fingerprints() == {"fp1", "fp2"}
+        assert rows[date(2025, 6, 2)].fingerprints() == set()
+
+    def test_remove_events_and_invalidate(self, index_repo):
+        index_repo.save_day(CALENDAR_KEY, DAY, {"e1": "fp1", "e2": "fp2"}, "delta-1")
+        assert index_repo.remove_events(CALENDAR_KEY, ["e1"], [DAY]) == 1
+        assert index_repo.get_days(CALENDAR_KEY, [DAY])[DAY].fingerprints() == {"fp2"}
+        assert index_repo.invalidate(CALENDAR_KEY) == 1
+        assert index_repo.get_days(CALENDAR_KEY, [DAY]) == {}
+
+
+class TestIndexedDuplicateCheck:
+    def test_initial_sync_populates_index(self, graph_repo, index_repo):
+        client = FakeAsyncClient(
+            {
+                "https://graph.microsoft.com/v1.0/users/user@example.com/calendars/cal-1/calendarView/delta": [
+                    FakeResponse(
+                        200,
+                        {
+                            "value": [graph_event("e1", "Existing", 9, 10)],
+                            "@odata.deltaLink": "https://delta/1",
+                        },
+                    )
+                ]
+            }
+        )
+        with patch("httpx.AsyncClient", client):
+            result = asyncio.run(
+                graph_repo.acheck_for_duplicates(
+                    [make_appointment("Existing", 9, 10), make_appointment("New", 11, 12)], DAY, DAY
+                )
+            )
+
+        assert [a.subject for a in result] == ["New"]
+        row = index_repo.get_days(CALENDAR_KEY, [DAY])[DAY]
+        assert row.delta_link == "https://delta/1"
+        assert row.fingerprints() == {
+            compute_fingerprint("Existing", datetime(2025, 6, 1, 9, tzinfo=UTC), datetime(2025, 6, 1, 10, tzinfo=UTC))
+        }
+
+    def test_refresh_applies_delta_changes_only(self, graph_repo, index_repo):
+        old_fp = compute_fingerprint("Old", datetime(2025, 6, 1, 8, tzinfo=UTC), datetime(2025, 6, 1, 9, tzinfo=UTC))
+        index_repo.save_day(CALENDAR_KEY, DAY, {"e0": old_fp}, "https://delta/1")
+        client = FakeAsyncClient(
+            {
+                "https://delta/1": [
+                    FakeResponse(
+                        200,
+                        {
+                            "value": [
+                                {"id": "e0", "@removed": {"reason": "deleted"}},
+                                graph_event("e1", "Existing", 9, 10),
+                            ],
+                            "@odata.deltaLink": "https://delta/2",
+                        },
+                    )
+                ]
+            }
+        )
+        with patch("httpx.AsyncClient", client):
+            result = asyncio.run(
+                graph_repo.acheck_for_duplicates(
+                    [make_appointment("Old", 8, 9), make_appointment("Existing", 9, 10)], DAY, DAY
+                )
+            )
+
+        assert client.requested == ["https://delta/1"]
+        assert [a.subject for a in result] == ["Old"]
+        assert index_repo.get_days(CALENDAR_KEY, [DAY])[DAY].delta_link == "https://delta/2"
+
+    def test_expired_delta_link_resyncs_day(self, graph_repo, index_repo):
+        index_repo.save_day(CALENDAR_KEY, DAY, {"stale": "stale-fp"}, "https://delta/expired")
+        client = FakeAsyncClient(
+            {
+                "https://delta/expired": [FakeResponse(410, {"error": {"code": "syncStateNotFound"}})],
+                "https://graph.microsoft.com": [
+                    FakeResponse(200, {"value": [], "@odata.deltaLink": "https://delta/fresh"})
+                ],
+            }
+        )
+        with patch("httpx.AsyncClient", client):
+            asyncio.run(graph_repo.acheck_for_duplicates([make_appointment("A", 9, 10)], DAY, DAY))
+
+        row = index_repo.get_days(CALENDAR_KEY, [DAY])[DAY]
+        assert row.fingerprints() == set()
+        assert row.delta_link == "https://delta/fresh"
+
+    def test_created_event_is_written_through(self, graph_repo, index_repo):
+        index_repo.save_day(CALENDAR_KEY, DAY, {}, "https://delta/1")
+        appointment = make_appointment("Created", 9, 10)
+        graph_repo._record_created_event(appointment, FakeResponse(201, {"id": "new-id"}))
+        row = index_repo.get_days(CALENDAR_KEY, [DAY])[DAY]
+        assert row.event_fingerprints == {"new-id": compute_fingerprint("Created", appointment.start_time, appointment.end_time)}
+
+    def test_appointment_on_another_utc_day_is_still_checked(self, graph_repo, index_repo):
+        sydney = timezone(timedelta(hours=10))
+        # 08:00-09:00 on 2 June in UTC+10 is 22:00-23:00 on 1 June in UTC
+        appointment = make_appointment("Existing", 22, 23)
+        appointment.start_time = appointment.start_time.astimezone(sydney)
+        appointment.end_time = appointment.end_time.astimezone(sydney)
+        index_repo.save_day(CALENDAR_KEY, date(2025, 6, 2), {}, "https://delta/2")
+        fingerprint = compute_fingerprint("Existing", appointment.start_time, appointment.end_time)
+        index_repo.save_day(CALENDAR_KEY, DAY, {"e1": fingerprint}, "https://delta/1")
+        client = FakeAsyncClient(
+            {
+                "https://delta/1": [FakeResponse(200, {"value": [], "@odata.deltaLink": "https://delta/1"})],
+                "https://delta/2": [FakeResponse(200, {"value": [], "@odata.deltaLink": "https://delta/2"})],
+            }
+        )
+        local_day = appointment.start_time.date()
+        with patch("httpx.AsyncClient", client):
+            result = asyncio.run(graph_repo.acheck_for_duplicates([appointment], local_day, local_day))
+
+        assert local_day == date(2025, 6, 2)
+        assert result == []
+        assert sorted(client.requested) == ["https://delta/1", "https://delta/2"]
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.models.category import Category
+from core.repositories.category_repository_msgraph import (
+    MasterCategoryCache,
+    MSGraphCategoryRepository,
+)
+
+
+def ms_category(category_id, name, color="preset1"):
+    return SimpleNamespace(id=category_id, display_name=name, color=color)
+
+
+@pytest.fixture
+def master_categories():
+    endpoint = MagicMock()
+    endpoint.get = AsyncMock(
+        return_value=SimpleNamespace(
+            value=[ms_category("id-1", "Acme - billable"), ms_category("id-2", "Admin")]
+        )
+    )
+    endpoint.post = AsyncMock(return_value=ms_category("id-3", "Globex - billable", "preset0"))
+    by_id = MagicMock()
+    by_id.patch = AsyncMock()
+    by_id.delete = AsyncMock()
+    endpoint.by_outlook_category_id.return_value = by_id
+    return endpoint
+
+
+@pytest.fixture
+def repo(master_categories):
+    client = MagicMock()
+    client.users.by_user_id.return_value.outlook.master_categories = master_categories
+    user = SimpleNamespace(id=1, email="User@Example.com")
+    return MSGraphCategoryRepository(client, user, cache=MasterCategoryCache(ttl=300))
+
+
+class TestMSGraphCategoryRepository:
+    def test_reads_share_one_listing(self, repo, master_categories):
+        categories = repo.list()
+        assert [(c.graph_id, c.name) for c in categories] == [("id-1", "Acme - billable"), ("id-2", "Admin")]
+        assert all(c.id is None for c in categories)
+        assert repo.get_by_name("Admin").graph_id == "id-2"
+        assert repo.get_by_id("id-1").name == "Acme - billable"
+        assert repo.get_by_name("Missing") is None
+        assert master_categories.get.await_count == 1
+
+    def test_add_writes_through(self, repo, master_categories):
+        repo.list()
+        repo.add(Category(user_id=1, name="Globex - billable"))
+        assert repo.get_by_name("Globex - billable").graph_id == "id-3"
+        assert master_categories.get.await_count == 1
+
+    def test_update_uses_cached_id(self, repo, master_categories):
+        category = repo.get_by_id("id-2")
+        category.name = "Administration"
+        repo.update(category)
+
+        master_categories.by_outlook_category_id.assert_called_once_with("id-2")
+        assert repo.get_by_name("Admin") is None
+        assert repo.get_by_name("Administration").graph_id == "id-2"
+        assert master_categories.get.await_count == 1
+
+    def test_update_with_graph_id_patches_without_listing(self, repo, master_categories):
+        category = Category(user_id=1, name="Administration")
+        category.graph_id = "id-2"
+        repo.update(category)
+
+        master_categories.by_outlook_category_id.assert_called_once_with("id-2")
+        assert master_categories.get.await_count == 0
+
+    def test_update_unknown_category_raises(self, repo):
+        with pytest.raises(RuntimeError, match="not found"):
+            repo.update(Category(user_id=1, name="Nope"))
+
+    def test_delete_writes_through(self, repo, master_categories):
+        repo.list()
+        repo.delete("id-1")
+        assert [c.graph_id for c in repo.list()] == ["id-2"]
+        assert master_categories.get.await_count == 1
+
+    def test_failed_write_invalidates_cache(self, repo, master_categories):
+        repo.list()
+        master_categories.by_outlook_category_id.return_value.delete.side_effect = Exception("boom")
+        with pytest.raises(RuntimeError):
+            repo.delete("id-1")
+        repo.list()
+        assert master_categories.get.await_count == 2
+
+    def test_cache_expires(self, repo, master_categories):
+        repo.cache.ttl = 0
+        repo.list()
+        repo.list()
+        assert master_categories.get.await_count == 2
@@ -0,0 +1,162 @@
+"""
+Unit tests for the background, batching AuditLogWriter.
+"""
+import threading
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+
+from core.services import audit_log_writer
+from core.services.audit_log_service import AuditLogService
+from core.services.audit_log_writer import AuditLogWriter, AuditLogWriterConfig
+
+
+class FakeRepository:
+    def __init__(self, fail_on=None, gate=None):
+        self.batches = []
+        self.fail_on = fail_on
+        self.gate = gate
+        self.session = SimpleNamespace(rollback=lambda: None)
+        self._next_id = 1
+        self.added = []
+
+    def add(self, audit_log):
+        audit_log.id = self._next_id
+        self._next_id += 1
+        self.added.append(audit_log)
+        return audit_log
+
+    def add_many(self, audit_logs):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail_on and any(log.operation == self.fail_on for log in audit_logs):
+            raise RuntimeError("constraint failed")
+        for log in audit_logs:
+            log.id = self._next_id
+            self._next_id += 1
+        self.batches.append(list(audit_logs))
+        return audit_logs
+
+
+def row(operation="op"):
+    return SimpleNamespace(id=None, action_type="test", operation=operation)
+
+
+def make_writer(repository, **config):
+    return AuditLogWriter(lambda: repository, AuditLogWriterConfig(**config))
+
+
+class TestAuditLogWriter:
+    def test_rows_are_written_in_batches(self):
+        repository = FakeRepository()
+        writer = make_writer(repository, batch_size=50, flush_interval_ms=1000)
+        try:
+            futures = [writer.submit(row()) for _ in range(120)]
+            assert writer.flush(5)
+        finally:
+            writer.close()
+
+        assert [f.result().id for f in futures] == list(range(1, 121))
+        assert len(repository.batches) < 120
+        assert max(len(b) for b in repository.batches) <= 50
+        stats = writer.stats()
+        assert stats["written"] == 120 and stats["dropped"] == 0
+
+    def test_wait_returns_persisted_row(self):
+        writer = make_writer(FakeRepository(), flush_interval_ms=1)
+        try:
+            assert writer.submit(row(), wait=True).result(5).id == 1
+        finally:
+            writer.close()
+
+    def test_failed_batch_retries_rows_individually(self):
+        repository = FakeRepository(fail_on="bad")
+        writer = make_writer(repository, flush_interval_ms=1000)
+        try:
+            good, bad = writer.submit(row()), writer.submit(row("bad"))
+            writer.flush(5)
+        finally:
+            writer.close()
+
+        assert good.result().id is not None
+        with pytest.raises(RuntimeError):
+            bad.result()
+        assert writer.stats()["failed"] == 1
+
+    def test_full_queue_drops_fire_and_forget_rows(self):
+        gate = threading.Event()
+        repository = FakeRepository(gate=gate)
+        writer = make_writer(repository, max_queue_size=1, batch_size=1, put_timeout_seconds=0.01)
+        try:
+            writer.submit(row())  # picked up by the writer, which blocks on the gate
+            while writer.stats()["pending"]:
+                pass
+            assert writer.submit(row()) is not None  # fills the queue
+            assert writer.submit(row()) is None
+            assert writer.stats()["dropped"] == 1
+        finally:
+            gate.set()
+            writer.close()
+        assert writer.stats()["written"] == 2
+
+    def test_waiting_submission_gives_up_after_wait_timeout(self):
+        gate = threading.Event()
+        writer = make_writer(FakeRepository(gate=gate), max_queue_size=1, batch_size=1, wait_timeout_seconds=0.01)
+        try:
+            writer.submit(row())
+            while writer.stats()["pending"]:
+                pass
+            writer.submit(row())
+            assert writer.submit(row(), wait=True) is None
+            assert not writer.flush(0.01)
+        finally:
+            gate.set()
+            writer.close()
+
+    def test_close_flushes_pending_rows(self):
+        repository = FakeRepository()
+        writer = make_writer(repository, flush_interval_ms=60000)
+        writer.submit(row())
+        writer.close()
+        assert sum(len(b) for b in repository.batches) == 1
+        with pytest.raises(RuntimeError):
+            writer.submit(row())
+
+
+class TestAuditLogServiceWithWriter:
+    def test_only_fire_and_forget_rows_go_through_writer(self, monkeypatch):
+        import core.services.audit_log_service as service_module
+
+        monkeypatch.setattr(service_module, "AuditLog", lambda **kwargs: SimpleNamespace(id=None, **kwargs))
+        written, synchronous = FakeRepository(), FakeRepository()
+        writer = make_writer(written, flush_interval_ms=1)
+        service = AuditLogService(repository=synchronous, writer=writer)
+        try:
+            assert service.log_operation(user_id=1, action_type="a", operation="b", status="success").id == 1
+            assert service.log_operation(
+                user_id=1, action_type="a", operation="c", status="success", wait=False
+            ) is None
+            writer.flush(5)
+        finally:
+            writer.close()
+        assert [log.operation for log in synchronous.added] == ["b"]
+        assert [log.operation for batch in written.batches for log in batch] == ["c"]
+
+    def test_injected_repository_stays_synchronous(self):
+        repository = FakeRepository()
+        assert AuditLogService(repository=repository).writer is None
+
+
+def test_writer_is_opt_in(monkeypatch):
+    monkeypatch.delenv("AUDIT_LOG_ASYNC_ENABLED", raising=False)
+    assert AuditLogWriterConfig.from_env().enabled is False
+
+
+def test_writer_is_not_used_with_in_memory_sqlite(monkeypatch):
+    import core.db
+
+    monkeypatch.setenv("AUDIT_LOG_ASYNC_ENABLED", "1")
+    monkeypatch.setattr(core.db, "engine", create_engine("sqlite://"))
+    monkeypatch.setattr(audit_log_writer, "_writer", None)
+    assert audit_log_writer.get_audit_log_writer() is None
@@ -279,3 +279,14 @@ class TestCategoryService:
         # Act & Assert
         with pytest.raises(ValueError, match="Category with name 'New Category' already exists"):
             self.service.create(category)
+
+    def test_update_msgraph_category_to_another_categorys_name_rejected(self):
+        """Test that MS Graph categories, which have no database id, are told apart by Graph id"""
+        category = Category(user_id=123, name="Taken")
+        category.graph_id = "graph-1"
+        existing_category = Category(user_id=123, name="Taken")
+        existing_category.graph_id = "graph-2"
+        self.mock_repository.get_by_name.return_value = existing_category
+
+        with pytest.raises(ValueError, match="already exists"):
+            self.service.update(category)
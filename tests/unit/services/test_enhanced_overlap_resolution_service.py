@@ -267,3 +267,86 @@ class TestEnhancedOverlapResolutionService:
         assert len(result['resolved']) == 1
         assert result['resolved'][0] == tentative1  # Higher priority
         assert tentative2 in result['filtered']
+
+
+class TestConfiguredOverlapRules:
+
+    def create_appointment(self, subject, show_as=None, importance=None, sensitivity=None):
+        start = datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc)
+        return Appointment(
+            user_id=1,
+            subject=subject,
+            start_time=start,
+            end_time=start + timedelta(hours=1),
+            calendar_id='test-calendar',
+            show_as=show_as,
+            importance=importance,
+            sensitivity=sensitivity,
+        )
+
+    def test_rule_hits_are_counted(self):
+        service = EnhancedOverlapResolutionService()
+        free = self.create_appointment("Free", show_as='free')
+        tentative = self.create_appointment("Tentative", show_as='tentative')
+        high = self.create_appointment("High", show_as='busy', importance='high')
+        low = self.create_appointment("Low", show_as='busy', importance='low')
+
+        result = service.apply_automatic_resolution_rules([free, tentative, high, low])
+
+        assert result['resolved'] == [high]
+        assert result['rule_hits'] == {'free': 1, 'tentative': 1, 'priority': 1}
+        service.apply_automatic_resolution_rules([free, high])
+        assert service.get_rule_statistics() == {'free': 2, 'tentative': 1, 'priority': 1}
+
+    def test_tie_is_counted_as_conflict(self):
+        service = EnhancedOverlapResolutionService()
+        a = self.create_appointment("A", importance='high')
+        b = self.create_appointment("B", importance='high')
+
+        result = service.apply_automatic_resolution_rules([a, b])
+
+        assert set(result['conflicts']) == {a, b}
+        assert result['rule_hits'] == {'priority:tie': 2}
+
+    def test_custom_rules_with_tie_continue(self):
+        rules = [
+            {"name": "importance", "action": "rank", "field": "importance",
+             "scores": {"high": 2}, "default": 1, "on_tie": "continue"},
+            {"name": "private", "action": "rank", "field": "sensitivity",
+             "scores": {"private": 0}, "default": 1},
+        ]
+        service = EnhancedOverlapResolutionService(rules=rules)
+        private = self.create_appointment("Private", importance='high', sensitivity='private')
+        normal = self.create_appointment("Normal", importance='high', sensitivity='normal')
+        low = self.create_appointment("Low", importance='low')
+
+        result = service.apply_automatic_resolution_rules([private, normal, low])
+
+        assert result['resolved'] == [normal]
+        assert set(result['filtered']) == {private, low}
+        assert result['rule_hits'] == {'importance': 1, 'private': 1}
+
+    def test_rules_loaded_from_env_file(self, tmp_path, monkeypatch):
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(
+            '{"rules": [{"name": "no-free", "action": "exclude", "field": "show_as", "match": ["Free", "OOF"]}]}'
+        )
+        monkeypatch.setenv("OVERLAP_RESOLUTION_RULES_FILE", str(rules_file))
+        service = EnhancedOverlapResolutionService()
+        oof = self.create_appointment("Away", show_as='oof')
+        busy = self.create_appointment("Busy", show_as='busy')
+
+        result = service.apply_automatic_resolution_rules([oof, busy])
+
+        assert result['resolved'] == [busy]
+        assert result['resolution_log'] == ["Rule 'no-free' filtered 1 appointments"]
+
+    @pytest.mark.parametrize("rule", [
+        {"name": "x", "action": "drop", "field": "show_as", "match": ["free"]},
+        {"name": "x", "action": "rank", "field": "importance"},
+        {"name": "x", "action": "exclude", "field": "show_as"},
+        {"action": "exclude", "field": "show_as", "match": ["free"]},
+    ])
+    def test_invalid_rules_are_rejected(self, rule):
+        with pytest.raises(ValueError):
+            EnhancedOverlapResolutionService(rules=[rule])
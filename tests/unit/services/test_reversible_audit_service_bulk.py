@@ -0,0 +1,121 @@
+"""
+Unit tests for bulk capture and grouped reversal in ReversibleAuditService.
+"""
+from datetime import datetime
+
+import pytest
+
+from core.models.audit_log import AuditLog
+from core.models.reversible_operation import ReversibleOperationItem
+from core.services.reversible_audit_service import (
+    COMPRESSED_STATE_KEY,
+    ReversibleAuditService,
+    compress_state,
+    decode_item_state,
+)
+
+
+class FakeAuditService:
+    def __init__(self, session):
+        self.session = session
+
+    def log_operation(self, **kwargs):
+        kwargs.pop("parent_audit_id", None)
+        audit_log = AuditLog(**kwargs)
+        self.session.add(audit_log)
+        self.session.commit()
+        return audit_log
+
+
+@pytest.fixture
+def service(db_session, test_user):
+    service = ReversibleAuditService(db_session)
+    service.audit_service = FakeAuditService(db_session)
+    return service
+
+
+@pytest.fixture
+def operation(service, test_user):
+    operation, _ = service.start_reversible_operation(
+        user_id=test_user.id, operation_type="archive", operation_name="calendar_archive_replace"
+    )
+    return operation
+
+
+def specs(count, action="delete"):
+    return [
+        {
+            "item_type": "appointment",
+            "item_id": str(i),
+            "external_id": f"evt-{i}",
+            "before_state": {"subject": f"Meeting {i}", "start_time": datetime(2025, 1, 1, 9)},
+            "reverse_action": action,
+        }
+        for i in range(count)
+    ]
+
+
+def test_capture_item_states_inserts_all_items(service, operation, db_session):
+    items = service.capture_item_states(operation, specs(45), chunk_size=10)
+
+    assert [item.item_id for item in items] == [str(i) for i in range(45)]
+    stored = db_session.query(ReversibleOperationItem).filter_by(operation_id=operation.id).all()
+    assert len(stored) == 45
+    assert stored[0].before_state == {"subject": "Meeting 0", "start_time": "2025-01-01T09:00:00"}
+
+
+def test_compressed_states_round_trip(service, operation, db_session):
+    items = service.capture_item_states(operation, specs(3), compress=True)
+    assert service.update_item_after_states(
+        [(item, {"ms_event_id": f"new-{item.item_id}"}) for item in items], compress=True
+    ) == 3
+
+    stored = db_session.query(ReversibleOperationItem).filter_by(item_id="2").one()
+    assert set(stored.before_state) == {COMPRESSED_STATE_KEY}
+    assert decode_item_state(stored.before_state)["subject"] == "Meeting 2"
+    assert decode_item_state(stored.after_state) == {"ms_event_id": "new-2"}
+
+
+def test_decode_leaves_plain_states_alone():
+    assert decode_item_state({"subject": "x"}) == {"subject": "x"}
+    assert decode_item_state(compress_state([1, 2])) == [1, 2]
+
+
+def test_reverse_operation_uses_batch_reverser_in_groups(service, operation, test_user):
+    calls = []
+
+    def reverser(items):
+        calls.append(len(items))
+        return {items[0].id: "gone"} if len(calls) == 1 else {}
+
+    service.batch_reversers[("appointment", "delete")] = reverser
+    service.capture_item_states(operation, specs(45))
+
+    result = service.reverse_operation(operation.id, test_user.id, "undo", batch_size=20)
+
+    assert calls == [20, 20, 5]
+    assert result["reversed_items"] == 44
+    assert result["failed_items"] == 1
+    assert result["errors"] == ["Failed to reverse appointment 0: gone"]
+    assert operation.is_reversed is False
+
+
+def test_reverse_operation_falls_back_to_single_items(service, operation, test_user):
+    service.capture_item_states(operation, specs(2, action="unknown"))
+
+    result = service.reverse_operation(operation.id, test_user.id, "undo")
+
+    assert result["failed_items"] == 2
+    assert "Unknown reverse action: unknown" in result["errors"][0]
+
+
+def test_groups_are_consecutive_runs_in_stored_order():
+    actions = ["delete", "delete", "restore", "delete", "delete", "delete"]
+    items = [
+        ReversibleOperationItem(item_type="appointment", item_id=str(i), reverse_action=action)
+        for i, action in enumerate(actions)
+    ]
+
+    groups = ReversibleAuditService._group_items(items, batch_size=2)
+
+    assert [[item.item_id for item in group] for group in groups] == [["0", "1"], ["2"], ["3", "4"], ["5"]]
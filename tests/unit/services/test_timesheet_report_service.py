@@ -0,0 +1,122 @@
+"""
+Unit tests for TimesheetReportService.
+"""
+from datetime import UTC, datetime
+
+import numpy as np
+import pytest
+
+from core.models.appointment import Appointment
+from core.services.timesheet_report_service import TimesheetReportService
+
+
+def make_appointment(subject, start, end, categories=None, show_as="busy"):
+    return Appointment(
+        user_id=1,
+        calendar_id="primary",
+        subject=subject,
+        start_time=start,
+        end_time=end,
+        categories=categories,
+        show_as=show_as,
+    )
+
+
+@pytest.fixture
+def service():
+    return TimesheetReportService()
+
+
+@pytest.fixture
+def appointments():
+    return [
+        make_appointment(
+            "Workshop",
+            datetime(2025, 6, 2, 9, tzinfo=UTC),
+            datetime(2025, 6, 2, 11, tzinfo=UTC),
+            ["Acme - billable"],
+        ),
+        make_appointment(
+            "Internal sync",
+            datetime(2025, 6, 2, 13, tzinfo=UTC),
+            datetime(2025, 6, 2, 14, tzinfo=UTC),
+            ["Acme - non-billable"],
+        ),
+        make_appointment(
+            "Drive to client",
+            datetime(2025, 6, 2, 23, 30, tzinfo=UTC),
+            datetime(2025, 6, 3, 0, 30, tzinfo=UTC),
+            ["Globex - billable"],
+        ),
+        make_appointment(
+            "Lunch",
+            datetime(2025, 6, 3, 12, tzinfo=UTC),
+            datetime(2025, 6, 3, 12, 30, tzinfo=UTC),
+        ),
+        make_appointment(
+            "Blocked out",
+            datetime(2025, 6, 3, 15, tzinfo=UTC),
+            datetime(2025, 6, 3, 16, tzinfo=UTC),
+            ["Acme - billable"],
+            show_as="free",
+        ),
+    ]
+
+
+class TestTimesheetReportService:
+    def test_build_columns_interns_labels(self, service, appointments):
+        columns = service.build_columns(appointments)
+
+        assert len(columns) == 4
+        assert columns.skipped == 1
+        assert columns.customers == ["Acme", "Globex", "(none)"]
+        assert columns.billing_types == ["billable", "non-billable", "travel", "personal"]
+        np.testing.assert_array_equal(columns.customer, [0, 0, 1, 2])
+        np.testing.assert_array_equal(columns.durations, [7200, 3600, 3600, 1800])
+
+    def test_aggregate_totals(self, service, appointments):
+        report = service.generate_report(appointments)
+
+        assert report["total_appointments"] == 4
+        assert report["total_hours"] == pytest.approx(4.5)
+        assert report["by_customer"]["Acme"] == {"hours": 3.0, "appointments": 2}
+        assert report["by_billing_type"]["travel"] == {"hours": 1.0, "appointments": 1}
+        assert report["by_customer_billing"]["Acme"] == {"billable": 2.0, "non-billable": 1.0}
+        assert report["by_customer_billing"]["Globex"] == {"travel": 1.0}
+        assert report["by_day"] == {"2025-06-02": 4.0, "2025-06-03": 0.5}
+
+    def test_by_day_uses_local_timezone(self, service, appointments):
+        report = service.generate_report(appointments, timezone="Europe/London")
+
+        # 23:30 UTC is 00:30 BST on the following day
+        assert report["by_day"] == {"2025-06-02": 3.0, "2025-06-03": 1.5}
+
+    def test_matches_category_statistics(self, service, appointments):
+        report = service.generate_report(appointments)
+        stats = service.category_service.get_category_statistics(
+            [a for a in appointments if a.show_as != "free"]
+        )
+
+        assert set(stats["customers"]) == {"Acme", "Globex"}
+        assert report["by_billing_type"]["non-billable"]["appointments"] == stats["billing_types"]["non-billable"]
+
+    def test_empty_input(self, service):
+        report = service.generate_report([])
+
+        assert report["total_appointments"] == 0
+        assert report["total_hours"] == 0
+        assert report["by_customer"] == {}
+        assert report["by_day"] == {}
+
+    def test_unique_appointments_drops_copies_from_other_calendars(self, service, appointments):
+        copy = make_appointment(
+            " Workshop ",
+            datetime(2025, 6, 2, 9, tzinfo=UTC),
+            datetime(2025, 6, 2, 11, tzinfo=UTC),
+            ["Acme - billable"],
+        )
+        copy.calendar_id = "archive"
+
+        unique = service.unique_appointments(appointments + [copy])
+
+        assert unique == appointments
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from core.todo.models import TaskCluster
+
+
+@pytest.fixture
+def fake_server():
+    """Start ``server_class(**kwargs)`` on a background thread; every server is shut down after the test."""
+    servers = []
+
+    def start(server_class, **kwargs):
+        server = server_class(**kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def tasks_and_clusters():
+    """
+    Build ``count`` two-task clusters of near-duplicate titles.
+
+    ``title`` is formatted with the cluster ``number`` and ``second_title``
+    with the first task's ``title``. ``bodies`` of None leaves the tasks
+    without a body; ``exact_pair`` appends an exact duplicate pair that
+    never reaches the model.
+    """
+
+    def build(
+        count: int,
+        title: str = "Task {number}",
+        second_title: str = "{title} again",
+        bodies=("first", "second"),
+        exact_pair: bool = False,
+    ):
+        tasks, clusters = [], []
+        for number in range(count):
+            first = title.format(number=number)
+            for suffix, task_title, body in zip("ab", (first, second_title.format(title=first)), bodies or (None, None)):
+                task = {"id": f"t-{number}-{suffix}", "title": task_title}
+                if bodies is not None:
+                    task["body"] = body
+                tasks.append(task)
+            clusters.append(TaskCluster(cluster_id=number + 1, indices=[2 * number, 2 * number + 1]))
+        if exact_pair:
+            tasks.append({"id": "dup-a", "title": "Water plants", "body": ""})
+            tasks.append({"id": "dup-b", "title": "Water plants", "body": ""})
+            clusters.append(TaskCluster(cluster_id=count + 1, indices=[2 * count, 2 * count + 1]))
+        return tasks, clusters
+
+    return build
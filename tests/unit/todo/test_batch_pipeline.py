@@ -0,0 +1,244 @@
+import asyncio
+import json
+import re
+import threading
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.todo.ai import AIDeduplicationService
+from core.todo.ai.batch_pipeline import BatchDedupPipeline, response_content
+from core.todo.config import TodoDedupConfig
+
+openai = pytest.importorskip("openai")
+
+
+class _FakeBatchServer(ThreadingHTTPServer):
+    """Files and Batches endpoints that answer each request by keeping index 0 and deleting the rest."""
+
+    def __init__(self, fail_titles=(), complete: bool = True) -> None:
+        super().__init__(("127.0.0.1", 0), _FakeBatchHandler)
+        self.fail_titles = set(fail_titles)
+        self.complete = complete
+        self.lock = threading.RLock()
+        self.files = {}
+        self.batches = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def add_file(self, content: bytes, purpose: str) -> dict:
+        with self.lock:
+            file_id = f"file-{len(self.files) + 1}"
+            self.files[file_id] = content
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": 0,
+            "filename": f"{file_id}.jsonl",
+            "purpose": purpose,
+            "status": "processed",
+        }
+
+    def finish(self, batch: dict) -> None:
+        outputs, errors = [], []
+        for line in self.files[batch["input_file_id"]].decode().splitlines():
+            request = json.loads(line)
+            prompt = request["body"]["messages"][1]["content"]
+            titles = re.findall(r'"title":"([^"]*)"', prompt)
+            if titles[0] in self.fail_titles:
+                errors.append(
+                    {
+                        "id": "req",
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": 500, "body": {"error": {"message": "server error"}}},
+                        "error": None,
+                    }
+                )
+                continue
+            decisions = [
+                {"index": index, "action": "keep" if index == 0 else "delete", "rationale": title}
+                for index, title in enumerate(titles)
+            ]
+            body = {"choices": [{"message": {"role": "assistant", "content": json.dumps({"decisions": decisions})}}]}
+            outputs.append({"id": "req", "custom_id": request["custom_id"], "response": {"status_code": 200, "body": body}})
+        batch["status"] = "completed"
+        batch["output_file_id"] = self.add_file("".join(json.dumps(line) + "\n" for line in outputs).encode(), "batch_output")["id"]
+        if errors:
+            batch["error_file_id"] = self.add_file("".join(json.dumps(line) + "\n" for line in errors).encode(), "batch_output")["id"]
+
+
+class _FakeBatchHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, payload, content_type: str = "application/json") -> None:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        server = self.server
+        data = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/v1/files":
+            message = BytesParser(policy=default_policy).parsebytes(
+                b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + data
+            )
+            fields = {part.get_param("name", header="content-disposition"): part.get_content() for part in message.iter_parts()}
+            content = fields["file"]
+            self._send(server.add_file(content if isinstance(content, bytes) else content.encode(), fields["purpose"]))
+            return
+        request = json.loads(data)
+        with server.lock:
+            batch = {
+                "id": f"batch-{len(server.batches) + 1}",
+                "object": "batch",
+                "endpoint": request["endpoint"],
+                "input_file_id": request["input_file_id"],
+                "completion_window": request["completion_window"],
+                "status": "validating",
+                "created_at": 0,
+            }
+            server.batches[batch["id"]] = batch
+        self._send(batch)
+
+    def do_GET(self) -> None:
+        server = self.server
+        match = re.fullmatch(r"/v1/files/([^/]+)/content", self.path)
+        if match:
+            self._send(server.files[match.group(1)], "application/jsonl")
+            return
+        batch = server.batches[self.path.rsplit("/", 1)[1]]
+        with server.lock:
+            if batch["status"] == "validating":
+                batch["status"] = "in_progress"
+            elif batch["status"] == "in_progress" and server.complete:
+                server.finish(batch)
+        self._send(batch)
+
+
+# Near-duplicate permit renewals plus an exact duplicate pair that never reaches the model
+_PERMITS = {"title": "Renew permit {number}", "second_title": "{title} soon", "exact_pair": True}
+
+
+def _service(server: _FakeBatchServer, state_dir, **overrides) -> AIDeduplicationService:
+    client = openai.OpenAI(base_url=server.base_url, api_key="test", max_retries=0)
+    settings = {
+        "batch_enabled": True,
+        "batch_shard_size": 2,
+        "batch_state_dir": str(state_dir),
+        "batch_poll_interval_seconds": 0,
+        "batch_completion_timeout_seconds": 30,
+    }
+    settings.update(overrides)
+    return AIDeduplicationService(config=TodoDedupConfig(**settings), openai_client=client)
+
+
+def test_batch_mode_submits_shards_and_merges_decisions(fake_server, tasks_and_clusters, tmp_path) -> None:
+    server = fake_server(_FakeBatchServer)
+    service = _service(server, tmp_path)
+    tasks, clusters = tasks_and_clusters(5, **_PERMITS)
+
+    decisions = service.process_clusters(tasks=tasks, clusters=clusters, available_lists=["Tasks"])
+
+    assert len(server.batches) == 3
+    assert [decisions[f"t-{number}-b"].raw_action for number in range(5)] == ["delete"] * 5
+    assert decisions["t-3-a"].cluster_id == 4 and decisions["t-3-a"].source != "auto"
+    assert decisions["dup-b"].source == "auto"
+    report = service.last_batch_report
+    assert (report.requests, report.shards, report.succeeded, report.failed, report.missing) == (5, 3, 5, 0, 0)
+    assert len(list(tmp_path.glob("run_*/shard_*_output.jsonl"))) == 3
+
+
+def test_failed_requests_are_accounted_per_request(fake_server, tasks_and_clusters, tmp_path) -> None:
+    server = fake_server(_FakeBatchServer, fail_titles={"Renew permit 2"})
+    service = _service(server, tmp_path)
+    tasks, clusters = tasks_and_clusters(4, **_PERMITS)
+
+    decisions = service.process_clusters(tasks=tasks, clusters=clusters, available_lists=["Tasks"])
+
+    report = service.last_batch_report
+    assert (report.succeeded, report.failed) == (3, 1)
+    assert report.errors == {"cluster-3-2": "server error"}
+    assert "t-2-a" not in decisions and "t-2-b" not in decisions
+    assert decisions["t-1-b"].raw_action == "delete"
+
+
+def test_timed_out_run_resumes_without_resubmitting(fake_server, tasks_and_clusters, tmp_path) -> None:
+    server = fake_server(_FakeBatchServer, complete=False)
+    service = _service(server, tmp_path, batch_completion_timeout_seconds=0)
+    tasks, clusters = tasks_and_clusters(3, **_PERMITS)
+
+    with pytest.raises(TimeoutError):
+        service.process_clusters(tasks=tasks, clusters=clusters, available_lists=["Tasks"])
+    assert len(server.batches) == 2
+
+    server.complete = True
+    resumed = _service(server, tmp_path)
+    decisions = resumed.process_clusters(tasks=tasks, clusters=clusters, available_lists=["Tasks"])
+
+    assert len(server.batches) == 2
+    assert resumed.last_batch_report.submitted_shards == 0
+    assert resumed.last_batch_report.succeeded == 3
+    assert decisions["t-2-b"].raw_action == "delete"
+
+
+def test_response_content_reads_chat_and_responses_bodies() -> None:
+    assert response_content({"choices": [{"message": {"content": "chat"}}]}) == "chat"
+    body = {"output": [{"type": "message", "content": [{"type": "output_text", "text": "responses"}]}]}
+    assert response_content(body) == "responses"
+    assert response_content({}) is None
+
+
+def test_pipeline_runs_from_inside_an_event_loop(fake_server, tasks_and_clusters, tmp_path) -> None:
+    server = fake_server(_FakeBatchServer)
+    tasks, clusters = tasks_and_clusters(3, **_PERMITS)
+
+    async def sync_caller():
+        return _service(server, tmp_path / "sync").process_clusters(
+            tasks=tasks, clusters=clusters, available_lists=["Tasks"]
+        )
+
+    async def async_caller():
+        client = openai.OpenAI(base_url=server.base_url, api_key="test", max_retries=0)
+        config = TodoDedupConfig(batch_poll_interval_seconds=0, batch_completion_timeout_seconds=30)
+        pipeline = BatchDedupPipeline(client, config, state_dir=tmp_path / "async")
+        messages = [{"role": "system", "content": "s"}, {"role": "user", "content": '[{"title":"Water plants"}]'}]
+        return await pipeline.arun([("request-1", messages)])
+
+    decisions = asyncio.run(sync_caller())
+    contents, report = asyncio.run(async_caller())
+
+    assert decisions["t-1-b"].raw_action == "delete"
+    assert (report.requests, report.succeeded) == (1, 1)
+    assert json.loads(contents["request-1"])["decisions"][0]["action"] == "keep"
+
+
+def test_requests_are_streamed_from_a_generator(fake_server, tmp_path) -> None:
+    server = fake_server(_FakeBatchServer)
+    client = openai.OpenAI(base_url=server.base_url, api_key="test", max_retries=0)
+    config = TodoDedupConfig(batch_shard_size=2, batch_poll_interval_seconds=0, batch_completion_timeout_seconds=30)
+    pipeline = BatchDedupPipeline(client, config, state_dir=tmp_path)
+    produced = []
+
+    def requests():
+        for number in range(5):
+            produced.append(number)
+            content = json.dumps([{"title": f"Task {number}"}], separators=(",", ":"))
+            yield f"request-{number}", [{"role": "system", "content": "s"}, {"role": "user", "content": content}]
+
+    contents, report = pipeline.run(requests())
+    _, resumed = pipeline.run(requests())
+
+    assert produced == list(range(5)) * 2
+    assert (report.requests, report.shards, report.succeeded) == (5, 3, 5)
+    assert resumed.run_id == report.run_id and resumed.submitted_shards == 0
+    assert len(server.batches) == 3
+    assert [path.name for path in tmp_path.iterdir() if path.is_dir()] == [f"run_{report.run_id}"]
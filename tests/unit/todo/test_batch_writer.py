@@ -0,0 +1,44 @@
+import gzip
+import json
+
+import pytest
+
+from core.todo.ai import BatchRequestBuilder, StreamingBatchWriter
+
+
+def _messages(number: int, padding: int = 0):
+    return [{"role": "user", "content": f"task {number}" + "x" * padding}]
+
+
+def _lines(path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_rolls_over_at_request_limit_and_matches_builder(tmp_path) -> None:
+    builder = BatchRequestBuilder()
+    with StreamingBatchWriter(tmp_path, max_requests=2) as writer:
+        for number in range(5):
+            writer.add_request(custom_id=f"r{number}", model="gpt-4o-mini", messages=_messages(number), max_tokens=50)
+            builder.add_request(custom_id=f"r{number}", model="gpt-4o-mini", messages=_messages(number), max_tokens=50)
+
+    assert [path.name for path in writer.shards] == ["batch_0000.jsonl", "batch_0001.jsonl", "batch_0002.jsonl"]
+    assert writer.shard_requests == [2, 2, 1]
+    builder.to_jsonl(tmp_path / "all.jsonl")
+    assert [line for path in writer.shards for line in _lines(path)] == _lines(tmp_path / "all.jsonl")
+
+
+def test_rolls_over_at_byte_limit_and_compresses(tmp_path) -> None:
+    writer = StreamingBatchWriter(tmp_path, prefix="shard", max_bytes=800, compress=True)
+    for number in range(4):
+        writer.add_request(custom_id=f"r{number}", model="gpt-5-mini", messages=_messages(number, 200), max_tokens=50)
+    shards = writer.close()
+
+    assert [path.name for path in shards][0] == "shard_0000.jsonl.gz"
+    assert len(shards) == 2 and writer.shard_requests == [2, 2]
+    assert _lines(shards[1])[0]["url"] == "/v1/responses"
+    assert writer.endpoint == "/v1/responses"
+
+    with pytest.raises(ValueError):
+        writer.add_request(custom_id="huge", model="gpt-5-mini", messages=_messages(9, 1000), max_tokens=50)
@@ -0,0 +1,121 @@
+import json
+from types import SimpleNamespace
+
+from core.todo.ai import AIDeduplicationService, DedupResponseParser
+from core.todo.config import TodoDedupConfig
+
+
+class _EchoCompletions:
+    """Keeps index 0 of every cluster and deletes the rest, for single and packed prompts."""
+
+    def __init__(self, drop_clusters=()) -> None:
+        self.drop_clusters = set(drop_clusters)
+        self.prompts = []
+
+    def create(self, **kwargs):
+        content = kwargs["messages"][1]["content"]
+        self.prompts.append(content)
+        payload = json.loads(content.rsplit("\n", 1)[1])
+        decisions = []
+        if payload and "cluster" in payload[0]:
+            for cluster in payload:
+                if cluster["tasks"][0]["title"] in self.drop_clusters:
+                    continue
+                decisions.extend(self._decide(cluster["tasks"], cluster=cluster["cluster"]))
+        else:
+            decisions = self._decide(payload)
+        response = json.dumps({"decisions": decisions})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=response))])
+
+    @staticmethod
+    def _decide(tasks, **extra):
+        return [
+            {"index": task["index"], "action": "keep" if task["index"] == 0 else "delete", "rationale": task["title"], **extra}
+            for task in tasks
+        ]
+
+
+# Two-task clusters without bodies
+_CALLS = {"title": "Call client {number}", "second_title": "{title} back", "bodies": None}
+
+
+def _run(tasks_and_clusters, budget: int, max_tasks: int = 24, drop_clusters=()):
+    completions = _EchoCompletions(drop_clusters)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    config = TodoDedupConfig(dedup_pack_token_budget=budget, dedup_pack_max_tasks=max_tasks)
+    service = AIDeduplicationService(config=config, openai_client=client)
+    tasks, clusters = tasks_and_clusters(6, **_CALLS)
+    decisions = service.process_clusters(tasks=tasks, clusters=clusters, available_lists=["Tasks"])
+    summary = {key: (d.raw_action, d.rationale, d.cluster_id, d.cluster_index) for key, d in decisions.items()}
+    return summary, completions, service.last_run_stats
+
+
+def test_packed_run_matches_unpacked_decisions_with_fewer_calls(tasks_and_clusters) -> None:
+    unpacked, unpacked_calls, unpacked_stats = _run(tasks_and_clusters, budget=0)
+    packed, packed_calls, packed_stats = _run(tasks_and_clusters, budget=8000)
+
+    assert packed == unpacked
+    assert list(packed) == list(unpacked)
+    assert len(unpacked_calls.prompts) == 6
+    assert len(packed_calls.prompts) == 1
+    assert packed_stats["packed_calls"] == 1
+    assert packed_stats["prompt_tokens_saved"] > packed_stats["prompt_tokens"]
+    assert unpacked_stats["prompt_tokens_saved"] == 0
+
+
+def test_packs_respect_task_limit(tasks_and_clusters) -> None:
+    _, completions, stats = _run(tasks_and_clusters, budget=8000, max_tasks=4)
+
+    assert len(completions.prompts) == 3
+    assert stats["packed_calls"] == 3
+
+
+def test_clusters_failing_validation_are_retried_alone(tasks_and_clusters) -> None:
+    expected, _, _ = _run(tasks_and_clusters, budget=0)
+    decisions, completions, stats = _run(tasks_and_clusters, budget=8000, drop_clusters={"Call client 4"})
+
+    assert decisions == expected
+    # One packed call, then the cluster without decisions on its own
+    assert len(completions.prompts) == 2
+    assert "Call client 4" in completions.prompts[1] and "Call client 3" not in completions.prompts[1]
+    assert stats["model_calls"] == 2
+
+
+def test_parse_packed_demultiplexes_by_cluster() -> None:
+    entries = [
+        [{"task": {}, "task_key": "a", "cluster_index": 0}, {"task": {}, "task_key": "b", "cluster_index": 1}],
+        [{"task": {}, "task_key": "c", "cluster_index": 2}],
+    ]
+    payload = json.dumps(
+        {
+            "decisions": [
+                {"cluster": 1, "index": 0, "action": "keep"},
+                {"cluster": 0, "index": 1, "action": "delete"},
+                {"cluster": 7, "index": 0, "action": "keep"},
+            ]
+        }
+    )
+
+    first, second = DedupResponseParser().parse_packed(payload, entries)
+
+    assert list(first[0]) == ["b"] and first[1] == ["Missing decision for index 0"]
+    assert list(second[0]) == ["c"] and second[1] == []
+    assert json.loads(second[2]) == {"decisions": [{"index": 0, "action": "keep"}]}
+    assert DedupResponseParser().parse_packed("nope", entries)[1][1][0].startswith("Invalid JSON")
+
+
+def test_packed_responses_are_cached_per_cluster(tasks_and_clusters, tmp_path) -> None:
+    from core.todo.ai import DecisionCache
+
+    cache = DecisionCache(tmp_path / "decisions.db")
+    tasks, clusters = tasks_and_clusters(6, **_CALLS)
+    for budget in (8000, 0):
+        completions = _EchoCompletions()
+        client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        service = AIDeduplicationService(
+            config=TodoDedupConfig(dedup_pack_token_budget=budget), openai_client=client, decision_cache=cache
+        )
+        decisions = service.process_clusters(tasks=tasks, clusters=clusters, available_lists=["Tasks"])
+
+    assert completions.prompts == []
+    assert decisions["t-5-b"].raw_action == "delete" and decisions["t-5-b"].cluster_id == 6
@@ -33,3 +33,88 @@ def test_cluster_tasks_respects_threshold() -> None:
 
     assert clusters == []
 
+
+
+def test_candidate_pairs_match_token_overlap() -> None:
+    from core.todo.services.clustering_service import candidate_pairs
+
+    titles = [
+        "Email Contoso about pricing",
+        "email contoso re: pricing",
+        "Prepare quarterly report",
+        "Call Fabrikam",
+        "",
+    ]
+
+    pairs = set(candidate_pairs(titles))
+
+    assert (0, 1) in pairs
+    assert not any(2 in pair for pair in pairs)
+    assert not any(4 in pair for pair in pairs)
+
+
+def test_cluster_membership_is_transitive_and_order_independent() -> None:
+    import random
+
+    service = TaskClusteringService(TodoDedupConfig(fuzzy_score_threshold=80))
+    # The first matches the second and the second the third, but the first
+    # and third score below 80
+    chain = [
+        {"title": "Renew the Contoso support contract"},
+        {"title": "Renew the Contoso support contract before Friday"},
+        {"title": "the Contoso contract before Friday or call legal"},
+    ]
+    other = [{"title": "Book flights to Lisbon"}]
+    tasks = chain + other
+
+    clusters = service.cluster_tasks(tasks, include_singletons=False, use_body=False)
+    assert [cluster.indices for cluster in clusters] == [[0, 1, 2]]
+
+    shuffled = list(range(len(tasks)))
+    random.Random(3).shuffle(shuffled)
+    reordered = service.cluster_tasks([tasks[i] for i in shuffled], include_singletons=False, use_body=False)
+    assert [sorted(shuffled[i] for i in cluster.indices) for cluster in reordered] == [[0, 1, 2]]
+
+
+def test_blocked_clusters_match_exhaustive_scoring() -> None:
+    service = TaskClusteringService(TodoDedupConfig(fuzzy_score_threshold=86))
+    tasks = [
+        {"title": "Follow up with Contoso", "body": "Email Alan about pricing"},
+        {"title": "Follow-up with Contoso", "body": "email alan re pricing"},
+        {"title": "Prepare quarterly report", "body": "Compile slide deck"},
+        {"title": "Prepare the quarterly report", "body": "slides"},
+        {"title": "Call Fabrikam", "body": ""},
+        {"title": "Call Fabrikma", "body": ""},
+        {"title": "Book flights", "body": ""},
+    ]
+
+    blocked = service.cluster_tasks(tasks)
+    exhaustive = service.cluster_tasks(tasks, blocking=False)
+
+    assert [c.indices for c in blocked] == [c.indices for c in exhaustive]
+
+
+def test_score_pairs_matches_per_pair_formula() -> None:
+    import numpy as np
+    from rapidfuzz import fuzz
+
+    from core.todo.services.clustering_service import score_pairs
+
+    titles = ["email contoso", "email contoso re pricing", "call fabrikam", "call fabrikma", "book flights"]
+    bodies = ["pricing sheet", "", "quarterly review notes", "quarterly review", ""]
+    left, right = np.triu_indices(len(titles), k=1)
+
+    for threshold in (60, 86, 95):
+        expected = []
+        for i, j in zip(left.tolist(), right.tolist()):
+            title_score = fuzz.partial_ratio(titles[i], titles[j])
+            body_score = fuzz.partial_ratio(bodies[i], bodies[j]) if bodies[i] and bodies[j] else 0
+            expected.append(max(int(0.7 * title_score + 0.3 * body_score), title_score) >= threshold)
+        assert score_pairs(titles, bodies, left, right, threshold).tolist() == expected
+
+
+def test_titles_are_compared_case_insensitively() -> None:
+    service = TaskClusteringService(TodoDedupConfig(fuzzy_score_threshold=95))
+    tasks = [{"title": "EMAIL CONTOSO"}, {"title": "email   contoso"}]
+
+    assert [c.indices for c in service.cluster_tasks(tasks, include_singletons=False)] == [[0, 1]]
@@ -0,0 +1,163 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.todo.ai import AIDeduplicationService, RateLimiter
+from core.todo.config import TodoDedupConfig
+
+openai = pytest.importorskip("openai")
+
+
+class _FakeOpenAIServer(ThreadingHTTPServer):
+    """OpenAI-compatible chat completions endpoint that rate limits the first requests."""
+
+    def __init__(self, rate_limited_requests: int = 0, delay: float = 0.05) -> None:
+        super().__init__(("127.0.0.1", 0), _FakeOpenAIHandler)
+        self.rate_limited_requests = rate_limited_requests
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class _FakeOpenAIHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            if server.requests <= server.rate_limited_requests:
+                self._send(429, {"error": {"message": "slow down", "type": "rate_limit"}}, {"retry-after-ms": "5"})
+                return
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        titles = re.findall(r'"title":"([^"]*)"', request["messages"][1]["content"])
+        content = json.dumps(
+            {
+                "decisions": [
+                    {"index": 0, "action": "keep", "rationale": titles[0]},
+                    {"index": 1, "action": "delete", "rationale": f"duplicate of {titles[0]}"},
+                ]
+            }
+        )
+        with server.lock:
+            server.in_flight -= 1
+        self._send(
+            200,
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": request["model"],
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+                ],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+            },
+        )
+
+
+def _service(server: _FakeOpenAIServer, concurrency: int, sleeps=None) -> AIDeduplicationService:
+    client = openai.OpenAI(base_url=server.base_url, api_key="test", max_retries=0)
+    config = TodoDedupConfig(dedup_model="gpt-4o-mini", dedup_max_concurrency=concurrency)
+    return AIDeduplicationService(
+        config=config,
+        openai_client=client,
+        sleep=sleeps.append if sleeps is not None else time.sleep,
+    )
+
+
+def test_concurrent_mode_matches_sequential_results(fake_server, tasks_and_clusters) -> None:
+    tasks, clusters = tasks_and_clusters(12)
+    sequential_server = fake_server(_FakeOpenAIServer)
+    concurrent_server = fake_server(_FakeOpenAIServer)
+
+    sequential = _service(sequential_server, concurrency=1).process_clusters(
+        tasks=tasks, clusters=clusters, available_lists=["Tasks"]
+    )
+    concurrent = _service(concurrent_server, concurrency=4).process_clusters(
+        tasks=tasks, clusters=clusters, available_lists=["Tasks"]
+    )
+
+    assert list(concurrent) == list(sequential)
+    assert [(d.raw_action, d.rationale, d.cluster_id) for d in concurrent.values()] == [
+        (d.raw_action, d.rationale, d.cluster_id) for d in sequential.values()
+    ]
+    assert concurrent["t-7-b"].rationale == "duplicate of Task 7"
+    assert sequential_server.max_in_flight == 1
+    assert 1 < concurrent_server.max_in_flight <= 4
+
+
+def test_rate_limited_calls_are_retried_after_server_hint(fake_server, tasks_and_clusters) -> None:
+    tasks, clusters = tasks_and_clusters(3)
+    server = fake_server(_FakeOpenAIServer, rate_limited_requests=2)
+    sleeps = []
+
+    decisions = _service(server, concurrency=2, sleeps=sleeps).process_clusters(
+        tasks=tasks, clusters=clusters, available_lists=["Tasks"]
+    )
+
+    assert len(decisions) == 6
+    assert sleeps == [0.005, 0.005]
+    assert server.requests == 5
+
+
+def test_rate_limit_errors_propagate_after_max_retries(fake_server, tasks_and_clusters) -> None:
+    tasks, clusters = tasks_and_clusters(1)
+    server = fake_server(_FakeOpenAIServer, rate_limited_requests=10)
+    service = _service(server, concurrency=1, sleeps=[])
+    service._config.dedup_max_retries = 2
+
+    with pytest.raises(openai.RateLimitError):
+        service.process_clusters(tasks=tasks, clusters=clusters, available_lists=["Tasks"])
+    assert server.requests == 3
+
+
+def test_rate_limiter_waits_for_request_and_token_budgets() -> None:
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=600, clock=lambda: now[0], sleep=sleep)
+
+    assert limiter.acquire(300) == 0
+    assert limiter.acquire(200) == 0
+    # Both buckets are short: one request refills in 30 s, 200 more tokens in 20 s
+    assert limiter.acquire(300) == pytest.approx(30)
+    limiter.refund(300)
+    assert limiter.acquire(0) == pytest.approx(30)
+    assert sleeps == [pytest.approx(30), pytest.approx(30)]
+
+
+def test_default_client_leaves_retries_to_the_service(monkeypatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    service = AIDeduplicationService(config=TodoDedupConfig())
+
+    assert service._client.max_retries == 0
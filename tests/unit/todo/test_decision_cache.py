@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+from core.todo.ai import AIDeduplicationService
+from core.todo.ai.decision_cache import DecisionCache
+from core.todo.config import TodoDedupConfig
+from core.todo.models import TaskCluster
+
+RESPONSE = (
+    '{"decisions": ['
+    '{"index": 0, "action": "keep", "target_list": null, "merged_title": null, "rationale": "keep"},'
+    '{"index": 1, "action": "delete", "target_list": null, "merged_title": null, "rationale": "dup"}'
+    "]}"
+)
+
+
+class _CountingCompletions:
+    def __init__(self, response: str) -> None:
+        self.response = response
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.response))])
+
+
+def _service(cache: DecisionCache, response: str = RESPONSE):
+    completions = _CountingCompletions(response)
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    service = AIDeduplicationService(
+        config=TodoDedupConfig(dedup_model="gpt-4o-mini"), openai_client=client, decision_cache=cache
+    )
+    return service, completions
+
+
+def _tasks():
+    return [
+        {"id": "a", "etag": "W/1", "title": "Call Contoso"},
+        {"id": "b", "etag": "W/2", "title": "Call Contoso re renewal"},
+        {"id": "c", "etag": "W/3", "title": "Draft budget"},
+        {"id": "d", "etag": "W/4", "title": "Draft the budget"},
+    ]
+
+
+CLUSTERS = [TaskCluster(cluster_id=1, indices=[0, 1]), TaskCluster(cluster_id=2, indices=[2, 3])]
+
+
+def test_unchanged_clusters_are_served_from_cache(tmp_path) -> None:
+    cache_path = tmp_path / "decisions.db"
+    first, first_calls = _service(DecisionCache(cache_path))
+    expected = first.process_clusters(tasks=_tasks(), clusters=CLUSTERS, available_lists=["Tasks"])
+
+    second, second_calls = _service(DecisionCache(cache_path))
+    tasks = _tasks()
+    tasks[3]["etag"] = "W/4b"
+    decisions = second.process_clusters(tasks=tasks, clusters=CLUSTERS, available_lists=["Tasks"])
+
+    assert first_calls.calls == 2
+    assert second_calls.calls == 1  # only the cluster with the edited task
+    assert second.cache_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert {key: d.raw_action for key, d in decisions.items()} == {key: d.raw_action for key, d in expected.items()}
+
+
+def test_changed_prompt_inputs_miss_the_cache(tmp_path) -> None:
+    cache = DecisionCache(tmp_path / "decisions.db")
+    service, completions = _service(cache)
+    service.process_clusters(tasks=_tasks(), clusters=CLUSTERS[:1], available_lists=["Tasks"])
+    service.process_clusters(tasks=_tasks(), clusters=CLUSTERS[:1], available_lists=["Tasks", "Clients"])
+
+    assert completions.calls == 2
+
+
+def test_unparseable_responses_are_not_cached(tmp_path) -> None:
+    cache = DecisionCache(tmp_path / "decisions.db")
+    service, completions = _service(cache, response="not json")
+    service.process_clusters(tasks=_tasks(), clusters=CLUSTERS[:1], available_lists=["Tasks"])
+    service.process_clusters(tasks=_tasks(), clusters=CLUSTERS[:1], available_lists=["Tasks"])
+
+    assert completions.calls == 2
+
+
+def test_entries_expire_and_least_recently_used_are_evicted(tmp_path) -> None:
+    now = [1000.0]
+    cache = DecisionCache(tmp_path / "decisions.db", ttl_seconds=60, max_entries=2, clock=lambda: now[0])
+    cache.EVICT_EVERY = 1
+
+    cache.put("a", "A")
+    now[0] += 1
+    cache.put("b", "B")
+    now[0] += 1
+    assert cache.get("a") == "A"  # a is now more recent than b
+    now[0] += 1
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    now[0] += 61
+    assert cache.get("c") is None
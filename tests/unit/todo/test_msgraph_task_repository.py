@@ -216,3 +216,61 @@ def test_update_task_raises_on_graph_error(repository: MSGraphTaskRepository, us
             task,
             changes={"title": "Updated"},
         )
+
+
+def test_list_all_tasks_batches_flagged_email_lookups(user: SimpleNamespace, monkeypatch: pytest.MonkeyPatch) -> None:
+    repository = MSGraphTaskRepository(max_workers=4)
+    lists_response = {
+        "value": [
+            {"id": "tasks", "displayName": "Tasks", "wellknownListName": "defaultList"},
+            {"id": "flag", "displayName": "Flagged Emails", "wellknownListName": "flaggedEmails"},
+        ]
+    }
+    flagged_tasks = [
+        {
+            "id": f"task-{number}",
+            "title": f"Reply {number}",
+            "status": "notStarted",
+            "linkedResources": [{"id": f"res{number}", "externalId": f"MSG{number}"}],
+        }
+        for number in range(25)
+    ]
+    batches = []
+
+    def fake_http_get(url: str, headers: Dict[str, str], params: Dict[str, str] | None = None):
+        if url.endswith("/me/todo/lists"):
+            return lists_response
+        if url.endswith("/me/todo/lists/tasks/tasks"):
+            return {"value": [{"id": "plain", "title": "Plain", "status": "notStarted", "linkedResources": []}]}
+        if url.endswith("/me/todo/lists/flag/tasks"):
+            return {"value": flagged_tasks}
+        if url.endswith("/me/messages/MSG3"):
+            return {"bodyPreview": "Retried 3"}
+        raise AssertionError(f"Unexpected URL: {url}")
+
+    def fake_http_post(url: str, headers: Dict[str, str], payload: Dict[str, Any]):
+        assert url == "https://graph.microsoft.com/v1.0/$batch"
+        batches.append(payload["requests"])
+        responses = []
+        for request in payload["requests"]:
+            message_id = request["url"].split("/")[-1].split("?")[0]
+            if message_id == "MSG3":
+                responses.append({"id": request["id"], "status": 429, "body": {}})
+            elif message_id == "MSG4":
+                responses.append({"id": request["id"], "status": 404, "body": {}})
+            else:
+                responses.append({"id": request["id"], "status": 200, "body": {"bodyPreview": f"Preview {message_id}"}})
+        return {"responses": list(reversed(responses))}
+
+    monkeypatch.setattr(repository, "_http_get", fake_http_get)
+    monkeypatch.setattr(repository, "_http_post", fake_http_post)
+
+    tasks = repository.list_all_tasks(user, "token")
+
+    assert [task.task_id for task in tasks] == ["plain"] + [f"task-{number}" for number in range(25)]
+    assert sorted(len(requests) for requests in batches) == [5, 20]
+    previews = {task.task_id: task.linked_resources[0].preview for task in tasks[1:]}
+    assert previews["task-0"] == "Preview MSG0"
+    assert previews["task-24"] == "Preview MSG24"
+    assert previews["task-3"] == "Retried 3"
+    assert previews["task-4"] is None
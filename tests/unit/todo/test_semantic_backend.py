@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from core.todo.config import TodoDedupConfig
+from core.todo.services import TaskClusteringService
+from core.todo.services.semantic_backend import (
+    EmbeddingCache,
+    HashedTfidfEmbedder,
+    InnerProductIndex,
+    SemanticBackend,
+    build_semantic_backend,
+)
+
+TASKS = [
+    {"title": "Send invoice to Acme", "etag": "W/1"},
+    {"title": "Acme – invoice follow-up", "etag": "W/2"},
+    {"title": "Book flights to Berlin", "etag": "W/3"},
+    {"title": "Prepare quarterly report", "etag": "W/4"},
+    {"title": "Call Fabrikam about renewal", "etag": "W/5"},
+    {"title": "Invoice Tailspin for March", "etag": "W/6"},
+]
+
+
+class CountingEmbedder(HashedTfidfEmbedder):
+    def __init__(self) -> None:
+        super().__init__()
+        self.embedded = []
+
+    def embed(self, texts):
+        self.embedded.extend(texts)
+        return super().embed(texts)
+
+
+def test_semantic_backend_groups_paraphrases() -> None:
+    fuzzy_only = TaskClusteringService(TodoDedupConfig())
+    blended = TaskClusteringService(TodoDedupConfig(semantic_backend="tfidf"))
+
+    assert fuzzy_only.cluster_tasks(TASKS, include_singletons=False) == []
+    assert [c.indices for c in blended.cluster_tasks(TASKS, include_singletons=False)] == [[0, 1]]
+
+
+def test_embeddings_are_cached_by_embedded_text(tmp_path) -> None:
+    texts = [task["title"] for task in TASKS]
+    embedder = CountingEmbedder()
+    backend = SemanticBackend(embedder, cache=EmbeddingCache(tmp_path / "embeddings.db"))
+
+    first = backend.embed_tasks(texts)
+    second = backend.embed_tasks(texts)
+    assert len(embedder.embedded) == len(TASKS)
+    np.testing.assert_allclose(first, second, rtol=1e-6)
+
+    # The same task embedded with its body is a different text
+    with_body = [texts[0] + " net 30 days"] + texts[1:]
+    backend.embed_tasks(with_body)
+    assert embedder.embedded[len(TASKS):] == [with_body[0]]
+
+
+def test_inner_product_index_finds_all_pairs_above_threshold() -> None:
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    left, right = InnerProductIndex(top_k=49, block_size=16).neighbour_pairs(vectors, 0.6)
+
+    similarities = vectors @ vectors.T
+    expected = {(i, j) for i in range(50) for j in range(i + 1, 50) if similarities[i, j] >= 0.6}
+    assert set(zip(left.tolist(), right.tolist())) == expected
+
+
+def test_config_reads_semantic_settings_from_env(monkeypatch) -> None:
+    monkeypatch.setenv("TODO_DEDUP_SEMANTIC_BACKEND", "TFIDF")
+    monkeypatch.setenv("TODO_DEDUP_SEMANTIC_WEIGHT", "0.4")
+
+    config = TodoDedupConfig.from_env()
+
+    assert config.semantic_backend == "tfidf"
+    assert config.semantic_weight == 0.4
+    assert config.fuzzy_score_threshold == 86
+    assert isinstance(build_semantic_backend(config), SemanticBackend)
+
+
+def test_unknown_semantic_backend_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        build_semantic_backend(TodoDedupConfig(semantic_backend="word2vec"))
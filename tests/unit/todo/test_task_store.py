@@ -0,0 +1,161 @@
+import random
+from types import SimpleNamespace
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import pytest
+
+from core.todo.config import TodoDedupConfig
+from core.todo.repositories import MSGraphTaskRepository, MSGraphTaskRepositoryError, TaskStore
+from core.todo.services import TaskClusteringService
+
+GRAPH = "https://graph.microsoft.com/v1.0"
+
+
+class _FakeGraph:
+    """To Do lists with a change log, served through delta, list, task and $batch endpoints."""
+
+    def __init__(self) -> None:
+        self.lists = [
+            {"id": "tasks", "displayName": "Tasks", "wellknownListName": "defaultList"},
+            {"id": "flag", "displayName": "Flagged Emails", "wellknownListName": "flaggedEmails"},
+        ]
+        self.tasks: Dict[str, Dict[str, Dict[str, Any]]] = {"tasks": {}, "flag": {}}
+        self.log: list = []
+        self.expired_tokens: set = set()
+        self.calls: list = []
+
+    def put(self, list_id: str, task_id: str, title: str, status: str = "notStarted", linked=()) -> None:
+        self.tasks[list_id][task_id] = {
+            "id": task_id,
+            "title": title,
+            "status": status,
+            "@odata.etag": f"W/\"{len(self.log)}\"",
+            "lastModifiedDateTime": f"2025-10-21T12:{len(self.log):02d}:00Z",
+            "linkedResources": list(linked),
+        }
+        self.log.append((list_id, {"id": task_id, "title": title}))
+
+    def delete(self, list_id: str, task_id: str) -> None:
+        del self.tasks[list_id][task_id]
+        self.log.append((list_id, {"id": task_id, "@removed": {"reason": "deleted"}}))
+
+    def get(self, url: str, headers: Dict[str, str], params: Dict[str, str] | None = None):
+        self.calls.append(("GET", url))
+        parts = urlsplit(url)
+        path = parts.path[len("/v1.0") :]
+        segments = path.strip("/").split("/")
+        if path == "/me/todo/lists":
+            return {"value": self.lists}
+        if path.startswith("/me/messages/"):
+            return {"bodyPreview": f"Email {segments[-1]}"}
+        list_id = segments[3]
+        if segments[-1] == "delta":
+            token = int(parts.query.split("=")[1]) if parts.query else None
+            if (list_id, token) in self.expired_tokens:
+                raise MSGraphTaskRepositoryError("Gone", 410)
+            if token is None:
+                changes = list(self.tasks[list_id].values())
+            else:
+                changes = [change for logged_list, change in self.log[token:] if logged_list == list_id]
+            return {"value": changes, "@odata.deltaLink": f"{GRAPH}{path}?$deltatoken={len(self.log)}"}
+        if segments[-1] == "tasks":
+            return {"value": [task for task in self.tasks[list_id].values() if task["status"] != "completed"]}
+        raise AssertionError(f"Unexpected URL: {url}")
+
+    def post(self, url: str, headers: Dict[str, str], payload: Dict[str, Any]):
+        assert url == f"{GRAPH}/$batch"
+        self.calls.append(("POST", url))
+        responses = []
+        for request in payload["requests"]:
+            path = request["url"].split("?")[0].strip("/").split("/")
+            if path[1] == "messages":
+                responses.append({"id": request["id"], "status": 200, "body": {"bodyPreview": f"Email {path[2]}"}})
+                continue
+            task = self.tasks[path[3]].get(path[5])
+            responses.append({"id": request["id"], "status": 200 if task else 404, "body": task or {}})
+        return {"responses": responses}
+
+
+@pytest.fixture
+def graph():
+    fake = _FakeGraph()
+    fake.put("tasks", "t1", "Book dentist")
+    fake.put("tasks", "t2", "Renew passport")
+    fake.put("flag", "f1", "Reply to Alex", linked=[{"id": "r1", "externalId": "MSG1"}])
+    fake.put("flag", "f2", "Reply to Sam", linked=[{"id": "r2", "externalId": "MSG2"}])
+    return fake
+
+
+@pytest.fixture
+def repository(graph: _FakeGraph, monkeypatch: pytest.MonkeyPatch) -> MSGraphTaskRepository:
+    repository = MSGraphTaskRepository(max_workers=2)
+    monkeypatch.setattr(repository, "_http_get", graph.get)
+    monkeypatch.setattr(repository, "_http_post", graph.post)
+    return repository
+
+
+def test_sync_applies_deltas_to_the_store(repository, graph, tmp_path) -> None:
+    user = SimpleNamespace(id=1, email="user@example.com")
+    store = TaskStore(tmp_path / "tasks.db")
+
+    first = repository.sync_tasks(user, "token", store)
+    assert first.changed_ids == {"t1", "t2", "f1", "f2"}
+    assert sorted(first.resynced_lists) == ["flag", "tasks"]
+    flagged = {task.task_id: task for task in store.tasks() if task.list_id == "flag"}
+    assert flagged["f1"].linked_resources[0].preview == "Email MSG1"
+    assert flagged["f1"].etag
+
+    graph.put("tasks", "t1", "Book dentist appointment")
+    graph.put("tasks", "t3", "Pay invoice")
+    graph.put("tasks", "t2", "Renew passport", status="completed")
+    graph.delete("flag", "f2")
+    graph.calls.clear()
+
+    second = repository.sync_tasks(user, "token", store)
+
+    assert second.changed_ids == {"t1", "t3"}
+    assert second.removed_ids == {"t2", "f2"}
+    assert second.resynced_lists == []
+    records = {record["id"]: record for record in store.records()}
+    assert set(records) == {"t1", "t3", "f1"}
+    assert records["t1"]["title"] == "Book dentist appointment"
+    assert records["f1"]["linked_message_preview"] == "Email MSG1"
+    # lists, one delta page per list and one $batch for the changed tasks
+    assert len(graph.calls) == 4
+
+    graph.expired_tokens.add(("tasks", len(graph.log)))
+    graph.put("tasks", "t4", "Water plants")
+    graph.calls.clear()
+    third = repository.sync_tasks(user, "token", store)
+    assert third.resynced_lists == ["tasks"]
+    # the resync pages the task listing rather than reading tasks one $batch sub-request each
+    assert not any(method == "POST" for method, _ in graph.calls)
+    assert {record["id"] for record in store.records()} == {"t1", "t3", "t4", "f1"}
+
+
+def _titles(count: int):
+    rng = random.Random(7)
+    words = ["invoice", "acme", "report", "call", "dentist", "renew", "permit", "email", "budget", "review"]
+    return [" ".join(rng.sample(words, 3)) for _ in range(count)]
+
+
+def test_recluster_changed_matches_a_full_run(tmp_path) -> None:
+    service = TaskClusteringService(TodoDedupConfig(fuzzy_score_threshold=86))
+    tasks = [{"id": f"t{index}", "title": title, "body": ""} for index, title in enumerate(_titles(120))]
+    store = TaskStore(tmp_path / "tasks.db")
+    store.save_clusters(tasks, service.cluster_tasks(tasks))
+
+    updated = [dict(task) for task in tasks if task["id"] not in {"t5", "t60"}]
+    updated[10]["title"] = "completely different title"
+    updated.append({"id": "new", "title": tasks[3]["title"] + " today", "body": ""})
+    changed = {"t5", "t60", updated[10]["id"], "new"}
+
+    clusters, touched = service.recluster_changed(updated, store.load_clusters(), changed)
+
+    expected = service.cluster_tasks(updated)
+    assert [cluster.indices for cluster in clusters] == [cluster.indices for cluster in expected]
+    assert [cluster.cluster_id for cluster in clusters] == list(range(1, len(clusters) + 1))
+    touched_members = {index for cluster in touched for index in cluster.indices}
+    assert len(updated) - 1 in touched_members
+    assert len(touched) < len(clusters)
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from core.utilities.appointment_fingerprint import (
+    appointment_fingerprint,
+    compute_fingerprint,
+    normalize_subject,
+)
+from core.utilities.calendar_overlap_utility import merge_duplicates
+
+
+START = datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc)
+END = datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+class TestAppointmentFingerprint:
+    """Test suite for the canonical appointment fingerprint"""
+
+    def test_fingerprint_is_stable_128_bit_hex(self):
+        fp = compute_fingerprint("Team Meeting", START, END)
+        assert len(fp) == 32
+        int(fp, 16)
+        # Persisted fingerprints must not change between releases
+        assert fp == "d057bf407387affb65b27a8df72d127f"
+
+    def test_fingerprint_normalizes_timezones(self):
+        plus_two = timezone(timedelta(hours=2))
+        local = compute_fingerprint(
+            "Standup", START.astimezone(plus_two), END.astimezone(plus_two)
+        )
+        naive_utc = compute_fingerprint(
+            "Standup", START.replace(tzinfo=None), END.replace(tzinfo=None)
+        )
+        iso = compute_fingerprint("Standup", "2024-01-01T09:00:00Z", "2024-01-01T10:00:00Z")
+        assert local == naive_utc == iso == compute_fingerprint("Standup", START, END)
+
+    def test_fingerprint_ignores_sub_second_precision(self):
+        assert compute_fingerprint("A", START.replace(microsecond=500), END) == compute_fingerprint(
+            "A", START, END
+        )
+
+    @pytest.mark.parametrize(
+        "subject, expected",
+        [
+            ("  Team   Meeting ", "Team Meeting"),
+            ("Team\tMeeting\n", "Team Meeting"),
+            (None, ""),
+        ],
+    )
+    def test_normalize_subject(self, subject, expected):
+        assert normalize_subject(subject) == expected
+
+    def test_fingerprint_is_case_sensitive(self):
+        assert compute_fingerprint("Meeting", START, END) != compute_fingerprint(
+            "meeting", START, END
+        )
+
+    def test_fingerprint_distinguishes_times(self):
+        assert compute_fingerprint("A", START, END) != compute_fingerprint(
+            "A", START, END + timedelta(minutes=1)
+        )
+
+    def test_objects_and_dicts_share_fingerprint(self):
+        obj = SimpleNamespace(subject="Review", start_time=START, end_time=END)
+        data = {"subject": "Review", "start_time": START, "end_time": END}
+        assert appointment_fingerprint(obj) == appointment_fingerprint(data)
+        assert appointment_fingerprint(None) is None
+
+    def test_merge_duplicates_uses_fingerprint(self):
+        a1 = SimpleNamespace(subject="Review", start_time=START, end_time=END)
+        a2 = SimpleNamespace(
+            subject=" Review ", start_time=START.astimezone(timezone(timedelta(hours=-5))), end_time=END
+        )
+        a3 = SimpleNamespace(subject="Other", start_time=START, end_time=END)
+        assert merge_duplicates([a1, a2, a3]) == [a1, a3]
+
+
+class TestSQLAlchemyFingerprintPersistence:
+    """Fingerprint column is populated and used for local duplicate checks"""
+
+    def test_add_persists_fingerprint_and_rejects_duplicate(self, db_session, test_user):
+        from core.exceptions import DuplicateAppointmentException
+        from core.models.appointment import Appointment
+        from core.repositories.appointment_repository_sqlalchemy import (
+            SQLAlchemyAppointmentRepository,
+        )
+
+        repo = SQLAlchemyAppointmentRepository(test_user, "fp-calendar", db_session)
+        appt = Appointment(
+            user_id=test_user.id, subject="Review", start_time=START, end_time=END, calendar_id="fp-calendar"
+        )
+        repo.add(appt)
+        assert appt.fingerprint == compute_fingerprint("Review", START, END)
+        assert repo.list_fingerprints() == {appt.fingerprint}
+
+        duplicate = Appointment(
+            user_id=test_user.id,
+            subject="Review  ",
+            start_time=START.replace(tzinfo=None),
+            end_time=END.replace(tzinfo=None),
+            calendar_id="fp-calendar",
+        )
+        with pytest.raises(DuplicateAppointmentException):
+            repo.add(duplicate)
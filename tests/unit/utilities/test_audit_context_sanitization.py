@@ -3,11 +3,13 @@ Tests for AuditContext sanitization integration.
 """
 
 import datetime
+import json
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 
 from core.utilities.audit_logging_utility import AuditContext
 from core.services.audit_log_service import AuditLogService
+from core.utilities.audit_sanitizer import DEFAULT_MAX_PAYLOAD_BYTES
 
 
 class TestAuditContextSanitization:
@@ -253,3 +255,41 @@ class TestAuditContextSanitization:
         assert sanitized_appointment["_model_type"] == "Appointment"
         assert sanitized_appointment["id"] == 999
         assert sanitized_appointment["subject"] == "Service Test Meeting"
+
+    def test_details_share_one_byte_budget_per_row(self, mock_audit_service):
+        """Test that many details together stay within the per-row byte budget."""
+        chunk = ["x" * 500] * 100  # about 50 KB per detail
+        with AuditContext(
+            audit_service=mock_audit_service,
+            user_id=1,
+            action_type="test",
+            operation="test_operation"
+        ) as audit_ctx:
+            for index in range(10):
+                audit_ctx.add_detail(f"chunk_{index}", chunk)
+            audit_ctx.set_request_data({"chunk": chunk})
+            audit_ctx.set_response_data({"chunk": chunk})
+
+        call_kwargs = mock_audit_service.log_operation.call_args[1]
+        row = {key: call_kwargs[key] for key in ("details", "request_data", "response_data")}
+        assert len(json.dumps(row)) < DEFAULT_MAX_PAYLOAD_BYTES + 4096
+        assert call_kwargs["details"]["chunk_9"] == "<truncated>"
+
+    def test_overwritten_details_do_not_use_up_the_budget(self, mock_audit_service):
+        """Test that replacing a detail refunds the budget charged for the old value."""
+        chunk = ["x" * 200] * 100  # about 20 KB per value
+        with AuditContext(
+            audit_service=mock_audit_service,
+            user_id=1,
+            action_type="test",
+            operation="test_operation"
+        ) as audit_ctx:
+            for _ in range(10):
+                audit_ctx.add_detail("phase", chunk)
+                audit_ctx.set_response_data({"chunk": chunk})
+            audit_ctx.add_detail("final_result", {"status": "success"})
+
+        call_kwargs = mock_audit_service.log_operation.call_args[1]
+        assert call_kwargs["details"]["phase"] == chunk
+        assert call_kwargs["details"]["final_result"] == {"status": "success"}
+        assert call_kwargs["response_data"] == {"chunk": chunk}
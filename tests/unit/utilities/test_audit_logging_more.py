@@ -70,8 +70,8 @@ def test_set_request_and_response_data_sanitization_failure(monkeypatch):
     fake = FakeAuditService()
     monkeypatch.setattr(al, 'AuditLogService', lambda: fake)
 
-    # Make sanitize_for_audit raise inside audit_logging_utility
-    monkeypatch.setattr(al, 'sanitize_for_audit', lambda v: (_ for _ in ()).throw(Exception('boom')))
+    # Make sanitize_audit_payload raise inside audit_logging_utility
+    monkeypatch.setattr(al, 'sanitize_audit_payload', lambda v, **kwargs: (_ for _ in ()).throw(Exception('boom')))
 
     ctx = al.AuditContext(audit_service=fake, user_id=1, action_type='a', operation='op')
     with ctx:
@@ -256,5 +256,70 @@ def test_sanitize_audit_data_with_dict():
     assert out['a'] == 1
 
 
+
+class _Appointment:
+    """Appointment-like object; the bounded sanitizer dispatches on class name."""
+
+    def __init__(self, i):
+        self.id = i
+        self.subject = f'Meeting {i}'
+        self.start_time = datetime(2025, 5, 1, 9, 0, tzinfo=pytz.UTC)
+        self.end_time = datetime(2025, 5, 1, 10, 0, tzinfo=pytz.UTC)
+        self.__table__ = type('T', (), {'name': 'appointments'})
+
+
+_Appointment.__name__ = 'Appointment'
+
+
+def test_bounded_small_payload_matches_sanitize_for_audit():
+    from core.utilities.audit_sanitizer import sanitize_audit_payload
+    data = {'status': 'ok', 'when': date(2025, 1, 2), 'conflicts': [_Appointment(1)], 1: {'a'}}
+    assert sanitize_audit_payload(data) == sanitize_for_audit(data)
+
+
+def test_bounded_large_collections_are_compact_and_truncated():
+    from core.utilities.audit_sanitizer import AuditPayloadSanitizer
+    sanitizer = AuditPayloadSanitizer(max_items=100, compact_threshold=5)
+    out = sanitizer.sanitize({'conflicts': [_Appointment(i) for i in range(250)]})
+
+    conflicts = out['conflicts']
+    assert len(conflicts) == 101
+    assert conflicts[0][:3] == [0, '2025-05-01T09:00:00+00:00', '2025-05-01T10:00:00+00:00']
+    assert len(conflicts[0][3]) == 12 and conflicts[0][3] != conflicts[1][3]
+    assert conflicts[-1] == '<truncated:150 more>'
+
+
+def test_bounded_sampling_spans_the_collection():
+    from core.utilities.audit_sanitizer import AuditPayloadSanitizer
+    out = AuditPayloadSanitizer(max_items=5, sample_large_collections=True).sanitize(list(range(101)))
+    assert out == [0, 25, 50, 75, 100, '<sampled:5 of 101>']
+
+
+def test_bounded_byte_budget_and_long_strings():
+    import json
+    from core.utilities.audit_sanitizer import AuditPayloadSanitizer, TRUNCATED_MARKER
+    sanitizer = AuditPayloadSanitizer(max_bytes=1000, max_string_length=50)
+    out = sanitizer.sanitize({'errors': ['x' * 200] * 100, 'after': 'dropped'})
+
+    assert out['errors'][0] == 'x' * 50 + '<truncated:150 chars>'
+    assert out['errors'][-1].startswith('<truncated:')
+    assert out.get('after', TRUNCATED_MARKER) == TRUNCATED_MARKER
+    assert len(json.dumps(out)) < 2000
+
+
+def test_bounded_registered_encoder():
+    from core.utilities.audit_sanitizer import AuditPayloadSanitizer
+
+    class Money:
+        def __init__(self, cents):
+            self.cents = cents
+
+    AuditPayloadSanitizer.register_encoder('Money', lambda m: f'{m.cents / 100:.2f}')
+    try:
+        assert AuditPayloadSanitizer().sanitize([Money(1250)]) == ['12.50']
+    finally:
+        AuditPayloadSanitizer._full_encoders.pop('Money', None)
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -6,18 +6,32 @@ token management, and security features.
 """
 
 import pytest
+import asyncio
 import os
 import tempfile
 from unittest.mock import Mock, patch, MagicMock, mock_open
 from core.utilities.auth_utility import (
     ensure_secure_cache_dir,
     get_msal_app,
+    get_token_provider,
     msal_login,
     get_cached_access_token,
     msal_logout
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_token_provider(tmp_path):
+    """Reset the process-wide token provider and keep its cache file in tmp_path."""
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir, mode=0o700)
+    with patch('core.utilities.auth_utility.CACHE_DIR', cache_dir), \
+            patch('core.utilities.auth_utility.CACHE_PATH', os.path.join(cache_dir, 'ms_token.json')):
+        get_token_provider().invalidate()
+        yield
+        get_token_provider().invalidate()
+
+
 class TestAuthUtility:
     """Test suite for authentication utility functions"""
     
@@ -314,3 +328,101 @@ class TestAuthUtility:
                 # Verify secure permissions (0o600 = owner read/write only)
                 chmod_call_args = mock_chmod.call_args[0]
                 assert chmod_call_args[1] == 0o600
+
+
+class TestTokenProvider:
+    """Test suite for the in-process token provider"""
+
+    def make_app(self, *results, state_changed=False):
+        app = MagicMock()
+        cache = MagicMock()
+        cache.has_state_changed = state_changed
+        cache.serialize.return_value = '{"AccessToken": {}}'
+        app.get_accounts.return_value = [{'account': 'test'}]
+        app.acquire_token_silent.side_effect = list(results)
+        return app, cache
+
+    @patch('core.utilities.auth_utility.get_msal_app')
+    def test_token_is_memoized_until_expiry(self, mock_get_app):
+        app, cache = self.make_app({'access_token': 't1', 'expires_in': 3600})
+        mock_get_app.return_value = (app, cache)
+
+        assert get_cached_access_token() == 't1'
+        assert get_cached_access_token() == 't1'
+
+        mock_get_app.assert_called_once()
+        app.acquire_token_silent.assert_called_once()
+
+    @patch('core.utilities.auth_utility.get_msal_app')
+    def test_refreshes_in_background_before_expiry(self, mock_get_app):
+        app, cache = self.make_app(
+            {'access_token': 't1', 'expires_in': 120},
+            {'access_token': 't2', 'expires_in': 3600},
+        )
+        mock_get_app.return_value = (app, cache)
+        provider = get_token_provider()
+
+        assert provider.get_token() == 't1'
+        # Inside the refresh margin the current token is still served
+        assert provider.get_token() == 't1'
+        provider._refresh_thread.join(timeout=5)
+        assert provider.get_token() == 't2'
+        assert app.acquire_token_silent.call_count == 2
+
+    @patch('core.utilities.auth_utility.get_msal_app')
+    def test_nearly_expired_token_refreshes_synchronously(self, mock_get_app):
+        app, cache = self.make_app(
+            {'access_token': 't1', 'expires_in': 30},
+            {'access_token': 't2', 'expires_in': 3600},
+        )
+        mock_get_app.return_value = (app, cache)
+
+        assert get_cached_access_token() == 't1'
+        assert get_cached_access_token() == 't2'
+
+    @patch('core.utilities.auth_utility.get_msal_app')
+    def test_cache_written_only_when_changed(self, mock_get_app):
+        from core.utilities import auth_utility
+
+        app, cache = self.make_app({'access_token': 't1', 'expires_in': 3600})
+        mock_get_app.return_value = (app, cache)
+        get_cached_access_token()
+        assert not os.path.exists(auth_utility.CACHE_PATH)
+
+        get_token_provider().invalidate()
+        app, cache = self.make_app({'access_token': 't2', 'expires_in': 3600}, state_changed=True)
+        mock_get_app.return_value = (app, cache)
+        assert get_cached_access_token() == 't2'
+        assert oct(os.stat(auth_utility.CACHE_PATH).st_mode)[-3:] == '600'
+        assert cache.has_state_changed is False
+
+        # Our own write is not treated as an external change
+        assert get_cached_access_token() == 't2'
+        assert mock_get_app.call_count == 2
+
+    @patch('core.utilities.auth_utility.get_msal_app')
+    def test_external_cache_change_reloads_app(self, mock_get_app):
+        from core.utilities import auth_utility
+
+        app, cache = self.make_app(
+            {'access_token': 't1', 'expires_in': 3600},
+            {'access_token': 't2', 'expires_in': 3600},
+        )
+        mock_get_app.return_value = (app, cache)
+        assert get_cached_access_token() == 't1'
+
+        ensure_secure_cache_dir()
+        with open(auth_utility.CACHE_PATH, 'w') as f:
+            f.write('{"logged in": "elsewhere"}')
+
+        assert get_cached_access_token() == 't2'
+        assert mock_get_app.call_count == 2
+
+    @patch('core.utilities.auth_utility.get_msal_app')
+    def test_aget_token(self, mock_get_app):
+        app, cache = self.make_app({'access_token': 't1', 'expires_in': 3600})
+        mock_get_app.return_value = (app, cache)
+
+        assert asyncio.run(get_token_provider().aget_token()) == 't1'
+        assert asyncio.run(get_token_provider().aget_token()) == 't1'
+        app.acquire_token_silent.assert_called_once()
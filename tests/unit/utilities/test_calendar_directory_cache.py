@@ -0,0 +1,123 @@
+"""
+Unit tests for the shared calendar directory cache used by CalendarResolver.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from core.utilities import calendar_resolver
+from core.utilities.calendar_resolver import (
+    CalendarDirectory,
+    CalendarResolver,
+    calendar_directory_cache,
+    resolve_calendar_uri,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, etag=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = {"ETag": etag} if etag else {}
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None):
+        self.calls.append((url, dict(headers or {})))
+        return self.responses.pop(0)
+
+    def close(self):
+        pass
+
+
+CALENDARS = [
+    {"id": "cal-1", "name": "Calendar", "isDefaultCalendar": True},
+    {"id": "cal-2", "name": "Activity Archive"},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_directory_cache():
+    calendar_directory_cache.invalidate()
+    yield
+    calendar_directory_cache.invalidate()
+
+
+@pytest.fixture
+def user():
+    user = Mock()
+    user.id = 7
+    user.email = "Dir@Example.com"
+    user.username = "dir"
+    return user
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession(FakeResponse(200, {"value": CALENDARS}, etag='W/"1"'))
+    monkeypatch.setattr(calendar_resolver.requests, "Session", lambda: session)
+    return session
+
+
+class TestCalendarDirectory:
+    def test_lookup_precedence(self):
+        directory = CalendarDirectory(
+            [{"id": "a", "name": "Activity Archive"}, {"id": "b", "name": "activity-archive"}]
+        )
+        assert directory.lookup("Activity Archive") == ("a", "exact")
+        assert directory.lookup("activity-archive") == ("b", "exact")
+        assert directory.lookup("ACTIVITY ARCHIVE")[0] == "a"
+        assert directory.lookup("Missing") == (None, None)
+
+
+class TestSharedCalendarDirectoryCache:
+    def test_resolvers_share_one_listing(self, user, session):
+        assert resolve_calendar_uri("msgraph://calendars/\"Activity Archive\"", user, "token") == "cal-2"
+        assert resolve_calendar_uri("msgraph://dir@example.com/calendars/\"Activity Archive\"", user, "token") == "cal-2"
+        assert len(session.calls) == 1
+
+    def test_unknown_name_refreshes_once_then_is_negatively_cached(self, user, session):
+        session.responses.append(FakeResponse(200, {"value": CALENDARS}, etag='W/"1"'))
+        resolver = CalendarResolver(user, "token")
+
+        assert resolver.resolve_calendar_uri("msgraph://calendars/\"New One\"") == "New One"
+        assert resolver.resolve_calendar_uri("msgraph://calendars/\"New One\"") == "New One"
+        # Initial listing plus a single forced refresh for the unknown name
+        assert len(session.calls) == 2
+        assert session.calls[1][1]["If-None-Match"] == 'W/"1"'
+
+    def test_expired_directory_revalidates_with_etag(self, user, session):
+        session.responses.append(FakeResponse(304))
+        resolver = CalendarResolver(user, "token")
+        resolver.resolve_calendar_uri("msgraph://calendars/\"Activity Archive\"")
+        calendar_directory_cache.get("dir@example.com").expires_at = 0
+
+        assert resolver.resolve_calendar_uri("msgraph://calendars/\"Activity Archive\"") == "cal-2"
+        assert len(session.calls) == 2
+        assert calendar_directory_cache.get("dir@example.com").is_fresh
+
+    def test_follows_next_link(self, user, monkeypatch):
+        session = FakeSession(
+            FakeResponse(200, {"value": CALENDARS[:1], "@odata.nextLink": "https://next"}),
+            FakeResponse(200, {"value": CALENDARS[1:]}),
+        )
+        monkeypatch.setattr(calendar_resolver.requests, "Session", lambda: session)
+
+        assert resolve_calendar_uri("msgraph://calendars/\"Activity Archive\"", user, "token") == "cal-2"
+        assert session.calls[1][0] == "https://next"
+
+    def test_clear_cache_invalidates_account(self, user, session):
+        session.responses.append(FakeResponse(200, {"value": CALENDARS}))
+        resolver = CalendarResolver(user, "token")
+        resolver.resolve_calendar_uri("msgraph://calendars/\"Activity Archive\"")
+        resolver.clear_cache()
+        resolver.resolve_calendar_uri("msgraph://calendars/\"Activity Archive\"")
+        assert len(session.calls) == 2
@@ -0,0 +1,103 @@
+"""
+Unit tests for chunked retention with cold archive export.
+"""
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, create_engine, func, select
+from sqlalchemy.orm import Session
+
+from core.utilities.retention_engine import ChunkedRetention, RetentionConfig
+
+metadata = MetaData()
+parents = Table(
+    "parents",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(32)),
+    Column("created_at", DateTime, nullable=False),
+)
+children = Table(
+    "children",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("parent_id", Integer, ForeignKey("parents.id"), nullable=False),
+)
+
+BASE = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            parents.insert(),
+            [{"id": i, "name": f"row {i}", "created_at": BASE + timedelta(days=i)} for i in range(1, 101)],
+        )
+        conn.execute(children.insert(), [{"parent_id": i} for i in range(1, 101) for _ in range(2)])
+    with Session(engine) as session:
+        yield session
+
+
+def count(session, table):
+    return session.execute(select(func.count()).select_from(table)).scalar()
+
+
+def test_purge_deletes_in_chunks(session):
+    retention = ChunkedRetention(session, parents, RetentionConfig(chunk_size=7))
+    result = retention.purge(parents.c.created_at < BASE + timedelta(days=51))
+
+    assert result.deleted == 50
+    assert result.chunks == 8
+    assert count(session, parents) == 50
+    assert session.execute(select(func.min(parents.c.id))).scalar() == 51
+
+
+def test_purge_deletes_children_with_parents(session):
+    retention = ChunkedRetention(
+        session, parents, RetentionConfig(chunk_size=10), children=[(children, children.c.parent_id)]
+    )
+    result = retention.purge(parents.c.id <= 30)
+
+    assert result.deleted == 30
+    assert count(session, children) == 140
+    assert session.execute(select(func.min(children.c.parent_id))).scalar() == 31
+
+
+def test_purge_exports_ndjson_archive(session, tmp_path):
+    config = RetentionConfig(chunk_size=4, export_dir=str(tmp_path))
+    retention = ChunkedRetention(session, parents, config, children=[(children, children.c.parent_id)])
+    result = retention.purge(parents.c.id <= 10, label="test")
+
+    assert result.exported == 10
+    assert len(result.export_files) == 2
+    parent_file = next(path for path in result.export_files if "parents_test" in path)
+    with gzip.open(parent_file, "rt", encoding="utf-8") as handle:
+        rows = [json.loads(line) for line in handle]
+    assert [row["id"] for row in rows] == list(range(1, 11))
+    assert rows[0]["created_at"].startswith("2025-01-02")
+
+
+def test_nothing_to_purge(session):
+    result = ChunkedRetention(session, parents).purge(parents.c.id < 0)
+    assert (result.deleted, result.chunks, result.export_files) == (0, 0, [])
+
+
+def test_unknown_export_format_raises(session, tmp_path):
+    config = RetentionConfig(export_dir=str(tmp_path), export_format="csv")
+    with pytest.raises(ValueError):
+        ChunkedRetention(session, parents, config).purge(parents.c.id <= 1)
+    assert count(session, parents) == 100
+
+
+def test_config_from_env(monkeypatch):
+    monkeypatch.setenv("RETENTION_CHUNK_SIZE", "250")
+    monkeypatch.setenv("RETENTION_EXPORT_FORMAT", "Parquet")
+    monkeypatch.setenv("RETENTION_VACUUM", "off")
+    config = RetentionConfig.from_env()
+    assert (config.chunk_size, config.export_format, config.vacuum) == (250, "parquet", False)
+    assert config.export_dir is None
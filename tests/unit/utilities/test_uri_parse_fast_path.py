@@ -0,0 +1,89 @@
+"""
+Unit tests for the memoized, compiled fast path of parse_resource_uri.
+
+The fast path must agree with the full parser for every input, so these tests
+compare both over a seeded set of generated URIs rather than fixed examples.
+"""
+import dataclasses
+import random
+
+import pytest
+
+from core.utilities import uri_utility
+from core.utilities.uri_utility import (
+    URIParseError,
+    clear_uri_parse_cache,
+    parse_resource_uri,
+)
+
+SCHEMES = ["msgraph", "local", "MSGraph", "s3", "x+y", "1bad", ""]
+ACCOUNTS = ["", "user@example.com", "first.last+tag@sub.example.co", "42", "bob", "a@b", "bad@@x.com", "User@Example.COM"]
+NAMESPACES = ["calendars", "contacts", "emails", "tasks", "files", "notes", "Calendars", ""]
+IDENTIFIER_PARTS = [
+    "primary", "Calendar", "calendar", "AAMkAGI2TG93AAA=", "17", "a/b", '"Activity Archive"',
+    "Activity%20Archive", "name\\\"x", " padded ", "Calendar: Work", "id;p", "id?q=1", "id#frag",
+    "'single'", "x@y", "(work)", "~", "", "tab\there", "trailing\n",
+]
+
+
+def generate_uris(count, seed=1234):
+    rng = random.Random(seed)
+    for _ in range(count):
+        scheme = rng.choice(SCHEMES)
+        parts = [p for p in (rng.choice(ACCOUNTS), rng.choice(NAMESPACES)) if p or rng.random() < 0.2]
+        identifier = "".join(rng.choice(IDENTIFIER_PARTS) for _ in range(rng.randint(0, 2)))
+        yield f"{scheme}://" + "/".join(parts + [identifier])
+
+
+def parse_outcome(parse, uri):
+    try:
+        return ("ok", parse(uri))
+    except URIParseError as e:
+        return ("error", str(e))
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    clear_uri_parse_cache()
+    yield
+    clear_uri_parse_cache()
+
+
+class TestParseResourceUriFastPath:
+    def test_matches_full_parser_for_generated_uris(self):
+        uris = list(generate_uris(3000))
+        fast_hits = sum(1 for uri in uris if uri_utility._FAST_URI_PATTERN.match(uri))
+        assert fast_hits > 100  # the generator actually exercises the fast path
+
+        for uri in uris:
+            expected = parse_outcome(uri_utility._parse_resource_uri_full, uri)
+            assert parse_outcome(parse_resource_uri, uri) == expected, uri
+            # Second call is served from the cache and must agree too
+            assert parse_outcome(parse_resource_uri, uri) == expected, uri
+
+    @pytest.mark.parametrize(
+        "uri",
+        [
+            "msgraph://calendars/primary",
+            "msgraph://user@example.com/calendars/AAMkAGI2TG93AAA=",
+            "msgraph://42/tasks/inbox",
+        ],
+    )
+    def test_common_shapes_take_fast_path(self, uri):
+        assert uri_utility._FAST_URI_PATTERN.match(uri)
+        assert parse_resource_uri(uri) == uri_utility._parse_resource_uri_full(uri)
+
+    def test_results_are_cached_and_immutable(self):
+        first = parse_resource_uri("msgraph://calendars/primary")
+        assert parse_resource_uri("msgraph://calendars/primary") is first
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first.identifier = "other"
+
+    def test_errors_are_not_cached(self):
+        with pytest.raises(URIParseError):
+            parse_resource_uri("msgraph://calendars")
+        assert uri_utility._parse_resource_uri_cached.cache_info().currsize == 0
+
+    def test_non_string_input_uses_full_parser(self):
+        with pytest.raises(URIParseError):
+            parse_resource_uri(None)
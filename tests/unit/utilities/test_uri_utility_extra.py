@@ -259,6 +259,8 @@ def test_parse_resource_uri_more_error_branches_and_unusual_inputs(monkeypatch):
     def bad_unquote(x):
         raise ValueError('boom')
     monkeypatch.setattr(uu.urllib.parse, 'unquote', bad_unquote)
+    # Drop memoized results so the URI goes through the (patched) parser again
+    uu.clear_uri_parse_cache()
     # This should fall back to parse_user_friendly_identifier and not raise
     p = parse_resource_uri('msgraph://calendars/Activity%20Archive')
     # Since unquote raised, parse_user_friendly_identifier will be used; for %20 input